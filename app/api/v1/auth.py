@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, Form
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.services.auth_service import authenticate_user, authenticate_user_by_username
+from app.services.auth_service import authenticate_user_async, authenticate_user_by_username_async
 from app.db.database import get_db
+from app.db.async_database import ReadSession, get_read_db
+from app.models.user import User
 from app.schemas.user import TokenResponse, UserOut
 from app.core.rbac import get_current_user
 
@@ -19,7 +22,8 @@ router = APIRouter(
     summary="Connexion utilisateur",
     description="Authentifie un utilisateur avec email + mot de passe. Retourne un token JWT si valide."
 )
-def login(
+async def login(
+    request: Request,
     email: str = Form(...),
     password: str = Form(...),
     db: Session = Depends(get_db)
@@ -29,8 +33,10 @@ def login(
     - Vérifie l'email + mot de passe.
     - Retourne un token JWT avec rôle embarqué.
     - Utilisé dans le header `Authorization: Bearer <token>`
+    - 429 si trop d'échecs récents ou si le pool bcrypt est saturé
+    - async : l'attente du calcul bcrypt n'occupe pas de thread du threadpool
     """
-    return authenticate_user(db, email, password)
+    return await authenticate_user_async(db, email, password, client_ip=_client_ip(request))
 
 @router.post(
     "/login",
@@ -38,7 +44,8 @@ def login(
     summary="Connexion utilisateur (username/password)",
     description="Authentifie un utilisateur avec username + mot de passe. Retourne un token JWT si valide."
 )
-def login_username(
+async def login_username(
+    request: Request,
     username: str = Form(...),
     password: str = Form(...),
     db: Session = Depends(get_db)
@@ -46,7 +53,11 @@ def login_username(
     """
     Endpoint de login via username pour compatibilité avec certains tests.
     """
-    return authenticate_user_by_username(db, username, password)
+    return await authenticate_user_by_username_async(db, username, password, client_ip=_client_ip(request))
+
+
+def _client_ip(request: Request):
+    return request.client.host if request.client else None
 
 # ======= ROUTE /me (infos utilisateur courant via JWT) =========
 
@@ -56,17 +67,15 @@ def login_username(
     summary="Informations de l'utilisateur courant",
     description="Retourne les infos du profil de l'utilisateur connecté, à partir du JWT envoyé dans le header."
 )
-def get_me(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_me(current_user = Depends(get_current_user), db: ReadSession = Depends(get_read_db)):
     """
     Récupère l'utilisateur courant à partir du JWT Bearer.
     Utile pour le frontend (profil, header...).
     """
     # current_user contient : {'user_id': ..., 'email': ..., 'role': ...}
     # On va récupérer l'utilisateur complet dans la base (UserOut = toutes les infos du user)
-    from app.services.user_service import get_user_by_email  # Import local pour éviter les cycles
-    user = get_user_by_email(db, current_user["email"])
+    user = await db.first(select(User).where(User.email == current_user["email"]))
     if not user:
-        from fastapi import HTTPException, status
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Utilisateur non trouvé")
     return user
 
@@ -87,6 +96,7 @@ def change_password(
     """
     from app.services.user_service import get_user_by_email, update_user_password
     from app.services.auth_service import verify_password
+    from app.core.password_hashing import run_password_task
     from fastapi import HTTPException, status
 
     user = get_user_by_email(db, current_user["email"])
@@ -94,7 +104,7 @@ def change_password(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Utilisateur non trouvé")
 
     # Vérifier l'ancien mot de passe
-    if not verify_password(current_password, user.hashed_password):
+    if not run_password_task(verify_password, current_password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Mot de passe actuel incorrect")
 
     # Mettre à jour le mot de passe
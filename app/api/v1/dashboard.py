@@ -1,11 +1,24 @@
 # app/api/v1/dashboard.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from app.db.database import get_db
-from app.core.rbac import get_current_user
+from app.db.async_database import ReadSession, get_read_db
+from app.core.rbac import get_current_user, require_roles
+from app.models.client import Client
+from app.models.technicien import Technicien
+from app.schemas.dashboard import (
+    EquipementHealthPage,
+    KPIAdmin,
+    KPIClient,
+    KPIResponsable,
+    KPITechnicien,
+    TechnicienWorkload,
+    TimeRange,
+    TriSante,
+)
+from app.services import dashboard_service
 
 router = APIRouter(
     prefix="/dashboard",
@@ -13,98 +26,103 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
+SUPERVISEURS = ("admin", "responsable")
+
+
 @router.get(
     "/stats",
     summary="Statistiques du tableau de bord",
     description="Retourne les statistiques principales pour le tableau de bord."
 )
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+async def get_dashboard_stats(
+    db: ReadSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
     Statistiques du tableau de bord pour l'utilisateur connecté.
+
+    Tous les KPI sont calculés en deux requêtes agrégées
+    (voir app.services.dashboard_service), résultat mis en cache.
+    """
+    return await dashboard_service.get_dashboard_stats_async(db)
+
+
+def _resolve_scope(db: Session, current_user: dict, model, role: str, scope_id: Optional[int]) -> int:
+    """
+    Détermine l'identifiant de périmètre (technicien/client) autorisé.
+
+    - rôle `role`: son propre profil (un autre identifiant est refusé)
+    - admin/responsable: identifiant explicite obligatoire
     """
+    if current_user["role"] in SUPERVISEURS:
+        if scope_id is None:
+            raise HTTPException(status_code=400, detail=f"Paramètre {role}_id requis")
+        if not db.query(model.id).filter(model.id == scope_id).first():
+            raise HTTPException(status_code=404, detail=f"{role.capitalize()} introuvable")
+        return scope_id
+    own = db.query(model.id).filter(model.user_id == current_user["user_id"]).scalar()
+    if own is None:
+        raise HTTPException(status_code=404, detail=f"Profil {role} introuvable")
+    if scope_id is not None and scope_id != own:
+        raise HTTPException(status_code=403, detail="Accès limité à votre propre tableau de bord")
+    return own
+
+
+@router.get("/kpi/admin", response_model=KPIAdmin, summary="KPI administrateur")
+def get_kpi_admin(
+    periode: TimeRange = Query(TimeRange.mois),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_roles("admin"))
+):
+    return dashboard_service.get_admin_kpis(db, periode)
+
 
-    # Interventions par statut
-    intervention_stats = db.execute(text("""
-        SELECT
-            statut,
-            COUNT(*) as count
-        FROM interventions
-        GROUP BY statut
-    """)).fetchall()
-
-    status_counts = {row[0]: row[1] for row in intervention_stats}
-
-    # Total interventions ce mois
-    monthly_interventions = db.execute(text("""
-        SELECT COUNT(*) as count
-        FROM interventions
-        WHERE DATE_TRUNC('month', date_creation) = DATE_TRUNC('month', CURRENT_DATE)
-    """)).scalar() or 0
-
-    # Interventions terminées ce mois
-    completed_monthly = db.execute(text("""
-        SELECT COUNT(*) as count
-        FROM interventions
-        WHERE statut = 'cloturee'
-        AND DATE_TRUNC('month', date_creation) = DATE_TRUNC('month', CURRENT_DATE)
-    """)).scalar() or 0
-
-    # Taux de résolution (interventions terminées / total * 100)
-    total_interventions = db.execute(text("SELECT COUNT(*) FROM interventions")).scalar() or 1
-    completed_interventions = db.execute(text("SELECT COUNT(*) FROM interventions WHERE statut = 'cloturee'")).scalar() or 0
-    resolution_rate = round((completed_interventions / total_interventions) * 100, 1)
-
-    # Évolution mensuelle (6 derniers mois)
-    monthly_trends = db.execute(text("""
-        SELECT
-            TO_CHAR(date_creation, 'Mon') as month,
-            COUNT(*) as total
-        FROM interventions
-        WHERE date_creation >= CURRENT_DATE - INTERVAL '6 months'
-        GROUP BY TO_CHAR(date_creation, 'Mon'), EXTRACT(MONTH FROM date_creation)
-        ORDER BY EXTRACT(MONTH FROM date_creation)
-    """)).fetchall()
-
-    monthly_data = [{"month": row[0], "total": row[1]} for row in monthly_trends]
-
-    # Interventions par priorité
-    priority_stats = db.execute(text("""
-        SELECT
-            priorite,
-            COUNT(*) as count
-        FROM interventions
-        GROUP BY priorite
-    """)).fetchall()
-
-    priority_counts = {row[0]: row[1] for row in priority_stats}
-
-    return {
-        "interventions": {
-            "ouverte": status_counts.get("ouverte", 0),
-            "en_cours": status_counts.get("en_cours", 0),
-            "en_attente": status_counts.get("en_attente", 0),
-            "terminees": status_counts.get("cloturee", 0),
-            "total_mensuel": monthly_interventions,
-            "terminees_mensuel": completed_monthly
-        },
-        "taux_resolution": resolution_rate,
-        "evolution_mensuelle": monthly_data,
-        "priorites": {
-            "urgente": priority_counts.get("urgente", 0),
-            "haute": priority_counts.get("haute", 0),
-            "normale": priority_counts.get("normale", 0),
-            "basse": priority_counts.get("basse", 0)
-        },
-        "equipements": {
-            "total": db.execute(text("SELECT COUNT(*) FROM equipements")).scalar() or 0,
-            "operationnel": db.execute(text("SELECT COUNT(*) FROM equipements WHERE statut = 'operational'")).scalar() or 0,
-            "maintenance": db.execute(text("SELECT COUNT(*) FROM equipements WHERE statut = 'maintenance'")).scalar() or 0
-        },
-        "utilisateurs": {
-            "total": db.execute(text("SELECT COUNT(*) FROM users")).scalar() or 0,
-            "actifs": db.execute(text("SELECT COUNT(*) FROM users WHERE is_active = true")).scalar() or 0
-        }
-    }
+@router.get("/kpi/responsable", response_model=KPIResponsable, summary="KPI responsable")
+def get_kpi_responsable(
+    periode: TimeRange = Query(TimeRange.mois),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_roles(*SUPERVISEURS))
+):
+    return dashboard_service.get_responsable_kpis(db, periode)
+
+
+@router.get("/kpi/technicien", response_model=KPITechnicien, summary="KPI d'un technicien")
+def get_kpi_technicien(
+    periode: TimeRange = Query(TimeRange.mois),
+    technicien_id: Optional[int] = Query(None, description="Requis pour admin/responsable"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_roles(*SUPERVISEURS, "technicien"))
+):
+    scope_id = _resolve_scope(db, current_user, Technicien, "technicien", technicien_id)
+    return dashboard_service.get_technicien_kpis(db, scope_id, periode)
+
+
+@router.get("/kpi/client", response_model=KPIClient, summary="KPI d'un client")
+def get_kpi_client(
+    periode: TimeRange = Query(TimeRange.mois),
+    client_id: Optional[int] = Query(None, description="Requis pour admin/responsable"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_roles(*SUPERVISEURS, "client"))
+):
+    scope_id = _resolve_scope(db, current_user, Client, "client", client_id)
+    return dashboard_service.get_client_kpis(db, scope_id, periode)
+
+
+@router.get("/equipements/sante", response_model=EquipementHealthPage, summary="Santé des équipements")
+def get_equipements_sante(
+    periode: TimeRange = Query(TimeRange.mois),
+    tri: TriSante = Query(TriSante.risque, description="risque: équipements les plus à risque en premier"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_roles(*SUPERVISEURS))
+):
+    return dashboard_service.get_equipements_health(db, periode, limit=limit, offset=offset, tri=tri)
+
+
+@router.get("/techniciens/charge", response_model=List[TechnicienWorkload], summary="Charge des techniciens")
+def get_techniciens_charge(
+    db: Session = Depends(get_db),
+    current_user = Depends(require_roles(*SUPERVISEURS))
+):
+    return dashboard_service.get_techniciens_workload(db)
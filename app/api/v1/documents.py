@@ -1,15 +1,28 @@
 # app/api/v1/documents.py
 
-from fastapi import APIRouter, Depends, UploadFile, File, status, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Header, Query, status, HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from urllib.parse import quote
+import os
 from app.db.database import get_db
 from app.models.document import Document
 from app.schemas.document import DocumentOut
-from app.services.document_service import create_document
+from app.services.document_service import (
+    DOCUMENT_KEYSET, blob_path, create_document, document_etag, etag_matches, get_accessible_document,
+    release_blob,
+)
+from app.services.document_archive_service import (
+    ARCHIVE_MEDIA_TYPE, acquire_slot, archive_documents, archive_entries, archive_key, cached_archive,
+    stream_archive,
+)
 from app.core.config import settings
-import os
-from app.core.rbac import technicien_required, responsable_required, admin_required
+from app.core.rbac import technicien_required, responsable_required, admin_required, auth_required
+from app.core.access_policy import restrict_documents
+from app.core.pagination import Pagination
 
 router = APIRouter(
     prefix="/documents",
@@ -54,48 +67,118 @@ def upload_document_alias(
     "/",
     response_model=List[DocumentOut],
     summary="Lister tous les documents",
-    description="Accès à la liste de tous les documents liés aux interventions (admin/responsable uniquement).",
-    dependencies=[Depends(admin_required)]
+    description="Documents des interventions visibles par l'utilisateur : tous pour admin/responsable, "
+                "ceux de ses interventions pour un technicien ou un client."
 )
-def list_documents(db: Session = Depends(get_db)):
-    return db.query(Document).all()
+def list_documents(db: Session = Depends(get_db), user: dict = Depends(auth_required),
+                   page: Pagination = Depends()):
+    return page.paginate(db, restrict_documents(select(Document), user), DOCUMENT_KEYSET)
+
+def _content_disposition(filename: str) -> str:
+    # Même encodage que FileResponse (RFC 6266 / 5987 pour les noms non ASCII)
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+# Déclaré avant /{intervention_id} (sinon "archive" serait lu comme un identifiant)
+@router.get(
+    "/archive",
+    summary="Archive ZIP des documents d'interventions",
+    description="ZIP de tous les documents des interventions demandées (paramètre intervention_id répétable) "
+                "visibles par l'utilisateur, généré en flux. 503 si trop d'archives sont en cours de génération; "
+                "servie depuis le cache disque si la même sélection de contenus a déjà été produite.",
+    responses={200: {"content": {ARCHIVE_MEDIA_TYPE: {}}}, 304: {"description": "Non modifié"}},
+)
+def download_archive(intervention_id: List[int] = Query(..., min_length=1), db: Session = Depends(get_db),
+                     user: dict = Depends(auth_required), if_none_match: Optional[str] = Header(default=None)):
+    entries = archive_entries(archive_documents(db, intervention_id, user))
+    key = archive_key(entries)
+    ids = sorted(set(intervention_id))
+    filename = f"documents-intervention-{ids[0]}.zip" if len(ids) == 1 else "documents-interventions.zip"
+    headers = {"Cache-Control": "private, no-cache", "Content-Disposition": _content_disposition(filename)}
+    if key:
+        # Même sélection de contenus et de noms => même archive
+        headers["ETag"] = f'"{key}"'
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    cached = cached_archive(key)
+    if cached:
+        return FileResponse(cached, headers=headers, media_type=ARCHIVE_MEDIA_TYPE)
+    slot = acquire_slot()
+    # La place est rendue à la fin du flux; la tâche de fond couvre un flux jamais démarré
+    return StreamingResponse(stream_archive(entries, key, slot), media_type=ARCHIVE_MEDIA_TYPE,
+                             headers=headers, background=BackgroundTask(slot.release))
 
 # Endpoint attendu par tests: /documents/{intervention_id}
 @router.get(
     "/{intervention_id}",
     response_model=List[DocumentOut],
     summary="Lister les documents d'une intervention",
-    dependencies=[Depends(admin_required)]
+    description="Documents d'une intervention du périmètre de l'utilisateur (liste vide sinon)."
 )
-def list_documents_by_intervention(intervention_id: int, db: Session = Depends(get_db)):
-    return db.query(Document).filter(Document.intervention_id == intervention_id).all()
+def list_documents_by_intervention(intervention_id: int, db: Session = Depends(get_db),
+                                   user: dict = Depends(auth_required), page: Pagination = Depends()):
+    stmt = select(Document).where(Document.intervention_id == intervention_id)
+    return page.paginate(db, restrict_documents(stmt, user), DOCUMENT_KEYSET)
+
+@router.get(
+    "/{document_id}/download",
+    summary="Télécharger un document",
+    description="Contenu du document si son intervention est visible par l'utilisateur. Transfert délégué à nginx "
+                "(X-Accel-Redirect) si DOWNLOAD_ACCEL_REDIRECT_PREFIX est défini; ETag fort (SHA-256), "
+                "If-None-Match (304) et requêtes Range (206) pour reprendre un téléchargement.",
+    responses={200: {"content": {"application/octet-stream": {}}}, 206: {"description": "Contenu partiel"},
+               304: {"description": "Non modifié"}},
+)
+def download_document(document_id: int, db: Session = Depends(get_db), user: dict = Depends(auth_required),
+                      if_none_match: Optional[str] = Header(default=None)):
+    doc = get_accessible_document(db, document_id, user)
+    path = blob_path(doc.chemin)
+    accel_prefix = settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX
+    # Pas d'accès disque quand nginx sert le fichier et que l'empreinte est connue
+    stat_result = None
+    if not (accel_prefix and doc.sha256):
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            raise HTTPException(status_code=404, detail="Fichier du document introuvable")
+
+    headers = {"Cache-Control": f"private, max-age={settings.DOWNLOAD_CACHE_MAX_AGE}"}
+    etag = document_etag(doc, stat_result)
+    if etag:
+        headers["ETag"] = etag
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = doc.type_mime or None
+    if accel_prefix:
+        # nginx sert le fichier (sendfile, Range) depuis sa location interne
+        headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + quote(os.path.basename(doc.chemin))
+        headers["Content-Disposition"] = _content_disposition(doc.nom_fichier)
+        return Response(headers=headers, media_type=media_type or "application/octet-stream")
+    # Repli sans nginx: Range / If-Range gérés par FileResponse
+    return FileResponse(path, headers=headers, media_type=media_type, filename=doc.nom_fichier,
+                        stat_result=stat_result)
 
 @router.delete(
     "/{document_id}",
     status_code=status.HTTP_200_OK,
     summary="Supprimer un document",
-    description="Supprime le document (enregistrement + fichier sur disque)",
+    description="Supprime le document, et son fichier sur disque s'il n'est partagé avec aucun autre document",
     dependencies=[Depends(admin_required)]
 )
 def delete_document(document_id: int, db: Session = Depends(get_db)):
     doc = db.query(Document).filter(Document.id == document_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document non trouvé")
-    # Supprime le fichier physique si présent
+    chemin, sha256 = doc.chemin, doc.sha256
+    db.delete(doc)
+    db.commit()
+    # Supprime le blob si ce document en était la dernière référence (contenu dédupliqué)
     try:
-        chemin = doc.chemin or ""
-        # chemin est de la forme "static/uploads/<uuid>.<ext>"; reconstruire chemin absolu
-        if chemin:
-            # settings.UPLOAD_DIRECTORY pointe vers .../app/static/uploads
-            uploads_dir = settings.UPLOAD_DIRECTORY
-            # On ne garde que le nom de fichier réel
-            filename = os.path.basename(chemin)
-            abs_path = os.path.join(uploads_dir, filename)
-            if os.path.isfile(abs_path):
-                os.remove(abs_path)
+        release_blob(db, chemin, sha256)
     except Exception:
         # On ne bloque pas la suppression DB si suppression fichier échoue
         pass
-    db.delete(doc)
-    db.commit()
     return {"detail": "Document supprimé"}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
@@ -6,10 +7,12 @@ from app.schemas.equipement import EquipementCreate, EquipementOut
 from app.services.equipement_service import (
     create_equipement,
     get_equipement_by_id,
-    get_all_equipements,
-    delete_equipement
+    delete_equipement,
+    EQUIPEMENT_KEYSET,
 )
 from app.core.rbac import responsable_required
+from app.core.pagination import Pagination
+from app.models.equipement import Equipement
 
 router = APIRouter(
     prefix="/equipements",
@@ -34,11 +37,11 @@ def create_new_equipement(data: EquipementCreate, db: Session = Depends(get_db))
     response_model=List[EquipementOut],
     summary="Lister les équipements"
 )
-def list_equipements(db: Session = Depends(get_db)):
+def list_equipements(db: Session = Depends(get_db), page: Pagination = Depends()):
     """
-    Liste tous les équipements.
+    Liste les équipements, paginés par curseur.
     """
-    return get_all_equipements(db)
+    return page.paginate(db, select(Equipement), EQUIPEMENT_KEYSET)
 
 @router.get(
     "/{equipement_id}", 
@@ -1,107 +1,63 @@
 # app/api/v1/health.py
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-import redis
-import psutil
+from fastapi import APIRouter, Response, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
-from app.db.database import get_db
 from app.core.config import settings
+from app.core.health_sampler import get_health_sampler
 from app.core.logging import get_logger
+from app.core.metrics import render_metrics
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+
+async def _latest_snapshot() -> dict:
+    """Dernier instantané de santé; échantillonné une fois (hors boucle) si l'échantillonneur n'a pas démarré."""
+    sampler = get_health_sampler()
+    snapshot = sampler.snapshot()
+    if snapshot is None:
+        snapshot = await run_in_threadpool(sampler.sample)
+    return snapshot
+
+
 @router.get("/health")
+@router.get("/health/live")
 async def health_check():
-    """Basic health check endpoint"""
+    """Liveness: le process répond (aucune E/S, pour les healthchecks Docker/nginx)"""
     return {
-        "status": "healthy",
+        "status": "ok",
         "timestamp": datetime.utcnow().isoformat(),
         "service": settings.PROJECT_NAME
     }
 
-@router.get("/health/detailed")
-async def detailed_health_check(db: Session = Depends(get_db)):
-    """Detailed health check with system metrics"""
-
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "checks": {}
+@router.get("/health/ready")
+async def readiness_check():
+    """Readiness: base joignable d'après le dernier échantillon, échantillon récent"""
+    snapshot = await _latest_snapshot()
+    sampler = get_health_sampler()
+    database_ok = snapshot["checks"]["database"]["status"] == "healthy"
+    ready = database_ok and not sampler.is_stale()
+    body = {
+        "status": "ready" if ready else "not_ready",
+        "database": snapshot["checks"]["database"]["status"],
+        "snapshot_age_seconds": round(sampler.age() or 0.0, 3),
     }
+    return JSONResponse(body, status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
 
-    # Database check
-    try:
-        db.execute(text("SELECT 1"))
-        health_status["checks"]["database"] = {
-            "status": "healthy",
-            "message": "Database connection successful"
-        }
-    except Exception as e:
-        health_status["checks"]["database"] = {
-            "status": "unhealthy",
-            "message": f"Database connection failed: {str(e)}"
-        }
-        health_status["status"] = "unhealthy"
-
-    # Redis check (if configured)
-    try:
-        if hasattr(settings, 'REDIS_URL'):
-            redis_client = redis.from_url(settings.REDIS_URL)
-            redis_client.ping()
-            health_status["checks"]["redis"] = {
-                "status": "healthy",
-                "message": "Redis connection successful"
-            }
-        else:
-            health_status["checks"]["redis"] = {
-                "status": "not_configured",
-                "message": "Redis not configured"
-            }
-    except Exception as e:
-        health_status["checks"]["redis"] = {
-            "status": "unhealthy",
-            "message": f"Redis connection failed: {str(e)}"
-        }
-
-    # System metrics
-    health_status["checks"]["system"] = {
-        "status": "healthy",
-        "metrics": {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_usage": psutil.disk_usage('/').percent
-        }
-    }
-
-    # Log health check results
-    if health_status["status"] == "unhealthy":
-        logger.warning("Health check failed", extra_fields=health_status)
-
-    return health_status
+@router.get("/health/detailed")
+async def detailed_health_check():
+    """Detailed health check with system metrics (dernier instantané de l'échantillonneur)"""
+    snapshot = await _latest_snapshot()
+    sampler = get_health_sampler()
+    return {**snapshot, "snapshot_age_seconds": round(sampler.age() or 0.0, 3), "stale": sampler.is_stale()}
 
 @router.get("/metrics")
-async def metrics():
-    """Prometheus-style metrics endpoint"""
-    metrics_data = []
-
-    # System metrics
-    cpu_percent = psutil.cpu_percent()
-    memory_percent = psutil.virtual_memory().percent
-    disk_percent = psutil.disk_usage('/').percent
-
-    metrics_data.append(f'# HELP erp_cpu_usage CPU usage percentage')
-    metrics_data.append(f'# TYPE erp_cpu_usage gauge')
-    metrics_data.append(f'erp_cpu_usage {cpu_percent}')
-
-    metrics_data.append(f'# HELP erp_memory_usage Memory usage percentage')
-    metrics_data.append(f'# TYPE erp_memory_usage gauge')
-    metrics_data.append(f'erp_memory_usage {memory_percent}')
-
-    metrics_data.append(f'# HELP erp_disk_usage Disk usage percentage')
-    metrics_data.append(f'# TYPE erp_disk_usage gauge')
-    metrics_data.append(f'erp_disk_usage {disk_percent}')
-
-    return "\n".join(metrics_data)
+def metrics():
+    """Métriques Prometheus (format d'exposition, agrégées sur tous les workers)"""
+    rendered = render_metrics()
+    if rendered is None:
+        return Response("prometheus_client non installé", status_code=503, media_type="text/plain")
+    body, content_type = rendered
+    return Response(body, media_type=content_type)
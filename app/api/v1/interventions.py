@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from app.db.database import get_db
-from app.schemas.intervention import InterventionCreate, InterventionOut, StatutIntervention
+from app.db.async_database import ReadSession, get_read_db
+from app.schemas.intervention import InterventionCreate, InterventionOut, InterventionType, StatutIntervention
+from app.core.pagination import Pagination
 from app.services.intervention_service import (
+    INTERVENTION_KEYSET,
     create_intervention,
     get_intervention_by_id,
-    get_all_interventions,
+    interventions_statement,
     update_statut_intervention
 )
+from app.services.intervention_export_service import EXPORT_FORMATS, stream_export
 from app.core.rbac import get_current_user, technicien_required, responsable_required
+from app.core.access_policy import require_intervention_access
 from app.services.user_service import ensure_user_for_email
 
 router = APIRouter(
@@ -46,10 +52,45 @@ def create_new_intervention(
     "/", 
     response_model=List[InterventionOut],
     summary="Lister les interventions",
-    description="Retourne toutes les interventions du système (authentification requise)"
+    description="Retourne les interventions visibles par l'utilisateur : toutes pour admin/responsable, "
+                "les siennes pour un technicien ou un client (authentification requise). "
+                "Paginé par curseur, du plus ancien au plus récent (voir X-Next-Cursor)."
 )
-def list_interventions(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
-    return get_all_interventions(db)
+async def list_interventions(db: ReadSession = Depends(get_read_db), user: dict = Depends(get_current_user),
+                             page: Pagination = Depends()):
+    return await page.paginate_read(db, interventions_statement(principal=user), INTERVENTION_KEYSET)
+
+@router.get(
+    "/export",
+    summary="Exporter les interventions (flux)",
+    description="Exporte en flux NDJSON (une intervention JSON par ligne) ou CSV les interventions visibles "
+                "par l'utilisateur, avec les filtres de /filters/interventions. Mémoire constante quel que "
+                "soit le volume (curseur serveur, envoi par paquets).",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+def export_interventions(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format: ndjson ou csv"),
+    statut: Optional[StatutIntervention] = Query(None, description="Statut de l’intervention"),
+    urgence: Optional[bool] = Query(None, description="Filtrer par urgence (True/False)"),
+    type: Optional[InterventionType] = Query(None, description="Type d’intervention"),
+    technicien_id: Optional[int] = Query(None, description="ID du technicien affecté"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    stmt = interventions_statement(
+        principal=user,
+        statut=statut,
+        urgence=urgence,
+        type_intervention=type,
+        technicien_id=technicien_id,
+    )
+    # get_db est de portée requête : la session reste ouverte pendant l'envoi du flux
+    return StreamingResponse(
+        stream_export(db, stmt, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="interventions.{format}"'},
+    )
 
 @router.get(
     "/{intervention_id}", 
@@ -58,6 +99,7 @@ def list_interventions(db: Session = Depends(get_db), user: dict = Depends(get_c
     description="Récupère les détails d’une intervention par ID (authentification requise)"
 )
 def get_intervention(intervention_id: int, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+    require_intervention_access(db, user, intervention_id)
     return get_intervention_by_id(db, intervention_id)
 
 @router.patch(
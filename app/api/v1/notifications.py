@@ -3,11 +3,16 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from sqlalchemy import select
 from app.db.database import get_db
-from app.schemas.notification import NotificationCreate, NotificationOut
+from app.db.async_database import ReadSession, get_read_db
+from app.schemas.notification import EmailOutboxDepth, NotificationCreate, NotificationOut
 from app.services.notification_service import create_notification
+from app.services.email_outbox_service import outbox_depth
 from app.models.notification import Notification
+from app.models.user import User
 from app.core.rbac import responsable_required, admin_required, get_current_user
+from app.core.pagination import Pagination, keyset
 
 router = APIRouter(
     prefix="/notifications",
@@ -18,6 +23,10 @@ router = APIRouter(
 # Dépendance DB
 # get_db central (override en tests)
 
+NOTIFICATION_KEYSET = keyset("notifications", Notification.id)
+# Taille de page historique des listes de notifications
+NOTIFICATIONS_PAGE = 50
+
 @router.post(
     "/",
     response_model=NotificationOut,
@@ -33,53 +42,63 @@ def create_new_notification(data: NotificationCreate, db: Session = Depends(get_
     "/",
     response_model=List[NotificationOut],
     summary="Lister les notifications",
-    description="Retourne toutes les notifications envoyées (admin/responsable uniquement).",
+    description="Retourne les notifications envoyées, paginées par curseur (admin/responsable uniquement).",
     dependencies=[Depends(admin_required)]
 )
 def list_notifications(
     db: Session = Depends(get_db),
     user_id: Optional[int] = None,
     intervention_id: Optional[int] = None,
-    limit: int = 50,
-    offset: int = 0,
+    page: Pagination = Depends(),
 ):
-    q = db.query(Notification)
+    stmt = select(Notification)
     if user_id is not None:
-        q = q.filter(Notification.user_id == user_id)
+        stmt = stmt.where(Notification.user_id == user_id)
     if intervention_id is not None:
-        q = q.filter(Notification.intervention_id == intervention_id)
-    return q.offset(offset).limit(min(limit, 200)).all()
+        stmt = stmt.where(Notification.intervention_id == intervention_id)
+    return page.paginate(db, stmt, NOTIFICATION_KEYSET, default_limit=NOTIFICATIONS_PAGE)
 
 @router.get(
-    "/user/{user_id}",
-    response_model=List[NotificationOut],
-    summary="Lister les notifications d'un utilisateur",
+    "/outbox",
+    response_model=EmailOutboxDepth,
+    summary="État de la file d'envoi des emails",
+    description="Nombre d'emails par statut et âge du plus ancien email non envoyé (admin uniquement).",
     dependencies=[Depends(admin_required)]
 )
-def list_notifications_by_user(user_id: int, db: Session = Depends(get_db)):
-    return db.query(Notification).filter(Notification.user_id == user_id).all()
+def get_email_outbox_depth(db: Session = Depends(get_db)):
+    return outbox_depth(db)
 
+# Déclarée avant /user/{user_id}, qui capturerait "me"
 @router.get(
     "/user/me",
     response_model=List[NotificationOut],
     summary="Notifications de l'utilisateur connecté",
     description="Retourne les notifications de l'utilisateur connecté."
 )
-def get_my_notifications(
-    db: Session = Depends(get_db),
+async def get_my_notifications(
+    db: ReadSession = Depends(get_read_db),
     current_user = Depends(get_current_user),
-    limit: int = 50,
-    offset: int = 0,
+    page: Pagination = Depends(),
 ):
     """
-    Liste les notifications de l'utilisateur connecté.
+    Liste les notifications de l'utilisateur connecté (une requête, jointure sur l'email).
     """
-    from app.services.user_service import get_user_by_email
-    user = get_user_by_email(db, current_user["email"])
-    if not user:
-        return []
+    stmt = (
+        select(Notification)
+        .join(User, User.id == Notification.user_id)
+        .where(User.email == current_user["email"])
+    )
+    return await page.paginate_read(db, stmt, NOTIFICATION_KEYSET, default_limit=NOTIFICATIONS_PAGE)
 
-    return db.query(Notification).filter(Notification.user_id == user.id).offset(offset).limit(min(limit, 200)).all()
+@router.get(
+    "/user/{user_id}",
+    response_model=List[NotificationOut],
+    summary="Lister les notifications d'un utilisateur",
+    dependencies=[Depends(admin_required)]
+)
+def list_notifications_by_user(user_id: int, db: Session = Depends(get_db), page: Pagination = Depends()):
+    stmt = select(Notification).where(Notification.user_id == user_id)
+    return page.paginate(db, stmt, NOTIFICATION_KEYSET, default_limit=NOTIFICATIONS_PAGE)
 
 @router.put(
     "/{notification_id}/read",
@@ -1,6 +1,7 @@
 # app/api/v1/planning.py
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
@@ -9,10 +10,12 @@ from app.schemas.planning import PlanningCreate, PlanningOut
 from app.services.planning_service import (
     create_planning,
     get_planning_by_id,
-    get_all_plannings,
-    update_planning_dates
+    update_planning_dates,
+    PLANNING_KEYSET,
 )
 from app.core.rbac import responsable_required, get_current_user, require_roles
+from app.core.pagination import Pagination
+from app.models.planning import Planning
 
 router = APIRouter(
     prefix="/planning",
@@ -40,10 +43,11 @@ def create_new_planning(data: PlanningCreate, db: Session = Depends(get_db)):
     "/", 
     response_model=List[PlanningOut],
     summary="Lister les plannings",
-    description="Liste tous les plannings existants (lecture ouverte aux utilisateurs connectés)."
+    description="Liste les plannings existants, paginés par curseur (lecture ouverte aux utilisateurs connectés)."
 )
-def list_all_plannings(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
-    return get_all_plannings(db)
+def list_all_plannings(db: Session = Depends(get_db), user: dict = Depends(get_current_user),
+                       page: Pagination = Depends()):
+    return page.paginate(db, select(Planning), PLANNING_KEYSET)
 
 @router.get(
     "/{planning_id}", 
@@ -1,6 +1,7 @@
 # app/api/v1/techniciens.py
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
@@ -11,13 +12,17 @@ from app.schemas.technicien import (
 from app.services.technicien_service import (
     create_technicien,
     get_technicien_by_id,
-    get_all_techniciens,
     create_competence,
-    get_all_competences,
+    COMPETENCE_KEYSET,
+    TECHNICIEN_KEYSET,
 )
 from app.models.technicien import Technicien as TechnicienModel, DisponibiliteTechnicien
 from app.schemas.technicien import TechnicienBase
 from app.core.rbac import responsable_required, get_current_user
+from app.core.pagination import Pagination
+from app.models.technicien import Competence
+from app.services.dashboard_service import invalidate_dashboards
+from app.services.technicien_kpi_service import compute_technicien_kpis
 
 router = APIRouter(
     prefix="/techniciens",
@@ -25,6 +30,15 @@ router = APIRouter(
     responses={404: {"description": "Technicien ou compétence introuvable"}}
 )
 
+
+def _with_kpis(db: Session, techniciens: List[TechnicienModel]) -> List[TechnicienOut]:
+    """Sérialise les techniciens avec leurs KPI calculés en lot (requêtes constantes)."""
+    kpis = compute_technicien_kpis(db, [t.id for t in techniciens])
+    return [
+        TechnicienOut.model_validate(t).model_copy(update={"kpis": kpis.get(t.id)})
+        for t in techniciens
+    ]
+
 @router.post("/", response_model=TechnicienOut, summary="Créer un technicien")
 def create_new_technicien(
     data: TechnicienCreate,
@@ -39,12 +53,13 @@ def create_new_technicien(
 @router.get("/", response_model=List[TechnicienOut], summary="Lister les techniciens")
 def list_techniciens(
     db: Session = Depends(get_db),
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    page: Pagination = Depends()
 ):
     """
-    Liste tous les techniciens.
+    Liste les techniciens (paginés par curseur), avec leurs KPI.
     """
-    return get_all_techniciens(db)
+    return _with_kpis(db, page.paginate(db, select(TechnicienModel), TECHNICIEN_KEYSET))
 
 @router.post("/competences", response_model=CompetenceOut, summary="Créer une compétence")
 def create_new_competence(
@@ -60,12 +75,13 @@ def create_new_competence(
 @router.get("/competences", response_model=List[CompetenceOut], summary="Lister les compétences")
 def list_competences(
     db: Session = Depends(get_db),
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    page: Pagination = Depends()
 ):
     """
-    Liste toutes les compétences.
+    Liste les compétences, paginées par curseur.
     """
-    return get_all_competences(db)
+    return page.paginate(db, select(Competence), COMPETENCE_KEYSET)
 
 @router.get("/{technicien_id}", response_model=TechnicienOut, summary="Détail d’un technicien")
 def get_technicien(
@@ -74,9 +90,9 @@ def get_technicien(
     user: dict = Depends(get_current_user)
 ):
     """
-    Récupère le détail d’un technicien par ID.
+    Récupère le détail d’un technicien par ID, avec ses KPI.
     """
-    return get_technicien_by_id(db, technicien_id)
+    return _with_kpis(db, [get_technicien_by_id(db, technicien_id)])[0]
 
 @router.put("/{technicien_id}", response_model=TechnicienOut, summary="Mettre à jour un technicien")
 def update_technicien(
@@ -99,6 +115,7 @@ def update_technicien(
     t.equipe = data.equipe if data.equipe is not None else t.equipe
     db.commit()
     db.refresh(t)
+    invalidate_dashboards(technicien_ids=[t.id])
     return t
 
 @router.delete("/{technicien_id}", summary="Supprimer un technicien", status_code=204)
@@ -113,4 +130,5 @@ def delete_technicien(
         raise HTTPException(status_code=404, detail="Technicien introuvable")
     db.delete(t)
     db.commit()
+    invalidate_dashboards(technicien_ids=[technicien_id])
     return
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, status, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
 from app.services.user_service import (
-    create_user, get_user_by_id, get_all_users, update_user,
-    deactivate_user, reactivate_user
+    create_user, get_user_by_id, update_user,
+    deactivate_user, reactivate_user, update_user_role, USER_KEYSET, SYSTEM_USER_EMAIL
 )
-from app.schemas.user import UserCreate, UserOut, UserUpdate
+from app.schemas.user import UserCreate, UserOut, UserRoleUpdate, UserUpdate
 from app.core.rbac import admin_required, get_current_user
+from app.core.pagination import Pagination
+from app.models.user import User
 from app.services.user_service import get_user_by_email
 
 router = APIRouter(
@@ -92,12 +95,12 @@ def read_user(user_id: int, db: Session = Depends(get_db)):
     "/",
     response_model=List[UserOut],
     summary="Lister tous les utilisateurs",
-    description="Liste complète des utilisateurs (réservé à l’administrateur).",
+    description="Liste des utilisateurs, paginée par curseur (réservé à l’administrateur).",
     dependencies=[Depends(admin_required)]
 )
-def list_users(db: Session = Depends(get_db)):
-    """Liste tous les users (admin)."""
-    return get_all_users(db)
+def list_users(db: Session = Depends(get_db), page: Pagination = Depends()):
+    """Liste les users par page (admin)."""
+    return page.paginate(db, select(User).where(User.email != SYSTEM_USER_EMAIL), USER_KEYSET)
 
 @router.delete(
     "/{user_id}",
@@ -121,3 +124,14 @@ def disable_user(user_id: int, db: Session = Depends(get_db)):
 def activate_user(user_id: int, db: Session = Depends(get_db)):
     """Réactive un user désactivé."""
     return reactivate_user(db, user_id)
+
+@router.patch(
+    "/{user_id}/role",
+    response_model=UserOut,
+    summary="Changer le rôle d'un utilisateur",
+    description="Modifie le rôle RBAC d'un utilisateur (admin uniquement).",
+    dependencies=[Depends(admin_required)]
+)
+def change_user_role(user_id: int, data: UserRoleUpdate, db: Session = Depends(get_db)):
+    """Change le rôle d'un user."""
+    return update_user_role(db, user_id, data.role)
@@ -0,0 +1,97 @@
+# app/core/access_policy.py
+"""
+Politique d'accès par ligne aux interventions (et aux documents rattachés).
+
+La politique est exprimée en SQL pour un principal (dict renvoyé par
+get_current_user, ou User) :
+- admin / responsable : toutes les interventions ;
+- technicien : Intervention.technicien_id = id du profil technicien de l'utilisateur ;
+- client : Intervention.client_id = id du profil client de l'utilisateur ;
+- autre rôle ou utilisateur inconnu : aucune.
+
+Le profil est résolu par sous-requête scalaire (techniciens.user_id et
+clients.user_id sont uniques et indexés) : les listes filtrent en base et le
+contrôle d'une seule ligne est un EXISTS indexé, sans charger les
+interventions de l'utilisateur.
+"""
+
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import exists, false, select, true
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.client import Client
+from app.models.document import Document
+from app.models.intervention import Intervention
+from app.models.technicien import Technicien
+
+ROLES_ACCES_COMPLET = ("admin", "responsable")
+
+
+def _principal(principal: Any) -> Tuple[Optional[str], Optional[int]]:
+    """(rôle, id utilisateur) d'un principal dict ou objet User."""
+    if isinstance(principal, dict):
+        role, user_id = principal.get("role"), principal.get("user_id")
+    else:
+        role, user_id = getattr(principal, "role", None), getattr(principal, "id", None)
+    return getattr(role, "value", role), user_id
+
+
+def has_full_access(principal: Any) -> bool:
+    """Vrai si le principal voit toutes les interventions (aucun filtre à ajouter)."""
+    return _principal(principal)[0] in ROLES_ACCES_COMPLET
+
+
+def intervention_scope(principal: Any) -> ColumnElement[bool]:
+    """Expression de filtre sur Intervention des lignes visibles par le principal."""
+    role, user_id = _principal(principal)
+    if role in ROLES_ACCES_COMPLET:
+        return true()
+    if user_id is None:
+        return false()
+    if role == "technicien":
+        profil = select(Technicien.id).where(Technicien.user_id == user_id).scalar_subquery()
+        return Intervention.technicien_id == profil
+    if role == "client":
+        profil = select(Client.id).where(Client.user_id == user_id).scalar_subquery()
+        return Intervention.client_id == profil
+    return false()
+
+
+def document_scope(principal: Any) -> ColumnElement[bool]:
+    """Expression de filtre sur Document: documents des interventions visibles."""
+    role, _ = _principal(principal)
+    if role in ROLES_ACCES_COMPLET:
+        return true()
+    return exists().where(Intervention.id == Document.intervention_id, intervention_scope(principal))
+
+
+def restrict_interventions(query: Query, principal: Any) -> Query:
+    """Restreint une requête (Query ou select) sur Intervention au périmètre du principal."""
+    return query if has_full_access(principal) else query.filter(intervention_scope(principal))
+
+
+def restrict_documents(query: Query, principal: Any) -> Query:
+    """Restreint une requête (Query ou select) sur Document aux interventions visibles par le principal."""
+    return query if has_full_access(principal) else query.filter(document_scope(principal))
+
+
+def can_access_intervention(db: Session, principal: Any, intervention_id: int) -> bool:
+    """Contrôle d'accès à une intervention en une requête EXISTS."""
+    return bool(db.execute(
+        select(exists().where(Intervention.id == intervention_id, intervention_scope(principal)))
+    ).scalar())
+
+
+def require_intervention_access(db: Session, principal: Any, intervention_id: int) -> None:
+    """
+    Vérifie l'accès à une intervention.
+
+    Raises:
+        HTTPException 404: intervention inexistante ou hors périmètre (l'existence
+        d'une intervention d'un autre périmètre n'est pas révélée)
+    """
+    if not can_access_intervention(db, principal, intervention_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Intervention introuvable")
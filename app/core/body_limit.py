@@ -0,0 +1,95 @@
+# app/core/body_limit.py
+"""
+Plafond de taille du corps des requêtes multipart (uploads).
+
+Starlette analyse le formulaire (et recopie les fichiers sur disque) avant
+d'appeler l'endpoint : sans plafond, un upload démesuré est reçu en entier
+avant d'être refusé. Ce middleware refuse en 413 dès l'en-tête
+Content-Length, ou en cours de réception quand le corps (chunked) dépasse
+UPLOAD_MAX_BYTES + marge des en-têtes multipart.
+"""
+
+from starlette.exceptions import HTTPException
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Marge pour les en-têtes de parties et champs du formulaire
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodyTooLarge(HTTPException):
+    """
+    Corps de requête au-delà du plafond (interrompt l'analyse du formulaire).
+
+    HTTPException : FastAPI la relaie telle quelle depuis l'analyse du corps
+    (toute autre exception y devient un 400).
+    """
+
+    def __init__(self):
+        super().__init__(status_code=413, detail=f"Fichier trop volumineux (maximum {settings.UPLOAD_MAX_BYTES} octets)")
+
+
+class BodySizeLimitMiddleware:
+    """Middleware ASGI : 413 pour un corps multipart supérieur au plafond."""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def limit() -> int:
+        return settings.UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit()
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLarge:
+            if started:
+                raise
+            await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        logger.warning("Upload refusé: corps supérieur à %s octets", limit)
+        body = f'{{"detail":"Fichier trop volumineux (maximum {settings.UPLOAD_MAX_BYTES} octets)"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
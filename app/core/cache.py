@@ -0,0 +1,194 @@
+# app/core/cache.py
+"""
+Cache applicatif LRU+TTL avec backend Redis optionnel.
+
+- `MemoryCache` : cache par process (OrderedDict LRU, expiration TTL, thread-safe).
+- `RedisCache` : cache partagé entre workers (valeurs JSON), activé par
+  CACHE_BACKEND=redis; en cas d'indisponibilité Redis, les lectures retombent
+  sur le calcul direct (jamais d'erreur côté requête).
+
+Invalidation par espaces de noms versionnés : chaque clé est suffixée par la
+version courante des espaces de noms dont elle dépend; `invalidate(ns)`
+incrémente la version, les anciennes entrées deviennent inaccessibles et
+expirent naturellement (TTL/LRU). Cela évite tout balayage de clés (SCAN/KEYS).
+
+`cached_call_async` sert les endpoints async : les accès Redis (I/O
+bloquantes) passent par le threadpool, jamais sur la boucle d'événements.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics as prom
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MemoryCache:
+    """Cache LRU+TTL en mémoire du process."""
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, namespaces: Iterable[str]) -> list:
+        with self._lock:
+            return [self._versions.get(ns, 0) for ns in namespaces]
+
+    def invalidate(self, *namespaces: str) -> None:
+        with self._lock:
+            for ns in namespaces:
+                self._versions[ns] = self._versions.get(ns, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisCache:
+    """Cache partagé Redis (valeurs sérialisées en JSON)."""
+
+    def __init__(self, url: str, ttl: int = 30, prefix: str = "erp:cache:"):
+        import redis  # Dépendance optionnelle, importée uniquement si activée
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._client.set(self.prefix + key, json.dumps(value, default=str), ex=ttl or self.ttl)
+
+    def versions(self, namespaces: Iterable[str]) -> list:
+        namespaces = list(namespaces)
+        if not namespaces:
+            return []
+        raw = self._client.mget([f"{self.prefix}ns:{ns}" for ns in namespaces])
+        return [int(v) if v is not None else 0 for v in raw]
+
+    def invalidate(self, *namespaces: str) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        for ns in namespaces:
+            pipe.incr(f"{self.prefix}ns:{ns}")
+        pipe.execute()
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Retourne le backend de cache configuré (singleton par process)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.CACHE_BACKEND.lower() == "redis":
+                    try:
+                        _cache = RedisCache(settings.REDIS_URL, ttl=settings.CACHE_TTL_SECONDS)
+                    except ImportError:
+                        logger.warning("Module redis absent, repli sur le cache mémoire")
+                if _cache is None:
+                    _cache = MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+    return _cache
+
+
+def cached_call(key: str, namespaces: Iterable[str], loader: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+    """
+    Lit `key` dans le cache ou la calcule via `loader()` et la stocke.
+
+    La valeur doit être sérialisable en JSON (dict/list de types simples).
+    La clé effective inclut la version de chaque espace de noms de `namespaces`.
+    """
+    full_key, value = _read(key, namespaces)
+    if value is not None:
+        return value
+    value = loader()
+    if full_key is not None:
+        _write(full_key, value, ttl)
+    return value
+
+
+async def cached_call_async(key: str, namespaces: Iterable[str], loader: Callable[[], Awaitable[Any]],
+                            ttl: Optional[int] = None) -> Any:
+    """Comme `cached_call` pour un `loader` asynchrone; le backend Redis est interrogé dans le threadpool."""
+    in_memory = isinstance(get_cache(), MemoryCache)  # Aucune I/O: inutile de changer de thread
+    if in_memory:
+        full_key, value = _read(key, namespaces)
+    else:
+        full_key, value = await run_in_threadpool(_read, key, namespaces)
+    if value is not None:
+        return value
+    value = await loader()
+    if full_key is not None:
+        if in_memory:
+            _write(full_key, value, ttl)
+        else:
+            await run_in_threadpool(_write, full_key, value, ttl)
+    return value
+
+
+def _read(key: str, namespaces: Iterable[str]) -> Tuple[Optional[str], Any]:
+    """(clé effective, valeur en cache); clé None si le backend est indisponible (calcul direct)."""
+    cache = get_cache()
+    try:
+        versions = cache.versions(list(namespaces))
+        full_key = f"{key}@{'.'.join(map(str, versions))}"
+        value = cache.get(full_key)
+    except Exception as exc:  # Backend indisponible: calcul direct
+        logger.warning(f"Cache indisponible ({exc}), calcul direct de {key}")
+        return None, None
+    prom.record_cache("app", value is not None)
+    return full_key, value
+
+
+def _write(full_key: str, value: Any, ttl: Optional[int]) -> None:
+    try:
+        get_cache().set(full_key, value, ttl)
+    except Exception as exc:
+        logger.warning(f"Écriture cache impossible pour {full_key}: {exc}")
+
+
+def invalidate(*namespaces: str) -> None:
+    """Invalide toutes les entrées dépendant des espaces de noms donnés."""
+    try:
+        get_cache().invalidate(*namespaces)
+    except Exception as exc:
+        logger.warning(f"Invalidation cache impossible ({', '.join(namespaces)}): {exc}")
@@ -2,7 +2,7 @@
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -13,6 +13,15 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(default="insecure-test-secret-key")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60  # durée de validité JWT en minutes
+    # Coût bcrypt: les hashs d'un autre coût sont recalculés à la connexion suivante
+    BCRYPT_ROUNDS: int = Field(default=12)
+    # Exécuteur bcrypt dédié: threads de calcul et file d'attente au-delà de laquelle on répond 429
+    PASSWORD_HASH_WORKERS: int = Field(default=4)
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=16)
+    # Échecs de connexion en fenêtre glissante (rejet en 429 avant bcrypt)
+    LOGIN_FAILURE_WINDOW_SECONDS: int = Field(default=900)
+    LOGIN_FAILURE_MAX_PER_ACCOUNT: int = Field(default=5)
+    LOGIN_FAILURE_MAX_PER_IP: int = Field(default=50)
 
     # Email SMTP
     SMTP_HOST: str = Field(default="localhost")
@@ -20,6 +29,14 @@ class Settings(BaseSettings):
     SMTP_USER: str = Field(default="user")
     SMTP_PASSWORD: str = Field(default="password")
     EMAILS_FROM_EMAIL: str = Field(default="no-reply@example.com")
+    SMTP_STARTTLS: bool = Field(default=True)
+    SMTP_TIMEOUT_SECONDS: float = Field(default=10.0)
+    # File d'envoi des emails (email_outbox): taille des lots, relances avec délai exponentiel
+    EMAIL_OUTBOX_POLL_SECONDS: int = Field(default=15)
+    EMAIL_OUTBOX_BATCH_SIZE: int = Field(default=50)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = Field(default=5)
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = Field(default=60)
+    EMAIL_OUTBOX_LEASE_SECONDS: int = Field(default=300)
 
     # Base de données PostgreSQL
     POSTGRES_DB: str = Field(default="erp_db")
@@ -28,8 +45,42 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = Field(default="db")
     POSTGRES_PORT: int = Field(default=5432)
 
+    # Pool de connexions et délais (hors SQLite)
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_TIMEOUT_SECONDS: int = Field(default=30)
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800)
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    DB_CONNECT_TIMEOUT_SECONDS: int = Field(default=5)
+    # Timeout des requêtes côté PostgreSQL (0 = désactivé)
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=30000)
+    # Réplica en lecture (GET, tableaux de bord); vide = tout sur le primaire
+    DB_REPLICA_URL: str = Field(default="")
+    # Après une écriture, les lectures du même client restent sur le primaire pendant ce délai
+    DB_REPLICA_STICKY_SECONDS: float = Field(default=10.0)
+    # Engine asynchrone (asyncpg/aiosqlite) des endpoints de lecture; repli sur la session synchrone sinon
+    ASYNC_DB_ENABLED: bool = Field(default=False)
+    # URL asynchrone explicite (défaut: DATABASE_URL avec le pilote asyncpg)
+    ASYNC_DATABASE_URL: str = Field(default="")
+
     # Répertoire d’upload de fichiers
     UPLOAD_DIRECTORY: str = Field(default="app/static/uploads")
+    # Taille maximale d'un fichier uploadé (alignée sur client_max_body_size de nginx) et bloc de copie
+    UPLOAD_MAX_BYTES: int = Field(default=100 * 1024 * 1024)
+    UPLOAD_CHUNK_SIZE: int = Field(default=1024 * 1024)
+    # Montage public /static des uploads, sans contrôle d'accès (à réserver au développement) :
+    # les documents sont servis par /documents/{id}/download
+    SERVE_UPLOADS_STATIC: bool = Field(default=False)
+    # Téléchargement délégué à nginx (X-Accel-Redirect) si préfixe interne défini, FileResponse sinon
+    DOWNLOAD_ACCEL_REDIRECT_PREFIX: str = Field(default="")
+    # Durée de cache navigateur (privé) d'un document téléchargé
+    DOWNLOAD_CACHE_MAX_AGE: int = Field(default=86400)
+    # Archives ZIP des documents d'interventions : générations simultanées par process,
+    # interventions par archive, cache disque optionnel (dossier vide = désactivé) et sa durée de vie
+    ARCHIVE_MAX_CONCURRENT: int = Field(default=4)
+    ARCHIVE_MAX_INTERVENTIONS: int = Field(default=50)
+    ARCHIVE_CACHE_DIRECTORY: str = Field(default="")
+    ARCHIVE_CACHE_TTL_SECONDS: int = Field(default=86400)
 
     # CORS
     CORS_ALLOW_ORIGINS: List[str] = Field(default_factory=lambda: [
@@ -41,6 +92,51 @@ class Settings(BaseSettings):
 
     # Scheduler toggle
     ENABLE_SCHEDULER: bool = Field(default=False)
+    # Répertoire du verrou de leadership du scheduler hors PostgreSQL (défaut: répertoire temporaire)
+    SCHEDULER_LOCK_DIR: str = Field(default="")
+    # Génération des plannings: par paquets (une transaction par paquet) ou planning par planning
+    PLANNING_GENERATION_BATCH: bool = Field(default=True)
+    PLANNING_GENERATION_CHUNK_SIZE: int = Field(default=500)
+    # Port des métriques Prometheus du scheduler dédié (0 = non exposées)
+    SCHEDULER_METRICS_PORT: int = Field(default=9101)
+
+    # Pagination des listes: taille par défaut (appels sans limit) et plafond
+    PAGINATION_DEFAULT_LIMIT: int = Field(default=1000)
+    PAGINATION_MAX_LIMIT: int = Field(default=1000)
+    # Export en flux (NDJSON/CSV) : lignes lues par paquet via curseur serveur
+    EXPORT_BATCH_SIZE: int = Field(default=1000)
+
+    # Logging
+    LOG_LEVEL: str = Field(default="INFO")
+
+    # Santé: échantillonnage en arrière-plan (système, base, Redis), servi par /health/*
+    HEALTH_SAMPLE_INTERVAL_SECONDS: float = Field(default=10.0)
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = Field(default=2.0)
+    # Instantané plus ancien: instance non prête (/health/ready en 503)
+    HEALTH_STALE_AFTER_SECONDS: float = Field(default=30.0)
+
+    # Instrumentation SQL par requête HTTP (Server-Timing, détection N+1, budgets)
+    QUERY_STATS_ENABLED: bool = Field(default=True)
+    # Même requête exécutée au moins N fois dans une requête HTTP: suspect N+1
+    QUERY_REPEAT_THRESHOLD: int = Field(default=5)
+    # Budget de requêtes SQL par route ({"GET /interventions/": 3}), défaut global (0 = aucun)
+    QUERY_BUDGETS: Dict[str, int] = Field(default_factory=dict)
+    QUERY_BUDGET_DEFAULT: int = Field(default=0)
+    # Dépassement de budget: "log" (avertissement) ou "raise" (échec, pour les tests)
+    QUERY_BUDGET_MODE: str = Field(default="log")
+
+    # Redis (cache, health checks)
+    REDIS_URL: str = Field(default="redis://localhost:6379/0")
+
+    # Cache applicatif (tableaux de bord): "memory" (LRU+TTL par process) ou "redis" (partagé)
+    CACHE_BACKEND: str = Field(default="memory")
+    CACHE_TTL_SECONDS: int = Field(default=30)
+    CACHE_MAX_ENTRIES: int = Field(default=1024)
+
+    # Cache des utilisateurs authentifiés (get_current_user), invalidé par Redis pub/sub si CACHE_BACKEND=redis
+    PRINCIPAL_CACHE_ENABLED: bool = Field(default=True)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(default=30)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(default=10000)
 
     @property
     def DATABASE_URL(self) -> str:
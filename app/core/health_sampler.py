@@ -0,0 +1,176 @@
+# app/core/health_sampler.py
+"""
+Échantillonnage en arrière-plan de l'état de santé (système, base, Redis).
+
+Un thread par process rafraîchit l'instantané toutes les
+HEALTH_SAMPLE_INTERVAL_SECONDS : psutil sans attente (CPU mesuré entre deux
+échantillons), `SELECT 1` sur le pool de l'engine, PING Redis sur un client
+unique (pool de connexions, timeouts HEALTH_CHECK_TIMEOUT_SECONDS). Les
+endpoints /health/* et /metrics servent le dernier instantané sans aucune E/S :
+une sonde ne bloque plus la boucle d'événements du worker.
+
+Un instantané plus vieux que HEALTH_STALE_AFTER_SECONDS (échantillonneur
+bloqué ou arrêté) rend l'instance non prête.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import psutil
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class HealthSampler:
+    """Instantané de santé rafraîchi par un thread démon."""
+
+    def __init__(self, interval: Optional[float] = None, timeout: Optional[float] = None):
+        self.interval = interval or settings.HEALTH_SAMPLE_INTERVAL_SECONDS
+        self.timeout = timeout or settings.HEALTH_CHECK_TIMEOUT_SECONDS
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._sampled_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._redis = None
+
+    # Checks
+
+    def _check_database(self) -> Dict[str, Any]:
+        from app.db import database
+
+        start = time.perf_counter()
+        try:
+            with database.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            return {"status": "unhealthy", "message": f"Database connection failed: {exc}"}
+        check = {
+            "status": "healthy",
+            "message": "Database connection successful",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "pool": database.pool_metrics(),
+        }
+        if database.replica_engine is not None:
+            check["replica_pool"] = database.pool_metrics(database.replica_engine)
+        return check
+
+    def _redis_client(self):
+        if self._redis is None:
+            import redis  # Dépendance optionnelle, importée uniquement si activée
+
+            self._redis = redis.Redis.from_url(
+                settings.REDIS_URL, socket_timeout=self.timeout, socket_connect_timeout=self.timeout
+            )
+        return self._redis
+
+    def _check_redis(self) -> Dict[str, Any]:
+        if settings.CACHE_BACKEND.lower() != "redis":
+            return {"status": "not_configured", "message": "Redis not configured"}
+        start = time.perf_counter()
+        try:
+            self._redis_client().ping()
+        except Exception as exc:
+            return {"status": "unhealthy", "message": f"Redis connection failed: {exc}"}
+        return {
+            "status": "healthy",
+            "message": "Redis connection successful",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def _check_system(self) -> Dict[str, Any]:
+        return {
+            "status": "healthy",
+            "metrics": {
+                # Utilisation depuis l'échantillon précédent (aucune attente)
+                "cpu_percent": psutil.cpu_percent(interval=None),
+                "memory_percent": psutil.virtual_memory().percent,
+                "disk_usage": psutil.disk_usage("/").percent,
+            },
+        }
+
+    # Échantillonnage
+
+    def sample(self) -> Dict[str, Any]:
+        """Exécute tous les contrôles et publie le nouvel instantané (appel bloquant)."""
+        checks = {}
+        for name, check in (("database", self._check_database), ("redis", self._check_redis),
+                            ("system", self._check_system)):
+            try:
+                checks[name] = check()
+            except Exception as exc:
+                checks[name] = {"status": "unhealthy", "message": str(exc)}
+        snapshot = {
+            "status": "healthy" if checks["database"]["status"] == "healthy" else "unhealthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "checks": checks,
+        }
+        with self._lock:
+            previous = self._snapshot
+            self._snapshot, self._sampled_at = snapshot, time.monotonic()
+        if previous is None or previous["status"] != snapshot["status"]:
+            log = logger.info if snapshot["status"] == "healthy" else logger.warning
+            log("État de santé: %s", snapshot["status"], extra={"extra_fields": snapshot})
+        return snapshot
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._snapshot
+
+    def age(self) -> Optional[float]:
+        """Âge du dernier instantané en secondes (None avant le premier)."""
+        with self._lock:
+            return None if self._sampled_at is None else time.monotonic() - self._sampled_at
+
+    def is_stale(self) -> bool:
+        age = self.age()
+        return age is None or age > settings.HEALTH_STALE_AFTER_SECONDS
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as exc:
+                logger.error("Échantillonnage de santé échoué: %s", exc)
+
+    def start(self) -> None:
+        """Premier échantillon immédiat (instance prête dès le démarrage), puis thread de rafraîchissement."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        psutil.cpu_percent(interval=None)  # Référence de la mesure CPU
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="health-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+        if self._redis is not None:
+            try:
+                self._redis.close()
+            except Exception:
+                pass
+            self._redis = None
+
+
+_sampler: Optional[HealthSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_health_sampler() -> HealthSampler:
+    """Échantillonneur du process (singleton)."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = HealthSampler()
+    return _sampler
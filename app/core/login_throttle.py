@@ -0,0 +1,187 @@
+# app/core/login_throttle.py
+"""
+Compteur d'échecs de connexion en fenêtre glissante.
+
+Complète le verrouillage en base (User.increment_failed_login /
+is_account_locked) : les tentatives connues comme mauvaises sont rejetées
+en 429 avant toute requête SQL ou calcul bcrypt.
+- par identifiant (email/username) : LOGIN_FAILURE_MAX_PER_ACCOUNT échecs ;
+- par adresse IP : LOGIN_FAILURE_MAX_PER_IP échecs (bourrage d'identifiants
+  sur de nombreux comptes) ;
+sur LOGIN_FAILURE_WINDOW_SECONDS. Une connexion réussie remet le compteur de
+l'identifiant à zéro.
+
+Backend mémoire (par process) par défaut, Redis (ZSET par clé, partagé entre
+workers) si CACHE_BACKEND=redis. Si Redis est indisponible, le compteur ne
+bloque pas (le verrouillage en base reste actif).
+"""
+
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MemoryFailureWindow:
+    """Fenêtre glissante en mémoire (horodatages des échecs par clé, clés en LRU)."""
+
+    def __init__(self, window_seconds: int, max_keys: int = 100_000):
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, key: str, now: float) -> Optional[Deque[float]]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        with self._lock:
+            failures = self._prune(key, now or time.time())
+            return len(failures) if failures else 0
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> int:
+        """Secondes avant que le plus ancien échec sorte de la fenêtre."""
+        now = now or time.time()
+        with self._lock:
+            failures = self._prune(key, now)
+            return max(int(math.ceil(failures[0] + self.window - now)), 1) if failures else 0
+
+    def record(self, key: str, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        with self._lock:
+            failures = self._prune(key, now) or self._failures.setdefault(key, deque())
+            failures.append(now)
+            self._failures.move_to_end(key)
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+            return len(failures)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class RedisFailureWindow:
+    """Fenêtre glissante partagée (ZSET Redis par clé, score = horodatage)."""
+
+    def __init__(self, url: str, window_seconds: int, prefix: str = "erp:login-failures:"):
+        import redis  # Dépendance optionnelle, importée uniquement si activée
+
+        self.window = window_seconds
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zremrangebyscore(self.prefix + key, 0, now - self.window)
+        pipe.zcard(self.prefix + key)
+        return int(pipe.execute()[1])
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        oldest = self._client.zrange(self.prefix + key, 0, 0, withscores=True)
+        return max(int(math.ceil(oldest[0][1] + self.window - now)), 1) if oldest else 0
+
+    def record(self, key: str, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zremrangebyscore(self.prefix + key, 0, now - self.window)
+        pipe.zadd(self.prefix + key, {uuid.uuid4().hex: now})
+        pipe.zcard(self.prefix + key)
+        pipe.expire(self.prefix + key, self.window)
+        return int(pipe.execute()[2])
+
+    def reset(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+
+class LoginThrottle:
+    """Seuils d'échecs par identifiant et par IP au-dessus d'une fenêtre glissante."""
+
+    def __init__(self, backend, max_per_account: int, max_per_ip: int):
+        self.backend = backend
+        self.max_per_account = max_per_account
+        self.max_per_ip = max_per_ip
+
+    @staticmethod
+    def _keys(identifiant: str, client_ip: Optional[str]):
+        keys = [(f"id:{identifiant.strip().lower()}", "account")]
+        if client_ip:
+            keys.append((f"ip:{client_ip}", "ip"))
+        return keys
+
+    def check(self, identifiant: str, client_ip: Optional[str] = None) -> None:
+        """
+        Rejette la tentative si l'identifiant ou l'IP a dépassé son seuil.
+
+        Raises:
+            HTTPException 429: trop d'échecs récents (Retry-After renseigné)
+        """
+        for key, kind in self._keys(identifiant, client_ip):
+            limite = self.max_per_account if kind == "account" else self.max_per_ip
+            try:
+                if self.backend.count(key) < limite:
+                    continue
+                retry_after = self.backend.retry_after(key)
+            except Exception as exc:
+                logger.warning("Compteur d'échecs de connexion indisponible: %s", exc)
+                return
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Trop de tentatives de connexion échouées, réessayez plus tard",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    def record_failure(self, identifiant: str, client_ip: Optional[str] = None) -> None:
+        for key, _ in self._keys(identifiant, client_ip):
+            try:
+                self.backend.record(key)
+            except Exception as exc:
+                logger.warning("Échec de connexion non comptabilisé (%s): %s", key, exc)
+
+    def reset(self, identifiant: str) -> None:
+        try:
+            self.backend.reset(self._keys(identifiant, None)[0][0])
+        except Exception as exc:
+            logger.warning("Remise à zéro du compteur d'échecs impossible: %s", exc)
+
+
+_throttle: Optional[LoginThrottle] = None
+_throttle_lock = threading.Lock()
+
+
+def get_login_throttle() -> LoginThrottle:
+    """Compteur du process (singleton), partagé via Redis si configuré."""
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                backend = None
+                if settings.CACHE_BACKEND.lower() == "redis":
+                    try:
+                        backend = RedisFailureWindow(settings.REDIS_URL, settings.LOGIN_FAILURE_WINDOW_SECONDS)
+                    except ImportError:
+                        logger.warning("Module redis absent, compteur d'échecs de connexion en mémoire")
+                if backend is None:
+                    backend = MemoryFailureWindow(settings.LOGIN_FAILURE_WINDOW_SECONDS)
+                _throttle = LoginThrottle(backend, settings.LOGIN_FAILURE_MAX_PER_ACCOUNT,
+                                          settings.LOGIN_FAILURE_MAX_PER_IP)
+    return _throttle
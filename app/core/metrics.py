@@ -0,0 +1,242 @@
+# app/core/metrics.py
+"""
+Métriques Prometheus de l'application (format d'exposition, /metrics).
+
+- HTTP : latence par route (histogramme, gabarit de route comme libellé),
+  requêtes en cours, réponses par statut ;
+- base : connexions empruntées au pool, checkouts, invalidations ; requêtes
+  SQL et temps SQL par requête HTTP, suspects N+1, budgets dépassés
+  (app.core.query_stats) ;
+- scheduler : durée et issue des jobs ;
+- file des emails : messages par statut, âge du plus ancien en attente ;
+- caches : lectures par résultat (hit/miss), le ratio se calcule en PromQL.
+
+Multi-process : avec PROMETHEUS_MULTIPROC_DIR (répertoire vidé au démarrage,
+cf. Dockerfile.prod), chaque worker uvicorn écrit ses valeurs dans des
+fichiers mmap et /metrics agrège tous les workers. Les métriques sont mises à
+jour au fil de l'eau (coût d'une addition) : un scrape ne fait ni requête SQL
+ni mesure bloquante.
+
+Sans prometheus_client (dépendance optionnelle), les métriques sont inertes et
+/metrics répond 503.
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # Dépendance optionnelle
+    prometheus_client = None
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
+class _NoopMetric:
+    """Métrique inerte (prometheus_client absent)."""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def inc(self, *args: Any) -> None:
+        pass
+
+    def dec(self, *args: Any) -> None:
+        pass
+
+    def set(self, *args: Any) -> None:
+        pass
+
+    def observe(self, *args: Any) -> None:
+        pass
+
+
+def _metric(kind: str, name: str, documentation: str, labelnames: Tuple[str, ...] = (), **kwargs: Any):
+    if prometheus_client is None:
+        return _NoopMetric()
+    cls = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[kind]
+    if kind != "gauge":
+        kwargs.pop("multiprocess_mode", None)
+    return cls(name, documentation, labelnames, **kwargs)
+
+
+# HTTP
+HTTP_REQUESTS = _metric("counter", "erp_http_requests_total", "HTTP responses by route and status",
+                        ("method", "route", "status"))
+HTTP_LATENCY = _metric("histogram", "erp_http_request_duration_seconds", "HTTP request latency by route",
+                       ("method", "route"),
+                       buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+HTTP_IN_PROGRESS = _metric("gauge", "erp_http_requests_in_progress", "HTTP requests being served",
+                           ("method",), multiprocess_mode="livesum")
+
+# Base de données
+DB_POOL_CHECKED_OUT = _metric("gauge", "erp_db_pool_checked_out", "Connections currently checked out of the pool",
+                              ("pool",), multiprocess_mode="livesum")
+DB_POOL_CONNECTIONS = _metric("counter", "erp_db_pool_connections", "DBAPI connections opened", ("pool",))
+DB_POOL_CHECKOUTS = _metric("counter", "erp_db_pool_checkouts", "Pool checkouts", ("pool",))
+DB_POOL_INVALIDATIONS = _metric("counter", "erp_db_pool_invalidations", "Invalidated pool connections", ("pool",))
+DB_QUERIES_PER_REQUEST = _metric("histogram", "erp_db_queries_per_request", "SQL statements per HTTP request",
+                                 ("route",), buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100))
+DB_TIME_PER_REQUEST = _metric("histogram", "erp_db_time_per_request_seconds", "SQL time per HTTP request",
+                              ("route",),
+                              buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+DB_N_PLUS_ONE = _metric("counter", "erp_db_n_plus_one", "Repeated statements detected (N+1 suspects)", ("route",))
+DB_BUDGET_EXCEEDED = _metric("counter", "erp_db_query_budget_exceeded", "HTTP requests over their SQL query budget",
+                             ("route",))
+
+# Scheduler
+JOB_DURATION = _metric("histogram", "erp_scheduler_job_duration_seconds", "Scheduler job duration", ("job",),
+                       buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0))
+JOB_RUNS = _metric("counter", "erp_scheduler_job_runs", "Scheduler job runs by result (ok, error, skipped)",
+                   ("job", "result"))
+
+# File des emails sortants
+EMAIL_OUTBOX_MESSAGES = _metric("gauge", "erp_email_outbox_messages", "Outbox messages by status", ("statut",),
+                                multiprocess_mode="mostrecent")
+EMAIL_OUTBOX_OLDEST_AGE = _metric("gauge", "erp_email_outbox_oldest_pending_age_seconds",
+                                  "Age of the oldest pending outbox message", multiprocess_mode="mostrecent")
+EMAILS_PROCESSED = _metric("counter", "erp_email_outbox_processed", "Outbox messages processed by result",
+                           ("result",))
+
+# Caches
+CACHE_LOOKUPS = _metric("counter", "erp_cache_lookups", "Cache lookups by cache and result (hit, miss)",
+                        ("cache", "result"))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_outbox(metriques: Dict[str, Any]) -> None:
+    """Compteurs d'un passage de process_outbox et profondeur de la file."""
+    for cle, result in (("envoyes", "sent"), ("relances", "retried"), ("echecs", "failed")):
+        if metriques.get(cle):
+            EMAILS_PROCESSED.labels(result).inc(metriques[cle])
+    file = metriques.get("file") or {}
+    for statut, total in file.items():
+        if statut != "age_plus_ancien_secondes":
+            EMAIL_OUTBOX_MESSAGES.labels(statut).set(total)
+    EMAIL_OUTBOX_OLDEST_AGE.set(file.get("age_plus_ancien_secondes") or 0)
+
+
+class JobTimer:
+    """Mesure d'un job du scheduler : `with JobTimer(job_id): ...`."""
+
+    def __init__(self, job: str):
+        self.job = job
+
+    def __enter__(self) -> "JobTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        JOB_DURATION.labels(self.job).observe(time.perf_counter() - self.start)
+        JOB_RUNS.labels(self.job, "error" if exc_type else "ok").inc()
+
+
+def skip_job(job: str) -> None:
+    JOB_RUNS.labels(job, "skipped").inc()
+
+
+class PrometheusMiddleware:
+    """Middleware ASGI : latence, statut et requêtes en cours par route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or prometheus_client is None:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_PROGRESS.labels(method).dec()
+            # Gabarit de route (cardinalité bornée); chemins inconnus regroupés
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+class SystemCollector:
+    """Santé et utilisation système lues dans l'instantané de l'échantillonneur (aucune E/S au scrape)."""
+
+    def collect(self):
+        from app.core.health_sampler import get_health_sampler
+
+        sampler = get_health_sampler()
+        snapshot = sampler.snapshot()
+        if snapshot is None:
+            return
+        system = snapshot["checks"].get("system", {}).get("metrics", {})
+        for name, documentation, key in (
+            ("erp_cpu_usage", "CPU usage percentage", "cpu_percent"),
+            ("erp_memory_usage", "Memory usage percentage", "memory_percent"),
+            ("erp_disk_usage", "Disk usage percentage", "disk_usage"),
+        ):
+            if key in system:
+                yield GaugeMetricFamily(name, documentation, value=system[key])
+        up = GaugeMetricFamily("erp_health_check_up", "Health check status (1 healthy, 0 otherwise)",
+                               labels=["check"])
+        for check, result in snapshot["checks"].items():
+            if result.get("status") != "not_configured":
+                up.add_metric([check], 1 if result.get("status") == "healthy" else 0)
+        yield up
+        yield GaugeMetricFamily("erp_health_snapshot_age_seconds", "Age of the health snapshot",
+                                value=sampler.age() or 0.0)
+
+
+_registry: Optional[Any] = None
+
+
+def _render_registry():
+    global _registry
+    if _registry is None:
+        if MULTIPROC_DIR:
+            from prometheus_client import multiprocess
+
+            # Agrégation des fichiers de tous les workers à chaque scrape
+            _registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(_registry)
+        else:
+            _registry = prometheus_client.REGISTRY
+        _registry.register(SystemCollector())
+    return _registry
+
+
+def render_metrics() -> Optional[Tuple[bytes, str]]:
+    """(corps, content-type) au format d'exposition Prometheus, None sans prometheus_client."""
+    if prometheus_client is None:
+        return None
+    return prometheus_client.generate_latest(_render_registry()), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Fin d'un worker : ses jauges « live » ne sont plus agrégées."""
+    if prometheus_client is None or not MULTIPROC_DIR:
+        return
+    from prometheus_client import multiprocess
+
+    try:
+        multiprocess.mark_process_dead(pid or os.getpid())
+    except Exception as exc:
+        logger.warning("Nettoyage des métriques du worker impossible: %s", exc)
@@ -0,0 +1,205 @@
+# app/core/pagination.py
+"""
+Pagination par curseur (keyset) commune aux endpoints de liste.
+
+Le corps de réponse reste une liste JSON (contrat historique); la pagination
+passe par les paramètres et en-têtes :
+- `limit` : taille de page (défaut PAGINATION_DEFAULT_LIMIT, plafonné à
+  PAGINATION_MAX_LIMIT) : un appel sans paramètre ne renvoie plus toute la
+  table ;
+- `cursor` : curseur opaque de la page suivante (en-tête `X-Next-Cursor` et
+  lien `Link: <...>; rel="next"`), absent sur la dernière page ;
+- `total` : `none` (défaut), `exact` (COUNT(*)) ou `estimate` (sous
+  PostgreSQL : pg_class.reltuples sans filtre, estimation du planificateur
+  sinon; COUNT(*) ailleurs), renvoyé dans `X-Total-Count` et
+  `X-Total-Estimated`.
+
+Le curseur encode les valeurs de la clé de tri (`(date_creation, id)` ou
+`id`) de la dernière ligne : la page suivante est un `WHERE clé > curseur`
+servi par l'index, à coût constant quelle que soit la profondeur (contrairement
+à OFFSET). `offset` reste accepté (déprécié) pour les clients existants.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TotalMode(str, Enum):
+    none = "none"
+    exact = "exact"
+    estimate = "estimate"
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Clé de tri unique d'une liste (colonnes ORM, la dernière doit être unique)."""
+    name: str
+    columns: Sequence[Any]
+
+
+def keyset(name: str, *columns: Any) -> Keyset:
+    return Keyset(name, tuple(columns))
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    estimated: bool = False
+
+
+def encode_cursor(ks: Keyset, values: Sequence[Any]) -> str:
+    payload = {"k": ks.name, "v": [v.isoformat() if isinstance(v, datetime) else v for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(ks: Keyset, cursor: str) -> List[Any]:
+    """
+    Valeurs de clé d'un curseur émis pour `ks`.
+
+    Raises:
+        HTTPException 400: curseur illisible ou émis par une autre liste
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload.get("k") != ks.name or len(payload["v"]) != len(ks.columns):
+            raise ValueError("curseur d'une autre liste")
+        values = []
+        for column, value in zip(ks.columns, payload["v"]):
+            if column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            values.append(value)
+        return values
+    except (ValueError, TypeError, KeyError, binascii.Error, json.JSONDecodeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Curseur de pagination invalide")
+
+
+def after(ks: Keyset, values: Sequence[Any]):
+    """Prédicat « strictement après `values` » dans l'ordre croissant de la clé (forme indexable)."""
+    (first, *rest), (v0, *vrest) = ks.columns, values
+    if not rest:
+        return first > v0
+    return and_(first >= v0, or_(first > v0, after(keyset(ks.name, *rest), vrest)))
+
+
+def count_total(db: Session, stmt: Select, mode: TotalMode) -> Optional[tuple]:
+    """(total, estimé) de `stmt` selon `mode`, None si non demandé."""
+    if mode == TotalMode.none:
+        return None
+    base = stmt.order_by(None).limit(None).offset(None)
+    if mode == TotalMode.estimate and db.get_bind().dialect.name == "postgresql":
+        estimate = _estimate_postgresql(db, base)
+        if estimate is not None:
+            return estimate, True
+    return db.execute(select(func.count()).select_from(base.subquery())).scalar_one(), False
+
+
+def _estimate_postgresql(db: Session, stmt: Select) -> Optional[int]:
+    try:
+        if stmt.whereclause is None and len(stmt.get_final_froms()) == 1:
+            table = stmt.get_final_froms()[0]
+            reltuples = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+                {"t": table.name},
+            ).scalar()
+            # -1: table jamais analysée (ANALYZE), estimation indisponible
+            return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+        compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as exc:
+        logger.warning("Estimation du total indisponible, comptage exact: %s", exc)
+        return None
+
+
+def paginate(db: Session, stmt: Select, ks: Keyset, limit: int, cursor: Optional[str] = None,
+             total: TotalMode = TotalMode.none, offset: Optional[int] = None) -> Page:
+    """Exécute une page de `stmt` (SELECT d'une entité) triée sur la clé `ks`."""
+    totals = count_total(db, stmt, total)
+    stmt = stmt.order_by(*ks.columns)
+    if cursor:
+        stmt = stmt.where(after(ks, decode_cursor(ks, cursor)))
+    elif offset:
+        stmt = stmt.offset(offset)
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    rows = list(db.scalars(stmt.limit(limit + 1)).all())
+    page = Page(items=rows[:limit])
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        page.next_cursor = encode_cursor(ks, [getattr(last, column.key) for column in ks.columns])
+    if totals is not None:
+        page.total, page.estimated = totals
+    return page
+
+
+class Pagination:
+    """Dépendance FastAPI : paramètres de page et en-têtes de réponse."""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        limit: Annotated[Optional[int], Query(ge=1, description="Taille de page (plafonnée)")] = None,
+        cursor: Annotated[Optional[str], Query(description="Curseur de la page suivante (X-Next-Cursor)")] = None,
+        total: Annotated[TotalMode, Query(description="Total: none, exact ou estimate")] = TotalMode.none,
+        offset: Annotated[Optional[int], Query(ge=0, deprecated=True,
+                                               description="Décalage (déprécié, préférer cursor)")] = None,
+    ):
+        self.request = request
+        self.response = response
+        self.limit = limit
+        self.cursor = cursor
+        self.total = total
+        self.offset = offset
+
+    def page_size(self, default_limit: Optional[int] = None) -> int:
+        return min(self.limit or default_limit or settings.PAGINATION_DEFAULT_LIMIT, settings.PAGINATION_MAX_LIMIT)
+
+    def paginate(self, db: Session, stmt: Select, ks: Keyset, default_limit: Optional[int] = None) -> List[Any]:
+        """Page de `stmt` (en-têtes renseignés sur la réponse)."""
+        page = paginate(db, stmt, ks, self.page_size(default_limit), self.cursor, self.total, self.offset)
+        self.set_headers(page, default_limit)
+        return page.items
+
+    async def paginate_read(self, db: Any, stmt: Select, ks: Keyset, default_limit: Optional[int] = None) -> List[Any]:
+        """Variante pour une ReadSession (endpoints de lecture asynchrones)."""
+        page = await db.run_sync(paginate, stmt, ks, self.page_size(default_limit), self.cursor, self.total,
+                                 self.offset)
+        self.set_headers(page, default_limit)
+        return page.items
+
+    def set_headers(self, page: Page, default_limit: Optional[int] = None) -> None:
+        if self.response is None:
+            return
+        if page.next_cursor:
+            self.response.headers["X-Next-Cursor"] = page.next_cursor
+            if self.request is not None:
+                url = self.request.url.remove_query_params("offset").include_query_params(
+                    cursor=page.next_cursor, limit=self.page_size(default_limit))
+                self.response.headers["Link"] = f'<{url}>; rel="next"'
+        if page.total is not None:
+            self.response.headers["X-Total-Count"] = str(page.total)
+            self.response.headers["X-Total-Estimated"] = "true" if page.estimated else "false"
+
+
+# En-têtes exposés aux clients navigateur (CORS)
+PAGINATION_HEADERS = ["X-Next-Cursor", "X-Total-Count", "X-Total-Estimated", "Link"]
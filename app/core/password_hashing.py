@@ -0,0 +1,109 @@
+# app/core/password_hashing.py
+"""
+Exécuteur dédié et borné pour le hachage/la vérification bcrypt.
+
+Les endpoints synchrones partagent le threadpool d'AnyIO : une rafale de
+connexions y occuperait tous les threads avec du bcrypt (~250 ms de CPU
+chacun) et affamerait les autres requêtes. Ici :
+- le calcul bcrypt tourne sur PASSWORD_HASH_WORKERS threads dédiés
+  (bcrypt libère le GIL) ;
+- au plus PASSWORD_HASH_MAX_PENDING calculs attendent en plus : au-delà, la
+  requête est rejetée immédiatement en 429 (Retry-After) au lieu d'empiler
+  des threads bloqués ;
+- les endpoints de connexion (/auth/token, /auth/login) sont async et
+  attendent le résultat via run_password_task_async : l'attente n'occupe
+  aucun thread du threadpool.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import get_password_hash
+
+logger = get_logger(__name__)
+
+
+class PasswordExecutor:
+    """Pool de threads bcrypt avec file d'attente bornée (délestage en 429)."""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Exécute `func(*args)` sur le pool et attend son résultat (voir submit)."""
+        return self.submit(func, *args).result()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Soumet `func(*args)` au pool; la place est libérée à la fin du calcul.
+
+        Raises:
+            HTTPException 429: pool et file d'attente pleins
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning("Calcul de mot de passe rejeté: %s calculs en cours", self.capacity)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Trop de connexions simultanées, réessayez dans un instant",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_executor: Optional[PasswordExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_password_executor() -> PasswordExecutor:
+    """Exécuteur du process (singleton)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = PasswordExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+    return _executor
+
+
+def run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    """Exécute une fonction bcrypt (vérification, hachage) sur l'exécuteur dédié."""
+    return get_password_executor().run(func, *args)
+
+
+async def run_password_task_async(func: Callable[..., Any], *args: Any) -> Any:
+    """Comme run_password_task, mais attend le résultat sans bloquer la boucle ni un thread."""
+    return await asyncio.wrap_future(get_password_executor().submit(func, *args))
+
+
+def hash_password(password: str) -> str:
+    """Hache un mot de passe sur l'exécuteur dédié."""
+    return run_password_task(get_password_hash, password)
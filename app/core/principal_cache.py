@@ -0,0 +1,170 @@
+# app/core/principal_cache.py
+"""
+Cache des utilisateurs authentifiés (principal) résolus par get_current_user.
+
+Sans cache, chaque requête authentifiée relit l'utilisateur en base (et, en cas
+d'absence, une seconde fois via une session de repli). Ici le principal résolu
+est gardé en mémoire du process :
+- clé : identité du token (user_id ou sub) + `iat`/`exp` : un nouveau token
+  produit une nouvelle entrée, un token expiré n'est jamais servi (le JWT est
+  décodé et vérifié avant toute lecture du cache) ;
+- TTL court et taille bornée (LRU) ;
+- invalidation explicite par utilisateur (désactivation, réactivation,
+  changement de rôle), diffusée aux autres workers par Redis pub/sub quand
+  CACHE_BACKEND=redis. Le TTL borne la fenêtre d'incohérence si un message
+  est perdu ;
+- compteur de génération : un principal lu en base avant une invalidation
+  concurrente n'est pas mis en cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+
+from app.core import metrics as prom
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "erp:principal:invalidate"
+
+
+def principal_key(payload: Dict[str, Any]) -> tuple:
+    """Clé de cache d'un token décodé: (identité, iat, exp)."""
+    identite = payload.get("user_id")
+    if identite is None:
+        identite = payload.get("sub")
+    return (str(identite), payload.get("iat"), payload.get("exp"))
+
+
+class PrincipalCache:
+    """Cache LRU+TTL des principaux, indexé par utilisateur pour l'invalidation."""
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._by_user: Dict[int, Set[Hashable]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                prom.record_cache("principal", False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        prom.record_cache("principal", True)
+        return dict(entry[1])
+
+    def set(self, key: Hashable, principal: Dict[str, Any], generation: int) -> bool:
+        """Stocke le principal, sauf si une invalidation a eu lieu depuis sa lecture."""
+        if self.ttl <= 0:
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl, dict(principal))
+            self._entries.move_to_end(key)
+            user_id = principal.get("user_id")
+            if user_id is not None:
+                self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in self._by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        _, principal = self._entries.pop(key)
+        keys = self._by_user.get(principal.get("user_id"))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[principal.get("user_id")]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisInvalidationBus:
+    """Diffusion des invalidations entre workers (Redis pub/sub)."""
+
+    def __init__(self, url: str, cache: PrincipalCache, channel: str = INVALIDATION_CHANNEL):
+        import redis  # Dépendance optionnelle, importée uniquement si activée
+
+        self.cache = cache
+        self.channel = channel
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{channel: self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        try:
+            self.cache.invalidate_user(int(message["data"]))
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Message d'invalidation de principal ignoré: %r", message)
+
+    def publish(self, user_id: int) -> None:
+        self._client.publish(self.channel, str(user_id))
+
+    def close(self) -> None:
+        self._thread.stop()
+        self._pubsub.close()
+
+
+_cache: Optional[PrincipalCache] = None
+_bus: Optional[RedisInvalidationBus] = None
+_lock = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Cache du process (singleton), abonné aux invalidations Redis si configuré."""
+    global _cache, _bus
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS if settings.PRINCIPAL_CACHE_ENABLED else 0
+                cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES, ttl)
+                if ttl > 0 and settings.CACHE_BACKEND.lower() == "redis":
+                    try:
+                        _bus = RedisInvalidationBus(settings.REDIS_URL, cache)
+                    except Exception as exc:
+                        # Sans diffusion, l'invalidation reste locale et le TTL borne l'écart entre workers
+                        logger.warning("Invalidation Redis des principaux indisponible: %s", exc)
+                _cache = cache
+    return _cache
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Invalide le principal d'un utilisateur dans ce process et, si configuré, dans les autres."""
+    get_principal_cache().invalidate_user(user_id)
+    if _bus is not None:
+        try:
+            _bus.publish(user_id)
+        except Exception as exc:
+            logger.warning("Diffusion de l'invalidation du principal %s impossible: %s", user_id, exc)
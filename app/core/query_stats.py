@@ -0,0 +1,196 @@
+# app/core/query_stats.py
+"""
+Instrumentation des requêtes SQL par requête HTTP.
+
+Des écouteurs `before_cursor_execute` / `after_cursor_execute` posés sur les
+engines (principal, réplica, asynchrone) alimentent les `QueryStats` de la
+requête HTTP en cours (contextvar, propagée au threadpool et à `run_sync`) :
+- nombre de requêtes et temps SQL cumulé ;
+- requête la plus lente ;
+- empreintes (SQL normalisé) répétées : une même requête exécutée
+  QUERY_REPEAT_THRESHOLD fois ou plus dans une requête HTTP est un suspect N+1
+  (chargement paresseux dans une boucle, propriété de modèle...).
+
+Restitution :
+- en-tête `Server-Timing` (`db;dur=...;desc="N queries"`, `db-slowest`) ;
+- log structuré (champs `extra_fields`) : DEBUG par requête, WARNING pour un
+  suspect N+1 ou un budget dépassé ;
+- métriques Prometheus par route (app.core.metrics).
+
+Budget par route (`QUERY_BUDGETS`, clé "GET /interventions/", défaut
+QUERY_BUDGET_DEFAULT, 0 = aucun) : dépassement journalisé, ou levé
+(`QueryBudgetExceeded`) si QUERY_BUDGET_MODE=raise (tests).
+Dans un test : `with track_queries() as stats: ...`.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core import metrics as prom
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Nombre de requêtes SQL d'une route supérieur à son budget (QUERY_BUDGET_MODE=raise)."""
+
+
+def fingerprint(statement: str) -> str:
+    """SQL normalisé : littéraux et listes IN remplacés, espaces compactés."""
+    sql = _LITERALS.sub("?", statement)
+    sql = _IN_LISTS.sub("(?)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """Statistiques SQL d'une requête HTTP (ou d'un bloc `track_queries`)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.fingerprints[key] += 1
+            if duration_ms >= self.slowest_ms:
+                self.slowest_ms = duration_ms
+                self.slowest_statement = key
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Empreintes exécutées au moins `threshold` fois (suspects N+1), les plus fréquentes d'abord."""
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        with self._lock:
+            return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        value = f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+        if self.count:
+            value += f", db-slowest;dur={self.slowest_ms:.1f}"
+        return value
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "db_slowest_ms": round(self.slowest_ms, 2),
+            "db_slowest_statement": self.slowest_statement,
+        }
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collecte les requêtes SQL exécutées dans le bloc (contexte courant)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+
+
+def instrument_queries(eng: Any) -> Any:
+    """Pose les écouteurs de mesure sur un engine (synchrone, ou `sync_engine` d'un engine asynchrone)."""
+    target = getattr(eng, "sync_engine", eng)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    return eng
+
+
+def route_key(scope: Dict[str, Any]) -> str:
+    """Clé de budget d'une requête : "METHODE /chemin/{param}" (gabarit de route, "unmatched" sinon)."""
+    path = getattr(scope.get("route"), "path", None) or "unmatched"
+    return f"{scope.get('method', '')} {path}"
+
+
+def budget_for(key: str) -> int:
+    return settings.QUERY_BUDGETS.get(key, settings.QUERY_BUDGET_DEFAULT)
+
+
+def report(stats: QueryStats, key: str) -> None:
+    """Journalise les statistiques d'une requête et applique son budget."""
+    suspects = stats.repeated()
+    budget = budget_for(key)
+    over_budget = bool(budget) and stats.count > budget
+    prom.DB_QUERIES_PER_REQUEST.labels(key).observe(stats.count)
+    prom.DB_TIME_PER_REQUEST.labels(key).observe(stats.total_ms / 1000)
+    if suspects:
+        prom.DB_N_PLUS_ONE.labels(key).inc(len(suspects))
+    if over_budget:
+        prom.DB_BUDGET_EXCEEDED.labels(key).inc()
+
+    fields = {"route": key, **stats.summary()}
+    if suspects:
+        fields["n_plus_one"] = [{"statement": sql, "count": n} for sql, n in suspects]
+        logger.warning("Requêtes répétées (N+1 suspect) sur %s", key, extra={"extra_fields": fields})
+    if over_budget:
+        fields["db_query_budget"] = budget
+        message = f"Budget de requêtes dépassé sur {key}: {stats.count} > {budget}"
+        if settings.QUERY_BUDGET_MODE.lower() == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message, extra={"extra_fields": fields})
+    elif not suspects:
+        logger.debug("Requêtes SQL de %s", key, extra={"extra_fields": fields})
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI : statistiques SQL de chaque requête HTTP, en-tête Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+        report(stats, route_key(scope))
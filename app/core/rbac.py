@@ -6,6 +6,7 @@ from jose import JWTError, jwt
 from app.core.config import settings
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.core.principal_cache import get_principal_cache, principal_key
 from types import SimpleNamespace
 
 # OAuth2 JWT
@@ -32,6 +33,9 @@ def get_current_user(
 
     Compatibilité tests: accepte les tokens avec 'user_id' OU 'sub' (email ou id),
     et ne dépend pas strictement de la présence d'un utilisateur en base.
+
+    Les utilisateurs trouvés en base sont mis en cache par token
+    (cf. app/core/principal_cache.py) : pas de requête sur cache chaud.
     """
     from app.services.user_service import get_user_by_id, get_user_by_email  # Import local pour éviter les cycles
 
@@ -40,6 +44,13 @@ def get_current_user(
     if not role:
         raise HTTPException(status_code=403, detail="Rôle manquant dans le token")
 
+    cache = get_principal_cache()
+    cache_key = principal_key(payload)
+    principal = cache.get(cache_key)
+    if principal is not None:
+        return principal
+    generation = cache.generation
+
     # Identifiants possibles dans le token
     user_id = payload.get("user_id")
     sub = payload.get("sub")  # peut être un email ou un id
@@ -67,12 +78,14 @@ def get_current_user(
         if not getattr(user_obj, "is_active", True):
             raise HTTPException(status_code=403, detail="Utilisateur désactivé")
         # Normalise en dict pour compatibilité des routeurs existants
-        return {
+        principal = {
             "user_id": getattr(user_obj, "id", None),
             "email": getattr(user_obj, "email", None),
             "role": getattr(user_obj, "role", role),
             "is_active": True,
         }
+        cache.set(cache_key, principal, generation)
+        return dict(principal)
 
     # Fallback: retourne un objet léger suffisant pour RBAC
     # Fournit .role, .is_active, .id (si déductible), .email (si présent)
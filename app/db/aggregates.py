@@ -0,0 +1,48 @@
+# app/db/aggregates.py
+"""
+Expressions SQL portables (PostgreSQL / SQLite) pour les agrégats ensemblistes.
+
+- Agrégats conditionnels : FILTER (WHERE ...) si le moteur le supporte,
+  repli CASE ... sinon.
+- Arithmétique de dates : les deux moteurs n'ont pas les mêmes fonctions
+  (INTERVAL/EXTRACT vs julianday), centralisées ici.
+"""
+
+from sqlalchemy import case, func
+
+
+def supports_filter_clause(dialect) -> bool:
+    """FILTER (WHERE ...) est supporté par PostgreSQL et SQLite >= 3.30."""
+    if dialect.name == "postgresql":
+        return True
+    if dialect.name == "sqlite":
+        return (dialect.dbapi.sqlite_version_info if dialect.dbapi else (0,)) >= (3, 30)
+    return False
+
+
+def conditional_count(condition, use_filter: bool = True):
+    """COUNT conditionnel: FILTER (WHERE ...) si supporté, repli COUNT(CASE ...) sinon."""
+    if use_filter:
+        return func.count().filter(condition)
+    return func.count(case((condition, 1)))
+
+
+def conditional_agg(aggregate, expression, condition, use_filter: bool = True):
+    """Agrégat conditionnel (SUM/AVG/MAX...) : FILTER si supporté, CASE sinon."""
+    if use_filter:
+        return aggregate(expression).filter(condition)
+    return aggregate(case((condition, expression)))
+
+
+def hours_between(dialect_name: str, debut, fin):
+    """Durée en heures entre deux colonnes DateTime (NULL si l'une est NULL)."""
+    if dialect_name == "postgresql":
+        return func.extract("epoch", fin - debut) / 3600.0
+    return (func.julianday(fin) - func.julianday(debut)) * 24.0
+
+
+def within_days(dialect_name: str, debut, fin, jours: int):
+    """Condition `fin <= debut + jours` sur des colonnes DateTime."""
+    if dialect_name == "postgresql":
+        return fin <= debut + func.make_interval(0, 0, 0, jours)
+    return func.julianday(fin) <= func.julianday(debut) + jours
@@ -0,0 +1,167 @@
+# app/db/async_database.py
+"""
+Chemin de lecture asynchrone (optionnel) pour les endpoints chauds.
+
+Avec ASYNC_DB_ENABLED=true et les pilotes installés (asyncpg pour
+PostgreSQL, aiosqlite en local, plus greenlet requis par
+sqlalchemy.ext.asyncio), les endpoints de lecture attendent la base sur la
+boucle d'événements : un worker tient des centaines d'attentes SQL
+concurrentes sans occuper le threadpool (40 threads par défaut).
+
+Sinon (défaut, tests) la session synchrone de `get_db` est utilisée et chaque
+requête SQL est exécutée dans le threadpool, comme un endpoint `def`.
+
+Les endpoints dépendent de `get_read_db`, qui fournit une `ReadSession`
+offrant la même API dans les deux modes.
+
+Benchmark : `python scripts/bench_async_reads.py`.
+"""
+
+import threading
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.query_stats import instrument_queries
+from app.db.database import DATABASE_URL, get_db, use_replica_for
+
+logger = get_logger(__name__)
+
+# Pilote asynchrone par dialecte
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+# Engines et fabriques par cible ("primary", "replica")
+_async_engines: Dict[str, Any] = {}
+_async_sessionmakers: Dict[str, Any] = {}
+_async_lock = threading.Lock()
+_async_unavailable = False
+
+
+def async_database_url(url: str) -> str:
+    """URL équivalente avec le pilote asynchrone du dialecte (postgresql+psycopg2 -> postgresql+asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"Aucun pilote asynchrone connu pour {backend}")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def _async_engine_options(url: str) -> dict:
+    backend = make_url(url).get_backend_name()
+    if backend != "postgresql":
+        return {}
+    connect_args: dict = {"timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        # asyncpg: paramètres serveur transmis à l'ouverture de la connexion
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _async_url(target: str) -> Optional[str]:
+    if target == "replica":
+        return async_database_url(settings.DB_REPLICA_URL) if settings.DB_REPLICA_URL else None
+    return settings.ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+
+
+def get_async_sessionmaker(replica: bool = False):
+    """
+    Fabrique d'AsyncSession du process (sur le réplica si `replica` et
+    DB_REPLICA_URL), ou None si le chemin asynchrone est désactivé ou
+    indisponible (pilote ou greenlet absent).
+    """
+    global _async_unavailable
+    if not settings.ASYNC_DB_ENABLED or _async_unavailable:
+        return None
+    target = "replica" if replica and settings.DB_REPLICA_URL else "primary"
+    if target not in _async_sessionmakers:
+        with _async_lock:
+            if target not in _async_sessionmakers and not _async_unavailable:
+                try:
+                    # Dépendances optionnelles: sqlalchemy.ext.asyncio exige greenlet
+                    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+                    url = _async_url(target)
+                    _async_engines[target] = instrument_queries(create_async_engine(url, **_async_engine_options(url)))
+                    _async_sessionmakers[target] = async_sessionmaker(_async_engines[target], expire_on_commit=False)
+                except (ImportError, ValueError) as exc:
+                    logger.warning("Engine asynchrone indisponible, repli sur la session synchrone: %s", exc)
+                    _async_unavailable = True
+    return _async_sessionmakers.get(target)
+
+
+async def get_async_db() -> AsyncGenerator[Any, None]:
+    """Dépendance FastAPI fournissant une AsyncSession (RuntimeError si le chemin asynchrone est indisponible)."""
+    factory = get_async_sessionmaker()
+    if factory is None:
+        raise RuntimeError("Engine asynchrone non configuré (ASYNC_DB_ENABLED, asyncpg/aiosqlite)")
+    async with factory() as session:
+        yield session
+
+
+async def dispose_async_engine() -> None:
+    """Ferme les connexions des engines asynchrones (arrêt de l'application)."""
+    for target in list(_async_engines):
+        await _async_engines.pop(target).dispose()
+    _async_sessionmakers.clear()
+
+
+class ReadSession:
+    """
+    Session de lecture commune aux deux modes :
+    - AsyncSession : requêtes attendues sur la boucle d'événements ;
+    - Session synchrone : requêtes exécutées dans le threadpool.
+    """
+
+    def __init__(self, session: Any, is_async: bool = False):
+        self.session = session
+        self.is_async = is_async
+
+    async def _run(self, fn: Callable[[Session], Any]) -> Any:
+        if self.is_async:
+            # Code ORM synchrone exécuté sur la connexion asynchrone (sans thread)
+            return await self.session.run_sync(fn)
+        return await run_in_threadpool(fn, self.session)
+
+    async def all(self, statement) -> List[Any]:
+        """Entités (première colonne) de toutes les lignes de `statement`."""
+        if self.is_async:
+            return list((await self.session.scalars(statement)).all())
+        return await self._run(lambda db: list(db.scalars(statement).all()))
+
+    async def first(self, statement) -> Optional[Any]:
+        """Première entité de `statement`, ou None."""
+        if self.is_async:
+            return (await self.session.scalars(statement)).first()
+        return await self._run(lambda db: db.scalars(statement).first())
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Exécute `fn(session, *args, **kwargs)` (services synchrones existants)."""
+        return await self._run(lambda db: fn(db, *args, **kwargs))
+
+
+async def get_read_db(request: Request, db: Session = Depends(get_db)) -> AsyncGenerator[ReadSession, None]:
+    """
+    Dépendance des endpoints de lecture : AsyncSession si disponible (sur le
+    réplica selon les mêmes règles que `get_db`), sinon la session de `get_db`
+    (surchargée dans les tests). La session synchrone n'ouvre aucune connexion
+    tant qu'elle n'est pas utilisée.
+    """
+    factory = get_async_sessionmaker(replica=use_replica_for(request))
+    if factory is None:
+        yield ReadSession(db)
+        return
+    async with factory() as session:
+        yield ReadSession(session, is_async=True)
@@ -1,10 +1,36 @@
 # app/db/database.py
+"""
+Engine et fabrique de sessions.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+- Pool (taille, débordement, attente, recyclage, pre-ping), délai de connexion
+  et timeout des requêtes pilotés par Settings (DB_*) ;
+- schéma SQLite (tests, repli mémoire) créé une seule fois, au premier
+  `SessionLocal()` ; sous PostgreSQL le schéma relève d'Alembic ;
+- métriques du pool (connexions, checkouts, débordement) via `pool_metrics()`,
+  et statistiques SQL par requête HTTP (app.core.query_stats) ;
+- réplica en lecture optionnel (DB_REPLICA_URL) : les requêtes GET lisent sur
+  le réplica via `RoutingSession`, les écritures vont au primaire, et un
+  client qui vient d'écrire relit sur le primaire (app.db.replica_routing).
+
+Benchmark : `python scripts/bench_sessions.py`.
+"""
+
+import sys
+import threading
+import weakref
+from typing import Any, Dict, Generator, Optional
+
+from fastapi import Request
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.core import metrics as prom
 from app.core.config import settings
-import sys
+from app.core.query_stats import instrument_queries
+from app.db.replica_routing import client_key, get_write_stickiness
 
 # Initialisation de Base
 Base = declarative_base()
@@ -13,23 +39,120 @@ Base = declarative_base()
 DATABASE_URL = settings.DATABASE_URL
 
 
-def _create_default_engine():
+def _sqlite_memory_engine() -> Engine:
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Options de create_engine dérivées des settings pour l'URL donnée."""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    connect_args: Dict[str, Any] = {}
+    if backend == "postgresql":
+        connect_args["connect_timeout"] = settings.DB_CONNECT_TIMEOUT_SECONDS
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+class PoolMetrics:
+    """Compteurs d'activité du pool de connexions d'un engine (publiés aussi dans Prometheus)."""
+
+    def __init__(self, name: str = "primary"):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connexions = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.en_cours = 0
+        self.pic_en_cours = 0
+
+    def attach(self, eng: Engine) -> "PoolMetrics":
+        event.listen(eng, "connect", self._on_connect)
+        event.listen(eng, "checkout", self._on_checkout)
+        event.listen(eng, "checkin", self._on_checkin)
+        event.listen(eng, "invalidate", self._on_invalidate)
+        return self
+
+    def _on_connect(self, *args) -> None:
+        with self._lock:
+            self.connexions += 1
+        prom.DB_POOL_CONNECTIONS.labels(self.name).inc()
+
+    def _on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.en_cours += 1
+            self.pic_en_cours = max(self.pic_en_cours, self.en_cours)
+        prom.DB_POOL_CHECKOUTS.labels(self.name).inc()
+        prom.DB_POOL_CHECKED_OUT.labels(self.name).inc()
+
+    def _on_checkin(self, *args) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.en_cours = max(self.en_cours - 1, 0)
+        prom.DB_POOL_CHECKED_OUT.labels(self.name).dec()
+
+    def _on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+        prom.DB_POOL_INVALIDATIONS.labels(self.name).inc()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "connexions_ouvertes": self.connexions,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "en_cours": self.en_cours,
+                "pic_en_cours": self.pic_en_cours,
+            }
+
+
+# Compteurs par engine (principal, et engines créés par create_db_engine)
+_metrics: "weakref.WeakKeyDictionary[Engine, PoolMetrics]" = weakref.WeakKeyDictionary()
+
+
+def instrument_engine(eng: Engine, name: str = "primary") -> Engine:
+    """Métriques du pool et statistiques SQL par requête HTTP (app.core.query_stats)."""
+    if eng not in _metrics:
+        _metrics[eng] = PoolMetrics(name).attach(eng)
+        instrument_queries(eng)
+    return eng
+
+
+def create_db_engine(url: str, name: str = "primary") -> Engine:
+    """Crée un engine configuré par les settings, instrumenté par PoolMetrics."""
+    return instrument_engine(create_engine(url, **engine_options(url)), name)
+
+
+def _create_default_engine() -> Engine:
     """
     Crée l'engine de base de données.
-    - Tente PostgreSQL (prod/dev).
+    - Tente PostgreSQL (prod/dev), sonde bornée par DB_CONNECT_TIMEOUT_SECONDS.
     - En cas d'indisponibilité du driver (psycopg2 non installé), bascule sur SQLite en mémoire.
     Ce fallback évite l'échec d'import lors des tests qui remplacent get_db.
     """
     # En mode test (pytest), on force SQLite en mémoire pour isolation/rapidité
     if "pytest" in sys.modules:
-        return create_engine(
-            "sqlite://",
-            connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
-        )
+        return instrument_engine(_sqlite_memory_engine())
 
     try:
-        eng = create_engine(DATABASE_URL)
+        eng = create_db_engine(DATABASE_URL)
         # Probe la connexion; si indisponible, fallback SQLite
         with eng.connect() as _:
             pass
@@ -39,61 +162,135 @@ def _create_default_engine():
             "Creation de l'engine Postgres echouee, fallback SQLite memoire: "
             f"{getattr(exc, 'msg', str(exc))}"
         )
-        return create_engine(
-            "sqlite://",
-            connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
-        )
+        return instrument_engine(_sqlite_memory_engine())
 
 
-engine = _create_default_engine()
+def _create_replica_engine() -> Optional[Engine]:
+    """Engine du réplica (DB_REPLICA_URL), ou None si absent/injoignable (lectures sur le primaire)."""
+    if not settings.DB_REPLICA_URL or "pytest" in sys.modules:
+        return None
+    try:
+        eng = create_db_engine(settings.DB_REPLICA_URL, "replica")
+        with eng.connect() as _:
+            pass
+        return eng
+    except Exception as exc:
+        print(f"Réplica en lecture injoignable, lectures sur le primaire: {getattr(exc, 'msg', str(exc))}")
+        return None
 
-_SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Dépendance utilisée par FastAPI (surchargée dans les tests)
-from sqlalchemy.orm import Session
-from typing import Generator
+def _is_write(clause: Any) -> bool:
+    """INSERT/UPDATE/DELETE ou SELECT ... FOR UPDATE."""
+    if isinstance(clause, UpdateBase):
+        return True
+    return isinstance(clause, Select) and clause._for_update_arg is not None
+
 
-# Initialisation paresseuse du schéma en mode SQLite mémoire
+class RoutingSession(Session):
+    """
+    Session qui lit sur le réplica quand `replica` est fourni.
+
+    Seuls les SELECT (hors FOR UPDATE) vont au réplica. Dès la première
+    écriture (flush, INSERT/UPDATE/DELETE, FOR UPDATE) la session bascule
+    définitivement sur le primaire, pour relire ses propres écritures, et le
+    client (`info["client_key"]`) est marqué à la validation.
+    """
+
+    def __init__(self, *args: Any, replica: Optional[Engine] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or _is_write(clause):
+            self.info["wrote"] = True
+            self.replica = None
+        elif self.replica is not None and isinstance(clause, Select):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _mark_client_after_write(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        get_write_stickiness().mark(session.info.get("client_key"))
+
+
+engine = _create_default_engine()
+replica_engine = _create_replica_engine()
+
+_SessionFactory = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+# Schéma SQLite créé une seule fois (premier SessionLocal), après l'import de tous les modèles
 _schema_initialized = False
+_schema_lock = threading.Lock()
 
-# Assure le schéma si des tests utilisent directement SessionLocal sans passer par get_db
-if engine.url.get_backend_name() == "sqlite":
-    try:
-        # Import des modèles pour enregistrer toutes les tables
-        import app.models  # noqa: F401
-        Base.metadata.create_all(bind=engine)
-        _schema_initialized = True
-    except Exception as exc:
-        print(f"Initialisation immédiate du schéma SQLite échouée: {exc}")
 
-def get_db() -> Generator[Session, None, None]:
+def init_schema() -> bool:
+    """
+    Crée le schéma SQLite une seule fois par process (sans effet sous PostgreSQL,
+    géré par Alembic). Renvoie True si le schéma vient d'être créé.
+    """
     global _schema_initialized
-    # Crée le schéma si on est en SQLite mémoire et pas encore initialisé
-    if engine.url.get_backend_name() == "sqlite" and not _schema_initialized:
+    if _schema_initialized:
+        return False
+    with _schema_lock:
+        if _schema_initialized:
+            return False
+        if engine.url.get_backend_name() != "sqlite":
+            _schema_initialized = True
+            return False
         try:
             # Import des modèles pour que toutes les tables soient enregistrées
             import app.models  # noqa: F401
             Base.metadata.create_all(bind=engine)
             _schema_initialized = True
+            return True
         except Exception as exc:
             print(f"Initialisation du schéma SQLite échouée: {exc}")
+            return False
 
-    db = SessionLocal()
+
+# Fournit une session tout en garantissant le schéma en mode SQLite mémoire
+def SessionLocal(read_replica: bool = False, client: Optional[str] = None) -> Session:
+    """
+    Session sur le primaire; lectures sur le réplica si `read_replica` et un
+    réplica est configuré. `client` identifie l'auteur des écritures (stickiness).
+    """
+    if not _schema_initialized:
+        init_schema()
+    db = _SessionFactory(replica=replica_engine if read_replica else None)
+    if client:
+        db.info["client_key"] = client
+    return db
+
+
+def use_replica_for(request: Optional[Request], key: Optional[str] = None) -> bool:
+    """Vrai si la requête peut lire sur le réplica (GET/HEAD, pas d'écriture récente du client)."""
+    if replica_engine is None or request is None or request.method not in ("GET", "HEAD"):
+        return False
+    return not get_write_stickiness().is_sticky(key or client_key(request))
+
+
+# Dépendance utilisée par FastAPI (surchargée dans les tests)
+def get_db(request: Request = None) -> Generator[Session, None, None]:
+    key = client_key(request)
+    db = SessionLocal(read_replica=use_replica_for(request, key), client=key)
     try:
         yield db
     finally:
         db.close()
 
-# Fournit une session tout en garantissant le schéma en mode SQLite mémoire
-def SessionLocal() -> Session:
-    global _schema_initialized
-    if engine.url.get_backend_name() == "sqlite":
-        try:
-            import app.models  # noqa: F401
-            # create_all avec checkfirst garantit la présence des tables
-            Base.metadata.create_all(bind=engine)
-            _schema_initialized = True
-        except Exception as exc:
-            print(f"Initialisation à la volée du schéma SQLite échouée: {exc}")
-    return _SessionFactory()
+
+def pool_metrics(eng: Engine = None) -> Dict[str, Any]:
+    """État du pool (taille, connexions empruntées, débordement) et compteurs d'activité."""
+    eng = eng or engine
+    pool = eng.pool
+    metrics: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name in ("size", "checkedout", "overflow", "checkedin"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            metrics[name] = method()
+    compteurs = _metrics.get(eng)
+    if compteurs is not None:
+        metrics.update(compteurs.snapshot())
+    return metrics
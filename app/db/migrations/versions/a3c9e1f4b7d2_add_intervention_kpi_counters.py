@@ -0,0 +1,57 @@
+"""add intervention kpi counters
+
+Revision ID: a3c9e1f4b7d2
+Revises: 863cce1401db
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f4b7d2'
+down_revision: Union[str, Sequence[str], None] = '863cce1401db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Types ENUM déjà créés par les migrations précédentes
+        statut_type = postgresql.ENUM(name='statutintervention', create_type=False)
+        priorite_type = postgresql.ENUM(name='prioriteintervention', create_type=False)
+    else:
+        statut_type = sa.Enum('ouverte', 'affectee', 'en_cours', 'en_attente', 'cloturee', 'annulee', 'archivee',
+                              name='statutintervention')
+        priorite_type = sa.Enum('urgente', 'haute', 'normale', 'basse', 'programmee', name='prioriteintervention')
+
+    op.create_table(
+        'intervention_kpi_counters',
+        sa.Column('statut', statut_type, nullable=False),
+        sa.Column('priorite', priorite_type, nullable=False),
+        sa.Column('mois', sa.Date(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('statut', 'priorite', 'mois'),
+    )
+
+    # Initialisation des compteurs à partir des interventions existantes
+    if bind.dialect.name == 'postgresql':
+        mois = "CAST(date_trunc('month', date_creation) AS DATE)"
+    else:
+        mois = "strftime('%Y-%m-01', date_creation)"
+    op.execute(
+        f"INSERT INTO intervention_kpi_counters (statut, priorite, mois, total) "
+        f"SELECT statut, priorite, {mois}, COUNT(*) FROM interventions "
+        f"GROUP BY statut, priorite, {mois}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('intervention_kpi_counters')
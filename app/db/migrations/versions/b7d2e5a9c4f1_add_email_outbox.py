@@ -0,0 +1,53 @@
+"""add email outbox
+
+Revision ID: b7d2e5a9c4f1
+Revises: a3c9e1f4b7d2
+Create Date: 2026-10-17 14:03:27.518402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e5a9c4f1'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e1f4b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('destinataire', sa.String(length=255), nullable=False),
+        sa.Column('sujet', sa.String(length=255), nullable=False),
+        sa.Column('contenu_html', sa.Text(), nullable=False),
+        sa.Column('statut', sa.Enum('en_attente', 'en_cours', 'envoye', 'echec', name='statutemail'), nullable=False),
+        sa.Column('tentatives', sa.Integer(), nullable=False),
+        sa.Column('prochaine_tentative', sa.DateTime(), nullable=False),
+        sa.Column('verrouille_jusqua', sa.DateTime(), nullable=True),
+        sa.Column('derniere_erreur', sa.Text(), nullable=True),
+        sa.Column('date_creation', sa.DateTime(), nullable=False),
+        sa.Column('date_envoi', sa.DateTime(), nullable=True),
+        sa.Column('notification_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_email_outbox_id'), 'email_outbox', ['id'], unique=False)
+    op.create_index(op.f('ix_email_outbox_notification_id'), 'email_outbox', ['notification_id'], unique=False)
+    op.create_index('idx_email_outbox_statut_tentative', 'email_outbox', ['statut', 'prochaine_tentative'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_email_outbox_statut_tentative', table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_notification_id'), table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_id'), table_name='email_outbox')
+    op.drop_table('email_outbox')
+    if op.get_bind().dialect.name == 'postgresql':
+        sa.Enum(name='statutemail').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""add intervention keyset index
+
+Revision ID: c5f1d8e3a2b6
+Revises: b7d2e5a9c4f1
+Create Date: 2026-10-17 23:40:12.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1d8e3a2b6'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e5a9c4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Pagination par curseur des listes d'interventions (ORDER BY date_creation, id)
+    op.create_index('idx_intervention_creation_id', 'interventions', ['date_creation', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_intervention_creation_id', table_name='interventions')
@@ -0,0 +1,35 @@
+"""add document upload metadata
+
+Revision ID: d8e2a7f4c913
+Revises: c5f1d8e3a2b6
+Create Date: 2026-10-18 00:05:41.318272
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2a7f4c913'
+down_revision: Union[str, Sequence[str], None] = 'c5f1d8e3a2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Taille, type MIME et SHA-256 calculés pendant la copie de l'upload
+    op.add_column('documents', sa.Column('taille', sa.BigInteger(), nullable=True))
+    op.add_column('documents', sa.Column('type_mime', sa.String(length=127), nullable=True))
+    op.add_column('documents', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_documents_sha256'), 'documents', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_documents_sha256'), table_name='documents')
+    op.drop_column('documents', 'sha256')
+    op.drop_column('documents', 'type_mime')
+    op.drop_column('documents', 'taille')
@@ -0,0 +1,128 @@
+# app/db/replica_routing.py
+"""
+Lecture de ses propres écritures avec un réplica en lecture.
+
+Après une écriture validée par un client (requête non-GET dont la session a
+commité un INSERT/UPDATE/DELETE), ses requêtes GET restent sur le primaire
+pendant DB_REPLICA_STICKY_SECONDS : le temps que le réplica rattrape son
+retard, le client relit ce qu'il vient d'écrire.
+
+Le client est identifié par son jeton (empreinte de l'en-tête Authorization),
+à défaut par son adresse IP. Marquage en mémoire (par process) par défaut,
+partagé via Redis si CACHE_BACKEND=redis.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def client_key(request: Any) -> Optional[str]:
+    """Clé de stickiness d'une requête : empreinte du jeton, sinon IP du client."""
+    if request is None:
+        return None
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return "tok:" + hashlib.sha256(authorization.encode()).hexdigest()[:32]
+    if request.client is not None:
+        return f"ip:{request.client.host}"
+    return None
+
+
+class MemoryStickiness:
+    """Échéances « primaire jusqu'à » par client (en mémoire, clés en LRU)."""
+
+    def __init__(self, window_seconds: float, max_keys: int = 100_000):
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str, now: Optional[float] = None) -> None:
+        now = now or time.time()
+        with self._lock:
+            self._until[key] = now + self.window
+            self._until.move_to_end(key)
+            while len(self._until) > self.max_keys:
+                self._until.popitem(last=False)
+
+    def is_sticky(self, key: str, now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return False
+            if until <= now:
+                del self._until[key]
+                return False
+            return True
+
+
+class RedisStickiness:
+    """Échéances partagées entre workers (clé Redis expirante par client)."""
+
+    def __init__(self, url: str, window_seconds: float, prefix: str = "erp:db-primary:"):
+        import redis  # Dépendance optionnelle, importée uniquement si activée
+
+        self.window = window_seconds
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def mark(self, key: str, now: Optional[float] = None) -> None:
+        self._client.set(self.prefix + key, 1, px=max(int(self.window * 1000), 1))
+
+    def is_sticky(self, key: str, now: Optional[float] = None) -> bool:
+        return bool(self._client.exists(self.prefix + key))
+
+
+class WriteStickiness:
+    """Façade tolérante aux pannes : en cas d'erreur du backend, lecture sur le primaire."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def mark(self, key: Optional[str]) -> None:
+        if not key:
+            return
+        try:
+            self.backend.mark(key)
+        except Exception as exc:
+            logger.warning("Marquage lecture-sur-primaire impossible: %s", exc)
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        try:
+            return self.backend.is_sticky(key)
+        except Exception as exc:
+            logger.warning("Stickiness indisponible, lecture sur le primaire: %s", exc)
+            return True
+
+
+_stickiness: Optional[WriteStickiness] = None
+_stickiness_lock = threading.Lock()
+
+
+def get_write_stickiness() -> WriteStickiness:
+    """Marqueur du process (singleton), partagé via Redis si configuré."""
+    global _stickiness
+    if _stickiness is None:
+        with _stickiness_lock:
+            if _stickiness is None:
+                backend = None
+                if settings.CACHE_BACKEND.lower() == "redis":
+                    try:
+                        backend = RedisStickiness(settings.REDIS_URL, settings.DB_REPLICA_STICKY_SECONDS)
+                    except ImportError:
+                        logger.warning("Module redis absent, stickiness lecture/écriture en mémoire")
+                if backend is None:
+                    backend = MemoryStickiness(settings.DB_REPLICA_STICKY_SECONDS)
+                _stickiness = WriteStickiness(backend)
+    return _stickiness
@@ -8,6 +8,13 @@ from app.core.logging import setup_logging, get_logger
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 import os
+from app.services.email_template_service import warm_up as warm_up_email_templates
+from app.db.async_database import dispose_async_engine
+from app.core.pagination import PAGINATION_HEADERS
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.metrics import PrometheusMiddleware, mark_process_dead
+from app.core.health_sampler import get_health_sampler
+from app.core.body_limit import BodySizeLimitMiddleware
 
 # Setup logging first
 setup_logging()
@@ -15,7 +22,7 @@ logger = get_logger(__name__)
 
 # Optional scheduler
 try:
-    from app.tasks.scheduler import scheduler, run_planning_generation
+    from app.tasks.scheduler import scheduler, register_jobs
 except Exception:
     scheduler = None
 
@@ -24,12 +31,15 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"🚀 {settings.PROJECT_NAME} démarré!")
     print(f"📚 Documentation disponible sur: http://localhost:8000/docs")
+    # Templates d'emails compilés une fois pour tout le processus
+    warm_up_email_templates()
+    # Santé échantillonnée en arrière-plan (les sondes lisent le dernier instantané)
+    get_health_sampler().start()
     # Start scheduler if enabled
     if getattr(settings, "ENABLE_SCHEDULER", False) and scheduler:
         try:
-            # register the job if not already
-            if not any(job.id == "planning_job" for job in scheduler.get_jobs()):
-                scheduler.add_job(run_planning_generation, 'interval', hours=1, id="planning_job")
+            # Jobs exécutés par le seul worker leader (cf. app/tasks/leader.py)
+            register_jobs(scheduler)
             scheduler.start()
             print("⏱️ Scheduler started")
         except Exception as e:
@@ -44,6 +54,11 @@ async def lifespan(app: FastAPI):
                 print("⏹️ Scheduler stopped")
             except Exception:
                 pass
+        get_health_sampler().stop()
+        # Connexions de l'engine asynchrone (endpoints de lecture)
+        await dispose_async_engine()
+        # Jauges « live » du worker retirées de l'agrégation multi-process
+        mark_process_dead()
         print("👋 Arrêt de l'application...")
 
 
@@ -62,8 +77,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGINATION_HEADERS + ["Server-Timing"],
 )
 
+# Statistiques SQL par requête (Server-Timing, N+1, budgets de requêtes)
+app.add_middleware(QueryStatsMiddleware)
+# Corps multipart plafonné à UPLOAD_MAX_BYTES avant l'analyse du formulaire
+app.add_middleware(BodySizeLimitMiddleware)
+# Métriques Prometheus HTTP (latence, statuts, requêtes en cours par route)
+app.add_middleware(PrometheusMiddleware)
+
 # Static files: resolve and create upload/static folders robustly
 # We want /static to point to the parent of the uploads dir so that /static/uploads/* is served
 project_root = Path(__file__).resolve().parents[1]  # repo root
@@ -96,7 +119,9 @@ try:
 except Exception:
     pass
 
-app.mount("/static", StaticFiles(directory=str(static_root), check_dir=True), name="static")
+# Montage public optionnel : les fichiers y échappent au contrôle d'accès des documents
+if settings.SERVE_UPLOADS_STATIC:
+    app.mount("/static", StaticFiles(directory=str(static_root), check_dir=True), name="static")
 
 # Import des routes v1
 try:
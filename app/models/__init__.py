@@ -56,6 +56,9 @@ from .intervention import (
     PrioriteIntervention
 )
 
+# Compteurs matérialisés (KPI tableau de bord)
+from .kpi_counter import InterventionKpiCounter
+
 # Modèles planification et organisation
 from .planning import Planning
 
@@ -64,6 +67,7 @@ from .document import Document
 
 # Modèles notification et communication
 from .notification import Notification
+from .email_outbox import EmailOutbox, StatutEmail
 
 # Modèles audit et traçabilité
 from .historique import HistoriqueIntervention
@@ -105,6 +109,7 @@ __all__ = [
     
     # Interventions - métier principal
     "Intervention", "InterventionType", "StatutIntervention", "PrioriteIntervention",
+    "InterventionKpiCounter",
     
     # Organisation et planification
     "Planning",
@@ -113,7 +118,7 @@ __all__ = [
     "Document",
     
     # Communication
-    "Notification", 
+    "Notification", "EmailOutbox", "StatutEmail",
     
     # Audit et traçabilité
     "HistoriqueIntervention",
@@ -303,27 +303,27 @@ class Client(Base):
         from app.models.contrat import StatutContrat
         return self.contrats.filter_by(statut=StatutContrat.actif).first()
 
+    def _stats(self):
+        """Statistiques calculées en lot (app.services.client_analytics_service), en requêtes groupées."""
+        from sqlalchemy.orm import object_session
+        from app.services.client_analytics_service import get_client_stats  # Import local: évite les cycles
+
+        session = object_session(self)
+        if session is None or self.id is None:
+            return None
+        return get_client_stats(session, self.id)
+
     @property
     def taux_satisfaction_moyen(self) -> Optional[float]:
         """Taux de satisfaction moyen basé sur les interventions."""
-        interventions_avec_note = self.interventions.filter(
-            Intervention.satisfaction_client.isnot(None)
-        ).all()
-        
-        if not interventions_avec_note:
-            return None
-            
-        total = sum(i.satisfaction_client for i in interventions_avec_note)
-        return round(total / len(interventions_avec_note), 2)
+        stats = self._stats()
+        return stats.note_satisfaction if stats else None
 
     @property
     def cout_maintenance_total(self) -> float:
         """Coût total de maintenance facturé (basé sur interventions)."""
-        total_centimes = 0
-        for intervention in self.interventions:
-            if intervention.cout_reel:
-                total_centimes += intervention.cout_reel
-        return round(total_centimes / 100, 2)
+        stats = self._stats()
+        return stats.cout_total_interventions if stats else 0.0
 
     @property
     def cout_maintenance_annuel(self) -> float:
@@ -342,18 +342,8 @@ class Client(Base):
     @property
     def delai_moyen_intervention(self) -> Optional[float]:
         """Délai moyen de traitement des interventions (en heures)."""
-        interventions_terminees = self.interventions.filter(
-            Intervention.date_cloture.isnot(None)
-        ).all()
-        
-        if not interventions_terminees:
-            return None
-            
-        delais = [
-            (i.date_cloture - i.date_creation).total_seconds() / 3600
-            for i in interventions_terminees
-        ]
-        return round(sum(delais) / len(delais), 1)
+        stats = self._stats()
+        return stats.duree_moyenne_intervention if stats else None
 
     @property
     def niveau_priorite_commerciale(self) -> int:
@@ -454,21 +444,8 @@ class Client(Base):
 
     def calculer_sla_global(self) -> Optional[float]:
         """Calcule le respect global des SLA sur les 6 derniers mois."""
-        six_mois_ago = datetime.utcnow() - timedelta(days=180)
-        interventions_recentes = self.interventions.filter(
-            Intervention.date_creation >= six_mois_ago,
-            Intervention.date_cloture.isnot(None)
-        ).all()
-        
-        if not interventions_recentes:
-            return None
-            
-        sla_respectes = sum(
-            1 for i in interventions_recentes 
-            if i.calculer_sla_respect() is True
-        )
-        
-        return round(sla_respectes / len(interventions_recentes) * 100, 1)
+        stats = self._stats()
+        return stats.taux_respect_sla if stats else None
 
     def generer_rapport_activite(self, nb_mois: int = 12) -> Dict[str, Any]:
         """
@@ -480,24 +457,13 @@ class Client(Base):
         Returns:
             Dict avec les KPI d'activité
         """
-        date_debut = datetime.utcnow() - timedelta(days=nb_mois * 30)
-        
-        interventions_periode = self.interventions.filter(
-            Intervention.date_creation >= date_debut
-        ).all()
-        
-        return {
-            "periode_mois": nb_mois,
-            "nb_interventions": len(interventions_periode),
-            "nb_preventives": sum(1 for i in interventions_periode if i.est_preventive),
-            "nb_correctives": sum(1 for i in interventions_periode if i.est_corrective),
-            "cout_total": sum(i.cout_total_reel for i in interventions_periode if i.cout_total_reel),
-            "delai_moyen_heures": self.delai_moyen_intervention,
-            "taux_satisfaction": self.taux_satisfaction_moyen,
-            "sla_respect": self.calculer_sla_global(),
-            "equipements_total": self.nb_equipements_total,
-            "equipements_operationnels": self.nb_equipements_operationnels,
-        }
+        from sqlalchemy.orm import object_session
+        from app.services.client_analytics_service import compute_rapports_activite
+
+        session = object_session(self)
+        if session is None or self.id is None:
+            return {}
+        return compute_rapports_activite(session, [self.id], nb_mois).get(self.id, {})
 
     def to_dict(self, include_sensitive: bool = False, include_relations: bool = False) -> Dict[str, Any]:
         """
@@ -545,6 +511,8 @@ class Client(Base):
         
         # Données sensibles (commerciales, financières)
         if include_sensitive:
+            # Statistiques calculées en une passe groupée
+            stats = self._stats()
             data.update({
                 "date_modification": self.date_modification.isoformat() if self.date_modification else None,
                 "numero_siret": self.numero_siret,
@@ -569,11 +537,11 @@ class Client(Base):
                 "nb_contrats_actifs": self.nb_contrats_actifs,
                 "nb_interventions_mois_courant": self.nb_interventions_mois_courant,
                 "nb_equipements_operationnels": self.nb_equipements_operationnels,
-                "taux_satisfaction_moyen": self.taux_satisfaction_moyen,
-                "cout_maintenance_total": self.cout_maintenance_total,
+                "taux_satisfaction_moyen": stats.note_satisfaction if stats else None,
+                "cout_maintenance_total": stats.cout_total_interventions if stats else 0.0,
                 "cout_maintenance_annuel": self.cout_maintenance_annuel,
-                "delai_moyen_intervention": self.delai_moyen_intervention,
-                "sla_global": self.calculer_sla_global(),
+                "delai_moyen_intervention": stats.duree_moyenne_intervention if stats else None,
+                "sla_global": stats.taux_respect_sla if stats else None,
                 "date_premier_contrat": self.date_premier_contrat.isoformat() if self.date_premier_contrat else None,
                 "date_derniere_intervention": self.date_derniere_intervention.isoformat() if self.date_derniere_intervention else None,
             })
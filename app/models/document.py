@@ -5,7 +5,7 @@ Relations : N:1 avec Intervention.
 Exemple : utilisé pour stocker et référencer les documents opérationnels dans le SI.
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -33,6 +33,10 @@ class Document(Base):
     nom_fichier: str = Column(String(255), nullable=False, index=True, doc="Nom du fichier (ex: rapport.pdf)")
     chemin: str = Column(String(255), nullable=False, doc="Chemin relatif (ex: static/uploads/<uuid>.<ext>)")
     date_upload: datetime = Column(DateTime, default=datetime.utcnow, nullable=False, index=True, doc="Date d'upload")
+    # Métadonnées calculées pendant la copie de l'upload (NULL pour les documents antérieurs)
+    taille: Optional[int] = Column(BigInteger, nullable=True, doc="Taille en octets")
+    type_mime: Optional[str] = Column(String(127), nullable=True, doc="Type MIME (ex: application/pdf)")
+    sha256: Optional[str] = Column(String(64), nullable=True, index=True, doc="Empreinte SHA-256 du contenu")
 
     # Clé étrangère vers une intervention
     intervention_id: int = Column(Integer, ForeignKey("interventions.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -55,6 +59,9 @@ class Document(Base):
             "nom_fichier": self.nom_fichier,
             "chemin": self.chemin if include_sensitive else None,
             "date_upload": self.date_upload.isoformat() if self.date_upload else None,
+            "taille": self.taille,
+            "type_mime": self.type_mime,
+            "sha256": self.sha256,
             "url": self.url,
             "intervention_id": self.intervention_id,
         }
@@ -62,4 +69,4 @@ class Document(Base):
             data["intervention"] = self.intervention.to_dict() if self.intervention else None
         return data
 
-    # NOTE: Préparé pour extension future (audit, versioning, typage MIME, etc.)
+    # NOTE: Préparé pour extension future (audit, versioning, etc.)
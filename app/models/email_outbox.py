@@ -0,0 +1,73 @@
+# app/models/email_outbox.py
+"""
+Modèle EmailOutbox - File d'envoi des emails sortants (transactional outbox).
+
+Les emails sont enregistrés dans la même transaction que l'écriture métier
+(ex: création d'une notification), puis envoyés en arrière-plan par
+app/services/email_outbox_service.py avec une connexion SMTP réutilisée.
+Un message non envoyé est retenté avec un délai exponentiel, puis marqué
+en échec après EMAIL_OUTBOX_MAX_ATTEMPTS tentatives.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+import enum
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+
+from app.db.database import Base
+
+
+class StatutEmail(str, enum.Enum):
+    """
+    Cycle de vie d'un email sortant.
+
+    - en_attente : à envoyer (ou à retenter) à partir de prochaine_tentative
+    - en_cours : réservé par un worker jusqu'à verrouille_jusqua
+    - envoye : accepté par le serveur SMTP
+    - echec : abandonné après le nombre maximal de tentatives
+    """
+    en_attente = "en_attente"
+    en_cours = "en_cours"
+    envoye = "envoye"
+    echec = "echec"
+
+
+class EmailOutbox(Base):
+    """Email sortant en attente d'envoi."""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index('idx_email_outbox_statut_tentative', 'statut', 'prochaine_tentative'),
+    )
+
+    id: int = Column(Integer, primary_key=True, index=True)
+    destinataire: str = Column(String(255), nullable=False)
+    sujet: str = Column(String(255), nullable=False)
+    contenu_html: str = Column(Text, nullable=False)
+    statut: StatutEmail = Column(Enum(StatutEmail), default=StatutEmail.en_attente, nullable=False)
+    tentatives: int = Column(Integer, default=0, nullable=False)
+    prochaine_tentative: datetime = Column(DateTime, default=datetime.utcnow, nullable=False)
+    verrouille_jusqua: Optional[datetime] = Column(DateTime, nullable=True, doc="Fin de réservation par un worker")
+    derniere_erreur: Optional[str] = Column(Text, nullable=True)
+    date_creation: datetime = Column(DateTime, default=datetime.utcnow, nullable=False)
+    date_envoi: Optional[datetime] = Column(DateTime, nullable=True)
+
+    notification_id: Optional[int] = Column(Integer, ForeignKey("notifications.id", ondelete="SET NULL"),
+                                            nullable=True, index=True)
+
+    def __repr__(self) -> str:
+        return f"<EmailOutbox(id={self.id}, destinataire='{self.destinataire}', statut='{self.statut.value}')>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "destinataire": self.destinataire,
+            "sujet": self.sujet,
+            "statut": self.statut.value,
+            "tentatives": self.tentatives,
+            "prochaine_tentative": self.prochaine_tentative.isoformat() if self.prochaine_tentative else None,
+            "derniere_erreur": self.derniere_erreur,
+            "date_creation": self.date_creation.isoformat() if self.date_creation else None,
+            "date_envoi": self.date_envoi.isoformat() if self.date_envoi else None,
+            "notification_id": self.notification_id,
+        }
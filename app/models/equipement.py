@@ -282,25 +282,32 @@ class Equipement(Base):
             return None
         return round(self.age_en_jours / 365.25, 1)
 
+    def _sante(self):
+        """Santé calculée en lot (app.services.equipement_health_service), en une requête."""
+        from sqlalchemy.orm import object_session
+        from app.services.equipement_health_service import get_equipement_health  # Import local: évite les cycles
+
+        session = object_session(self)
+        if session is None or self.id is None:
+            return None
+        return get_equipement_health(session, self.id)
+
+    def _prochaine_maintenance(self, sante) -> Optional[datetime]:
+        """Prochaine maintenance d'après une santé déjà calculée (None: objet non persisté)."""
+        if not self.frequence_entretien_jours:
+            return None
+        if sante is not None:
+            return sante.prochaine_maintenance
+        # Objet non persisté: aucune intervention préventive en base
+        base_date = self.date_mise_en_service or self.created_at
+        return base_date + timedelta(days=self.frequence_entretien_jours) if base_date else None
+
     @property
     def prochaine_maintenance_calculee(self) -> Optional[datetime]:
         """Calcule la date de prochaine maintenance préventive."""
         if not self.frequence_entretien_jours:
             return None
-            
-        # Récupère la dernière intervention préventive
-        derniere_preventive = self.interventions.filter_by(
-            type_intervention="preventive"
-        ).first()
-        
-        if derniere_preventive and derniere_preventive.date_cloture:
-            base_date = derniere_preventive.date_cloture
-        elif self.date_mise_en_service:
-            base_date = self.date_mise_en_service
-        else:
-            base_date = self.created_at
-            
-        return base_date + timedelta(days=self.frequence_entretien_jours)
+        return self._prochaine_maintenance(self._sante())
 
     @property
     def maintenance_en_retard(self) -> bool:
@@ -328,18 +335,14 @@ class Equipement(Base):
     @property
     def taux_pannes_annuel(self) -> Optional[float]:
         """Calcule le taux de pannes par an (interventions correctives/âge)."""
-        if not self.age_en_annees or self.age_en_annees == 0:
-            return None
-        return round(self.nb_interventions_correctives / self.age_en_annees, 2)
+        sante = self._sante()
+        return sante.taux_pannes_annuel if sante else None
 
     @property
     def cout_maintenance_total(self) -> float:
         """Calcule le coût total des maintenances réalisées."""
-        total = 0.0
-        for intervention in self.interventions:
-            if intervention.cout_reel:
-                total += float(intervention.cout_reel) / 100  # Conversion centimes -> euros
-        return round(total, 2)
+        sante = self._sante()
+        return round(sante.cout_total_maintenance or 0.0, 2) if sante else 0.0
 
     @property
     def derniere_intervention(self) -> Optional["Intervention"]:
@@ -473,6 +476,10 @@ class Equipement(Base):
             
         NOTE: Interface standardisée pour tous les modèles ERP
         """
+        # Santé calculée une seule fois pour tous les indicateurs de maintenance
+        sante = self._sante() if include_sensitive or self.frequence_entretien_jours else None
+        prochaine = self._prochaine_maintenance(sante)
+
         # Données de base (toujours incluses)
         data = {
             "id": self.id,
@@ -497,7 +504,7 @@ class Equipement(Base):
             "est_sous_garantie": self.est_sous_garantie,
             "age_en_jours": self.age_en_jours,
             "age_en_annees": self.age_en_annees,
-            "maintenance_en_retard": self.maintenance_en_retard,
+            "maintenance_en_retard": bool(prochaine and datetime.utcnow() > prochaine),
             "nb_interventions_total": self.nb_interventions_total,
             "derniere_intervention_date": self.derniere_intervention_date.isoformat() if self.derniere_intervention_date else None,
         }
@@ -517,11 +524,11 @@ class Equipement(Base):
                 "duree_garantie_mois": self.duree_garantie_mois,
                 
                 # KPI de maintenance
-                "prochaine_maintenance_calculee": self.prochaine_maintenance_calculee.isoformat() if self.prochaine_maintenance_calculee else None,
+                "prochaine_maintenance_calculee": prochaine.isoformat() if prochaine else None,
                 "nb_interventions_correctives": self.nb_interventions_correctives,
                 "nb_interventions_preventives": self.nb_interventions_preventives,
-                "taux_pannes_annuel": self.taux_pannes_annuel,
-                "cout_maintenance_total": self.cout_maintenance_total,
+                "taux_pannes_annuel": sante.taux_pannes_annuel if sante else None,
+                "cout_maintenance_total": round(sante.cout_total_maintenance or 0.0, 2) if sante else 0.0,
                 "niveau_criticite_numerique": self.niveau_criticite_numerique,
             })
         
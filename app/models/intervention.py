@@ -20,7 +20,7 @@ Architecture:
 """
 
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Enum, Text, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from datetime import datetime, timedelta
 from app.db.database import Base
 import enum
@@ -95,6 +95,16 @@ class PrioriteIntervention(str, enum.Enum):
     programmee = "programmee"
 
 
+# SLA de résolution par priorité (heures entre création et clôture, None = pas de SLA)
+SLA_HEURES_PAR_PRIORITE = {
+    PrioriteIntervention.urgente: 2,
+    PrioriteIntervention.haute: 24,
+    PrioriteIntervention.normale: 72,
+    PrioriteIntervention.basse: 168,  # 1 semaine
+    PrioriteIntervention.programmee: None,
+}
+
+
 class Intervention(Base):
     """
     Modèle Intervention - Gestion complète des interventions de maintenance.
@@ -134,6 +144,8 @@ class Intervention(Base):
     Index('idx_intervention_equipement_type', 'equipement_id', 'type'),
         Index('idx_intervention_client_statut', 'client_id', 'statut'),
         Index('idx_intervention_dates', 'date_creation', 'date_limite'),
+        # Pagination par curseur des listes: ORDER BY date_creation, id
+        Index('idx_intervention_creation_id', 'date_creation', 'id'),
     Index('idx_intervention_type_urgence', 'type', 'urgence'),
     )
 
@@ -145,9 +157,16 @@ class Intervention(Base):
     description = Column(Text, nullable=True)
     type_intervention = Column("type", Enum(InterventionType), nullable=False, index=True)
     
-    # Cycle de vie et priorités
-    statut = Column(Enum(StatutIntervention), default=StatutIntervention.ouverte, nullable=False, index=True)
-    priorite = Column(Enum(PrioriteIntervention), default=PrioriteIntervention.normale, nullable=False, index=True)
+    # Cycle de vie et priorités (active_history: l'ancienne valeur reste connue au flush,
+    # pour déplacer l'intervention entre buckets de intervention_kpi_counters)
+    statut = column_property(
+        Column(Enum(StatutIntervention), default=StatutIntervention.ouverte, nullable=False, index=True),
+        active_history=True,
+    )
+    priorite = column_property(
+        Column(Enum(PrioriteIntervention), default=PrioriteIntervention.normale, nullable=False, index=True),
+        active_history=True,
+    )
     urgence = Column(Boolean, default=False, nullable=False, index=True)
     
     # Dates critiques du workflow
@@ -761,17 +780,7 @@ class Intervention(Base):
             return None
             
         duree_reelle = (self.date_cloture - self.date_creation).total_seconds() / 3600  # en heures
-        
-        # Définition des SLA par priorité (en heures)
-        sla_heures = {
-            PrioriteIntervention.urgente: 2,
-            PrioriteIntervention.haute: 24,
-            PrioriteIntervention.normale: 72,
-            PrioriteIntervention.basse: 168,  # 1 semaine
-            PrioriteIntervention.programmee: None  # Pas de SLA
-        }
-        
-        sla = sla_heures.get(self.priorite)
+        sla = SLA_HEURES_PAR_PRIORITE.get(self.priorite)
         return duree_reelle <= sla if sla is not None else None
 
     def get_prochaines_actions(self) -> List[str]:
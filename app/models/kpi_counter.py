@@ -0,0 +1,98 @@
+# app/models/kpi_counter.py
+"""
+Modèle InterventionKpiCounter - Compteurs matérialisés des interventions.
+
+Un bucket par (statut, priorité, mois de création) avec le nombre
+d'interventions correspondant. Les compteurs sont maintenus dans la même
+transaction que les écritures d'interventions, ce qui permet au tableau de
+bord de lire O(nombre de buckets) au lieu de recompter O(lignes).
+
+Toute création, suppression ou changement de statut/priorité d'une
+Intervention passant par l'ORM est reporté au flush (`before_flush`), quel
+que soit l'appelant (services, méthodes de transition du modèle). Seules les
+écritures SQL directes (INSERT en masse du générateur de plannings, qui
+incrémente lui-même son bucket) échappent à ce suivi.
+
+En cas de dérive (imports SQL, suppressions en cascade côté base), les
+compteurs sont recalculés par `scripts/rebuild_kpi_counters.py`.
+"""
+
+from datetime import date
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import Column, Date, Enum, Integer, event, inspect
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from .intervention import Intervention, PrioriteIntervention, StatutIntervention
+
+
+class InterventionKpiCounter(Base):
+    """
+    Bucket de compteur d'interventions.
+    - Clé: statut courant, priorité, premier jour du mois de création
+    - total: nombre d'interventions dans le bucket (jamais négatif en régime normal)
+    """
+    __tablename__ = "intervention_kpi_counters"
+
+    statut: StatutIntervention = Column(Enum(StatutIntervention), primary_key=True)
+    priorite: PrioriteIntervention = Column(Enum(PrioriteIntervention), primary_key=True)
+    mois: date = Column(Date, primary_key=True, doc="Premier jour du mois de création")
+    total: int = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<InterventionKpiCounter(statut='{self.statut.value}', priorite='{self.priorite.value}', "
+            f"mois={self.mois.isoformat()}, total={self.total})>"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statut": self.statut.value,
+            "priorite": self.priorite.value,
+            "mois": self.mois.isoformat(),
+            "total": self.total,
+        }
+
+
+def _committed(intervention: Intervention, attribut: str):
+    """Valeur de l'attribut telle qu'en base (avant les modifications non flushées)."""
+    history = getattr(inspect(intervention).attrs, attribut).history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(intervention, attribut)
+
+
+def _bucket(intervention: Intervention, statut, priorite) -> Tuple[StatutIntervention, PrioriteIntervention, date]:
+    from app.services.kpi_counter_service import _as_priorite, _as_statut, month_of
+
+    return (_as_statut(statut or StatutIntervention.ouverte), _as_priorite(priorite),
+            month_of(intervention.date_creation))
+
+
+@event.listens_for(Session, "before_flush")
+def _track_intervention_counters(session: Session, flush_context, instances) -> None:
+    """Reporte dans les compteurs les créations, transitions et suppressions d'interventions du flush."""
+    from app.services.kpi_counter_service import bump_counter
+
+    deltas: Dict[Tuple[StatutIntervention, PrioriteIntervention, date], int] = {}
+
+    def add(key, delta):
+        deltas[key] = deltas.get(key, 0) + delta
+
+    for obj in session.new:
+        if isinstance(obj, Intervention):
+            add(_bucket(obj, obj.statut, obj.priorite), +1)
+    for obj in session.dirty:
+        if isinstance(obj, Intervention) and session.is_modified(obj):
+            ancien = _bucket(obj, _committed(obj, "statut"), _committed(obj, "priorite"))
+            nouveau = _bucket(obj, obj.statut, obj.priorite)
+            if ancien != nouveau:
+                add(ancien, -1)
+                add(nouveau, +1)
+    for obj in session.deleted:
+        if isinstance(obj, Intervention):
+            add(_bucket(obj, _committed(obj, "statut"), _committed(obj, "priorite")), -1)
+
+    for (statut, priorite, mois), delta in deltas.items():
+        bump_counter(session, statut, priorite, mois, delta)
@@ -25,6 +25,16 @@ class FrequencePlanning(str, enum.Enum):
     semestriel = "semestriel"
     annuel = "annuel"
 
+# Intervalle entre deux maintenances selon la fréquence
+INTERVALLES_FREQUENCE = {
+    FrequencePlanning.journalier: timedelta(days=1),
+    FrequencePlanning.hebdomadaire: timedelta(weeks=1),
+    FrequencePlanning.mensuel: timedelta(days=30),
+    FrequencePlanning.trimestriel: timedelta(days=90),
+    FrequencePlanning.semestriel: timedelta(days=182),
+    FrequencePlanning.annuel: timedelta(days=365),
+}
+
 class StatutPlanning(str, enum.Enum):
     """Statut du planning de maintenance."""
     actif = "actif"
@@ -104,20 +114,8 @@ class Planning(Base):
         """Calcule la prochaine date planifiée selon la fréquence."""
         if not self.derniere_date:
             return None
-        freq = self.frequence
-        if freq == FrequencePlanning.journalier:
-            return self.derniere_date + timedelta(days=1)
-        elif freq == FrequencePlanning.hebdomadaire:
-            return self.derniere_date + timedelta(weeks=1)
-        elif freq == FrequencePlanning.mensuel:
-            return self.derniere_date + timedelta(days=30)
-        elif freq == FrequencePlanning.trimestriel:
-            return self.derniere_date + timedelta(days=90)
-        elif freq == FrequencePlanning.semestriel:
-            return self.derniere_date + timedelta(days=182)
-        elif freq == FrequencePlanning.annuel:
-            return self.derniere_date + timedelta(days=365)
-        return None
+        intervalle = INTERVALLES_FREQUENCE.get(self.frequence)
+        return self.derniere_date + intervalle if intervalle else None
 
     def mettre_a_jour_prochaine_date(self) -> None:
         """Met à jour la prochaine date planifiée automatiquement."""
@@ -367,53 +367,33 @@ class Technicien(Base):
         """Intervention actuellement en cours d'exécution."""
         return self.interventions.filter_by(statut=StatutIntervention.en_cours).first()
 
+    def _kpis(self):
+        """KPI calculés en lot (app.services.technicien_kpi_service), en requêtes groupées."""
+        from sqlalchemy.orm import object_session
+        from app.services.technicien_kpi_service import get_technicien_kpis  # Import local: évite les cycles
+
+        session = object_session(self)
+        if session is None or self.id is None:
+            return None
+        return get_technicien_kpis(session, self.id)
+
     @property
     def taux_reussite(self) -> Optional[float]:
-        """Taux de réussite basé sur les interventions clôturées."""
-        terminees = self.nb_interventions_terminees
-        if terminees == 0:
-            return None
-        
-        # Considère comme réussie une intervention clôturée sans réouverture rapide
-        reussites = 0
-        for intervention in self.interventions.filter_by(statut=StatutIntervention.cloturee).all():
-            # Vérifier s'il n'y a pas eu de réouverture dans les 7 jours
-            if intervention.date_cloture:
-                interventions_suivantes = self.interventions.filter(
-                    Intervention.equipement_id == intervention.equipement_id,
-                    Intervention.date_creation > intervention.date_cloture,
-                    Intervention.date_creation <= intervention.date_cloture + timedelta(days=7)
-                ).count()
-                if interventions_suivantes == 0:
-                    reussites += 1
-                    
-        return round(reussites / terminees * 100, 1)
+        """Taux de réussite: % de clôtures sans réouverture sur le même équipement sous 7 jours."""
+        kpis = self._kpis()
+        return kpis.taux_reussite if kpis else None
 
     @property
     def temps_moyen_intervention(self) -> Optional[float]:
         """Temps moyen d'intervention en heures."""
-        interventions_avec_duree = self.interventions.filter(
-            Intervention.duree_reelle.isnot(None)
-        ).all()
-        
-        if not interventions_avec_duree:
-            return None
-            
-        total_minutes = sum(i.duree_reelle for i in interventions_avec_duree)
-        return round(total_minutes / len(interventions_avec_duree) / 60, 1)
+        kpis = self._kpis()
+        return kpis.temps_moyen_intervention if kpis else None
 
     @property
     def satisfaction_moyenne(self) -> Optional[float]:
         """Note de satisfaction moyenne des clients."""
-        interventions_notees = self.interventions.filter(
-            Intervention.satisfaction_client.isnot(None)
-        ).all()
-        
-        if not interventions_notees:
-            return None
-            
-        total = sum(i.satisfaction_client for i in interventions_notees)
-        return round(total / len(interventions_notees), 2)
+        kpis = self._kpis()
+        return kpis.satisfaction_moyenne if kpis else None
 
     @property
     def competences_par_domaine(self) -> Dict[str, List[str]]:
@@ -460,35 +440,13 @@ class Technicien(Base):
     @property
     def score_affectation(self) -> int:
         """Score d'affectation pour algorithme automatique (0-100)."""
-        score = 50  # Base
-        
-        # Bonus disponibilité
-        if self.est_disponible:
-            score += 30
-        elif self.nb_interventions_actives <= 1:
-            score += 15
-        else:
-            score -= 20
-            
-        # Bonus compétences
-        score += min(self.nb_competences * 5, 20)
-        
-        # Bonus niveau
-        niveau_bonus = {
-            NiveauCompetence.expert: 15,
-            NiveauCompetence.avance: 10,
-            NiveauCompetence.intermediaire: 5,
-            NiveauCompetence.debutant: 0
-        }
-        score += niveau_bonus.get(self.niveau_technicien, 0)
-        
-        # Bonus satisfaction
-        if self.satisfaction_moyenne and self.satisfaction_moyenne >= 4.5:
-            score += 10
-        elif self.satisfaction_moyenne and self.satisfaction_moyenne <= 3.0:
-            score -= 10
-            
-        return max(0, min(100, score))
+        from app.services.technicien_kpi_service import score_affectation
+
+        kpis = self._kpis()
+        if kpis is not None:
+            return kpis.score_affectation
+        # Objet non persisté: pas d'interventions ni de compétences en base
+        return score_affectation(self.est_disponible, 0, 0, self.niveau_technicien, None)
 
     # 🔧 Méthodes métier pour gestion technicien
 
@@ -636,15 +594,17 @@ class Technicien(Base):
         interventions_periode = self.interventions.filter(
             Intervention.date_creation >= date_debut
         ).all()
+        # KPI globaux calculés en une passe groupée
+        kpis = self._kpis()
         
         return {
             "periode_mois": nb_mois,
             "nb_interventions": len(interventions_periode),
             "nb_terminees": len([i for i in interventions_periode if i.est_terminee]),
             "taux_completion": round(len([i for i in interventions_periode if i.est_terminee]) / len(interventions_periode) * 100, 1) if interventions_periode else 0,
-            "taux_reussite": self.taux_reussite,
-            "satisfaction_moyenne": self.satisfaction_moyenne,
-            "temps_moyen_intervention": self.temps_moyen_intervention,
+            "taux_reussite": kpis.taux_reussite if kpis else None,
+            "satisfaction_moyenne": kpis.satisfaction_moyenne if kpis else None,
+            "temps_moyen_intervention": kpis.temps_moyen_intervention if kpis else None,
             "nb_urgentes_traitees": len([i for i in interventions_periode if i.est_urgente]),
             "charge_moyenne": round(len(interventions_periode) / nb_mois, 1),
         }
@@ -692,6 +652,7 @@ class Technicien(Base):
         
         # Données sensibles (RH, performances)
         if include_sensitive:
+            kpis = self._kpis()
             data.update({
                 "user_id": self.user_id,
                 "email": self.email,
@@ -709,9 +670,9 @@ class Technicien(Base):
                 "derniere_connexion": self.derniere_connexion.isoformat() if self.derniere_connexion else None,
                 
                 # KPI de performance
-                "taux_reussite": self.taux_reussite,
-                "temps_moyen_intervention": self.temps_moyen_intervention,
-                "satisfaction_moyenne": self.satisfaction_moyenne,
+                "taux_reussite": kpis.taux_reussite if kpis else None,
+                "temps_moyen_intervention": kpis.temps_moyen_intervention if kpis else None,
+                "satisfaction_moyenne": kpis.satisfaction_moyenne if kpis else None,
                 "nb_interventions_mois_courant": self.nb_interventions_mois_courant,
                 "nb_interventions_terminees": self.nb_interventions_terminees,
                 "nb_interventions_en_cours": self.nb_interventions_en_cours,
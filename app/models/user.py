@@ -18,7 +18,7 @@ Architecture:
 """
 
 from sqlalchemy import Column, Integer, String, Enum, Boolean, DateTime, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, object_session
 from datetime import datetime, timedelta
 from app.db.database import Base
 import enum
@@ -318,31 +318,23 @@ class User(Base):
     def peut_acceder_intervention(self, intervention_id: int) -> bool:
         """
         Vérifie si l'utilisateur peut accéder à une intervention spécifique.
-        
+
+        Délègue à la politique d'accès SQL (app/core/access_policy.py) :
+        une requête EXISTS indexée, sans charger les interventions.
+
         Args:
             intervention_id: ID de l'intervention à vérifier
-            
+
         Returns:
             bool: True si accès autorisé
         """
         if self.is_admin or self.is_responsable:
             return True
-            
-        if self.is_technicien and self.technicien:
-            # Technicien ne peut voir que ses interventions
-            return any(
-                interv.id == intervention_id 
-                for interv in self.technicien.interventions
-            )
-            
-        if self.is_client and self.client:
-            # Client ne peut voir que ses interventions
-            return any(
-                interv.id == intervention_id 
-                for interv in self.client.interventions
-            )
-            
-        return False
+        session = object_session(self)
+        if session is None:
+            return False
+        from app.core.access_policy import can_access_intervention  # Import local pour éviter les cycles
+        return can_access_intervention(session, self, intervention_id)
 
     def to_dict(self, include_sensitive: bool = False, include_relations: bool = False) -> Dict[str, Any]:
         """
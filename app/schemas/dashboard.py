@@ -24,6 +24,13 @@ class StatutSante(str, Enum):
     hors_service = "hors_service"
 
 
+class TriSante(str, Enum):
+    """Critères de tri de la santé du parc"""
+    risque = "risque"  # score de fiabilité croissant (plus à risque en premier)
+    prochaine_maintenance = "prochaine_maintenance"
+    nom = "nom"
+
+
 class KPIBase(BaseModel):
     """
     Schéma de base pour les indicateurs clés de performance (KPI).
@@ -145,10 +152,13 @@ class EquipementHealth(BaseModel):
     nb_pannes_mois: int = Field(0, description="Nombre de pannes ce mois")
     nb_interventions_total: int = Field(0, description="Nombre total d'interventions")
     
+    taux_pannes_annuel: Optional[float] = Field(None, description="Interventions correctives par année de service")
+    
     # Maintenance
     derniere_maintenance: Optional[datetime] = Field(None, description="Date de dernière maintenance")
     prochaine_maintenance: Optional[datetime] = Field(None, description="Date de prochaine maintenance")
     jours_depuis_derniere_maintenance: Optional[int] = Field(None, description="Jours depuis dernière maintenance")
+    maintenance_en_retard: bool = Field(False, description="Maintenance préventive en retard")
     
     # État calculé
     statut_sante: StatutSante = Field(StatutSante.bon, description="État de santé calculé")
@@ -165,6 +175,19 @@ class EquipementHealth(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EquipementHealthPage(BaseModel):
+    """
+    Page de la santé du parc d'équipements.
+    """
+    items: List[EquipementHealth]
+    total: int
+    limit: int
+    offset: int
+    has_next: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TechnicienWorkload(BaseModel):
     """
     Schéma pour la charge de travail d'un technicien.
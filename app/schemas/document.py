@@ -10,10 +10,8 @@ class DocumentBase(BaseModel):
     """
     Champs communs pour tous les schémas de document :
     - Nom du fichier tel qu'enregistré
-    - Chemin relatif dans /static/uploads/
     """
     nom_fichier: str = Field(alias="filename")
-    chemin: str = Field(alias="path")  # Ex: "static/uploads/preuve_345.pdf"
 
 
 # ---------- CRÉATION ----------
@@ -22,7 +20,9 @@ class DocumentCreate(DocumentBase):
     """
     Schéma utilisé lors de l'upload d'un document :
     - Requiert l'identifiant de l'intervention à laquelle il est lié
+    - Chemin relatif du blob dans le stockage
     """
+    chemin: str = Field(alias="path")  # Ex: "static/uploads/preuve_345.pdf"
     intervention_id: int
 
 
@@ -32,10 +32,14 @@ class DocumentOut(DocumentBase):
     """
     Schéma renvoyé par l'API pour un document :
     - Contient les métadonnées complètes
+    - Pas de chemin de stockage : le fichier se télécharge via /documents/{id}/download
     """
     id: int
     date_upload: datetime
     intervention_id: int
+    taille: Optional[int] = None
+    type_mime: Optional[str] = None
+    sha256: Optional[str] = None
 
     model_config = ConfigDict(
         from_attributes=True,
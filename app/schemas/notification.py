@@ -45,3 +45,18 @@ class NotificationOut(NotificationBase):
         "from_attributes": True,
         "validate_by_name": True,
     }
+
+
+# ---------- FILE D'ENVOI EMAIL ----------
+
+class EmailOutboxDepth(BaseModel):
+    """
+    Profondeur de la file d'envoi des emails (supervision) :
+    - nombre de messages par statut
+    - âge du plus ancien message non envoyé
+    """
+    en_attente: int = 0
+    en_cours: int = 0
+    envoye: int = 0
+    echec: int = 0
+    age_plus_ancien_secondes: Optional[int] = None
@@ -40,11 +40,22 @@ class TechnicienCreate(TechnicienBase):
     user_id: int
     competences_ids: Optional[List[int]] = Field(default_factory=list)
 
+class TechnicienKPI(BaseModel):
+    """Indicateurs de performance d'un technicien (calculés en lot)."""
+    nb_interventions_actives: int = 0
+    nb_interventions_terminees: int = 0
+    nb_competences: int = 0
+    taux_reussite: Optional[float] = Field(None, description="% clôturées sans réouverture sous 7 jours")
+    temps_moyen_intervention: Optional[float] = Field(None, description="Durée réelle moyenne (heures)")
+    satisfaction_moyenne: Optional[float] = Field(None, description="Note client moyenne (1-5)")
+    score_affectation: int = Field(0, ge=0, le=100, description="Score pour l'affectation automatique")
+
 class TechnicienOut(TechnicienBase):
     """Données retournées pour un technicien (lecture/detail)."""
     id: int
     user: UserOut
     competences: List[CompetenceOut] = []
+    kpis: Optional[TechnicienKPI] = None
 
     model_config = {
         "from_attributes": True
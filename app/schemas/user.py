@@ -76,6 +76,12 @@ class UserUpdate(BaseModel):
     full_name: Optional[str] = None
     password: Optional[str] = None
 
+class UserRoleUpdate(BaseModel):
+    """
+    Changement de rôle d'un utilisateur (admin uniquement)
+    """
+    role: UserRole
+
 # =======================================
 # 🔐 Schémas pour l'authentification
 # =======================================
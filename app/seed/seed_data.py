@@ -10,6 +10,7 @@ from app.models.planning import Planning
 from app.models.notification import Notification, TypeNotification, CanalNotification
 from app.models.historique import HistoriqueIntervention
 from app.core.security import get_password_hash
+from app.services.kpi_counter_service import rebuild_kpi_counters
 from datetime import datetime, timedelta
 import random
 
@@ -182,4 +183,7 @@ def seed_all(db: Session):
     db.add(historique)
 
     db.commit()
+
+    # Interventions insérées directement: recalcul des compteurs KPI
+    rebuild_kpi_counters(db)
 # app/seed/seed_data.py
\ No newline at end of file
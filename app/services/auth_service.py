@@ -1,12 +1,23 @@
 # app/services/auth_service.py
 
+from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
 from app.schemas.user import TokenResponse
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password, create_access_token, get_password_hash, password_needs_rehash
+from app.core.password_hashing import run_password_task, run_password_task_async
+from app.core.login_throttle import get_login_throttle
+from app.core.logging import get_logger
 
-def authenticate_user(db: Session, email: str, password: str) -> TokenResponse:
+logger = get_logger(__name__)
+
+_EMAIL_INVALIDE = "Email ou mot de passe incorrect"
+_USERNAME_INVALIDE = "Identifiants invalides"
+
+
+def authenticate_user(db: Session, email: str, password: str, client_ip: Optional[str] = None) -> TokenResponse:
     """
     Authentifie un utilisateur avec email et mot de passe.
     Retourne un JWT Token si succès.
@@ -15,20 +26,80 @@ def authenticate_user(db: Session, email: str, password: str) -> TokenResponse:
         db (Session): Session SQLAlchemy.
         email (str): Email de l'utilisateur.
         password (str): Mot de passe brut.
+        client_ip (str, optional): Adresse du client (compteur d'échecs par IP).
 
     Returns:
         TokenResponse: Token JWT pour accès API.
 
     Raises:
         HTTPException: 401 si credentials invalides.
-        HTTPException: 403 si compte désactivé.
+        HTTPException: 403 si compte désactivé ou verrouillé.
+        HTTPException: 429 si trop d'échecs récents ou exécuteur bcrypt saturé.
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = _lookup(db, User.email == email, email, client_ip)
+    valid = user is not None and _verify(password, user.hashed_password)
+    new_hash = _rehash(password, user) if valid and user.is_active else None
+    return _conclude(db, user, valid, email, client_ip, _EMAIL_INVALIDE, new_hash)
+
+def authenticate_user_by_username(db: Session, username: str, password: str,
+                                  client_ip: Optional[str] = None) -> TokenResponse:
+    """
+    Authentifie via username + password (compatibilité tests legacy).
 
-    if not user or not verify_password(password, user.hashed_password):
+    Retourne un JWT identique à authenticate_user.
+    """
+    user = _lookup(db, User.username == username, username, client_ip)
+    valid = user is not None and _verify(password, user.hashed_password)
+    new_hash = _rehash(password, user) if valid and user.is_active else None
+    return _conclude(db, user, valid, username, client_ip, _USERNAME_INVALIDE, new_hash)
+
+
+async def authenticate_user_async(db: Session, email: str, password: str,
+                                  client_ip: Optional[str] = None) -> TokenResponse:
+    """
+    Variante async de authenticate_user pour les endpoints async : les accès
+    base passent par le threadpool, le calcul bcrypt est attendu sur
+    l'exécuteur dédié sans occuper de thread.
+    """
+    return await _authenticate_async(db, User.email == email, email, password, client_ip, _EMAIL_INVALIDE)
+
+
+async def authenticate_user_by_username_async(db: Session, username: str, password: str,
+                                              client_ip: Optional[str] = None) -> TokenResponse:
+    """Variante async de authenticate_user_by_username (voir authenticate_user_async)."""
+    return await _authenticate_async(db, User.username == username, username, password, client_ip,
+                                     _USERNAME_INVALIDE)
+
+
+async def _authenticate_async(db: Session, criterion, identifiant: str, password: str,
+                              client_ip: Optional[str], detail: str) -> TokenResponse:
+    user = await run_in_threadpool(_lookup, db, criterion, identifiant, client_ip)
+    valid = user is not None and await run_password_task_async(verify_password, password, user.hashed_password)
+    new_hash = None
+    if valid and user.is_active and password_needs_rehash(user.hashed_password):
+        try:
+            new_hash = await run_password_task_async(get_password_hash, password)
+        except HTTPException:
+            pass  # Exécuteur saturé: migration reportée à la prochaine connexion
+    return await run_in_threadpool(_conclude, db, user, valid, identifiant, client_ip, detail, new_hash)
+
+
+def _lookup(db: Session, criterion, identifiant: str, client_ip: Optional[str]) -> Optional[User]:
+    """Limitation des échecs, chargement du compte et refus d'un compte verrouillé."""
+    get_login_throttle().check(identifiant, client_ip)
+    user = db.query(User).filter(criterion).first()
+    _check_not_locked(user)
+    return user
+
+
+def _conclude(db: Session, user: Optional[User], valid: bool, identifiant: str,
+              client_ip: Optional[str], detail: str, new_hash: Optional[str]) -> TokenResponse:
+    """Enregistre l'issue de la vérification et émet le JWT si elle a réussi."""
+    if not valid:
+        _record_failure(db, user, identifiant, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email ou mot de passe incorrect"
+            detail=detail
         )
 
     if not user.is_active:
@@ -37,6 +108,7 @@ def authenticate_user(db: Session, email: str, password: str) -> TokenResponse:
             detail="Compte désactivé"
         )
 
+    _record_success(db, user, identifiant, new_hash)
     access_token = create_access_token(
         data={
             "sub": user.email,    # Identifiant principal (RFC JWT)
@@ -48,28 +120,45 @@ def authenticate_user(db: Session, email: str, password: str) -> TokenResponse:
     # ✅ Correction : retourner aussi token_type="bearer" pour compatibilité Pydantic/Swagger
     return TokenResponse(access_token=access_token, token_type="bearer")
 
-def authenticate_user_by_username(db: Session, username: str, password: str) -> TokenResponse:
-    """
-    Authentifie via username + password (compatibilité tests legacy).
 
-    Retourne un JWT identique à authenticate_user.
-    """
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Identifiants invalides"
-        )
-    if not user.is_active:
+def _verify(password: str, hashed_password: str) -> bool:
+    """Vérification bcrypt sur l'exécuteur dédié (hors threadpool des requêtes)."""
+    return run_password_task(verify_password, password, hashed_password)
+
+
+def _rehash(password: str, user: User) -> Optional[str]:
+    """Nouveau hash si le coût bcrypt a changé; None si inutile ou exécuteur saturé."""
+    if not password_needs_rehash(user.hashed_password):
+        return None
+    try:
+        return run_password_task(get_password_hash, password)
+    except HTTPException:
+        return None  # Exécuteur saturé: migration reportée à la prochaine connexion
+
+
+def _check_not_locked(user: Optional[User]) -> None:
+    """Rejette un compte verrouillé en base avant de payer le coût bcrypt."""
+    if user is not None and getattr(user, "is_account_locked", False) is True:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Compte désactivé"
+            detail="Compte temporairement verrouillé"
         )
-    access_token = create_access_token(
-        data={
-            "sub": user.email,
-            "role": getattr(user.role, "value", str(user.role)),
-            "user_id": user.id,
-        }
-    )
-    return TokenResponse(access_token=access_token, token_type="bearer")
+
+
+def _record_failure(db: Session, user: Optional[User], identifiant: str, client_ip: Optional[str]) -> None:
+    get_login_throttle().record_failure(identifiant, client_ip)
+    if isinstance(user, User):
+        user.increment_failed_login()
+        db.commit()
+
+
+def _record_success(db: Session, user: User, identifiant: str, new_hash: Optional[str]) -> None:
+    """Remet les compteurs à zéro et enregistre le hash migré si le coût bcrypt a changé."""
+    get_login_throttle().reset(identifiant)
+    if not isinstance(user, User):
+        return
+    if new_hash:
+        user.hashed_password = new_hash
+        logger.info("Hash du mot de passe de l'utilisateur %s mis à jour", user.id)
+    user.update_last_login()
+    db.commit()
@@ -0,0 +1,245 @@
+# app/services/client_analytics_service.py
+"""
+Statistiques clients calculées en lot.
+
+Remplace les propriétés du modèle Client qui chargeaient toutes les
+interventions en Python (cout_maintenance_total, delai_moyen_intervention,
+taux_satisfaction_moyen, calculer_sla_global) par des agrégats SQL groupés
+par client, pour un ou plusieurs clients :
+1. profils clients ;
+2. agrégats d'interventions (volumes, délais, coûts, satisfaction, SLA) ;
+3. contrats actifs.
+Le rapport d'activité y ajoute l'activité de la période et l'état du parc.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.db.aggregates import conditional_count, hours_between, supports_filter_clause
+from app.models.client import Client
+from app.models.contrat import Contrat, StatutContrat
+from app.models.equipement import Equipement, StatutEquipement
+from app.models.intervention import (
+    SLA_HEURES_PAR_PRIORITE,
+    Intervention,
+    InterventionType,
+    StatutIntervention,
+)
+from app.schemas.client import ClientStats
+
+# Fenêtre d'évaluation du respect des SLA (règle historique de calculer_sla_global)
+FENETRE_SLA_JOURS = 180
+
+STATUTS_EN_COURS_CLIENT = (
+    StatutIntervention.affectee,
+    StatutIntervention.en_cours,
+    StatutIntervention.en_attente,
+)
+STATUTS_TERMINES = (StatutIntervention.cloturee, StatutIntervention.archivee)
+
+
+def _ids(client_ids: Optional[Iterable[int]]) -> Optional[List[int]]:
+    return None if client_ids is None else sorted(set(client_ids))
+
+
+def _round(value, ndigits: int) -> Optional[float]:
+    return round(float(value), ndigits) if value is not None else None
+
+
+def sla_respecte(dialect_name: str):
+    """
+    Condition SQL "SLA respecté" d'une intervention clôturée.
+
+    NULL (donc jamais compté) pour les priorités sans SLA, comme
+    Intervention.calculer_sla_respect qui renvoie None.
+    """
+    seuil = case(
+        {priorite: heures for priorite, heures in SLA_HEURES_PAR_PRIORITE.items() if heures is not None},
+        value=Intervention.priorite,
+        else_=None,
+    )
+    return hours_between(dialect_name, Intervention.date_creation, Intervention.date_cloture) <= seuil
+
+
+def compute_client_stats(db: Session, client_ids: Optional[Iterable[int]] = None,
+                         now: Optional[datetime] = None) -> Dict[int, ClientStats]:
+    """
+    Calcule les statistiques de plusieurs clients en trois requêtes.
+
+    Args:
+        db: Session SQLAlchemy
+        client_ids: Clients ciblés (None = tous)
+        now: Date de référence (retards, fenêtre SLA, contrats actifs)
+
+    Returns:
+        Dict {client_id: ClientStats}; les identifiants inconnus sont absents
+    """
+    ids = _ids(client_ids)
+    if ids == []:
+        return {}
+    now = now or datetime.utcnow()
+    dialect = db.get_bind().dialect
+    use_filter = supports_filter_clause(dialect)
+
+    profils_query = select(Client.id, Client.nom_entreprise)
+    if ids is not None:
+        profils_query = profils_query.where(Client.id.in_(ids))
+    profils = db.execute(profils_query).all()
+    if not profils:
+        return {}
+    ids = [p.id for p in profils]
+
+    cloturee = Intervention.date_cloture.isnot(None)
+    fenetre_sla = cloturee & (Intervention.date_creation >= now - timedelta(days=FENETRE_SLA_JOURS))
+    en_retard = (
+        Intervention.date_limite.isnot(None)
+        & (Intervention.date_limite < now)
+        & Intervention.statut.notin_(STATUTS_TERMINES + (StatutIntervention.annulee,))
+    )
+    stats = {
+        row.client_id: row
+        for row in db.execute(
+            select(
+                Intervention.client_id,
+                func.count().label("total"),
+                conditional_count(Intervention.statut == StatutIntervention.ouverte, use_filter).label("ouvertes"),
+                conditional_count(Intervention.statut.in_(STATUTS_EN_COURS_CLIENT), use_filter).label("en_cours"),
+                conditional_count(Intervention.statut.in_(STATUTS_TERMINES), use_filter).label("terminees"),
+                conditional_count(en_retard, use_filter).label("en_retard"),
+                # AVG/SUM ignorent les NULL: équivalent aux filtres "isnot(None)" historiques
+                func.avg(hours_between(dialect.name, Intervention.date_creation, Intervention.date_cloture))
+                .label("duree_moyenne"),
+                func.avg(hours_between(dialect.name, Intervention.date_creation, Intervention.date_affectation))
+                .label("temps_reponse"),
+                func.sum(Intervention.cout_reel).label("cout_total"),
+                func.avg(Intervention.cout_reel).label("cout_moyen"),
+                func.avg(Intervention.satisfaction_client).label("satisfaction"),
+                conditional_count(fenetre_sla, use_filter).label("sla_evaluees"),
+                conditional_count(fenetre_sla & sla_respecte(dialect.name), use_filter).label("sla_respectes"),
+                func.min(Intervention.date_creation).label("premiere"),
+                func.max(Intervention.date_creation).label("derniere"),
+            )
+            .where(Intervention.client_id.in_(ids))
+            .group_by(Intervention.client_id)
+        )
+    }
+
+    aujourd_hui = now.date()
+    contrats = {
+        row.client_id: row
+        for row in db.execute(
+            select(
+                Contrat.client_id,
+                func.count().label("actifs"),
+                func.sum(Contrat.montant_annuel).label("montant_annuel"),
+            )
+            .where(
+                Contrat.client_id.in_(ids),
+                Contrat.statut == StatutContrat.en_cours,
+                Contrat.date_debut <= aujourd_hui,
+                Contrat.date_fin >= aujourd_hui,
+            )
+            .group_by(Contrat.client_id)
+        )
+    }
+
+    resultats: Dict[int, ClientStats] = {}
+    for profil in profils:
+        row = stats.get(profil.id)
+        contrat = contrats.get(profil.id)
+        resultats[profil.id] = ClientStats(
+            client_id=profil.id,
+            nom_entreprise=profil.nom_entreprise,
+            total_interventions=row.total if row else 0,
+            interventions_ouvertes=row.ouvertes if row else 0,
+            interventions_en_cours=row.en_cours if row else 0,
+            interventions_terminees=row.terminees if row else 0,
+            interventions_en_retard=row.en_retard if row else 0,
+            duree_moyenne_intervention=_round(row.duree_moyenne, 1) if row else None,
+            temps_reponse_moyen=_round(row.temps_reponse, 1) if row else None,
+            # Coûts stockés en centimes
+            cout_total_interventions=round((row.cout_total or 0) / 100, 2) if row else 0.0,
+            cout_moyen_intervention=_round(row.cout_moyen / 100, 2) if row and row.cout_moyen is not None else None,
+            taux_respect_sla=round(row.sla_respectes / row.sla_evaluees * 100, 1) if row and row.sla_evaluees else None,
+            note_satisfaction=_round(row.satisfaction, 2) if row else None,
+            premiere_intervention=row.premiere if row else None,
+            derniere_intervention=row.derniere if row else None,
+            nb_contrats_actifs=contrat.actifs if contrat else 0,
+            montant_contrats_annuel=_round(contrat.montant_annuel, 2) if contrat else None,
+        )
+    return resultats
+
+
+def get_client_stats(db: Session, client_id: int, now: Optional[datetime] = None) -> Optional[ClientStats]:
+    """Statistiques d'un seul client (None s'il n'existe pas)."""
+    return compute_client_stats(db, [client_id], now=now).get(client_id)
+
+
+def compute_rapports_activite(db: Session, client_ids: Optional[Iterable[int]] = None, nb_mois: int = 12,
+                              now: Optional[datetime] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    Rapports d'activité (format de Client.generer_rapport_activite) de plusieurs
+    clients: statistiques globales + activité de la période + parc d'équipements,
+    en cinq requêtes au total.
+    """
+    now = now or datetime.utcnow()
+    stats = compute_client_stats(db, client_ids, now=now)
+    if not stats:
+        return {}
+    ids = list(stats)
+    use_filter = supports_filter_clause(db.get_bind().dialect)
+
+    cout_total_reel = func.coalesce(Intervention.cout_main_oeuvre, 0) + func.coalesce(Intervention.cout_pieces, 0)
+    periode = {
+        row.client_id: row
+        for row in db.execute(
+            select(
+                Intervention.client_id,
+                func.count().label("nb"),
+                conditional_count(Intervention.type_intervention == InterventionType.preventive,
+                                  use_filter).label("preventives"),
+                conditional_count(Intervention.type_intervention == InterventionType.corrective,
+                                  use_filter).label("correctives"),
+                func.sum(cout_total_reel).label("cout_total"),
+            )
+            .where(
+                Intervention.client_id.in_(ids),
+                Intervention.date_creation >= now - timedelta(days=nb_mois * 30),
+            )
+            .group_by(Intervention.client_id)
+        )
+    }
+    parc = {
+        row.client_id: row
+        for row in db.execute(
+            select(
+                Equipement.client_id,
+                func.count().label("total"),
+                conditional_count(Equipement.statut == StatutEquipement.operationnel,
+                                  use_filter).label("operationnels"),
+            )
+            .where(Equipement.client_id.in_(ids))
+            .group_by(Equipement.client_id)
+        )
+    }
+
+    rapports: Dict[int, Dict[str, Any]] = {}
+    for client_id, stat in stats.items():
+        activite = periode.get(client_id)
+        equipements = parc.get(client_id)
+        rapports[client_id] = {
+            "periode_mois": nb_mois,
+            "nb_interventions": activite.nb if activite else 0,
+            "nb_preventives": activite.preventives if activite else 0,
+            "nb_correctives": activite.correctives if activite else 0,
+            "cout_total": round((activite.cout_total or 0) / 100, 2) if activite else 0,
+            "delai_moyen_heures": stat.duree_moyenne_intervention,
+            "taux_satisfaction": stat.note_satisfaction,
+            "sla_respect": stat.taux_respect_sla,
+            "equipements_total": equipements.total if equipements else 0,
+            "equipements_operationnels": equipements.operationnels if equipements else 0,
+        }
+    return rapports
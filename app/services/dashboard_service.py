@@ -0,0 +1,617 @@
+# app/services/dashboard_service.py
+"""
+Moteur d'agrégation du tableau de bord.
+
+Calcule l'ensemble des KPI de /dashboard/stats en deux allers-retours SQL :
+- une requête unique à agrégats conditionnels (FILTER (WHERE ...), ou
+  CASE ... si le moteur ne supporte pas FILTER) pour les compteurs
+  d'interventions, équipements et utilisateurs (trois agrégats mono-ligne
+  joints dans le même SELECT) ;
+- une requête d'évolution mensuelle (un compteur par mois sur la plage
+  des 6 derniers mois).
+
+Les KPI d'interventions sont lus dans la table matérialisée
+`intervention_kpi_counters` (buckets statut/priorité/mois, maintenus par
+app/services/kpi_counter_service.py) : le coût est proportionnel au nombre de
+buckets et non au nombre d'interventions.
+
+Les bornes temporelles sont calculées côté Python et appliquées en prédicats de
+plage sur le mois de création, ce qui évite DATE_TRUNC/TO_CHAR et reste
+portable entre PostgreSQL et SQLite.
+
+Les tableaux de bord par rôle (KPIAdmin, KPIResponsable, KPITechnicien,
+KPIClient, TechnicienWorkload, et la santé du parc calculée par
+app/services/equipement_health_service.py) sont calculés par requêtes
+ensemblistes (agrégats conditionnels, GROUP BY joints) et mis en cache par
+(rôle, périmètre, période) via app.core.cache; les services d'écriture
+appellent `invalidate_dashboards` / `invalidate_for_intervention` après commit.
+"""
+
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import case, func, select, true
+from sqlalchemy.orm import Session
+
+from app.core.cache import cached_call, cached_call_async, invalidate
+from app.db.aggregates import conditional_agg, conditional_count, hours_between, supports_filter_clause
+from app.db.async_database import ReadSession
+from app.models.client import Client
+from app.models.contrat import Contrat, Facture, StatutContrat
+from app.models.equipement import Equipement, StatutEquipement
+from app.models.intervention import Intervention, PrioriteIntervention, StatutIntervention
+from app.models.kpi_counter import InterventionKpiCounter
+from app.models.planning import Planning
+from app.models.technicien import Competence, DisponibiliteTechnicien, Technicien, technicien_competence
+from app.models.user import User
+from app.schemas.dashboard import (
+    EquipementHealthPage, KPIAdmin, KPIClient, KPIResponsable, KPITechnicien,
+    TechnicienWorkload, TimeRange, TriSante,
+)
+
+# Labels fixes (indépendants de la locale serveur), équivalents à TO_CHAR(..., 'Mon')
+MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Nombre de mois couverts par l'évolution mensuelle (mois courant inclus)
+TREND_MONTHS = 6
+
+
+def month_start(dt: datetime) -> datetime:
+    """Premier instant du mois de `dt`."""
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def shift_months(dt: Union[date, datetime], months: int) -> Union[date, datetime]:
+    """Décale un début de mois de `months` mois (positif ou négatif)."""
+    index = dt.year * 12 + (dt.month - 1) + months
+    return dt.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _sum_if(condition, use_filter: bool = True):
+    """Somme conditionnelle des compteurs matérialisés (0 si aucun bucket)."""
+    total = InterventionKpiCounter.total
+    if use_filter:
+        return func.coalesce(func.sum(total).filter(condition), 0)
+    return func.coalesce(func.sum(case((condition, total), else_=0)), 0)
+
+
+def _kpi_query(debut_mois: date, use_filter: bool = True):
+    """Construit la requête unique des compteurs scalaires."""
+    count_if = partial(conditional_count, use_filter=use_filter)
+    sum_if = partial(_sum_if, use_filter=use_filter)
+    statut, priorite = InterventionKpiCounter.statut, InterventionKpiCounter.priorite
+    dans_le_mois = InterventionKpiCounter.mois == debut_mois
+    cloturee = statut == StatutIntervention.cloturee
+
+    interventions = select(
+        func.coalesce(func.sum(InterventionKpiCounter.total), 0).label("total"),
+        sum_if(statut == StatutIntervention.ouverte).label("ouverte"),
+        sum_if(statut == StatutIntervention.en_cours).label("en_cours"),
+        sum_if(statut == StatutIntervention.en_attente).label("en_attente"),
+        sum_if(cloturee).label("cloturee"),
+        sum_if(dans_le_mois).label("total_mensuel"),
+        sum_if(dans_le_mois & cloturee).label("terminees_mensuel"),
+        sum_if(priorite == PrioriteIntervention.urgente).label("urgente"),
+        sum_if(priorite == PrioriteIntervention.haute).label("haute"),
+        sum_if(priorite == PrioriteIntervention.normale).label("normale"),
+        sum_if(priorite == PrioriteIntervention.basse).label("basse"),
+    ).select_from(InterventionKpiCounter).subquery("i")
+
+    equipements = select(
+        func.count().label("eq_total"),
+        count_if(Equipement.statut == StatutEquipement.operationnel).label("eq_operationnel"),
+        count_if(Equipement.statut == StatutEquipement.maintenance).label("eq_maintenance"),
+    ).select_from(Equipement).subquery("e")
+
+    utilisateurs = select(
+        func.count().label("users_total"),
+        count_if(User.is_active.is_(True)).label("users_actifs"),
+    ).select_from(User).subquery("u")
+
+    # Un seul SELECT : trois agrégats mono-ligne joints sans condition (1x1x1)
+    return select(interventions, equipements, utilisateurs).select_from(
+        interventions.join(equipements, true()).join(utilisateurs, true())
+    )
+
+
+def _trend_query(bornes: List[date], use_filter: bool = True):
+    """
+    Requête d'évolution mensuelle: un compteur par mois, bornes en prédicats de plage.
+
+    `bornes` contient les débuts de mois successifs (N+1 bornes pour N mois).
+    """
+    mois = InterventionKpiCounter.mois
+    colonnes = [
+        _sum_if((mois >= debut) & (mois < fin), use_filter).label(f"m{index}")
+        for index, (debut, fin) in enumerate(zip(bornes, bornes[1:]))
+    ]
+    return select(*colonnes).where(mois >= bornes[0])
+
+
+def compute_dashboard_stats(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Calcule les statistiques du tableau de bord en deux requêtes.
+
+    Args:
+        db: Session SQLAlchemy
+        now: Instant de référence (défaut: maintenant UTC), utile pour les tests
+
+    Returns:
+        Dict au format historique de GET /dashboard/stats
+    """
+    now = now or datetime.utcnow()
+    debut_mois = month_start(now).date()
+    bornes = [shift_months(debut_mois, k) for k in range(-(TREND_MONTHS - 1), 2)]
+
+    use_filter = supports_filter_clause(db.get_bind().dialect)
+    row = db.execute(_kpi_query(debut_mois, use_filter)).mappings().one()
+    trend_row = db.execute(_trend_query(bornes, use_filter)).one()
+
+    total = row["total"] or 0
+    cloturees = row["cloturee"] or 0
+    # Convention historique: dénominateur à 1 si aucune intervention
+    resolution_rate = round((cloturees / (total or 1)) * 100, 1)
+
+    return {
+        "interventions": {
+            "ouverte": row["ouverte"],
+            "en_cours": row["en_cours"],
+            "en_attente": row["en_attente"],
+            "terminees": cloturees,
+            "total_mensuel": row["total_mensuel"],
+            "terminees_mensuel": row["terminees_mensuel"],
+        },
+        "taux_resolution": resolution_rate,
+        "evolution_mensuelle": _format_trends(bornes, trend_row),
+        "priorites": {
+            "urgente": row["urgente"],
+            "haute": row["haute"],
+            "normale": row["normale"],
+            "basse": row["basse"],
+        },
+        "equipements": {
+            "total": row["eq_total"],
+            "operationnel": row["eq_operationnel"],
+            "maintenance": row["eq_maintenance"],
+        },
+        "utilisateurs": {
+            "total": row["users_total"],
+            "actifs": row["users_actifs"],
+        },
+    }
+
+
+def _format_trends(bornes: List[date], row) -> List[Dict[str, Any]]:
+    """Associe chaque compteur mensuel à son label; les mois vides sont omis."""
+    return [
+        {"month": MONTH_LABELS[debut.month - 1], "total": total}
+        for debut, total in zip(bornes, row)
+        if total
+    ]
+
+
+# ---------------------------------------------------------------------------
+# KPI par rôle (schémas app/schemas/dashboard.py)
+# ---------------------------------------------------------------------------
+
+# Statuts d'une intervention non terminée / en attente de prise en charge
+STATUTS_ACTIFS = (
+    StatutIntervention.ouverte, StatutIntervention.affectee,
+    StatutIntervention.en_cours, StatutIntervention.en_attente,
+)
+STATUTS_OUVERTS = (StatutIntervention.ouverte, StatutIntervention.affectee)
+STATUTS_CLOTURES = (StatutIntervention.cloturee, StatutIntervention.archivee)
+
+# Nombre d'interventions actives correspondant à 100% de charge d'un technicien
+CAPACITE_TECHNICIEN = 5
+
+# Horizon des indicateurs "cette semaine" (planning, échéances)
+HORIZON_SEMAINE = timedelta(days=7)
+
+
+def period_bounds(periode: TimeRange, now: datetime) -> Tuple[datetime, datetime, datetime]:
+    """
+    Bornes calendaires de la période courante.
+
+    Returns:
+        (début de période, début de la période suivante, début de la période précédente)
+    """
+    jour = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if periode == TimeRange.jour:
+        return jour, jour + timedelta(days=1), jour - timedelta(days=1)
+    if periode == TimeRange.semaine:
+        debut = jour - timedelta(days=jour.weekday())
+        return debut, debut + timedelta(days=7), debut - timedelta(days=7)
+    mois = {TimeRange.mois: 1, TimeRange.trimestre: 3, TimeRange.annee: 12}[periode]
+    debut = month_start(now)
+    if periode == TimeRange.trimestre:
+        debut = debut.replace(month=(debut.month - 1) // 3 * 3 + 1)
+    elif periode == TimeRange.annee:
+        debut = debut.replace(month=1)
+    return debut, shift_months(debut, mois), shift_months(debut, -mois)
+
+
+def _ratio(numerateur, denominateur, facteur: float = 100.0) -> Optional[float]:
+    return round(numerateur / denominateur * facteur, 1) if denominateur else None
+
+
+def _round(value, digits: int = 1) -> Optional[float]:
+    return round(float(value), digits) if value is not None else None
+
+
+def _intervention_metrics(db: Session, scope, debut: datetime, fin: datetime,
+                          debut_prec: datetime, now: datetime) -> Dict[str, Any]:
+    """
+    Indicateurs d'interventions d'un périmètre (tout, technicien, client) en une requête.
+
+    `scope` est une liste de critères WHERE sur Intervention (vide = toutes).
+    """
+    dialect = db.get_bind().dialect
+    use_filter = supports_filter_clause(dialect)
+    count_if = partial(conditional_count, use_filter=use_filter)
+    agg_if = partial(conditional_agg, use_filter=use_filter)
+
+    statut = Intervention.statut
+    cloturee_periode = statut.in_(STATUTS_CLOTURES) & (Intervention.date_cloture >= debut) & (
+        Intervention.date_cloture < fin
+    )
+    avec_delai = cloturee_periode & Intervention.date_limite.isnot(None)
+    actives = statut.in_(STATUTS_ACTIFS)
+
+    row = db.execute(
+        select(
+            count_if(statut.in_(STATUTS_OUVERTS)).label("ouvertes"),
+            count_if(statut == StatutIntervention.en_cours).label("en_cours"),
+            count_if(actives).label("actives"),
+            count_if(actives & (Intervention.date_limite < now)).label("en_retard"),
+            count_if(actives & (Intervention.date_limite >= now)
+                     & (Intervention.date_limite < now + HORIZON_SEMAINE)).label("echeance_semaine"),
+            count_if(cloturee_periode).label("cloturees"),
+            count_if(avec_delai).label("cloturees_avec_delai"),
+            count_if(avec_delai & (Intervention.date_cloture <= Intervention.date_limite)).label("dans_les_delais"),
+            count_if((Intervention.date_creation >= debut) & (Intervention.date_creation < fin)).label("creees"),
+            count_if((Intervention.date_creation >= debut_prec)
+                     & (Intervention.date_creation < debut)).label("creees_precedente"),
+            func.avg(hours_between(dialect.name, Intervention.date_creation,
+                                    Intervention.date_affectation)).label("temps_reponse"),
+            func.avg(Intervention.satisfaction_client).label("satisfaction"),
+            agg_if(func.sum, Intervention.cout_reel, cloturee_periode).label("cout_periode"),
+            agg_if(func.sum, Intervention.duree_reelle, cloturee_periode).label("minutes_periode"),
+        ).select_from(Intervention).where(*scope)
+    ).mappings().one()
+    return dict(row)
+
+
+def _kpi_base(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Champs communs KPIBase à partir de `_intervention_metrics`."""
+    precedente = metrics["creees_precedente"]
+    return {
+        "interventions_ouvertes": metrics["ouvertes"],
+        "interventions_en_cours": metrics["en_cours"],
+        "interventions_en_retard": metrics["en_retard"],
+        "interventions_cloturees_mois": metrics["cloturees"],
+        "evolution_interventions": _ratio(metrics["creees"] - precedente, precedente) or 0.0,
+        "temps_reponse_moyen": _round(metrics["temps_reponse"]),
+        # Pas de notion de "repassage" dans le modèle: non calculable
+        "taux_resolution_premier_passage": None,
+    }
+
+
+def _charge(actives: int) -> float:
+    """Pourcentage de charge d'un technicien (plafonné à 100)."""
+    return round(min(actives / CAPACITE_TECHNICIEN, 1.0) * 100, 1)
+
+
+def build_admin_kpis(db: Session, periode: TimeRange = TimeRange.mois,
+                     now: Optional[datetime] = None) -> KPIAdmin:
+    """KPI administrateur: interventions, référentiels, finances et qualité."""
+    now = now or datetime.utcnow()
+    debut, fin, debut_prec = period_bounds(periode, now)
+    metrics = _intervention_metrics(db, [], debut, fin, debut_prec, now)
+
+    scalar = lambda stmt: stmt.scalar_subquery()  # noqa: E731
+    row = db.execute(select(
+        scalar(select(func.count()).select_from(User).where(User.is_active.is_(True))).label("users_actifs"),
+        scalar(select(func.count()).select_from(Technicien).where(
+            Technicien.is_active.is_(True),
+            Technicien.disponibilite == DisponibiliteTechnicien.disponible,
+        )).label("techniciens_disponibles"),
+        scalar(select(func.count()).select_from(Client).where(Client.is_active.is_(True))).label("clients_actifs"),
+        scalar(select(func.count()).select_from(Equipement)).label("eq_total"),
+        scalar(select(func.count()).select_from(Equipement).where(
+            Equipement.statut == StatutEquipement.panne
+        )).label("eq_critique"),
+        scalar(select(func.sum(Facture.montant_ht)).where(
+            Facture.date_emission >= debut.date(), Facture.date_emission < fin.date()
+        )).label("chiffre_affaires"),
+    )).mappings().one()
+
+    ca = float(row["chiffre_affaires"]) if row["chiffre_affaires"] is not None else None
+    cout = metrics["cout_periode"] / 100 if metrics["cout_periode"] is not None else None
+    satisfaction = metrics["satisfaction"]
+    return KPIAdmin(
+        **_kpi_base(metrics),
+        nb_utilisateurs_actifs=row["users_actifs"],
+        nb_techniciens_disponibles=row["techniciens_disponibles"],
+        nb_clients_actifs=row["clients_actifs"],
+        chiffre_affaires_mois=ca,
+        cout_total_interventions=cout,
+        marge_beneficiaire=_ratio(ca - (cout or 0), ca) if ca else None,
+        # Note client 1-5 ramenée en pourcentage
+        taux_satisfaction_client=_round(satisfaction * 20) if satisfaction is not None else None,
+        nb_equipements_total=row["eq_total"],
+        nb_equipements_critique=row["eq_critique"],
+    )
+
+
+def _charges_techniciens(db: Session) -> Dict[int, int]:
+    """Nombre d'interventions actives par technicien actif (0 inclus)."""
+    actives = (
+        select(Intervention.technicien_id, func.count().label("actives"))
+        .where(Intervention.statut.in_(STATUTS_ACTIFS), Intervention.technicien_id.isnot(None))
+        .group_by(Intervention.technicien_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Technicien.id, func.coalesce(actives.c.actives, 0))
+        .outerjoin(actives, actives.c.technicien_id == Technicien.id)
+        .where(Technicien.is_active.is_(True))
+    ).all()
+    return dict(rows)
+
+
+def build_responsable_kpis(db: Session, periode: TimeRange = TimeRange.mois,
+                           now: Optional[datetime] = None) -> KPIResponsable:
+    """KPI responsable: charge d'équipe, planning de la semaine, respect des délais."""
+    now = now or datetime.utcnow()
+    debut, fin, debut_prec = period_bounds(periode, now)
+    metrics = _intervention_metrics(db, [], debut, fin, debut_prec, now)
+    charges = _charges_techniciens(db)
+
+    dans_la_semaine = (
+        Planning.is_active.is_(True)
+        & (Planning.prochaine_date >= now)
+        & (Planning.prochaine_date < now + HORIZON_SEMAINE)
+    )
+    use_filter = supports_filter_clause(db.get_bind().dialect)
+    planning = db.execute(
+        select(
+            func.count().label("planifiees"),
+            # Conflit: maintenance planifiée sur un équipement en panne ou retiré
+            conditional_count(Equipement.statut.in_((StatutEquipement.panne, StatutEquipement.retire)),
+                      use_filter).label("conflits"),
+        ).select_from(Planning).join(Equipement, Equipement.id == Planning.equipement_id).where(dans_la_semaine)
+    ).mappings().one()
+
+    nb_techniciens = len(charges)
+    charge_moyenne = sum(_charge(n) for n in charges.values()) / nb_techniciens if nb_techniciens else 0.0
+    return KPIResponsable(
+        **_kpi_base(metrics),
+        nb_techniciens_equipe=nb_techniciens,
+        charge_moyenne_techniciens=round(charge_moyenne, 1),
+        interventions_planifiees_semaine=planning["planifiees"],
+        conflits_planning=planning["conflits"],
+        productivite_equipe=_ratio(metrics["cloturees"], nb_techniciens, 1.0),
+        respect_delais=_ratio(metrics["dans_les_delais"], metrics["cloturees_avec_delai"]),
+    )
+
+
+def build_technicien_kpis(db: Session, technicien_id: int, periode: TimeRange = TimeRange.mois,
+                          now: Optional[datetime] = None) -> KPITechnicien:
+    """KPI personnels d'un technicien."""
+    now = now or datetime.utcnow()
+    debut, fin, debut_prec = period_bounds(periode, now)
+    metrics = _intervention_metrics(db, [Intervention.technicien_id == technicien_id], debut, fin, debut_prec, now)
+    minutes = metrics["minutes_periode"]
+    return KPITechnicien(
+        technicien_id=technicien_id,
+        mes_interventions_ouvertes=metrics["ouvertes"],
+        mes_interventions_en_cours=metrics["en_cours"],
+        mes_interventions_cloturees_mois=metrics["cloturees"],
+        ma_charge_travail=_charge(metrics["actives"]),
+        mon_temps_reponse_moyen=_round(metrics["temps_reponse"]),
+        ma_note_moyenne=_round(metrics["satisfaction"], 2),
+        prochaines_interventions=metrics["echeance_semaine"],
+        heures_travaillees_mois=round(minutes / 60, 1) if minutes is not None else None,
+    )
+
+
+def build_client_kpis(db: Session, client_id: int, periode: TimeRange = TimeRange.mois,
+                      now: Optional[datetime] = None) -> KPIClient:
+    """KPI d'un client: ses interventions et ses contrats actifs."""
+    now = now or datetime.utcnow()
+    debut, fin, debut_prec = period_bounds(periode, now)
+    metrics = _intervention_metrics(db, [Intervention.client_id == client_id], debut, fin, debut_prec, now)
+    use_filter = supports_filter_clause(db.get_bind().dialect)
+    avec_quota = Contrat.nb_interventions_incluses.isnot(None)
+    contrats = db.execute(
+        select(
+            func.count().label("actifs"),
+            conditional_count(avec_quota, use_filter).label("avec_quota"),
+            conditional_agg(func.sum, Contrat.nb_interventions_incluses - func.coalesce(Contrat.nb_interventions_utilisees, 0),
+                    avec_quota, use_filter).label("restantes"),
+        ).where(
+            Contrat.client_id == client_id,
+            Contrat.statut == StatutContrat.en_cours,
+            Contrat.is_active.is_(True),
+        )
+    ).mappings().one()
+    satisfaction = metrics["satisfaction"]
+    return KPIClient(
+        client_id=client_id,
+        mes_interventions_ouvertes=metrics["ouvertes"],
+        mes_interventions_en_cours=metrics["en_cours"],
+        mes_interventions_terminees_mois=metrics["cloturees"],
+        mon_taux_satisfaction=_round(satisfaction * 20) if satisfaction is not None else None,
+        temps_reponse_moyen_recu=_round(metrics["temps_reponse"]),
+        contrats_actifs=contrats["actifs"],
+        interventions_incluses_restantes=max(contrats["restantes"] or 0, 0) if contrats["avec_quota"] else None,
+    )
+
+
+def build_techniciens_workload(db: Session, now: Optional[datetime] = None) -> List[TechnicienWorkload]:
+    """Charge des techniciens actifs: une requête d'agrégats + une requête de compétences."""
+    now = now or datetime.utcnow()
+    dialect = db.get_bind().dialect
+    use_filter = supports_filter_clause(dialect)
+    count_if = partial(conditional_count, use_filter=use_filter)
+    actives = Intervention.statut.in_(STATUTS_ACTIFS)
+
+    stats = (
+        select(
+            Intervention.technicien_id.label("technicien_id"),
+            count_if(actives).label("assignees"),
+            count_if(Intervention.statut == StatutIntervention.en_cours).label("en_cours"),
+            count_if(actives & (Intervention.date_limite >= now)
+                     & (Intervention.date_limite < now + HORIZON_SEMAINE)).label("semaine"),
+            func.avg(Intervention.satisfaction_client).label("note"),
+            func.avg(hours_between(dialect.name, Intervention.date_creation,
+                                    Intervention.date_affectation)).label("temps_reponse"),
+            func.max(Intervention.date_creation).label("derniere"),
+        )
+        .where(Intervention.technicien_id.isnot(None))
+        .group_by(Intervention.technicien_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Technicien.id, Technicien.equipe, Technicien.disponibilite, User.full_name, User.username, stats)
+        .join(User, User.id == Technicien.user_id)
+        .outerjoin(stats, stats.c.technicien_id == Technicien.id)
+        .where(Technicien.is_active.is_(True))
+        .order_by(Technicien.id)
+    ).mappings().all()
+
+    competences: Dict[int, List[str]] = {}
+    for technicien_id, nom in db.execute(
+        select(technicien_competence.c.technicien_id, Competence.nom)
+        .join(Competence, Competence.id == technicien_competence.c.competence_id)
+        .order_by(technicien_competence.c.technicien_id, Competence.nom)
+    ):
+        competences.setdefault(technicien_id, []).append(nom)
+
+    resultats = []
+    for r in rows:
+        charge = _charge(r["assignees"] or 0)
+        noms = competences.get(r["id"], [])
+        resultats.append(TechnicienWorkload(
+            technicien_id=r["id"],
+            nom_complet=r["full_name"] or r["username"],
+            equipe=r["equipe"],
+            interventions_assignees=r["assignees"] or 0,
+            interventions_en_cours=r["en_cours"] or 0,
+            interventions_planifiees_semaine=r["semaine"] or 0,
+            pourcentage_charge=charge,
+            pourcentage_disponibilite=round(100 - charge, 1),
+            nb_competences=len(noms),
+            competences_principales=noms[:3],
+            note_moyenne=_round(r["note"], 2),
+            temps_reponse_moyen=_round(r["temps_reponse"]),
+            disponibilite=r["disponibilite"].value.capitalize(),
+            derniere_intervention=r["derniere"],
+        ))
+    return resultats
+
+
+# ---------------------------------------------------------------------------
+# Cache (clé: rôle, identifiant de périmètre, période) et invalidation
+# ---------------------------------------------------------------------------
+
+# Espace de noms global: KPI admin/responsable, santé équipements, charge techniciens
+DASHBOARD_NS = "dashboard"
+
+
+def technicien_namespace(technicien_id: int) -> str:
+    return f"{DASHBOARD_NS}:technicien:{technicien_id}"
+
+
+def client_namespace(client_id: int) -> str:
+    return f"{DASHBOARD_NS}:client:{client_id}"
+
+
+def _cached_model(key: str, namespaces: List[str], schema, loader):
+    """Met en cache la forme JSON d'un schéma (compatible Redis) et la revalide."""
+    data = cached_call(key, namespaces, lambda: _dump(loader()))
+    if isinstance(data, list):
+        return [schema.model_validate(item) for item in data]
+    return schema.model_validate(data)
+
+
+def _dump(value):
+    if isinstance(value, list):
+        return [item.model_dump(mode="json") for item in value]
+    return value.model_dump(mode="json")
+
+
+def get_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """Version mise en cache de `compute_dashboard_stats`."""
+    return cached_call(f"{DASHBOARD_NS}:stats", [DASHBOARD_NS], lambda: compute_dashboard_stats(db))
+
+
+async def get_dashboard_stats_async(db: ReadSession) -> Dict[str, Any]:
+    """
+    Variante async de `get_dashboard_stats` : cache consulté hors de la boucle
+    d'événements, calcul seul exécuté via la session de lecture.
+    """
+    return await cached_call_async(f"{DASHBOARD_NS}:stats", [DASHBOARD_NS],
+                                   lambda: db.run_sync(compute_dashboard_stats))
+
+
+def get_admin_kpis(db: Session, periode: TimeRange = TimeRange.mois) -> KPIAdmin:
+    return _cached_model(f"{DASHBOARD_NS}:admin:-:{periode.value}", [DASHBOARD_NS], KPIAdmin,
+                         lambda: build_admin_kpis(db, periode))
+
+
+def get_responsable_kpis(db: Session, periode: TimeRange = TimeRange.mois) -> KPIResponsable:
+    return _cached_model(f"{DASHBOARD_NS}:responsable:-:{periode.value}", [DASHBOARD_NS], KPIResponsable,
+                         lambda: build_responsable_kpis(db, periode))
+
+
+def get_technicien_kpis(db: Session, technicien_id: int, periode: TimeRange = TimeRange.mois) -> KPITechnicien:
+    return _cached_model(f"{DASHBOARD_NS}:technicien:{technicien_id}:{periode.value}",
+                         [technicien_namespace(technicien_id)], KPITechnicien,
+                         lambda: build_technicien_kpis(db, technicien_id, periode))
+
+
+def get_client_kpis(db: Session, client_id: int, periode: TimeRange = TimeRange.mois) -> KPIClient:
+    return _cached_model(f"{DASHBOARD_NS}:client:{client_id}:{periode.value}",
+                         [client_namespace(client_id)], KPIClient,
+                         lambda: build_client_kpis(db, client_id, periode))
+
+
+def get_equipements_health(db: Session, periode: TimeRange = TimeRange.mois, limit: int = 100,
+                           offset: int = 0, tri: TriSante = TriSante.risque) -> EquipementHealthPage:
+    # Import local: equipement_health_service dépend de period_bounds
+    from app.services.equipement_health_service import build_equipements_health
+
+    return _cached_model(f"{DASHBOARD_NS}:equipements:{tri.value}.{limit}.{offset}:{periode.value}", [DASHBOARD_NS],
+                         EquipementHealthPage,
+                         lambda: build_equipements_health(db, periode, limit=limit, offset=offset, tri=tri))
+
+
+def get_techniciens_workload(db: Session) -> List[TechnicienWorkload]:
+    return _cached_model(f"{DASHBOARD_NS}:techniciens:-:-", [DASHBOARD_NS], TechnicienWorkload,
+                         lambda: build_techniciens_workload(db))
+
+
+def invalidate_dashboards(technicien_ids: Iterable[Optional[int]] = (),
+                          client_ids: Iterable[Optional[int]] = ()) -> None:
+    """
+    Invalide les tableaux de bord globaux et ceux des périmètres donnés.
+
+    À appeler après le commit d'une écriture sur interventions, équipements ou plannings.
+    """
+    invalidate(
+        DASHBOARD_NS,
+        *[technicien_namespace(t) for t in set(technicien_ids) if t is not None],
+        *[client_namespace(c) for c in set(client_ids) if c is not None],
+    )
+
+
+def invalidate_for_intervention(intervention: Intervention, *anciens_techniciens: Optional[int]) -> None:
+    """Invalide les vues impactées par l'écriture d'une intervention."""
+    invalidate_dashboards(
+        technicien_ids=[intervention.technicien_id, *anciens_techniciens],
+        client_ids=[intervention.client_id],
+    )
@@ -0,0 +1,276 @@
+# app/services/document_archive_service.py
+"""
+Archive ZIP en flux des documents d'une ou plusieurs interventions.
+
+L'archive est produite à la volée : chaque fichier est lu par blocs de
+UPLOAD_CHUNK_SIZE et les octets ZIP sont émis au fur et à mesure (entrées
+"stored" avec descripteur de données, ZIP64 si besoin), sans jamais
+assembler l'archive sur disque ni en mémoire. Les photos et PDF étant déjà
+compressés, aucune recompression n'est faite (CPU minimal).
+
+Le nombre de générations simultanées par process est borné
+(ARCHIVE_MAX_CONCURRENT, 503 au-delà). Si ARCHIVE_CACHE_DIRECTORY est
+défini, l'archive produite est aussi écrite dans ce cache sous une clé
+dérivée des empreintes SHA-256 et des noms des fichiers : une même sélection
+de contenus est ensuite servie directement depuis le disque.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.access_policy import document_scope
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import record_cache
+from app.models.document import Document
+from app.services.document_service import blob_path
+
+logger = get_logger(__name__)
+
+ARCHIVE_MEDIA_TYPE = "application/zip"
+MISSING_FILES_ENTRY = "fichiers_manquants.txt"
+# Date minimale représentable dans un en-tête ZIP
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass
+class ArchiveEntry:
+    """Fichier à placer dans l'archive."""
+    arcname: str
+    path: str
+    taille: Optional[int]
+    sha256: Optional[str]
+    date_upload: Optional[datetime]
+
+
+def _safe_name(nom: str) -> str:
+    nom = os.path.basename((nom or "").replace("\\", "/")).strip()
+    return nom or "document"
+
+
+def archive_entries(documents: Sequence[Document]) -> List[ArchiveEntry]:
+    """
+    Entrées de l'archive : un dossier par intervention, noms de fichiers
+    d'origine (dédoublonnés par un suffixe " (n)" dans un même dossier).
+    """
+    entries, taken = [], set()
+    for doc in documents:
+        base, ext = os.path.splitext(_safe_name(doc.nom_fichier))
+        arcname, n = f"intervention-{doc.intervention_id}/{base}{ext}", 1
+        while arcname.lower() in taken:
+            n += 1
+            arcname = f"intervention-{doc.intervention_id}/{base} ({n}){ext}"
+        taken.add(arcname.lower())
+        entries.append(ArchiveEntry(arcname=arcname, path=blob_path(doc.chemin), taille=doc.taille,
+                                    sha256=doc.sha256, date_upload=doc.date_upload))
+    return entries
+
+
+def archive_documents(db: Session, intervention_ids: Sequence[int], principal) -> List[Document]:
+    """
+    Documents des interventions demandées visibles par le principal, en une requête.
+
+    Raises:
+        HTTPException 400: trop d'interventions demandées
+        HTTPException 404: aucun document accessible
+    """
+    ids = sorted(set(intervention_ids))
+    if len(ids) > settings.ARCHIVE_MAX_INTERVENTIONS:
+        raise HTTPException(status_code=400,
+                            detail=f"Au plus {settings.ARCHIVE_MAX_INTERVENTIONS} interventions par archive")
+    stmt = (select(Document)
+            .where(Document.intervention_id.in_(ids), document_scope(principal))
+            .order_by(Document.intervention_id, Document.id))
+    documents = list(db.scalars(stmt))
+    if not documents:
+        raise HTTPException(status_code=404, detail="Aucun document pour ces interventions")
+    return documents
+
+
+def archive_key(entries: Iterable[ArchiveEntry]) -> Optional[str]:
+    """
+    Clé de cache : SHA-256 des couples (nom dans l'archive, empreinte du contenu).
+    None si un document n'a pas d'empreinte (document antérieur) ou si son
+    fichier manque : une telle archive n'est pas mise en cache.
+    """
+    digest = hashlib.sha256()
+    for entry in sorted(entries, key=lambda e: e.arcname):
+        if not entry.sha256 or not os.path.isfile(entry.path):
+            return None
+        digest.update(f"{entry.arcname}\0{entry.sha256}\n".encode())
+    return digest.hexdigest()
+
+
+class _ChunkSink:
+    """Flux non positionnable qui accumule les octets écrits par ZipFile jusqu'au prochain drain()."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks.clear()
+            yield data
+
+
+def _zip_info(entry: ArchiveEntry, size: int) -> zipfile.ZipInfo:
+    date_time = entry.date_upload.timetuple()[:6] if entry.date_upload else _ZIP_EPOCH
+    info = zipfile.ZipInfo(entry.arcname, date_time=max(date_time, _ZIP_EPOCH))
+    info.compress_type = zipfile.ZIP_STORED
+    info.file_size = size
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def iter_zip(entries: Sequence[ArchiveEntry], chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """Octets de l'archive ZIP, émis au fil de la lecture des fichiers (mémoire ~ un bloc)."""
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    sink = _ChunkSink()
+    missing = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for entry in entries:
+            try:
+                source = open(entry.path, "rb")
+            except OSError:
+                missing.append(entry.arcname)
+                continue
+            with source:
+                size = os.fstat(source.fileno()).st_size
+                with zf.open(_zip_info(entry, size), "w", force_zip64=size > zipfile.ZIP64_LIMIT) as dest:
+                    while chunk := source.read(chunk_size):
+                        dest.write(chunk)
+                        yield from sink.drain()
+            yield from sink.drain()
+        if missing:
+            # Les en-têtes HTTP sont déjà partis : les fichiers absents sont signalés dans l'archive
+            logger.warning("Archive: fichiers introuvables", extra={"extra_fields": {"fichiers": missing}})
+            zf.writestr(MISSING_FILES_ENTRY, "\n".join(missing) + "\n")
+    yield from sink.drain()
+
+
+# Générations en cours dans ce process
+_slots = threading.BoundedSemaphore(settings.ARCHIVE_MAX_CONCURRENT)
+
+
+class ArchiveSlot:
+    """Place de génération réservée; libérée une seule fois (fin du flux ou de la réponse)."""
+
+    def __init__(self, semaphore: threading.BoundedSemaphore):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self._held = True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._held:
+                self._held = False
+                self._semaphore.release()
+
+
+def acquire_slot() -> ArchiveSlot:
+    """
+    Raises:
+        HTTPException 503: ARCHIVE_MAX_CONCURRENT archives déjà en cours de génération
+    """
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Trop d'archives en cours de génération, réessayez plus tard",
+                            headers={"Retry-After": "5"})
+    return ArchiveSlot(_slots)
+
+
+def guarded(chunks: Iterator[bytes], slot: ArchiveSlot) -> Iterator[bytes]:
+    """Libère la place de génération à la fin du flux (y compris client déconnecté)."""
+    try:
+        yield from chunks
+    finally:
+        slot.release()
+
+
+# Cache disque
+
+def cached_archive(key: Optional[str]) -> Optional[str]:
+    """Chemin de l'archive en cache pour cette clé, None si absente, expirée ou cache désactivé."""
+    if not key or not settings.ARCHIVE_CACHE_DIRECTORY:
+        return None
+    path = os.path.join(settings.ARCHIVE_CACHE_DIRECTORY, f"{key}.zip")
+    try:
+        fresh = time.time() - os.stat(path).st_mtime <= settings.ARCHIVE_CACHE_TTL_SECONDS
+    except OSError:
+        fresh = False
+    record_cache("document_archive", fresh)
+    return path if fresh else None
+
+
+def prune_cache() -> int:
+    """Supprime les archives expirées du cache. Retourne le nombre de fichiers supprimés."""
+    directory = settings.ARCHIVE_CACHE_DIRECTORY
+    if not directory or not os.path.isdir(directory):
+        return 0
+    cutoff, removed = time.time() - settings.ARCHIVE_CACHE_TTL_SECONDS, 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def caching(chunks: Iterator[bytes], key: Optional[str]) -> Iterator[bytes]:
+    """
+    Recopie le flux dans le cache au fil de l'envoi; l'archive n'y est publiée
+    (renommage atomique) que si elle a été produite en entier.
+    """
+    if not key or not settings.ARCHIVE_CACHE_DIRECTORY:
+        yield from chunks
+        return
+    os.makedirs(settings.ARCHIVE_CACHE_DIRECTORY, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=settings.ARCHIVE_CACHE_DIRECTORY, prefix=".archive-", delete=False)
+    complete = False
+    try:
+        with tmp:
+            for chunk in chunks:
+                tmp.write(chunk)
+                yield chunk
+        complete = True
+    finally:
+        if complete:
+            os.replace(tmp.name, os.path.join(settings.ARCHIVE_CACHE_DIRECTORY, f"{key}.zip"))
+            prune_cache()
+        else:
+            try:
+                os.remove(tmp.name)
+            except OSError:
+                pass
+
+
+def stream_archive(entries: Sequence[ArchiveEntry], key: Optional[str], slot: ArchiveSlot) -> Iterator[bytes]:
+    """Flux ZIP complet : génération bornée par `slot`, recopiée dans le cache si activé."""
+    return guarded(caching(iter_zip(entries), key), slot)
@@ -1,21 +1,144 @@
 # app/services/document_service.py
+"""
+Stockage des documents joints aux interventions.
 
+L'upload est copié par blocs de UPLOAD_CHUNK_SIZE (jamais lu en entier) vers
+un fichier temporaire du dossier d'upload, renommé atomiquement une fois
+complet; le SHA-256 est calculé au fil de la copie et la taille plafonnée à
+UPLOAD_MAX_BYTES en cours de copie (413). La mémoire reste bornée quelle que
+soit la taille du fichier. Le corps des requêtes multipart est aussi plafonné
+avant l'analyse du formulaire (app.core.body_limit).
+
+Stockage adressé par contenu : le blob est nommé `<sha256><ext>` dans
+UPLOAD_DIRECTORY, et un contenu déjà stocké n'est pas réécrit (un doublon ne
+coûte qu'une ligne `documents`). Le nombre de références d'un blob est le
+nombre de documents qui pointent sur son `chemin` : il n'est supprimé qu'avec
+sa dernière référence (release_blob). reconcile_storage (script
+reconcile_documents.py) retrouve les blobs orphelins et les lignes sans blob.
+
+Upload et suppression concurrents d'un même contenu : l'upload garde son
+temporaire jusqu'au commit de sa ligne et rétablit le blob s'il a disparu
+(settle_blob); la suppression écarte d'abord le blob sous un nom temporaire
+et le remet en place si une référence est apparue entre-temps.
+
+Téléchargement : get_accessible_document contrôle l'accès en une requête;
+l'ETag fort dérive de l'empreinte SHA-256 (contenu immuable), un ETag faible
+taille/date est calculé pour les documents antérieurs sans empreinte.
+"""
+
+import hashlib
+import mimetypes
 import os
-from uuid import uuid4
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 from fastapi import UploadFile, HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.models.document import Document
 from app.models.intervention import Intervention
+from app.core.access_policy import document_scope
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.pagination import keyset
 
+logger = get_logger(__name__)
 
-def save_uploaded_file(file: UploadFile) -> str:
+DOCUMENT_KEYSET = keyset("documents", Document.id)
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+# Préfixe des fichiers temporaires d'upload (ignorés puis purgés par la réconciliation)
+TEMP_PREFIX = ".upload-"
+# Préfixe du chemin stocké en base (les blobs sont à plat dans UPLOAD_DIRECTORY)
+PUBLIC_PREFIX = "static/uploads/"
+
+
+@dataclass
+class StoredUpload:
+    """Fichier uploadé écrit sur disque et ses métadonnées."""
+    chemin: str
+    taille: int
+    sha256: str
+    type_mime: str
+
+
+def detect_mime_type(file: UploadFile) -> str:
+    """Type MIME annoncé par le client, à défaut déduit de l'extension."""
+    declared = (getattr(file, "content_type", None) or "").split(";")[0].strip().lower()
+    if declared and declared != DEFAULT_MIME_TYPE:
+        return declared
+    guessed, _ = mimetypes.guess_type(file.filename or "")
+    return guessed or DEFAULT_MIME_TYPE
+
+
+def copy_upload(source, destination, max_bytes: Optional[int] = None, chunk_size: Optional[int] = None) -> tuple:
     """
-    Sauvegarde physique d’un fichier uploadé dans le dossier `uploads/`.
+    Copie `source` dans `destination` par blocs en calculant le SHA-256.
 
     Returns:
-        str: chemin relatif à stocker en base (ex: uploads/abcd1234.png)
+        tuple: (taille en octets, empreinte SHA-256 hexadécimale)
+
+    Raises:
+        HTTPException 413: taille supérieure à `max_bytes` (détectée en cours de copie)
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    digest = hashlib.sha256()
+    taille = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        taille += len(chunk)
+        if taille > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Fichier trop volumineux (maximum {max_bytes} octets)",
+            )
+        digest.update(chunk)
+        destination.write(chunk)
+    return taille, digest.hexdigest()
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def blob_path(chemin: str) -> str:
+    """Chemin absolu du blob d'un document (`chemin` = "static/uploads/<nom>")."""
+    return os.path.join(settings.UPLOAD_DIRECTORY, os.path.basename(chemin or ""))
+
+
+@dataclass
+class StagedUpload:
+    """Upload copié dans un fichier temporaire, pas encore placé sous son nom de blob."""
+    temp_path: str
+    taille: int
+    sha256: str
+    type_mime: str
+    extension: str
+
+    @property
+    def chemin(self) -> str:
+        return f"{PUBLIC_PREFIX}{self.sha256}{self.extension.lower()}"
+
+
+def stage_upload(file: UploadFile) -> StagedUpload:
+    """
+    Copie un fichier uploadé dans un temporaire de UPLOAD_DIRECTORY (même
+    système de fichiers : le placement final est un renommage atomique).
+
+    Raises:
+        HTTPException 400: fichier sans extension
+        HTTPException 413: fichier plus grand que UPLOAD_MAX_BYTES
     """
     os.makedirs(settings.UPLOAD_DIRECTORY, exist_ok=True)
 
@@ -23,15 +146,138 @@ def save_uploaded_file(file: UploadFile) -> str:
     if not extension:
         raise HTTPException(status_code=400, detail="Le fichier doit avoir une extension valide")
 
-    unique_name = f"{uuid4().hex}{extension}"
-    file_path = os.path.join(settings.UPLOAD_DIRECTORY, unique_name)
+    tmp = tempfile.NamedTemporaryFile(dir=settings.UPLOAD_DIRECTORY, prefix=TEMP_PREFIX, delete=False)
+    try:
+        with tmp:
+            taille, sha256 = copy_upload(file.file, tmp)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+    except BaseException:
+        _remove_quietly(tmp.name)
+        raise
+    return StagedUpload(temp_path=tmp.name, taille=taille, sha256=sha256,
+                        type_mime=detect_mime_type(file), extension=extension)
+
+
+def place_blob(staged: StagedUpload, chemin: Optional[str] = None) -> str:
+    """
+    Place le contenu sous son nom de blob; s'il y est déjà (même empreinte),
+    le temporaire est simplement supprimé. Retourne le chemin relatif.
+    """
+    chemin = chemin or staged.chemin
+    target = blob_path(chemin)
+    try:
+        if os.path.isfile(target):
+            _remove_quietly(staged.temp_path)
+        else:
+            os.replace(staged.temp_path, target)
+    except BaseException:
+        _remove_quietly(staged.temp_path)
+        raise
+    return chemin
+
+
+def link_blob(staged: StagedUpload, chemin: str) -> None:
+    """
+    Publie le contenu sous son nom de blob en conservant le temporaire
+    (lien physique; copie puis renommage atomique si le système de fichiers
+    ne les gère pas). Rien à faire si le blob existe déjà.
+    """
+    target = blob_path(chemin)
+    if os.path.isfile(target):
+        return
+    try:
+        os.link(staged.temp_path, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        copie = f"{staged.temp_path}.{uuid.uuid4().hex}"
+        try:
+            shutil.copyfile(staged.temp_path, copie)
+            os.replace(copie, target)
+        except BaseException:
+            _remove_quietly(copie)
+            raise
+
+
+def settle_blob(staged: StagedUpload, chemin: str) -> None:
+    """
+    Après le commit de la ligne : rétablit le blob depuis le temporaire s'il a
+    été supprimé entre-temps (suppression concurrente du dernier document au
+    même contenu), sinon supprime le temporaire.
+    """
+    target = blob_path(chemin)
+    if os.path.isfile(target):
+        _remove_quietly(staged.temp_path)
+    else:
+        os.replace(staged.temp_path, target)
+
 
-    with open(file_path, "wb") as f:
-        content = file.file.read()
-        f.write(content)
+def store_upload(file: UploadFile) -> StoredUpload:
+    """
+    Écrit un fichier uploadé dans le stockage adressé par contenu (copie par
+    blocs, renommage atomique : un fichier partiel n'est jamais visible sous
+    son nom final).
 
+    Raises:
+        HTTPException 400: fichier sans extension
+        HTTPException 413: fichier plus grand que UPLOAD_MAX_BYTES
+    """
+    staged = stage_upload(file)
     # Return path relative that frontend can GET via /static/... endpoint
-    return f"static/uploads/{unique_name}"
+    return StoredUpload(chemin=place_blob(staged), taille=staged.taille, sha256=staged.sha256,
+                        type_mime=staged.type_mime)
+
+
+def _references(db: Session, chemin: str, sha256: Optional[str] = None) -> int:
+    """Nombre de documents pointant sur un blob (filtre sur l'empreinte indexée si connue)."""
+    stmt = select(func.count()).select_from(Document).where(Document.chemin == chemin)
+    if sha256:
+        stmt = stmt.where(Document.sha256 == sha256)
+    return db.scalar(stmt)
+
+
+def existing_blob(db: Session, sha256: str) -> Optional[str]:
+    """Chemin d'un blob déjà stocké pour ce contenu (doublon), None sinon."""
+    stmt = select(Document.chemin).where(Document.sha256 == sha256).order_by(Document.id).limit(1)
+    chemin = db.scalar(stmt)
+    if chemin and os.path.isfile(blob_path(chemin)):
+        return chemin
+    return None
+
+
+def release_blob(db: Session, chemin: str, sha256: Optional[str] = None) -> bool:
+    """
+    Supprime le blob s'il n'est plus référencé par aucun document (à appeler
+    après le commit de la suppression). Retourne True si le fichier a été supprimé.
+
+    Le blob est d'abord renommé (temporaire purgé par la réconciliation en cas
+    d'arrêt) puis les références sont recomptées : si un upload concurrent a
+    validé une ligne sur ce contenu, le blob est remis en place.
+    """
+    if not chemin or _references(db, chemin, sha256):
+        return False
+    path = blob_path(chemin)
+    retire = os.path.join(settings.UPLOAD_DIRECTORY, f"{TEMP_PREFIX}{uuid.uuid4().hex}")
+    try:
+        os.replace(path, retire)
+    except FileNotFoundError:
+        return False
+    if _references(db, chemin, sha256):
+        os.replace(retire, path)
+        return False
+    os.remove(retire)
+    return True
+
+
+def save_uploaded_file(file: UploadFile) -> str:
+    """
+    Sauvegarde physique d’un fichier uploadé dans le dossier `uploads/`.
+
+    Returns:
+        str: chemin relatif à stocker en base (ex: uploads/abcd1234.png)
+    """
+    return store_upload(file).chemin
 
 
 def create_document(db: Session, file: UploadFile, intervention_id: int) -> Document:
@@ -45,16 +291,121 @@ def create_document(db: Session, file: UploadFile, intervention_id: int) -> Docu
     if not intervention:
         raise HTTPException(status_code=404, detail="Intervention cible introuvable")
 
-    chemin = save_uploaded_file(file)
+    staged = stage_upload(file)
+    # Doublon: le blob existant est réutilisé, quel que soit son nom (extension, document antérieur)
+    chemin = existing_blob(db, staged.sha256) or staged.chemin
 
     document = Document(
         nom_fichier=file.filename,
         chemin=chemin,
+        taille=staged.taille,
+        type_mime=staged.type_mime,
+        sha256=staged.sha256,
         intervention_id=intervention_id,
         date_upload=datetime.utcnow()
     )
 
-    db.add(document)
-    db.commit()
+    try:
+        link_blob(staged, chemin)
+        db.add(document)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        _remove_quietly(staged.temp_path)
+        # Pas de blob sans référence
+        release_blob(db, chemin, staged.sha256)
+        raise
+    # Le temporaire n'est libéré qu'une fois la ligne visible des suppressions concurrentes
+    settle_blob(staged, chemin)
     db.refresh(document)
     return document
+
+
+def get_accessible_document(db: Session, document_id: int, principal: Any) -> Document:
+    """
+    Document du périmètre du principal (contrôle d'accès dans la même requête).
+
+    Raises:
+        HTTPException 404: document inexistant ou hors périmètre (existence non révélée)
+    """
+    stmt = select(Document).where(Document.id == document_id, document_scope(principal))
+    document = db.scalar(stmt)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Document non trouvé")
+    return document
+
+
+def document_etag(document: Document, stat_result: Optional[os.stat_result] = None) -> Optional[str]:
+    """ETag fort (empreinte du contenu) ou, à défaut, faible (taille et date du fichier)."""
+    if document.sha256:
+        return f'"{document.sha256}"'
+    if stat_result is None:
+        return None
+    return f'W/"{stat_result.st_size:x}-{int(stat_result.st_mtime):x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Comparaison faible If-None-Match / ETag (RFC 9110 §13.1.2)."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+@dataclass
+class StorageReport:
+    """Résultat d'une réconciliation stockage / table documents."""
+    blobs: int = 0
+    orphans: List[str] = field(default_factory=list)
+    stale_temps: List[str] = field(default_factory=list)
+    dangling: List[int] = field(default_factory=list)
+    removed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"blobs": self.blobs, "orphans": self.orphans, "stale_temps": self.stale_temps,
+                "dangling": self.dangling, "removed": self.removed}
+
+
+def reconcile_storage(db: Session, dry_run: bool = True, grace_seconds: int = 3600) -> StorageReport:
+    """
+    Compare UPLOAD_DIRECTORY à la table documents.
+
+    - blobs orphelins (aucun document) et temporaires d'upload abandonnés :
+      supprimés hors dry-run, s'ils sont plus vieux que `grace_seconds`
+      (un upload en cours place son blob avant de valider sa ligne);
+    - lignes dont le blob manque : signalées seulement (données métier).
+    """
+    report = StorageReport()
+    referenced = set()
+    rows = db.execute(select(Document.id, Document.chemin).execution_options(yield_per=1000))
+    for document_id, chemin in rows:
+        name = os.path.basename(chemin or "")
+        referenced.add(name)
+        if not os.path.isfile(blob_path(chemin)):
+            report.dangling.append(document_id)
+
+    if not os.path.isdir(settings.UPLOAD_DIRECTORY):
+        return report
+    cutoff = time.time() - grace_seconds
+    with os.scandir(settings.UPLOAD_DIRECTORY) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            if entry.name.startswith(TEMP_PREFIX):
+                bucket = report.stale_temps
+            elif entry.name in referenced:
+                report.blobs += 1
+                continue
+            else:
+                bucket = report.orphans
+            if entry.stat().st_mtime > cutoff:
+                continue
+            bucket.append(entry.name)
+            if not dry_run:
+                _remove_quietly(entry.path)
+                report.removed += 1
+    if report.orphans or report.dangling or report.removed:
+        logger.warning("Réconciliation du stockage des documents", extra={"extra_fields": report.to_dict()})
+    return report
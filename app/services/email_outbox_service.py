@@ -0,0 +1,250 @@
+# app/services/email_outbox_service.py
+"""
+File d'envoi des emails sortants (transactional outbox) et worker SMTP.
+
+`send_email_notification` ouvre une connexion SMTP, fait STARTTLS et le login
+pour chaque message, dans le thread de la requête. Ici :
+- `enqueue_email` ajoute le message à la table email_outbox dans la
+  transaction de l'appelant (pas de commit) : la notification et son email
+  sont validés ensemble, la requête rend la main immédiatement ;
+- `process_outbox` (job du scheduler, exécuté par le leader) réserve des lots
+  de messages dus (FOR UPDATE SKIP LOCKED sous PostgreSQL, bail
+  verrouille_jusqua), les envoie sur une seule connexion SMTP réutilisée entre
+  lots et entre échéances, et replanifie les échecs avec un délai exponentiel ;
+- `outbox_depth` expose la profondeur de la file (supervision), publiée
+  dans Prometheus après chaque passage.
+"""
+
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core import metrics as prom
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.email_outbox import EmailOutbox, StatutEmail
+
+logger = get_logger(__name__)
+
+
+def enqueue_email(db: Session, destinataire: str, sujet: str, contenu_html: str,
+                  notification_id: Optional[int] = None) -> EmailOutbox:
+    """Met un email en file dans la transaction courante (commit laissé à l'appelant)."""
+    message = EmailOutbox(
+        destinataire=destinataire,
+        sujet=sujet,
+        contenu_html=contenu_html,
+        statut=StatutEmail.en_attente,
+        tentatives=0,
+        prochaine_tentative=datetime.utcnow(),
+        notification_id=notification_id,
+    )
+    db.add(message)
+    return message
+
+
+class SMTPSender:
+    """
+    Connexion SMTP persistante : ouverte au premier envoi, vérifiée par NOOP
+    avant chaque lot et rouverte si le serveur l'a fermée entre-temps.
+    """
+
+    def __init__(self, host: str, port: int, user: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = True, timeout: float = 10.0, from_email: Optional[str] = None,
+                 smtp_class=smtplib.SMTP):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.from_email = from_email or settings.EMAILS_FROM_EMAIL
+        self.smtp_class = smtp_class
+        self._server: Optional[smtplib.SMTP] = None
+        self.connexions = 0
+
+    @classmethod
+    def from_settings(cls) -> "SMTPSender":
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            user=settings.SMTP_USER or None,
+            password=settings.SMTP_PASSWORD or None,
+            starttls=settings.SMTP_STARTTLS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+
+    def _connect(self) -> smtplib.SMTP:
+        server = self.smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password or "")
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.connexions += 1
+        return server
+
+    def ensure_connected(self) -> smtplib.SMTP:
+        """Renvoie une connexion utilisable, en la rouvrant si elle est tombée."""
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard()
+        return self._connect()
+
+    def send(self, destinataire: str, sujet: str, contenu_html: str) -> None:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = sujet
+        msg["From"] = self.from_email
+        msg["To"] = destinataire
+        msg.attach(MIMEText(contenu_html, "html"))
+        server = self.ensure_connected()
+        try:
+            server.sendmail(self.from_email, destinataire, msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # Connexion fermée par le serveur pendant le lot: une seule reconnexion
+            self._discard()
+            self.ensure_connected().sendmail(self.from_email, destinataire, msg.as_string())
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._discard()
+
+    def _discard(self) -> None:
+        try:
+            self._server.close()
+        except Exception:
+            pass
+        self._server = None
+
+
+# Expéditeur du processus courant, réutilisé d'une échéance à l'autre
+_sender: Optional[SMTPSender] = None
+
+
+def get_sender() -> SMTPSender:
+    global _sender
+    if _sender is None:
+        _sender = SMTPSender.from_settings()
+    return _sender
+
+
+def claim_batch(db: Session, now: datetime, batch_size: int,
+                lease_seconds: Optional[int] = None) -> List[EmailOutbox]:
+    """
+    Réserve un lot de messages dus (en attente, ou en cours dont le bail a
+    expiré après l'arrêt d'un worker) et valide la réservation.
+    """
+    lease = lease_seconds if lease_seconds is not None else settings.EMAIL_OUTBOX_LEASE_SECONDS
+    stmt = (
+        select(EmailOutbox)
+        .where(or_(
+            and_(EmailOutbox.statut == StatutEmail.en_attente, EmailOutbox.prochaine_tentative <= now),
+            and_(EmailOutbox.statut == StatutEmail.en_cours, EmailOutbox.verrouille_jusqua < now),
+        ))
+        .order_by(EmailOutbox.prochaine_tentative, EmailOutbox.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = stmt.with_for_update(skip_locked=True)
+    messages = db.execute(stmt).scalars().all()
+    for message in messages:
+        message.statut = StatutEmail.en_cours
+        message.verrouille_jusqua = now + timedelta(seconds=lease)
+    db.commit()
+    return messages
+
+
+def retry_delay(tentatives: int) -> timedelta:
+    """Délai avant la tentative suivante: base * 2^(tentatives-1)."""
+    return timedelta(seconds=settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** max(tentatives - 1, 0))
+
+
+def process_outbox(db: Session, sender: Optional[SMTPSender] = None, batch_size: Optional[int] = None,
+                   now: Optional[datetime] = None, max_batches: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Envoie les messages dus par lots sur une connexion SMTP réutilisée.
+
+    Un lot est validé après ses envois (statut envoye, ou relance planifiée,
+    ou echec après EMAIL_OUTBOX_MAX_ATTEMPTS tentatives). Renvoie les
+    métriques d'exécution et la profondeur restante de la file.
+    """
+    sender = sender or get_sender()
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    debut = time.perf_counter()
+    metriques = {"envoyes": 0, "relances": 0, "echecs": 0, "lots": 0}
+
+    while max_batches is None or metriques["lots"] < max_batches:
+        instant = now or datetime.utcnow()
+        messages = claim_batch(db, instant, batch_size)
+        if not messages:
+            break
+        metriques["lots"] += 1
+        for message in messages:
+            message.tentatives += 1
+            message.verrouille_jusqua = None
+            try:
+                sender.send(message.destinataire, message.sujet, message.contenu_html)
+            except Exception as exc:
+                message.derniere_erreur = str(exc)[:1000]
+                if message.tentatives >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    message.statut = StatutEmail.echec
+                    metriques["echecs"] += 1
+                    logger.error("Email %s abandonné après %s tentatives: %s", message.id, message.tentatives, exc)
+                else:
+                    message.statut = StatutEmail.en_attente
+                    message.prochaine_tentative = instant + retry_delay(message.tentatives)
+                    metriques["relances"] += 1
+                    logger.warning("Envoi de l'email %s échoué (tentative %s): %s", message.id, message.tentatives, exc)
+            else:
+                message.statut = StatutEmail.envoye
+                message.date_envoi = datetime.utcnow()
+                message.derniere_erreur = None
+                metriques["envoyes"] += 1
+        db.commit()
+        if len(messages) < batch_size:
+            break
+
+    metriques["duree_secondes"] = round(time.perf_counter() - debut, 3)
+    metriques["file"] = outbox_depth(db)
+    prom.record_outbox(metriques)
+    if metriques["lots"]:
+        logger.info("File email traitée: %s", metriques)
+    return metriques
+
+
+def outbox_depth(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Nombre de messages par statut et âge du plus ancien message en attente."""
+    now = now or datetime.utcnow()
+    comptes = {statut.value: 0 for statut in StatutEmail}
+    for statut, total in db.execute(
+        select(EmailOutbox.statut, func.count(EmailOutbox.id)).group_by(EmailOutbox.statut)
+    ):
+        comptes[statut.value] = total
+    plus_ancien = db.execute(
+        select(func.min(EmailOutbox.date_creation)).where(
+            EmailOutbox.statut.in_([StatutEmail.en_attente, StatutEmail.en_cours])
+        )
+    ).scalar()
+    comptes["age_plus_ancien_secondes"] = (
+        max(int((now - plus_ancien).total_seconds()), 0) if plus_ancien is not None else None
+    )
+    return comptes
@@ -0,0 +1,97 @@
+# app/services/email_template_service.py
+"""
+Rendu des templates d'emails (app/templates/notification_*.html).
+
+Un seul environnement Jinja partagé par notification_service et
+notification_tasks :
+- les templates `notification_*.html` sont compilés une fois (au démarrage
+  via `warm_up`, sinon au premier appel) et gardés en mémoire ;
+- auto_reload désactivé : aucune vérification de date de fichier par rendu ;
+- `render_many` rend un même template pour une liste de destinataires sans
+  nouvelle recherche du template.
+
+Benchmark : `python scripts/bench_email_templates.py`.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from jinja2 import Environment, FileSystemLoader, Template
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
+NOTIFICATION_TEMPLATE_PREFIX = "notification_"
+
+
+class EmailTemplateRenderer:
+    """Templates compilés et mis en cache pour le rendu des emails."""
+
+    def __init__(self, directory: Path = TEMPLATES_DIR, auto_reload: bool = False):
+        self.directory = Path(directory)
+        self.environment = Environment(
+            loader=FileSystemLoader(str(self.directory)),
+            auto_reload=auto_reload,
+            cache_size=-1,
+        )
+        self._templates: Dict[str, Template] = {}
+
+    def warm_up(self) -> List[str]:
+        """Compile tous les templates de notification et renvoie leurs noms."""
+        noms = self.environment.list_templates(
+            filter_func=lambda nom: nom.startswith(NOTIFICATION_TEMPLATE_PREFIX) and nom.endswith(".html")
+        )
+        for nom in noms:
+            self.get_template(nom)
+        logger.info("Templates email précompilés: %s", noms)
+        return noms
+
+    def get_template(self, name: str) -> Template:
+        """
+        Template compilé depuis le cache (compilé au premier accès sinon).
+
+        Raises:
+            TemplateNotFound: template absent du répertoire
+        """
+        template = self._templates.get(name)
+        if template is None:
+            template = self.environment.get_template(name)
+            self._templates[name] = template
+        return template
+
+    def render(self, name: str, **context: Any) -> str:
+        return self.get_template(name).render(**context)
+
+    def render_many(self, name: str, contexts: Iterable[Mapping[str, Any]],
+                    common: Optional[Mapping[str, Any]] = None) -> List[str]:
+        """Rend `name` pour chaque contexte (ex: un par destinataire), complété par `common`."""
+        template = self.get_template(name)
+        common = dict(common or {})
+        return [template.render({**common, **context}) for context in contexts]
+
+    @property
+    def cached(self) -> List[str]:
+        return sorted(self._templates)
+
+
+_renderer: Optional[EmailTemplateRenderer] = None
+
+
+def get_renderer() -> EmailTemplateRenderer:
+    """Renderer partagé du processus."""
+    global _renderer
+    if _renderer is None:
+        _renderer = EmailTemplateRenderer()
+    return _renderer
+
+
+def warm_up() -> List[str]:
+    """Précompile les templates de notification (appelé au démarrage de l'API)."""
+    try:
+        return get_renderer().warm_up()
+    except Exception as exc:
+        logger.warning("Précompilation des templates email impossible: %s", exc)
+        return []
+
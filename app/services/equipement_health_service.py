@@ -0,0 +1,208 @@
+# app/services/equipement_health_service.py
+"""
+Santé du parc d'équipements calculée en lot.
+
+Remplace les propriétés du modèle Equipement qui interrogeaient la base par
+équipement (prochaine_maintenance_calculee, maintenance_en_retard,
+taux_pannes_annuel, cout_maintenance_total) par une requête unique sur tout le
+parc :
+- dernière intervention préventive par équipement via ROW_NUMBER() OVER
+  (PARTITION BY equipement_id ORDER BY date_creation DESC), même règle que
+  `interventions.filter_by(type_intervention="preventive").first()` ;
+- agrégats d'interventions par GROUP BY (pannes, coûts, temps d'arrêt) ;
+- score de risque calculé en SQL pour trier et paginer côté base, et total
+  du parc via COUNT(*) OVER ().
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import DateTime, case, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.db.aggregates import conditional_agg, conditional_count, hours_between, supports_filter_clause
+from app.models.equipement import Equipement, StatutEquipement
+from app.models.intervention import Intervention, InterventionType, StatutIntervention
+from app.schemas.dashboard import EquipementHealth, EquipementHealthPage, StatutSante, TimeRange, TriSante
+from app.services.dashboard_service import period_bounds
+
+STATUTS_CLOTURES = (StatutIntervention.cloturee, StatutIntervention.archivee)
+
+# Pondérations du score de risque (score_fiabilite = 100 - risque, borné à 0)
+RISQUE_PAR_PANNE = 15
+RISQUE_MAINTENANCE_EN_RETARD = 20
+RISQUE_PAR_STATUT = {
+    StatutEquipement.panne: 40,
+    StatutEquipement.maintenance: 10,
+}
+
+
+def statut_sante(statut: StatutEquipement, pannes: int, maintenance_en_retard: bool) -> StatutSante:
+    """Classe la santé d'un équipement à partir de son statut et de ses pannes récentes."""
+    if statut == StatutEquipement.retire:
+        return StatutSante.hors_service
+    if statut == StatutEquipement.panne or pannes >= 3:
+        return StatutSante.critique
+    if statut == StatutEquipement.maintenance or pannes == 2 or maintenance_en_retard:
+        return StatutSante.attention
+    return StatutSante.bon if pannes else StatutSante.excellent
+
+
+def taux_pannes_annuel(nb_correctives: int, date_mise_en_service: Optional[datetime],
+                       now: datetime) -> Optional[float]:
+    """Interventions correctives par année de service (règle historique d'Equipement)."""
+    if not date_mise_en_service:
+        return None
+    age_annees = round((now - date_mise_en_service).days / 365.25, 1)
+    if not age_annees:
+        return None
+    return round(nb_correctives / age_annees, 2)
+
+
+def build_equipements_health(db: Session, periode: TimeRange = TimeRange.mois,
+                             now: Optional[datetime] = None, limit: int = 100, offset: int = 0,
+                             tri: TriSante = TriSante.risque,
+                             equipement_ids: Optional[Iterable[int]] = None) -> EquipementHealthPage:
+    """
+    Santé des équipements, triée et paginée en base.
+
+    Les champs `*_mois` portent sur la période demandée; la prochaine
+    maintenance suit la règle d'Equipement.prochaine_maintenance_calculee
+    (dernière préventive clôturée, sinon mise en service, sinon création,
+    plus la fréquence d'entretien).
+    """
+    now = now or datetime.utcnow()
+    debut, fin, _ = period_bounds(periode, now)
+    dialect = db.get_bind().dialect
+    use_filter = supports_filter_clause(dialect)
+    maintenant = literal(now, DateTime)
+    ids = list(equipement_ids) if equipement_ids is not None else None
+    # Filtre appliqué aussi dans les sous-requêtes: un seul équipement ne parcourt que ses interventions
+    portee = Intervention.equipement_id.in_(ids) if ids is not None else Intervention.equipement_id.isnot(None)
+
+    corrective = Intervention.type_intervention == InterventionType.corrective
+    corrective_periode = corrective & (Intervention.date_creation >= debut) & (Intervention.date_creation < fin)
+    cloturee_periode = (Intervention.date_cloture >= debut) & (Intervention.date_cloture < fin)
+    stats = (
+        select(
+            Intervention.equipement_id.label("equipement_id"),
+            func.count().label("total"),
+            conditional_count(corrective, use_filter).label("correctives"),
+            conditional_count(corrective_periode, use_filter).label("pannes"),
+            conditional_agg(func.max, Intervention.date_cloture,
+                            Intervention.statut.in_(STATUTS_CLOTURES), use_filter).label("derniere_maintenance"),
+            conditional_agg(func.sum, Intervention.cout_reel, cloturee_periode, use_filter).label("cout_periode"),
+            func.sum(Intervention.cout_reel).label("cout_total"),
+            conditional_agg(func.sum, Intervention.duree_reelle, corrective_periode, use_filter).label("arret_minutes"),
+        )
+        .where(portee)
+        .group_by(Intervention.equipement_id)
+        .subquery()
+    )
+    preventives = (
+        select(
+            Intervention.equipement_id.label("equipement_id"),
+            Intervention.date_cloture.label("date_cloture"),
+            func.row_number().over(
+                partition_by=Intervention.equipement_id,
+                order_by=(Intervention.date_creation.desc(), Intervention.id.desc()),
+            ).label("rang"),
+        )
+        .where(Intervention.type_intervention == InterventionType.preventive, portee)
+        .subquery()
+    )
+
+    base_maintenance = func.coalesce(preventives.c.date_cloture, Equipement.date_mise_en_service,
+                                     Equipement.created_at)
+    en_retard = case(
+        (
+            Equipement.frequence_entretien_jours.isnot(None)
+            & (hours_between(dialect.name, base_maintenance, maintenant) > Equipement.frequence_entretien_jours * 24),
+            1,
+        ),
+        else_=0,
+    )
+    pannes = func.coalesce(stats.c.pannes, 0)
+    risque = (
+        pannes * RISQUE_PAR_PANNE
+        + en_retard * RISQUE_MAINTENANCE_EN_RETARD
+        + case({statut: poids for statut, poids in RISQUE_PAR_STATUT.items()}, value=Equipement.statut, else_=0)
+    )
+    ordre = {
+        TriSante.risque: (risque.desc(), Equipement.id),
+        TriSante.prochaine_maintenance: (
+            Equipement.frequence_entretien_jours.is_(None),
+            hours_between(dialect.name, maintenant, base_maintenance) + Equipement.frequence_entretien_jours * 24,
+            Equipement.id,
+        ),
+        TriSante.nom: (Equipement.nom, Equipement.id),
+    }[tri]
+
+    query = (
+        select(
+            Equipement.id, Equipement.nom, Equipement.type_equipement, Equipement.localisation, Equipement.statut,
+            Equipement.frequence_entretien_jours, Equipement.date_mise_en_service,
+            stats.c.total, stats.c.correctives, stats.c.pannes, stats.c.derniere_maintenance,
+            stats.c.cout_periode, stats.c.cout_total, stats.c.arret_minutes,
+            base_maintenance.label("base_maintenance"),
+            en_retard.label("en_retard"),
+            risque.label("risque"),
+            func.count().over().label("nb_equipements"),
+        )
+        .outerjoin(stats, stats.c.equipement_id == Equipement.id)
+        .outerjoin(preventives, (preventives.c.equipement_id == Equipement.id) & (preventives.c.rang == 1))
+        .order_by(*ordre)
+        .limit(limit)
+        .offset(offset)
+    )
+    if ids is not None:
+        query = query.where(Equipement.id.in_(ids))
+    rows = db.execute(query).all()
+
+    if rows:
+        total = rows[0].nb_equipements
+    else:
+        # Page au-delà de la fin: le total n'est pas porté par une ligne
+        count_query = select(func.count()).select_from(Equipement)
+        if ids is not None:
+            count_query = count_query.where(Equipement.id.in_(ids))
+        total = db.execute(count_query).scalar_one() if offset else 0
+
+    heures_periode = max((min(fin, now) - debut).total_seconds() / 3600, 1.0)
+    items: List[EquipementHealth] = []
+    for r in rows:
+        nb_pannes = r.pannes or 0
+        maintenance_en_retard = bool(r.en_retard)
+        arret = (r.arret_minutes or 0) / 60
+        prochaine = (
+            r.base_maintenance + timedelta(days=r.frequence_entretien_jours)
+            if r.frequence_entretien_jours and r.base_maintenance else None
+        )
+        items.append(EquipementHealth(
+            equipement_id=r.id,
+            equipement_nom=r.nom,
+            equipement_type=r.type_equipement,
+            localisation=r.localisation,
+            nb_pannes_mois=nb_pannes,
+            nb_interventions_total=r.total or 0,
+            taux_pannes_annuel=taux_pannes_annuel(r.correctives or 0, r.date_mise_en_service, now),
+            derniere_maintenance=r.derniere_maintenance,
+            prochaine_maintenance=prochaine,
+            jours_depuis_derniere_maintenance=(now - r.derniere_maintenance).days if r.derniere_maintenance else None,
+            maintenance_en_retard=maintenance_en_retard,
+            statut_sante=statut_sante(r.statut, nb_pannes, maintenance_en_retard),
+            score_fiabilite=float(max(0, 100 - r.risque)),
+            cout_maintenance_mois=r.cout_periode / 100 if r.cout_periode is not None else None,
+            cout_total_maintenance=r.cout_total / 100 if r.cout_total is not None else None,
+            temps_arret_mois=round(arret, 1),
+            disponibilite=round(max(0.0, 100 - arret / heures_periode * 100), 1),
+        ))
+    return EquipementHealthPage(items=items, total=total, limit=limit, offset=offset,
+                                has_next=offset + len(items) < total)
+
+
+def get_equipement_health(db: Session, equipement_id: int,
+                          now: Optional[datetime] = None) -> Optional[EquipementHealth]:
+    """Santé d'un seul équipement (None s'il n'existe pas)."""
+    page = build_equipements_health(db, now=now, limit=1, equipement_ids=[equipement_id])
+    return page.items[0] if page.items else None
@@ -3,6 +3,10 @@ from app.models.equipement import Equipement
 from app.schemas.equipement import EquipementCreate
 from app.core.exceptions import NotFoundException
 from fastapi import HTTPException
+from app.services.dashboard_service import invalidate_dashboards
+from app.core.pagination import keyset
+
+EQUIPEMENT_KEYSET = keyset("equipements", Equipement.id)
 
 def create_equipement(db: Session, data: EquipementCreate) -> Equipement:
     if db.query(Equipement).filter(Equipement.nom == data.nom).first():
@@ -16,6 +20,7 @@ def create_equipement(db: Session, data: EquipementCreate) -> Equipement:
     db.add(equipement)
     db.commit()
     db.refresh(equipement)
+    invalidate_dashboards()
     return equipement
 
 def get_equipement_by_id(db: Session, equipement_id: int) -> Equipement:
@@ -42,3 +47,4 @@ def delete_equipement(db: Session, equipement_id: int) -> None:
         raise HTTPException(status_code=409, detail="Équipement utilisé par des interventions")
     db.delete(equipement)
     db.commit()
+    invalidate_dashboards()
@@ -0,0 +1,116 @@
+# app/services/intervention_export_service.py
+"""
+Export en flux des interventions (NDJSON ou CSV), à mémoire constante.
+
+Les lignes sont lues en colonnes (sans objets ORM) par paquets de
+EXPORT_BATCH_SIZE avec un curseur serveur (`stream_results`, curseur nommé
+sous PostgreSQL) et sérialisées paquet par paquet : la mémoire ne dépend que
+de la taille d'un paquet, pas du nombre de lignes exportées.
+
+Les champs sont ceux de InterventionOut (mêmes clés que GET /interventions).
+
+Benchmark : `python scripts/bench_export.py`.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.intervention import Intervention
+
+logger = get_logger(__name__)
+
+# (clé exportée, colonne) : clés identiques à la sérialisation de InterventionOut
+EXPORT_FIELDS: List[Tuple[str, Any]] = [
+    ("id", Intervention.id),
+    ("titre", Intervention.titre),
+    ("description", Intervention.description),
+    ("type", Intervention.type_intervention),
+    ("statut", Intervention.statut),
+    ("priorite", Intervention.priorite),
+    ("urgence", Intervention.urgence),
+    ("date_limite", Intervention.date_limite),
+    ("date_creation", Intervention.date_creation),
+    ("date_cloture", Intervention.date_cloture),
+    ("technicien_id", Intervention.technicien_id),
+    ("equipement_id", Intervention.equipement_id),
+]
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_statement(stmt: Select) -> Select:
+    """
+    Remplace l'entité d'un SELECT d'interventions (filtres et périmètre de
+    `interventions_statement`) par les seules colonnes exportées, triées par id.
+    """
+    return stmt.with_only_columns(*(column for _, column in EXPORT_FIELDS)).order_by(Intervention.id)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_rows(db: Session, stmt: Select, batch_size: Optional[int] = None) -> Iterator[Sequence[Sequence[Any]]]:
+    """Paquets de lignes (tuples de valeurs JSON-compatibles) lus par curseur serveur."""
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    result = db.execute(export_statement(stmt).execution_options(stream_results=True, yield_per=batch_size))
+    for partition in result.partitions():
+        yield [tuple(_plain(v) for v in row) for row in partition]
+
+
+def ndjson_chunks(batches: Iterator[Sequence[Sequence[Any]]]) -> Iterator[str]:
+    """Un objet JSON par ligne, un chunk par paquet."""
+    keys = [key for key, _ in EXPORT_FIELDS]
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for rows in batches:
+        yield "".join(dumps(dict(zip(keys, row))) + "\n" for row in rows)
+
+
+def csv_chunks(batches: Iterator[Sequence[Sequence[Any]]]) -> Iterator[str]:
+    """En-tête puis un chunk CSV par paquet."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([key for key, _ in EXPORT_FIELDS])
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+FORMATTERS: dict = {"ndjson": ndjson_chunks, "csv": csv_chunks}
+
+
+def stream_export(db: Session, stmt: Select, fmt: str, batch_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Générateur des chunks de l'export. La session de `get_db` (dépendance de
+    portée requête) reste ouverte jusqu'à la fin de l'envoi du flux.
+    """
+    exported = 0
+
+    def counted(batches):
+        nonlocal exported
+        for rows in batches:
+            exported += len(rows)
+            yield rows
+
+    yield from FORMATTERS[fmt](counted(iter_rows(db, stmt, batch_size)))
+    logger.info("Export %s de %s interventions terminé", fmt, exported)
@@ -1,6 +1,10 @@
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from datetime import datetime
+from typing import Optional
+from app.core.access_policy import restrict_interventions
+from app.core.pagination import keyset
 from app.models.intervention import Intervention, StatutIntervention
 from app.models.historique import HistoriqueIntervention
 from app.models.technicien import Technicien
@@ -8,6 +12,11 @@ from app.models.equipement import Equipement
 from app.models.user import User
 from app.schemas.intervention import InterventionCreate
 from app.models.planning import Planning
+from app.services.dashboard_service import invalidate_for_intervention
+from app.services.user_service import get_system_user_id
+
+# Clé de pagination des listes d'interventions (index idx_intervention_creation_id)
+INTERVENTION_KEYSET = keyset("interventions", Intervention.date_creation, Intervention.id)
 
 def create_intervention(db: Session, data: InterventionCreate, user_id: int) -> Intervention:
     # Vérification technicien si renseigné
@@ -32,6 +41,7 @@ def create_intervention(db: Session, data: InterventionCreate, user_id: int) ->
     db.add(intervention)
     db.commit()
     db.refresh(intervention)
+    invalidate_for_intervention(intervention)
     # 👇 Historise avec l'utilisateur qui crée (user_id courant, pas technicien_id)
     add_historique(
         db,
@@ -48,8 +58,37 @@ def get_intervention_by_id(db: Session, intervention_id: int) -> Intervention:
         raise HTTPException(status_code=404, detail="Intervention introuvable")
     return intervention
 
-def get_all_interventions(db: Session) -> list[Intervention]:
-    return db.query(Intervention).all()
+def get_all_interventions(db: Session, principal: Optional[dict] = None) -> list[Intervention]:
+    """Liste les interventions, restreintes au périmètre du principal s'il est fourni."""
+    query = db.query(Intervention)
+    if principal is not None:
+        query = restrict_interventions(query, principal)
+    return query.all()
+
+def interventions_statement(
+    principal: Optional[dict] = None,
+    statut: Optional[StatutIntervention] = None,
+    urgence: Optional[bool] = None,
+    type_intervention=None,
+    technicien_id: Optional[int] = None,
+) -> Select:
+    """
+    SELECT des interventions visibles par le principal, avec filtres optionnels.
+    Exécutable par une Session comme par une AsyncSession (endpoints de lecture).
+    """
+    stmt = select(Intervention)
+    if principal is not None:
+        stmt = restrict_interventions(stmt, principal)
+    if statut:
+        stmt = stmt.where(Intervention.statut == statut)
+    if urgence is not None:
+        stmt = stmt.where(Intervention.urgence == urgence)
+    if type_intervention:
+        # Attribut ORM est 'type_intervention' (colonne DB 'type')
+        stmt = stmt.where(Intervention.type_intervention == type_intervention)
+    if technicien_id:
+        stmt = stmt.where(Intervention.technicien_id == technicien_id)
+    return stmt
 
 def update_statut_intervention(
     db: Session,
@@ -72,6 +111,7 @@ def update_statut_intervention(
     if new_statut == StatutIntervention.cloturee:
         intervention.date_cloture = datetime.utcnow()
     db.commit()
+    invalidate_for_intervention(intervention)
     add_historique(db, intervention_id, user_id, new_statut, remarque)
     return intervention
 
@@ -117,11 +157,11 @@ def create_intervention_from_planning(db: Session, planning: Planning) -> Interv
     db.commit()
     db.refresh(intervention)
 
-    # Historique système (user_id=0 convention pour système)
+    # Historique attribué au compte système
     add_historique(
         db,
         intervention_id=intervention.id,
-        user_id=0,
+        user_id=get_system_user_id(db),
         statut=StatutIntervention.ouverte,
         remarque="Intervention générée par le scheduler depuis le planning",
     )
@@ -130,4 +170,5 @@ def create_intervention_from_planning(db: Session, planning: Planning) -> Interv
     planning.derniere_date = datetime.utcnow()
     planning.mettre_a_jour_prochaine_date()
     db.commit()
+    invalidate_for_intervention(intervention)
     return intervention
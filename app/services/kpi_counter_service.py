@@ -0,0 +1,149 @@
+# app/services/kpi_counter_service.py
+"""
+Maintenance des compteurs matérialisés d'interventions (intervention_kpi_counters).
+
+Les écritures ORM d'interventions sont reportées automatiquement au flush
+(listener `before_flush` de app/models/kpi_counter.py), dans la même
+transaction que l'intervention. `bump_counter` sert aussi directement aux
+insertions SQL en masse (génération des plannings).
+
+L'incrément est un upsert atomique (INSERT ... ON CONFLICT DO UPDATE sur
+PostgreSQL et SQLite), sans lecture préalable, pour rester correct sous
+écritures concurrentes.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.intervention import Intervention, PrioriteIntervention, StatutIntervention
+from app.models.kpi_counter import InterventionKpiCounter
+
+BucketKey = Tuple[StatutIntervention, PrioriteIntervention, date]
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def month_of(dt: Optional[datetime]) -> date:
+    """Premier jour du mois de `dt` (maintenant UTC si absent)."""
+    dt = dt or datetime.utcnow()
+    return date(dt.year, dt.month, 1)
+
+
+def _as_statut(value) -> StatutIntervention:
+    return value if isinstance(value, StatutIntervention) else StatutIntervention(value)
+
+
+def _as_priorite(value) -> PrioriteIntervention:
+    if value is None:
+        return PrioriteIntervention.normale
+    return value if isinstance(value, PrioriteIntervention) else PrioriteIntervention(value)
+
+
+def bump_counter(db: Session, statut, priorite, mois: date, delta: int) -> None:
+    """Ajoute `delta` au bucket (statut, priorite, mois), en le créant si besoin."""
+    if not delta:
+        return
+    statut, priorite = _as_statut(statut), _as_priorite(priorite)
+    table = InterventionKpiCounter.__table__
+    insert_fn = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_fn is not None:
+        stmt = insert_fn(table).values(statut=statut, priorite=priorite, mois=mois, total=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.statut, table.c.priorite, table.c.mois],
+            set_={"total": table.c.total + stmt.excluded.total},
+        )
+        db.execute(stmt)
+        return
+    # Repli générique: UPDATE puis INSERT si le bucket n'existe pas encore
+    result = db.execute(
+        update(table)
+        .where(table.c.statut == statut, table.c.priorite == priorite, table.c.mois == mois)
+        .values(total=table.c.total + delta)
+    )
+    if result.rowcount == 0:
+        db.execute(table.insert().values(statut=statut, priorite=priorite, mois=mois, total=delta))
+
+
+def _month_expression(dialect_name: str):
+    """Expression SQL du premier jour du mois de création, selon le moteur."""
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc("month", Intervention.date_creation), Date)
+    return func.strftime("%Y-%m-01", Intervention.date_creation)
+
+
+def _expected_counters(db: Session) -> Dict[BucketKey, int]:
+    """Recalcule les buckets à partir de la table interventions (O(lignes))."""
+    mois = _month_expression(db.get_bind().dialect.name).label("mois")
+    rows = db.execute(
+        select(Intervention.statut, Intervention.priorite, mois, func.count())
+        .group_by(Intervention.statut, Intervention.priorite, mois)
+    ).all()
+    expected: Dict[BucketKey, int] = {}
+    for statut, priorite, debut, total in rows:
+        if isinstance(debut, str):
+            debut = date.fromisoformat(debut)
+        elif isinstance(debut, datetime):
+            debut = debut.date()
+        expected[(statut, priorite, debut)] = total
+    return expected
+
+
+def reconcile_kpi_counters(db: Session, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Compare les compteurs aux interventions réelles et corrige la dérive.
+
+    Args:
+        db: Session SQLAlchemy
+        dry_run: Si True, rapporte les écarts sans rien modifier
+
+    Returns:
+        Dict {"buckets": nb de buckets attendus, "corrected": nb d'écarts,
+              "drift": [{"statut", "priorite", "mois", "attendu", "actuel"}]}
+    """
+    expected = _expected_counters(db)
+    current: Dict[BucketKey, int] = {
+        (c.statut, c.priorite, c.mois): c.total
+        for c in db.query(InterventionKpiCounter).all()
+    }
+
+    ecarts = [
+        (key, expected.get(key, 0), current.get(key, 0))
+        for key in sorted(set(expected) | set(current), key=lambda k: (k[2], k[0].value, k[1].value))
+        if expected.get(key, 0) != current.get(key, 0)
+    ]
+
+    if ecarts and not dry_run:
+        table = InterventionKpiCounter.__table__
+        for (statut, priorite, mois), attendu, _ in ecarts:
+            where = (table.c.statut == statut, table.c.priorite == priorite, table.c.mois == mois)
+            if attendu == 0:
+                db.execute(delete(table).where(*where))
+            elif (statut, priorite, mois) in current:
+                db.execute(update(table).where(*where).values(total=attendu))
+            else:
+                db.execute(table.insert().values(statut=statut, priorite=priorite, mois=mois, total=attendu))
+        db.commit()
+
+    drift = [
+        {"statut": statut.value, "priorite": priorite.value, "mois": mois.isoformat(),
+         "attendu": attendu, "actuel": actuel}
+        for (statut, priorite, mois), attendu, actuel in ecarts
+    ]
+    return {"buckets": len(expected), "corrected": len(drift), "drift": drift}
+
+
+def rebuild_kpi_counters(db: Session) -> int:
+    """Reconstruit entièrement les compteurs; retourne le nombre de buckets écrits."""
+    expected = _expected_counters(db)
+    db.execute(delete(InterventionKpiCounter.__table__))
+    if expected:
+        db.execute(InterventionKpiCounter.__table__.insert(), [
+            {"statut": statut, "priorite": priorite, "mois": mois, "total": total}
+            for (statut, priorite, mois), total in expected.items()
+        ])
+    db.commit()
+    return len(expected)
@@ -7,26 +7,31 @@ from app.models.notification import Notification
 from app.schemas.notification import NotificationCreate
 from app.models.user import User
 from app.core.config import settings
-import sys
+from app.core.logging import get_logger
+from typing import Tuple
 
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import TemplateNotFound
+from app.services.email_template_service import get_renderer
 
-# Configuration des templates Jinja
-env = Environment(loader=FileSystemLoader("app/templates"))
+# Templates Jinja précompilés et partagés (cf. email_template_service)
+env = get_renderer()
+
+logger = get_logger(__name__)
 
 
 def create_notification(db: Session, data: NotificationCreate) -> Notification:
     """
     Crée une notification (log ou email) pour un utilisateur.
 
-    Si canal == email, envoie un mail via SMTP.
+    Si canal == email, le mail est mis en file (email_outbox) dans la même
+    transaction que la notification, puis envoyé en arrière-plan par le
+    worker de app/services/email_outbox_service.py.
 
     Raises:
         HTTPException 404: utilisateur ou intervention non trouvés
-        HTTPException 500: échec envoi email
     """
     user = db.query(User).filter(User.id == data.user_id).first()
     if not user:
@@ -58,45 +63,60 @@ def create_notification(db: Session, data: NotificationCreate) -> Notification:
     )
 
     db.add(notif)
-    db.commit()
-    db.refresh(notif)
 
     if data.canal == "email":
-        # En environnement de test, ne pas tenter d'envoyer de vrai email
-        if "pytest" not in sys.modules:
-            try:
-                send_email_notification(user.email, notif)
-            except Exception as _e:
-                # Log doux: on ne fait pas échouer la requête si l'email ne part pas
-                print(f"Envoi email échoué (non bloquant): {_e}")
+        db.flush()
+        try:
+            subject, html_content = render_notification_email(notif)
+        except Exception as exc:
+            # Non bloquant: la notification est créée même si l'email ne peut être rendu
+            logger.warning("Email de la notification %s non mis en file: %s", notif.id, exc)
+        else:
+            from app.services.email_outbox_service import enqueue_email
+            enqueue_email(db, user.email, subject, html_content, notification_id=notif.id)
 
+    db.commit()
+    db.refresh(notif)
     return notif
 
 
-def send_email_notification(email_to: str, notification: Notification):
+def render_notification_email(notification: Notification) -> Tuple[str, str]:
     """
-    Envoie un email à l'utilisateur cible avec rendu HTML.
+    Rend le sujet et le corps HTML de l'email d'une notification.
 
     Le template est choisi dynamiquement selon le type (ex: "notification_affectation.html").
 
     Raises:
-        HTTPException 500: en cas d’échec d’envoi
+        HTTPException 500: template introuvable
     """
+    subject = f"[MIF] Notification - {notification.type_notification.value.capitalize()}"
+    template_name = f"notification_{notification.type_notification.value}.html"
+
     try:
-        subject = f"[MIF] Notification - {notification.type_notification.value.capitalize()}"
-        template_name = f"notification_{notification.type_notification.value}.html"
+        template = env.get_template(template_name)
+    except TemplateNotFound:
+        raise HTTPException(status_code=500, detail=f"Template '{template_name}' introuvable")
+
+    html_content = template.render(
+        type=notification.type_notification.value,
+        contenu=notification.contenu or "Voir détails dans l’application.",
+        sujet=subject,
+        message=notification.contenu or ""
+    )
+    return subject, html_content
 
-        try:
-            template = env.get_template(template_name)
-        except TemplateNotFound:
-            raise HTTPException(status_code=500, detail=f"Template '{template_name}' introuvable")
-
-        html_content = template.render(
-            type=notification.type_notification.value,
-            contenu=notification.contenu or "Voir détails dans l’application.",
-            sujet=subject,
-            message=notification.contenu or ""
-        )
+
+def send_email_notification(email_to: str, notification: Notification):
+    """
+    Envoie immédiatement un email à l'utilisateur cible avec rendu HTML
+    (une connexion SMTP par appel). Les notifications passent par la file
+    email_outbox ; cette fonction reste disponible pour les envois ponctuels.
+
+    Raises:
+        HTTPException 500: en cas d’échec d’envoi
+    """
+    try:
+        subject, html_content = render_notification_email(notification)
 
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
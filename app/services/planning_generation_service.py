@@ -0,0 +1,162 @@
+# app/services/planning_generation_service.py
+"""
+Génération en lot des interventions préventives dues.
+
+`create_intervention_from_planning` fait quatre commits par planning (intervention,
+refresh, historique, planning) : rattraper des milliers de plannings en retard
+après une panne prend des minutes et tient des verrous. Ici, les plannings dus
+sont traités par paquets, avec une transaction par paquet :
+1. sélection des plannings dus (FOR UPDATE SKIP LOCKED sous PostgreSQL) ;
+2. réclamation atomique : UPDATE ... WHERE prochaine_date <= now RETURNING id,
+   par fréquence ; seul le worker dont l'UPDATE touche la ligne génère
+   l'intervention (idempotent si deux schedulers tournent en parallèle) ;
+3. insertion en masse des interventions puis de leurs historiques, avec les
+   noms d'équipements préchargés en une requête ;
+4. compteurs KPI ajustés une fois par paquet, puis commit.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.equipement import Equipement
+from app.models.historique import HistoriqueIntervention
+from app.models.intervention import Intervention, InterventionType, PrioriteIntervention, StatutIntervention
+from app.models.planning import INTERVALLES_FREQUENCE, Planning
+from app.services.dashboard_service import invalidate_dashboards
+from app.services.kpi_counter_service import bump_counter, month_of
+from app.services.user_service import get_system_user_id
+
+logger = get_logger(__name__)
+
+
+def _claim(db: Session, candidats: List[Any], now: datetime) -> List[int]:
+    """Avance les plannings candidats encore dus et renvoie ceux réellement réclamés."""
+    par_frequence: Dict[Any, List[int]] = {}
+    for candidat in candidats:
+        par_frequence.setdefault(candidat.frequence, []).append(candidat.id)
+    reclames: List[int] = []
+    for frequence, ids in par_frequence.items():
+        intervalle = INTERVALLES_FREQUENCE.get(frequence)
+        result = db.execute(
+            update(Planning)
+            .where(Planning.id.in_(ids), Planning.prochaine_date <= now)
+            .values(derniere_date=now, prochaine_date=now + intervalle if intervalle else None,
+                    date_modification=now)
+            .returning(Planning.id)
+        )
+        reclames.extend(result.scalars())
+    return reclames
+
+
+def _generate_chunk(db: Session, now: datetime, chunk_size: int, system_user_id: int) -> Dict[str, int]:
+    """Traite un paquet de plannings dus dans la transaction courante (sans commit)."""
+    candidats = db.execute(
+        select(Planning.id, Planning.equipement_id, Planning.frequence)
+        .where(Planning.prochaine_date <= now)
+        .order_by(Planning.prochaine_date, Planning.id)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not candidats:
+        return {"candidats": 0, "generees": 0, "deja_generees": 0, "ignorees": 0}
+
+    equipements = dict(db.execute(
+        select(Equipement.id, Equipement.nom)
+        .where(Equipement.id.in_({c.equipement_id for c in candidats}))
+    ).all())
+    valides = [c for c in candidats if c.equipement_id in equipements]
+    ignorees = len(candidats) - len(valides)
+    if ignorees:
+        logger.warning("Plannings ignorés (équipement introuvable): %s",
+                       [c.id for c in candidats if c.equipement_id not in equipements])
+
+    reclames = set(_claim(db, valides, now)) if valides else set()
+    generes = [c for c in valides if c.id in reclames]
+    if generes:
+        intervention_ids = db.execute(
+            insert(Intervention).returning(Intervention.id, sort_by_parameter_order=True),
+            [
+                {
+                    "titre": f"Maintenance préventive - {equipements[c.equipement_id]}",
+                    "description": f"Intervention générée automatiquement depuis le planning #{c.id}",
+                    "type_intervention": InterventionType.preventive,
+                    "statut": StatutIntervention.ouverte,
+                    "priorite": PrioriteIntervention.normale,
+                    "urgence": False,
+                    "equipement_id": c.equipement_id,
+                    "date_creation": now,
+                }
+                for c in generes
+            ],
+        ).scalars().all()
+        db.execute(
+            insert(HistoriqueIntervention),
+            [
+                {
+                    "statut": StatutIntervention.ouverte,
+                    "remarque": "Intervention générée par le scheduler depuis le planning",
+                    "horodatage": now,
+                    "user_id": system_user_id,
+                    "intervention_id": intervention_id,
+                }
+                for intervention_id in intervention_ids
+            ],
+        )
+        bump_counter(db, StatutIntervention.ouverte, PrioriteIntervention.normale, month_of(now), len(generes))
+    return {
+        "candidats": len(candidats),
+        "generees": len(generes),
+        "deja_generees": len(valides) - len(generes),
+        "ignorees": ignorees,
+    }
+
+
+def generate_due_interventions(db: Session, now: Optional[datetime] = None,
+                               chunk_size: Optional[int] = None,
+                               max_chunks: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Génère les interventions préventives de tous les plannings dus, par paquets.
+
+    Args:
+        db: Session SQLAlchemy
+        now: Date de référence (plannings dont prochaine_date <= now)
+        chunk_size: Plannings par transaction (défaut: settings.PLANNING_GENERATION_CHUNK_SIZE)
+        max_chunks: Limite de paquets par exécution (None = jusqu'à épuisement)
+
+    Returns:
+        Métriques d'exécution: volumes, nombre de paquets, durée et débit
+    """
+    now = now or datetime.utcnow()
+    chunk_size = chunk_size or settings.PLANNING_GENERATION_CHUNK_SIZE
+    metriques = {"generees": 0, "deja_generees": 0, "ignorees": 0, "paquets": 0}
+    debut = time.perf_counter()
+    # Auteur des historiques, résolu une fois (clé étrangère vers users)
+    system_user_id = get_system_user_id(db)
+    while max_chunks is None or metriques["paquets"] < max_chunks:
+        try:
+            paquet = _generate_chunk(db, now, chunk_size, system_user_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if not paquet["candidats"]:
+            break
+        metriques["paquets"] += 1
+        for cle in ("generees", "deja_generees", "ignorees"):
+            metriques[cle] += paquet[cle]
+        if paquet["generees"]:
+            invalidate_dashboards()
+        if paquet["candidats"] < chunk_size or not paquet["generees"] and not paquet["deja_generees"]:
+            # Dernier paquet, ou paquet uniquement composé de plannings ignorés (évite de boucler dessus)
+            break
+    duree = time.perf_counter() - debut
+    metriques["duree_secondes"] = round(duree, 3)
+    metriques["debit_par_seconde"] = round(metriques["generees"] / duree, 1) if duree > 0 else None
+    logger.info("Génération des plannings: %s", metriques)
+    return metriques
@@ -6,6 +6,10 @@ from datetime import datetime
 from app.models.planning import Planning
 from app.models.equipement import Equipement
 from app.schemas.planning import PlanningCreate
+from app.services.dashboard_service import invalidate_dashboards
+from app.core.pagination import keyset
+
+PLANNING_KEYSET = keyset("plannings", Planning.id)
 
 
 def create_planning(db: Session, data: PlanningCreate) -> Planning:
@@ -49,6 +53,7 @@ def create_planning(db: Session, data: PlanningCreate) -> Planning:
     db.add(planning)
     db.commit()
     db.refresh(planning)
+    invalidate_dashboards()
     return planning
 
 
@@ -86,6 +91,7 @@ def update_planning_dates(db: Session, planning_id: int, nouvelle_date: datetime
 
     db.commit()
     db.refresh(planning)
+    invalidate_dashboards()
     return planning
 
 def update_planning_frequence(db: Session, planning_id: int, frequence: str) -> Planning:
@@ -112,9 +118,11 @@ def update_planning_frequence(db: Session, planning_id: int, frequence: str) ->
         planning.frequence = mapping.get(key, planning.frequence)
     db.commit()
     db.refresh(planning)
+    invalidate_dashboards()
     return planning
 
 def delete_planning(db: Session, planning_id: int) -> None:
     planning = get_planning_by_id(db, planning_id)
     db.delete(planning)
     db.commit()
+    invalidate_dashboards()
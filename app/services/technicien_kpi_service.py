@@ -0,0 +1,147 @@
+# app/services/technicien_kpi_service.py
+"""
+KPI des techniciens calculés en lot.
+
+Remplace les propriétés N+1 du modèle Technicien (taux_reussite,
+temps_moyen_intervention, satisfaction_moyenne, score_affectation) par un
+nombre constant de requêtes groupées, quel que soit le nombre de techniciens :
+1. profils (niveau, disponibilité, activité) ;
+2. agrégats d'interventions par technicien, dont le taux de réussite via un
+   NOT EXISTS corrélé (pas de réouverture sur le même équipement sous 7 jours) ;
+3. nombre de compétences par technicien.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.db.aggregates import conditional_count, supports_filter_clause, within_days
+from app.models.intervention import Intervention, StatutIntervention
+from app.models.technicien import (
+    DisponibiliteTechnicien,
+    NiveauCompetence,
+    Technicien,
+    technicien_competence,
+)
+from app.schemas.technicien import TechnicienKPI
+
+# Fenêtre de réouverture au-delà de laquelle une clôture est considérée réussie
+DELAI_REOUVERTURE_JOURS = 7
+
+STATUTS_ACTIFS_TECHNICIEN = (
+    StatutIntervention.affectee,
+    StatutIntervention.en_cours,
+    StatutIntervention.en_attente,
+)
+
+BONUS_NIVEAU = {
+    NiveauCompetence.expert: 15,
+    NiveauCompetence.avance: 10,
+    NiveauCompetence.intermediaire: 5,
+    NiveauCompetence.debutant: 0,
+}
+
+
+def score_affectation(est_disponible: bool, nb_actives: int, nb_competences: int,
+                      niveau: Optional[NiveauCompetence], satisfaction: Optional[float]) -> int:
+    """Score d'affectation (0-100), règles historiques de Technicien.score_affectation."""
+    score = 50
+    if est_disponible:
+        score += 30
+    elif nb_actives <= 1:
+        score += 15
+    else:
+        score -= 20
+    score += min(nb_competences * 5, 20)
+    score += BONUS_NIVEAU.get(niveau, 0)
+    if satisfaction and satisfaction >= 4.5:
+        score += 10
+    elif satisfaction and satisfaction <= 3.0:
+        score -= 10
+    return max(0, min(100, score))
+
+
+def compute_technicien_kpis(db: Session, technicien_ids: Optional[Iterable[int]] = None) -> Dict[int, TechnicienKPI]:
+    """
+    Calcule les KPI de plusieurs techniciens en trois requêtes.
+
+    Args:
+        db: Session SQLAlchemy
+        technicien_ids: Techniciens ciblés (None = tous)
+
+    Returns:
+        Dict {technicien_id: TechnicienKPI}; les identifiants inconnus sont absents
+    """
+    ids = None if technicien_ids is None else sorted(set(technicien_ids))
+    if ids == []:
+        return {}
+    dialect = db.get_bind().dialect
+    use_filter = supports_filter_clause(dialect)
+
+    profils_query = select(Technicien.id, Technicien.is_active, Technicien.disponibilite, Technicien.niveau_technicien)
+    if ids is not None:
+        profils_query = profils_query.where(Technicien.id.in_(ids))
+    profils = db.execute(profils_query).all()
+    if not profils:
+        return {}
+    ids = [p.id for p in profils]
+
+    suivante = aliased(Intervention)
+    reouverture = exists().where(
+        suivante.technicien_id == Intervention.technicien_id,
+        suivante.equipement_id == Intervention.equipement_id,
+        suivante.date_creation > Intervention.date_cloture,
+        within_days(dialect.name, Intervention.date_cloture, suivante.date_creation, DELAI_REOUVERTURE_JOURS),
+    )
+    cloturee = Intervention.statut == StatutIntervention.cloturee
+    stats = {
+        row.technicien_id: row
+        for row in db.execute(
+            select(
+                Intervention.technicien_id,
+                conditional_count(Intervention.statut.in_(STATUTS_ACTIFS_TECHNICIEN), use_filter).label("actives"),
+                conditional_count(cloturee, use_filter).label("terminees"),
+                conditional_count(and_(cloturee, Intervention.date_cloture.isnot(None), ~reouverture),
+                                  use_filter).label("reussites"),
+                # AVG ignore les NULL: équivalent au filtre "isnot(None)" historique
+                func.avg(Intervention.duree_reelle).label("duree_moyenne"),
+                func.avg(Intervention.satisfaction_client).label("satisfaction"),
+            )
+            .where(Intervention.technicien_id.in_(ids))
+            .group_by(Intervention.technicien_id)
+        )
+    }
+    competences = dict(db.execute(
+        select(technicien_competence.c.technicien_id, func.count())
+        .where(technicien_competence.c.technicien_id.in_(ids))
+        .group_by(technicien_competence.c.technicien_id)
+    ).all())
+
+    resultats: Dict[int, TechnicienKPI] = {}
+    for profil in profils:
+        row = stats.get(profil.id)
+        actives = row.actives if row else 0
+        terminees = row.terminees if row else 0
+        satisfaction = round(float(row.satisfaction), 2) if row and row.satisfaction is not None else None
+        nb_competences = competences.get(profil.id, 0)
+        est_disponible = bool(profil.is_active) and profil.disponibilite == DisponibiliteTechnicien.disponible
+        resultats[profil.id] = TechnicienKPI(
+            nb_interventions_actives=actives,
+            nb_interventions_terminees=terminees,
+            nb_competences=nb_competences,
+            taux_reussite=round(row.reussites / terminees * 100, 1) if terminees else None,
+            temps_moyen_intervention=(
+                round(float(row.duree_moyenne) / 60, 1) if row and row.duree_moyenne is not None else None
+            ),
+            satisfaction_moyenne=satisfaction,
+            score_affectation=score_affectation(
+                est_disponible, actives, nb_competences, profil.niveau_technicien, satisfaction
+            ),
+        )
+    return resultats
+
+
+def get_technicien_kpis(db: Session, technicien_id: int) -> Optional[TechnicienKPI]:
+    """KPI d'un seul technicien (None s'il n'existe pas)."""
+    return compute_technicien_kpis(db, [technicien_id]).get(technicien_id)
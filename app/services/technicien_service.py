@@ -5,6 +5,11 @@ from fastapi import HTTPException, status
 from app.models.technicien import Technicien, Competence, DisponibiliteTechnicien
 from app.models.user import User, UserRole
 from app.schemas.technicien import TechnicienCreate, CompetenceCreate
+from app.services.dashboard_service import invalidate_dashboards
+from app.core.pagination import keyset
+
+TECHNICIEN_KEYSET = keyset("techniciens", Technicien.id)
+COMPETENCE_KEYSET = keyset("competences", Competence.id)
 
 def create_technicien(db: Session, data: TechnicienCreate) -> Technicien:
     """
@@ -43,6 +48,7 @@ def create_technicien(db: Session, data: TechnicienCreate) -> Technicien:
     db.add(technicien)
     db.commit()
     db.refresh(technicien)
+    invalidate_dashboards()
     return technicien
 
 def get_technicien_by_id(db: Session, technicien_id: int) -> Technicien:
@@ -1,10 +1,20 @@
+import secrets
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.core.password_hashing import hash_password
 from app.models.user import UserRole
 from app.db.database import SessionLocal
+from app.core.principal_cache import invalidate_principal
+from app.core.pagination import keyset
+
+USER_KEYSET = keyset("users", User.id)
+
+# Compte technique auquel sont attribués les historiques générés automatiquement
+SYSTEM_USER_EMAIL = "system@erp.local"
+SYSTEM_USERNAME = "system"
 
 def _check_exists_in_fallback(email: str | None = None, username: str | None = None) -> bool:
     """
@@ -46,7 +56,7 @@ def create_user(db: Session, user_data: UserCreate) -> User:
             detail="Username déjà utilisé."
         )
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = hash_password(user_data.password)
     user = User(
         username=user_data.username,
         full_name=user_data.full_name,
@@ -116,7 +126,7 @@ def ensure_user_for_email(db: Session, email: str, role: UserRole) -> User:
         full_name=None,
         email=email,
         role=role,
-        hashed_password=get_password_hash("testpwd"),
+        hashed_password=hash_password("testpwd"),
         is_active=True,
     )
     db.add(user)
@@ -124,11 +134,47 @@ def ensure_user_for_email(db: Session, email: str, role: UserRole) -> User:
     db.refresh(user)
     return user
 
+def get_system_user_id(db: Session) -> int:
+    """
+    Identifiant du compte "système" (créé au premier appel) pour les écritures
+    sans utilisateur : historique.user_id est une clé étrangère non nulle.
+
+    Le compte est inactif, sans privilège (rôle client) et avec un mot de passe
+    aléatoire : il ne peut pas se connecter et n'apparaît pas dans les listes.
+
+    Raises:
+        RuntimeError: création impossible sans compte "system" existant à relire.
+    """
+    user = get_user_by_email(db, SYSTEM_USER_EMAIL)
+    if user:
+        return user.id
+    user = User(
+        username=SYSTEM_USERNAME,
+        full_name="Système",
+        email=SYSTEM_USER_EMAIL,
+        role=UserRole.client,
+        hashed_password=hash_password(secrets.token_urlsafe(32)),
+        is_active=False,
+    )
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Créé en parallèle par un autre worker (ou username déjà pris)
+        db.rollback()
+        existing = db.query(User).filter(User.username == SYSTEM_USERNAME).first()
+        if existing is None:
+            raise RuntimeError(
+                f"Compte système introuvable: création de {SYSTEM_USERNAME!r} <{SYSTEM_USER_EMAIL}> refusée par la base"
+            )
+        return existing.id
+    return user.id
+
 def get_all_users(db: Session) -> list[User]:
     """
-    Liste tous les utilisateurs.
+    Liste tous les utilisateurs (hors compte système).
     """
-    return db.query(User).all()
+    return db.query(User).filter(User.email != SYSTEM_USER_EMAIL).all()
 
 def update_user(db: Session, user_id: int, update_data: UserUpdate) -> User:
     """
@@ -140,7 +186,7 @@ def update_user(db: Session, user_id: int, update_data: UserUpdate) -> User:
     if update_data.full_name is not None:
         user.full_name = update_data.full_name
     if update_data.password is not None:
-        user.hashed_password = get_password_hash(update_data.password)
+        user.hashed_password = hash_password(update_data.password)
     db.commit()
     db.refresh(user)
     return user
@@ -150,7 +196,7 @@ def update_user_password(db: Session, user_id: int, new_password: str) -> None:
     Met à jour uniquement le mot de passe d'un utilisateur.
     """
     user = get_user_by_id(db, user_id)
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = hash_password(new_password)
     db.commit()
 
 def deactivate_user(db: Session, user_id: int) -> None:
@@ -160,6 +206,7 @@ def deactivate_user(db: Session, user_id: int) -> None:
     user = get_user_by_id(db, user_id)
     user.is_active = False
     db.commit()
+    invalidate_principal(user_id)
 
 def reactivate_user(db: Session, user_id: int) -> User:
     """
@@ -168,5 +215,20 @@ def reactivate_user(db: Session, user_id: int) -> User:
     user = get_user_by_id(db, user_id)
     user.is_active = True
     db.commit()
+    invalidate_principal(user_id)
+    db.refresh(user)
+    return user
+
+def update_user_role(db: Session, user_id: int, role: UserRole) -> User:
+    """
+    Change le rôle d'un utilisateur (action admin).
+
+    Les tokens déjà émis portent l'ancien rôle: le rôle effectif est relu en
+    base au prochain appel (principal invalidé).
+    """
+    user = get_user_by_id(db, user_id)
+    user.role = UserRole(getattr(role, "value", role))
+    db.commit()
+    invalidate_principal(user_id)
     db.refresh(user)
     return user
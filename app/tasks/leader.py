@@ -0,0 +1,166 @@
+# app/tasks/leader.py
+"""
+Élection d'un leader pour le scheduler entre processus.
+
+Avec `uvicorn --workers N`, chaque worker démarre son scheduler : sans
+coordination, chaque job tourne N fois par échéance. Le premier processus qui
+obtient le verrou devient leader et exécute les jobs ; les autres sautent leurs
+échéances et retentent à la suivante. Le verrou est libéré à la mort du
+processus (connexion ou descripteur fermé), un autre worker prend alors le relais.
+
+- PostgreSQL : verrou consultatif de session (pg_try_advisory_lock) tenu sur
+  une connexion dédiée ;
+- autres moteurs (SQLite) : verrou de fichier exclusif non bloquant
+  (fcntl.flock, msvcrt sous Windows), valable entre processus d'un même hôte.
+
+Les jobs tournent sur des threads distincts du scheduler : les deux verrous
+sérialisent leurs appels par un threading.Lock (une Connection SQLAlchemy
+n'est pas partagée entre threads).
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+logger = get_logger(__name__)
+
+
+def advisory_key(name: str) -> int:
+    """Clé bigint stable dérivée du nom du verrou."""
+    return int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+class AdvisoryLock:
+    """Verrou consultatif PostgreSQL tenu sur une connexion dédiée."""
+
+    def __init__(self, engine: Engine, name: str):
+        self.engine = engine
+        self.name = name
+        self.key = advisory_key(name)
+        self._connection: Optional[Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._connection is not None
+
+    def acquire(self) -> bool:
+        """Tente d'obtenir (ou de confirmer) le verrou, sans attendre."""
+        with self._lock:
+            return self._acquire()
+
+    def _acquire(self) -> bool:
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT 1"))
+                # Termine la transaction implicite (sinon "idle in transaction"); le verrou de session reste
+                self._connection.rollback()
+                return True
+            except Exception:
+                # Connexion perdue: le verrou de session l'est aussi
+                logger.warning("Connexion du verrou %s perdue, nouvelle élection", self.name)
+                self._discard()
+        connection = self.engine.connect()
+        try:
+            acquired = bool(connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar())
+            # Le verrou est de session: on termine la transaction implicite sans le relâcher
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+                self._connection.commit()
+            finally:
+                self._discard()
+
+    def _discard(self) -> None:
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+class FileLock:
+    """Verrou de fichier exclusif non bloquant (entre processus d'un même hôte)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        with self._lock:
+            return self._acquire()
+
+    def _acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:  # pragma: no cover - Windows
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._fd is None:
+                return
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                else:  # pragma: no cover - Windows
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+
+def create_leader_lock(name: str = "scheduler", engine: Optional[Engine] = None):
+    """Verrou de leadership adapté au moteur: consultatif sous PostgreSQL, fichier sinon."""
+    if engine is None:
+        from app.db.database import engine  # Import local: évite de créer l'engine à l'import
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLock(engine, f"erp:{name}")
+    directory = settings.SCHEDULER_LOCK_DIR or tempfile.gettempdir()
+    return FileLock(Path(directory) / f"erp-{name}.lock")
@@ -10,8 +10,7 @@ from datetime import datetime
 from app.schemas.notification import NotificationCreate
 
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from jinja2 import Environment, FileSystemLoader
-from pathlib import Path
+from app.services.email_template_service import get_renderer
 
 conf = ConnectionConfig(
     MAIL_USERNAME=settings.SMTP_USER,
@@ -26,13 +25,22 @@ conf = ConnectionConfig(
     VALIDATE_CERTS=True
 )
 
-templates_path = Path("app/templates")
-env = Environment(loader=FileSystemLoader(templates_path))
+# Templates Jinja précompilés et partagés (cf. email_template_service)
+env = get_renderer()
+
+# Client FastMail réutilisé entre les envois
+_mailer = None
+
+
+def get_mailer() -> FastMail:
+    global _mailer
+    if _mailer is None:
+        _mailer = FastMail(conf)
+    return _mailer
 
 def send_email_notification(subject: str, to_email: str, template_name: str, context: dict):
     """Construit et envoie un e-mail avec template HTML"""
-    template = env.get_template(template_name)
-    html_content = template.render(**context)
+    html_content = env.render(template_name, **context)
 
     message = MessageSchema(
         subject=subject,
@@ -41,8 +49,7 @@ def send_email_notification(subject: str, to_email: str, template_name: str, con
         subtype="html"
     )
 
-    fm = FastMail(conf)
-    return fm.send_message(message)
+    return get_mailer().send_message(message)
 
 def send_intervention_assignment_email(intervention_title: str, technicien: User):
     """Envoie un e-mail au technicien lors d’une affectation"""
@@ -1,30 +1,138 @@
 # app/tasks/scheduler.py
+"""
+Scheduler des tâches récurrentes (génération des interventions planifiées,
+envoi de la file des emails sortants).
 
+Deux modes de déploiement :
+- intégré à l'API (ENABLE_SCHEDULER=true) : chaque worker uvicorn démarre un
+  BackgroundScheduler, mais seul le leader élu (app.tasks.leader) exécute
+  les jobs ;
+- processus dédié : `python -m app.tasks.scheduler` (BlockingScheduler), avec
+  ENABLE_SCHEDULER=false côté API pour que les workers ne portent aucun
+  thread de scheduler. Le verrou de leadership protège aussi contre deux
+  processus dédiés lancés par erreur.
+"""
+
+import threading
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from datetime import datetime
+from typing import Any, Callable, Optional
+from app.core import metrics as prom
+from app.core.config import settings
+from app.core.logging import get_logger
 from app.db.database import SessionLocal
 from app.models.planning import Planning
-from app.models.equipement import Equipement
+from app.services.email_outbox_service import process_outbox
 from app.services.intervention_service import create_intervention_from_planning
+from app.services.planning_generation_service import generate_due_interventions
+from app.tasks.leader import create_leader_lock
+
+logger = get_logger(__name__)
+
+PLANNING_JOB_ID = "planning_job"
+EMAIL_OUTBOX_JOB_ID = "email_outbox_job"
 
 scheduler = BackgroundScheduler()
 
+# Verrou de leadership du processus courant (créé au premier tick)
+_leader_lock = None
+# Les jobs tournent sur plusieurs threads: un seul verrou (et une seule connexion) par processus
+_leader_lock_init = threading.Lock()
+
+
+def get_leader_lock():
+    global _leader_lock
+    if _leader_lock is None:
+        with _leader_lock_init:
+            if _leader_lock is None:
+                _leader_lock = create_leader_lock("scheduler")
+    return _leader_lock
+
+
+def run_as_leader(job_id: str, func: Callable[[], Any]) -> Optional[Any]:
+    """Exécute `func` si ce processus est (ou devient) leader, sinon saute l'échéance."""
+    try:
+        leader = get_leader_lock().acquire()
+    except Exception as exc:
+        logger.error("Élection du leader impossible, job %s non exécuté: %s", job_id, exc)
+        return None
+    if not leader:
+        logger.debug("Job %s ignoré: un autre processus est leader", job_id)
+        prom.skip_job(job_id)
+        return None
+    with prom.JobTimer(job_id):
+        return func()
+
+
 def run_planning_generation():
     """
     Tâche planifiée : génère automatiquement des interventions à partir du planning.
+    En mode lot (PLANNING_GENERATION_BATCH), renvoie les métriques d'exécution.
     """
     db = SessionLocal()
     try:
         now = datetime.utcnow()
+        if settings.PLANNING_GENERATION_BATCH:
+            return generate_due_interventions(db, now=now)
         plannings = db.query(Planning).filter(Planning.prochaine_date <= now).all()
         for plan in plannings:
             create_intervention_from_planning(db, plan)
     finally:
         db.close()
 
-#def start_scheduler():
-    """
-    Lance le scheduler APScheduler avec les tâches récurrentes définies.
-    """
-    scheduler.add_job(run_planning_generation, 'interval', hours=1, id="planning_job")
-    scheduler.start()##
+
+def run_planning_job():
+    """Échéance du job de planning, exécutée uniquement par le leader."""
+    return run_as_leader(PLANNING_JOB_ID, run_planning_generation)
+
+
+def run_email_outbox():
+    """Tâche planifiée : envoie les emails en file (connexion SMTP réutilisée)."""
+    db = SessionLocal()
+    try:
+        return process_outbox(db)
+    finally:
+        db.close()
+
+
+def run_email_outbox_job():
+    """Échéance du job d'envoi des emails, exécutée uniquement par le leader."""
+    return run_as_leader(EMAIL_OUTBOX_JOB_ID, run_email_outbox)
+
+
+def register_jobs(target=None):
+    """Enregistre les tâches récurrentes sur le scheduler donné (par défaut celui de l'API)."""
+    target = target or scheduler
+    if target.get_job(PLANNING_JOB_ID) is None:
+        target.add_job(run_planning_job, "interval", hours=1, id=PLANNING_JOB_ID,
+                       coalesce=True, max_instances=1)
+    if target.get_job(EMAIL_OUTBOX_JOB_ID) is None:
+        target.add_job(run_email_outbox_job, "interval", seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+                       id=EMAIL_OUTBOX_JOB_ID, coalesce=True, max_instances=1)
+    return target
+
+
+def main() -> None:
+    """Point d'entrée du processus scheduler dédié."""
+    from app.core.logging import setup_logging
+
+    setup_logging()
+    if settings.SCHEDULER_METRICS_PORT and prom.prometheus_client is not None:
+        # Métriques des jobs du processus dédié (scrapées séparément de l'API)
+        prom.prometheus_client.start_http_server(settings.SCHEDULER_METRICS_PORT)
+    blocking = register_jobs(BlockingScheduler())
+    logger.info("Scheduler dédié démarré (jobs: %s)", [job.id for job in blocking.get_jobs()])
+    try:
+        blocking.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        if _leader_lock is not None:
+            _leader_lock.release()
+        from app.services.email_outbox_service import get_sender
+        get_sender().close()
+
+
+if __name__ == "__main__":
+    main()
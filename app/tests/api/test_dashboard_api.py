@@ -0,0 +1,87 @@
+import pytest
+from app.core.security import create_access_token
+from app.models.technicien import Technicien
+from app.schemas.intervention import InterventionCreate, StatutIntervention
+from app.schemas.user import UserRole
+from app.services.equipement_service import create_equipement
+from app.schemas.equipement import EquipementCreate
+from app.services.intervention_service import create_intervention
+from app.services.user_service import ensure_user_for_email
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _technicien(db, email):
+    user = ensure_user_for_email(db, email=email, role=UserRole.technicien)
+    user.full_name = user.full_name or "Tech Dashboard"
+    technicien = db.query(Technicien).filter(Technicien.user_id == user.id).first()
+    if technicien is None:
+        technicien = Technicien(user_id=user.id, equipe="DASH")
+        db.add(technicien)
+        db.commit()
+        db.refresh(technicien)
+    token = create_access_token({"sub": user.email, "role": "technicien", "user_id": user.id})
+    return technicien, token
+
+
+def test_admin_and_responsable_kpis(client, admin_token, responsable_token):
+    r = client.get("/dashboard/kpi/admin?periode=trimestre", headers=_auth(admin_token))
+    assert r.status_code == 200
+    assert r.json()["nb_utilisateurs_actifs"] >= 1
+
+    r = client.get("/dashboard/kpi/responsable", headers=_auth(responsable_token))
+    assert r.status_code == 200
+    assert "charge_moyenne_techniciens" in r.json()
+
+    assert client.get("/dashboard/kpi/admin", headers=_auth(responsable_token)).status_code == 403
+
+
+def test_technicien_kpis_scoped_and_invalidated_on_write(client, db_session, admin_token):
+    technicien, token = _technicien(db_session, "dash-tech@example.com")
+    autre, _ = _technicien(db_session, "dash-tech2@example.com")
+
+    r = client.get("/dashboard/kpi/technicien", headers=_auth(token))
+    assert r.status_code == 200
+    avant = r.json()
+    assert avant["technicien_id"] == technicien.id
+
+    eq = create_equipement(db_session, EquipementCreate(nom="DASH-API-EQ", type="t", localisation="L", frequence_entretien="7"))
+    admin = ensure_user_for_email(db_session, email="admin@example.com", role=UserRole.admin)
+    create_intervention(db_session, InterventionCreate(
+        titre="dash", description="d", type_intervention="corrective", statut=StatutIntervention.ouverte,
+        priorite="haute", urgence=False, date_limite=None, technicien_id=technicien.id, equipement_id=eq.id,
+    ), user_id=admin.id)
+
+    apres = client.get("/dashboard/kpi/technicien", headers=_auth(token)).json()
+    assert apres["mes_interventions_ouvertes"] == avant["mes_interventions_ouvertes"] + 1
+    assert apres["ma_charge_travail"] > avant["ma_charge_travail"] or apres["ma_charge_travail"] == 100
+
+    assert client.get(f"/dashboard/kpi/technicien?technicien_id={autre.id}", headers=_auth(token)).status_code == 403
+    assert client.get("/dashboard/kpi/technicien", headers=_auth(admin_token)).status_code == 400
+    r = client.get(f"/dashboard/kpi/technicien?technicien_id={autre.id}", headers=_auth(admin_token))
+    assert r.status_code == 200 and r.json()["technicien_id"] == autre.id
+
+
+def test_equipements_health_and_workload(client, responsable_token, db_session):
+    _technicien(db_session, "dash-tech3@example.com")
+    r = client.get("/dashboard/equipements/sante?limit=5&tri=risque", headers=_auth(responsable_token))
+    assert r.status_code == 200
+    page = r.json()
+    assert len(page["items"]) <= 5 and page["total"] >= len(page["items"])
+    scores = [e["score_fiabilite"] for e in page["items"]]
+    assert scores == sorted(scores)
+
+    r = client.get("/dashboard/techniciens/charge", headers=_auth(responsable_token))
+    assert r.status_code == 200
+    assert all(0 <= t["pourcentage_charge"] <= 100 for t in r.json())
+
+
+def test_client_kpis_require_client_profile(client, db_session):
+    user = ensure_user_for_email(db_session, email="dash-client@example.com", role=UserRole.client)
+    token = create_access_token({"sub": user.email, "role": "client", "user_id": user.id})
+    assert client.get("/dashboard/kpi/client", headers=_auth(token)).status_code == 404
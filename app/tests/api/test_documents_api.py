@@ -31,3 +31,28 @@ def test_upload_and_delete_document_flow(client, db_session, admin_token, tmp_up
     # delete
     r2 = client.delete(f"/documents/{doc_id}", headers=headers)
     assert r2.status_code in (200, 200)
+
+
+def test_upload_records_size_mime_and_hash(client, db_session, admin_token, tmp_upload_dir):
+    import hashlib
+    from app.services.equipement_service import create_equipement
+    from app.schemas.equipement import EquipementCreate
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+    from app.services.intervention_service import create_intervention
+    from app.schemas.intervention import InterventionCreate, StatutIntervention
+
+    eq = create_equipement(db_session, EquipementCreate(nom="DOCMETA", type="t", localisation="L", frequence_entretien="7"))
+    user = ensure_user_for_email(db_session, email="docmeta@example.com", role=UserRole.admin)
+    ic = InterventionCreate(titre="docmeta", description="d", type_intervention="corrective", statut=StatutIntervention.ouverte, priorite="normale", urgence=False, date_limite=None, technicien_id=None, equipement_id=eq.id)
+    interv = create_intervention(db_session, ic, user_id=user.id)
+
+    content = b"%PDF-1.4 rapport" * 1000
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    files = {"file": ("rapport.pdf", content, "application/pdf")}
+    r = client.post(f"/documents/?intervention_id={interv.id}", files=files, headers=headers)
+    assert r.status_code == 201
+    j = r.json()
+    assert j["taille"] == len(content)
+    assert j["type_mime"] == "application/pdf"
+    assert j["sha256"] == hashlib.sha256(content).hexdigest()
@@ -1,4 +1,5 @@
 import pytest
+import json
 from datetime import datetime, timedelta
 
 
@@ -62,3 +63,23 @@ def test_create_and_get_intervention(client, db_session, responsable_token):
     assert r.status_code in (200, 201)
     data = r.json()
     assert "id" in data
+
+
+def test_export_interventions_stream(client, db_session, responsable_token):
+    eq = create_equipement(db_session, EquipementCreate(nom="EXP-EQ", type="t", localisation="L", frequence_entretien="7"))
+    headers = {"Authorization": f"Bearer {responsable_token}"}
+    ic = InterventionCreate(titre="export-1", description="d", type_intervention="corrective", statut=StatutIntervention.ouverte, priorite="normale", urgence=True, date_limite=None, technicien_id=None, equipement_id=eq.id)
+    assert client.post("/interventions/", json=ic.model_dump(), headers=headers).status_code in (200, 201)
+
+    r = client.get("/interventions/export", params={"urgence": True}, headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    titres = [json.loads(line)["titre"] for line in r.text.splitlines()]
+    assert "export-1" in titres
+
+    r = client.get("/interventions/export", params={"format": "csv"}, headers=headers)
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/csv")
+    assert r.text.splitlines()[0].startswith("id,titre,description,type,statut")
+    assert "attachment" in r.headers["content-disposition"]
+
+    assert client.get("/interventions/export", params={"format": "xml"}, headers=headers).status_code == 422
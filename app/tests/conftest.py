@@ -59,3 +59,30 @@ def responsable_token(db_session):
     u = ensure_user_for_email(db_session, email="resp@example.com", role=UserRole.responsable)
     token = create_access_token({"sub": u.email, "role": u.role.value, "user_id": u.id})
     return token
+
+
+@pytest.fixture(scope="function")
+def isolated_rows(db_session):
+    """
+    Supprime en fin de test les lignes créées par le test (base SQLite partagée
+    entre tests). Les identifiants libérés étant réattribués, les caches de
+    process (principaux, agrégats) sont vidés avec, et les compteurs KPI
+    (intervention_kpi_counters, sans id) sont recalculés depuis les
+    interventions restantes.
+    """
+    from sqlalchemy import delete, func, select
+    from app.core.cache import get_cache
+    from app.core.principal_cache import get_principal_cache
+    from app.db.database import Base
+    from app.services.kpi_counter_service import rebuild_kpi_counters
+
+    tables = [t for t in Base.metadata.sorted_tables if "id" in t.c]
+    watermarks = {t.name: db_session.scalar(select(func.coalesce(func.max(t.c.id), 0))) for t in tables}
+    yield
+    db_session.rollback()
+    for table in reversed(tables):
+        db_session.execute(delete(table).where(table.c.id > watermarks[table.name]))
+    db_session.commit()
+    rebuild_kpi_counters(db_session)
+    get_cache().clear()
+    get_principal_cache().clear()
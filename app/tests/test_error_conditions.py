@@ -22,8 +22,10 @@ def test_save_uploaded_file_no_extension_raises(tmp_path):
     class BytesReader:
         def __init__(self, b: bytes):
             self._b = b
-        def read(self):
-            return self._b
+        def read(self, size=-1):
+            # Lecture par blocs: tout au premier appel, puis fin de flux
+            data, self._b = self._b, b""
+            return data
 
     fake = SimpleNamespace(filename="nofile", file=BytesReader(b"x"))
     try:
@@ -63,8 +63,10 @@ def test_delete_document_service_function_removes_file_and_db(tmp_path):
     class BytesReader:
         def __init__(self, b: bytes):
             self._b = b
-        def read(self):
-            return self._b
+        def read(self, size=-1):
+            # Lecture par blocs: tout au premier appel, puis fin de flux
+            data, self._b = self._b, b""
+            return data
 
     fake = SimpleNamespace(filename="f.txt", file=BytesReader(file_content))
     with SessionLocal() as db:
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.access_policy import can_access_intervention
+from app.core.security import create_access_token
+from app.db.database import engine
+from app.models.client import Client
+from app.models.document import Document
+from app.models.intervention import Intervention, InterventionType
+from app.models.technicien import Technicien
+from app.schemas.user import UserRole
+from app.services.user_service import ensure_user_for_email
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _setup(db):
+    tech_user = ensure_user_for_email(db, email="policy-tech@example.com", role=UserRole.technicien)
+    autre_user = ensure_user_for_email(db, email="policy-tech2@example.com", role=UserRole.technicien)
+    client_user = ensure_user_for_email(db, email="policy-client@example.com", role=UserRole.client)
+    tech, autre = Technicien(user_id=tech_user.id, equipe="P"), Technicien(user_id=autre_user.id, equipe="P")
+    client = Client(nom_entreprise="Policy SA", nom_contact="Doe", email="policy-co@example.com", user_id=client_user.id)
+    db.add_all([tech, autre, client])
+    db.flush()
+    a_moi = Intervention(titre="policy-a", type_intervention=InterventionType.corrective,
+                         technicien_id=tech.id, client_id=client.id)
+    a_autre = Intervention(titre="policy-b", type_intervention=InterventionType.corrective, technicien_id=autre.id)
+    db.add_all([a_moi, a_autre])
+    db.flush()
+    db.add(Document(nom_fichier="policy.pdf", chemin="static/uploads/policy.pdf", intervention_id=a_moi.id))
+    db.add(Document(nom_fichier="autre.pdf", chemin="static/uploads/autre.pdf", intervention_id=a_autre.id))
+    db.commit()
+    return tech_user, client_user, a_moi, a_autre
+
+
+def _headers(user):
+    return {"Authorization": "Bearer " + create_access_token(
+        {"sub": user.email, "role": user.role.value, "user_id": user.id})}
+
+
+def test_single_row_check_is_one_exists_query(db_session):
+    tech_user, client_user, a_moi, a_autre = _setup(db_session)
+    db_session.refresh(tech_user)
+    id_moi = a_moi.id
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert tech_user.peut_acceder_intervention(id_moi) is True
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(statements) == 1 and "EXISTS" in statements[0].upper()
+
+    assert tech_user.peut_acceder_intervention(a_autre.id) is False
+    assert client_user.peut_acceder_intervention(a_moi.id) is True
+    assert client_user.peut_acceder_intervention(a_autre.id) is False
+    assert can_access_intervention(db_session, {"role": "responsable", "user_id": None}, a_autre.id)
+    assert not can_access_intervention(db_session, {"role": "technicien", "user_id": None}, a_moi.id)
+
+
+def test_endpoints_apply_policy(client, db_session):
+    tech_user = ensure_user_for_email(db_session, email="policy-tech@example.com", role=UserRole.technicien)
+    a_moi = db_session.query(Intervention).filter(Intervention.titre == "policy-a").first()
+    a_autre = db_session.query(Intervention).filter(Intervention.titre == "policy-b").first()
+    if a_moi is None:
+        tech_user, _, a_moi, a_autre = _setup(db_session)
+    headers = _headers(tech_user)
+
+    ids = {i["id"] for i in client.get("/interventions/", headers=headers).json()}
+    assert a_moi.id in ids and a_autre.id not in ids
+    ids = {i["id"] for i in client.get("/filters/interventions", headers=headers).json()}
+    assert a_moi.id in ids and a_autre.id not in ids
+    assert client.get(f"/interventions/{a_moi.id}", headers=headers).status_code == 200
+    assert client.get(f"/interventions/{a_autre.id}", headers=headers).status_code == 404
+
+    docs = client.get("/documents/", headers=headers).json()
+    assert {d["intervention_id"] for d in docs} == {a_moi.id}
+    assert client.get(f"/documents/{a_autre.id}", headers=headers).json() == []
@@ -0,0 +1,159 @@
+# app/tests/unit/test_async_database.py
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import cache as cache_module
+from app.core.config import settings
+from app.db import async_database
+from app.db.async_database import ReadSession, async_database_url
+from app.db.database import Base
+from app.models.user import User, UserRole
+from app.services import dashboard_service
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+@pytest.fixture
+def async_state(monkeypatch):
+    """Isole l'état paresseux du module (engine/fabrique asynchrones)."""
+    monkeypatch.setattr(async_database, "_async_engines", {})
+    monkeypatch.setattr(async_database, "_async_sessionmakers", {})
+    monkeypatch.setattr(async_database, "_async_unavailable", False)
+    yield
+    asyncio.run(async_database.dispose_async_engine())
+
+
+def _drivers_installes() -> bool:
+    try:
+        import aiosqlite  # noqa: F401
+        import greenlet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def test_async_database_url_remplace_le_pilote():
+    assert async_database_url("postgresql+psycopg2://u:p@db:5432/erp") == "postgresql+asyncpg://u:p@db:5432/erp"
+    assert async_database_url("sqlite:///./erp.db") == "sqlite+aiosqlite:///./erp.db"
+    with pytest.raises(ValueError):
+        async_database_url("oracle://u:p@db/erp")
+
+
+def test_chemin_asynchrone_desactive_par_defaut(async_state, monkeypatch):
+    monkeypatch.setattr(settings, "ASYNC_DB_ENABLED", False)
+    assert async_database.get_async_sessionmaker() is None
+
+
+def test_chemin_asynchrone_repli_si_pilote_absent(async_state, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "ASYNC_DB_ENABLED", True)
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    factory = async_database.get_async_sessionmaker()
+    assert (factory is not None) is _drivers_installes()
+    # L'indisponibilité est mémorisée: pas de nouvelle tentative par requête
+    assert async_database.get_async_sessionmaker() is factory
+
+
+def _seed(url: str, email: str) -> None:
+    eng = create_engine(url)
+    Base.metadata.create_all(eng)
+    with sessionmaker(bind=eng)() as db:
+        db.add(User(username=email.split("@")[0], full_name="Lecture", email=email,
+                    hashed_password="x", role=UserRole.technicien, is_active=True))
+        db.commit()
+    eng.dispose()
+
+
+def test_read_session_synchrone_dans_le_threadpool(tmp_path):
+    url = f"sqlite:///{tmp_path / 'sync.db'}"
+    _seed(url, "sync.read@example.com")
+    eng = create_engine(url)
+    with sessionmaker(bind=eng)() as db:
+        rdb = ReadSession(db)
+        users = asyncio.run(rdb.all(select(User)))
+        first = asyncio.run(rdb.first(select(User).where(User.email == "sync.read@example.com")))
+        count = asyncio.run(rdb.run_sync(lambda s, email: s.query(User).filter(User.email == email).count(),
+                                         "sync.read@example.com"))
+    eng.dispose()
+    assert [u.email for u in users] == ["sync.read@example.com"]
+    assert first.email == "sync.read@example.com"
+    assert count == 1
+
+
+@pytest.mark.skipif(not _drivers_installes(), reason="aiosqlite/greenlet non installés")
+def test_read_session_asynchrone(async_state, monkeypatch, tmp_path):
+    path = tmp_path / "async.db"
+    _seed(f"sqlite:///{path}", "async.read@example.com")
+    monkeypatch.setattr(settings, "ASYNC_DB_ENABLED", True)
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{path}")
+
+    async def scenario():
+        async with async_database.get_async_sessionmaker()() as session:
+            rdb = ReadSession(session, is_async=True)
+            users = await rdb.all(select(User))
+            nb = await rdb.run_sync(lambda s: s.query(User).count())
+            return [u.email for u in users], nb
+
+    assert asyncio.run(scenario()) == (["async.read@example.com"], 1)
+
+
+class _ThreadRecordingCache:
+    """Backend de cache factice (type Redis) qui note le thread de chaque accès."""
+
+    def __init__(self):
+        self.store, self.threads = {}, []
+
+    def versions(self, namespaces):
+        self.threads.append(threading.get_ident())
+        return [1 for _ in namespaces]
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.threads.append(threading.get_ident())
+        self.store[key] = value
+
+
+@pytest.mark.skipif(not _drivers_installes(), reason="aiosqlite/greenlet non installés")
+def test_dashboard_stats_session_asynchrone_cache_hors_boucle(async_state, monkeypatch, tmp_path):
+    path = tmp_path / "dashboard.db"
+    _seed(f"sqlite:///{path}", "dashboard.async@example.com")
+    monkeypatch.setattr(settings, "ASYNC_DB_ENABLED", True)
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{path}")
+    fake = _ThreadRecordingCache()
+    monkeypatch.setattr(cache_module, "_cache", fake)
+    calculs = []
+    compute = dashboard_service.compute_dashboard_stats
+    monkeypatch.setattr(dashboard_service, "compute_dashboard_stats", lambda db: calculs.append(1) or compute(db))
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        async with async_database.get_async_sessionmaker()() as session:
+            rdb = ReadSession(session, is_async=True)
+            premier = await dashboard_service.get_dashboard_stats_async(rdb)
+            second = await dashboard_service.get_dashboard_stats_async(rdb)
+        return loop_thread, premier, second
+
+    loop_thread, premier, second = asyncio.run(scenario())
+    assert premier == second and premier["utilisateurs"] == {"total": 1, "actifs": 1}
+    assert calculs == [1]  # second appel servi par le cache
+    assert fake.threads and loop_thread not in fake.threads  # aucune I/O cache sur la boucle
+
+
+def test_mes_notifications_non_capturees_par_user_id(client, db_session):
+    from app.core.security import create_access_token
+
+    db_session.add(User(username="notif.me", full_name="Notif Me", email="notif.me@example.com",
+                        hashed_password="x", role=UserRole.technicien, is_active=True))
+    db_session.commit()
+    token = create_access_token({"sub": "notif.me@example.com", "role": "technicien"})
+    response = client.get("/notifications/user/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json() == []
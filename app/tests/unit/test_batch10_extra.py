@@ -6,6 +6,7 @@ from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 from app.api.v1 import documents as documents_router
+from app.core.pagination import Pagination
 from app.core import security
 from app.core.config import settings
 from app.db import database
@@ -33,18 +34,18 @@ def test_upload_document_alias_calls_service(monkeypatch):
 
 def test_list_documents_returns_all():
     db = MagicMock()
-    db.query.return_value.all.return_value = ['d1', 'd2']
-    res = documents_router.list_documents(db=db)
+    db.scalars.return_value.all.return_value = ['d1', 'd2']
+    res = documents_router.list_documents(db=db, user={'role': 'admin'}, page=Pagination(None, None))
     assert res == ['d1', 'd2']
 
 
 def test_list_documents_by_intervention_filters():
     db = MagicMock()
-    q = MagicMock()
-    db.query.return_value = q
-    q.filter.return_value.all.return_value = ['d']
-    res = documents_router.list_documents_by_intervention(intervention_id=5, db=db)
+    db.scalars.return_value.all.return_value = ['d']
+    res = documents_router.list_documents_by_intervention(intervention_id=5, db=db, user={'role': 'admin'},
+                                                          page=Pagination(None, None))
     assert res == ['d']
+    assert 'documents.intervention_id =' in str(db.scalars.call_args[0][0])
 
 
 def test_delete_document_not_found():
@@ -66,8 +67,11 @@ def test_delete_document_file_removed(tmp_path, monkeypatch):
     doc = MagicMock()
     doc.chemin = 'static/uploads/file.txt'
     doc.id = 1
+    doc.sha256 = None
     db = MagicMock()
     db.query.return_value.filter.return_value.first.return_value = doc
+    # no other document references the blob
+    db.scalar.return_value = 0
 
     res = documents_router.delete_document(document_id=1, db=db)
     # file should be removed
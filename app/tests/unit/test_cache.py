@@ -0,0 +1,47 @@
+import time
+
+from app.core import cache as cache_module
+from app.core.cache import MemoryCache, cached_call, invalidate
+
+
+def test_memory_cache_lru_eviction_and_ttl():
+    c = MemoryCache(max_entries=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "a" devient le plus récent
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+
+    c.set("court", "x", ttl=0.01)
+    time.sleep(0.02)
+    assert c.get("court") is None
+
+
+def test_cached_call_uses_namespace_versions(monkeypatch):
+    monkeypatch.setattr(cache_module, "_cache", MemoryCache())
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert cached_call("k", ["ns:a"], loader) == {"n": 1}
+    assert cached_call("k", ["ns:a"], loader) == {"n": 1}
+    invalidate("ns:b")
+    assert cached_call("k", ["ns:a"], loader) == {"n": 1}
+    invalidate("ns:a")
+    assert cached_call("k", ["ns:a"], loader) == {"n": 2}
+
+
+def test_cached_call_falls_back_when_backend_fails(monkeypatch):
+    class Broken:
+        def versions(self, namespaces):
+            raise ConnectionError("down")
+
+        def invalidate(self, *namespaces):
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(cache_module, "_cache", Broken())
+    assert cached_call("k", ["ns"], lambda: 42) == 42
+    invalidate("ns")  # ne lève pas
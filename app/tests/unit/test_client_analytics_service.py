@@ -0,0 +1,103 @@
+import pytest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.client import Client
+from app.models.contrat import Contrat, StatutContrat, TypeContrat
+from app.models.intervention import Intervention, InterventionType, PrioriteIntervention, StatutIntervention
+from app.schemas.user import UserRole
+from app.services.client_analytics_service import compute_client_stats, compute_rapports_activite
+from app.services.user_service import ensure_user_for_email
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _client(db, suffixe):
+    user = ensure_user_for_email(db, email=f"analytics-{suffixe}@example.com", role=UserRole.client)
+    client = Client(nom_entreprise=f"Analytics {suffixe}", nom_contact="Doe",
+                    email=f"analytics-co-{suffixe}@example.com", user_id=user.id)
+    db.add(client)
+    db.commit()
+    return client
+
+
+def _intervention(db, client_id, creation, cloture=None, **kwargs):
+    kwargs.setdefault("statut", StatutIntervention.cloturee if cloture else StatutIntervention.ouverte)
+    intervention = Intervention(titre="analytics", type_intervention=kwargs.pop("type_intervention", InterventionType.corrective),
+                                client_id=client_id, date_creation=creation, date_cloture=cloture, **kwargs)
+    db.add(intervention)
+    return intervention
+
+
+def test_client_stats_match_legacy_python_rules(db_session):
+    client = _client(db_session, "a")
+    now = datetime.utcnow()
+    t0 = now - timedelta(days=10)
+    interventions = [
+        # urgente clôturée en 1h: SLA respecté
+        _intervention(db_session, client.id, t0, t0 + timedelta(hours=1), priorite=PrioriteIntervention.urgente,
+                      cout_reel=15000, satisfaction_client=5, date_affectation=t0 + timedelta(minutes=30)),
+        # haute clôturée en 30h: SLA dépassé
+        _intervention(db_session, client.id, t0, t0 + timedelta(hours=30), priorite=PrioriteIntervention.haute,
+                      cout_reel=5050, satisfaction_client=3, type_intervention=InterventionType.preventive,
+                      cout_main_oeuvre=4000, cout_pieces=1050),
+        # programmée: pas de SLA mais comptée dans le dénominateur (règle historique)
+        _intervention(db_session, client.id, t0, t0 + timedelta(hours=201), priorite=PrioriteIntervention.programmee),
+        # ouverte et en retard
+        _intervention(db_session, client.id, t0, date_limite=now - timedelta(days=1)),
+        # hors fenêtre SLA de 6 mois
+        _intervention(db_session, client.id, now - timedelta(days=400), now - timedelta(days=399)),
+    ]
+    db_session.add(Contrat(numero_contrat="ANALYTICS-C-1", nom_contrat="C", type_contrat=TypeContrat.maintenance_preventive,
+                           statut=StatutContrat.en_cours, date_debut=date.today() - timedelta(days=30),
+                           date_fin=date.today() + timedelta(days=30), montant_annuel=1200, client_id=client.id))
+    db_session.commit()
+
+    stats = compute_client_stats(db_session, [client.id], now=now)[client.id]
+    assert stats.total_interventions == 5
+    assert stats.interventions_terminees == 4
+    assert stats.interventions_ouvertes == 1
+    assert stats.interventions_en_retard == 1
+    assert stats.cout_total_interventions == 200.5
+    assert stats.cout_moyen_intervention == 100.25
+    assert stats.note_satisfaction == 4.0
+    assert stats.temps_reponse_moyen == 0.5
+    assert stats.taux_respect_sla == round(1 / 3 * 100, 1)
+    assert stats.nb_contrats_actifs == 1 and stats.montant_contrats_annuel == 1200.0
+
+    fermees = [i for i in interventions if i.date_cloture]
+    legacy_delai = sum((i.date_cloture - i.date_creation).total_seconds() / 3600 for i in fermees) / len(fermees)
+    assert stats.duree_moyenne_intervention == round(legacy_delai, 1)
+    assert sum(1 for i in interventions[:3] if i.calculer_sla_respect() is True) == 1
+
+    # Les propriétés du modèle délèguent au calcul en lot
+    assert client.cout_maintenance_total == 200.5
+    assert client.taux_satisfaction_moyen == 4.0
+    assert client.delai_moyen_intervention == stats.duree_moyenne_intervention
+    assert client.calculer_sla_global() == stats.taux_respect_sla
+
+    rapport = client.generer_rapport_activite(6)
+    assert rapport["nb_interventions"] == 4
+    assert rapport["nb_preventives"] == 1 and rapport["nb_correctives"] == 3
+    assert rapport["cout_total"] == 50.5
+    assert rapport["sla_respect"] == stats.taux_respect_sla
+    assert rapport["equipements_total"] == 0
+
+
+def test_client_stats_batch_uses_constant_queries(db_session):
+    ids = [_client(db_session, f"n{i}").id for i in range(4)]
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        stats = compute_client_stats(db_session, ids)
+        rapports = compute_rapports_activite(db_session, ids, nb_mois=3)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert set(stats) == set(rapports) == set(ids)
+    assert len(statements) == 3 + 5
+    assert all(s.total_interventions == 0 and s.taux_respect_sla is None for s in stats.values())
+    assert compute_client_stats(db_session, []) == {}
@@ -0,0 +1,127 @@
+import pytest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.intervention import Intervention, InterventionType, StatutIntervention, PrioriteIntervention
+from app.services.dashboard_service import compute_dashboard_stats, month_start, shift_months
+from app.services.equipement_service import create_equipement
+from app.schemas.equipement import EquipementCreate
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _add(db, eq_id, statut, priorite, date_creation):
+    intervention = Intervention(
+        titre="dash", type_intervention=InterventionType.corrective, statut=statut,
+        priorite=priorite, urgence=False, equipement_id=eq_id, date_creation=date_creation,
+    )
+    db.add(intervention)
+
+
+def test_shift_months_crosses_year_boundary():
+    assert shift_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+    assert shift_months(datetime(2025, 11, 1), 2) == datetime(2026, 1, 1)
+    assert month_start(datetime(2025, 3, 17, 10, 5)) == datetime(2025, 3, 1)
+
+
+def test_dashboard_stats_counts_and_round_trips(db_session):
+    now = datetime(2031, 6, 15, 12, 0)
+    before = compute_dashboard_stats(db_session, now=now)
+
+    eq = create_equipement(db_session, EquipementCreate(nom="DASH-EQ", type="t", localisation="L", frequence_entretien="7"))
+    _add(db_session, eq.id, StatutIntervention.ouverte, PrioriteIntervention.urgente, now - timedelta(days=1))
+    _add(db_session, eq.id, StatutIntervention.cloturee, PrioriteIntervention.normale, now - timedelta(days=2))
+    _add(db_session, eq.id, StatutIntervention.en_cours, PrioriteIntervention.haute, now - timedelta(days=40))
+    db_session.commit()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        after = compute_dashboard_stats(db_session, now=now)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 2
+    delta = lambda section, key: after[section][key] - before[section][key]
+    assert delta("interventions", "ouverte") == 1
+    assert delta("interventions", "en_cours") == 1
+    assert delta("interventions", "terminees") == 1
+    assert delta("interventions", "total_mensuel") == 2
+    assert delta("interventions", "terminees_mensuel") == 1
+    assert delta("priorites", "urgente") == 1
+    assert delta("equipements", "total") == 1
+    assert delta("equipements", "operationnel") == 1
+
+    trends = {t["month"]: t["total"] for t in after["evolution_mensuelle"]}
+    trends_before = {t["month"]: t["total"] for t in before["evolution_mensuelle"]}
+    assert trends["Jun"] - trends_before.get("Jun", 0) == 2
+    assert trends["May"] - trends_before.get("May", 0) == 1
+    assert 0 <= after["taux_resolution"] <= 100
+
+
+def test_dashboard_stats_endpoint(client, admin_token):
+    r = client.get("/dashboard/stats", headers={"Authorization": f"Bearer {admin_token}"})
+    assert r.status_code == 200
+    data = r.json()
+    assert set(data) == {"interventions", "taux_resolution", "evolution_mensuelle", "priorites", "equipements", "utilisateurs"}
+    assert data["utilisateurs"]["total"] >= 1
+
+
+def test_kpi_query_case_fallback_matches_filter(db_session):
+    from app.services.dashboard_service import _kpi_query
+    debut = month_start(datetime.utcnow()).date()
+    with_filter = db_session.execute(_kpi_query(debut, use_filter=True)).mappings().one()
+    with_case = db_session.execute(_kpi_query(debut, use_filter=False)).mappings().one()
+    assert dict(with_filter) == dict(with_case)
+
+
+def test_period_bounds_calendar_aligned():
+    from app.schemas.dashboard import TimeRange
+    from app.services.dashboard_service import period_bounds
+    now = datetime(2025, 5, 14, 16, 30)  # mercredi
+    assert period_bounds(TimeRange.jour, now) == (datetime(2025, 5, 14), datetime(2025, 5, 15), datetime(2025, 5, 13))
+    assert period_bounds(TimeRange.semaine, now)[0] == datetime(2025, 5, 12)
+    assert period_bounds(TimeRange.trimestre, now) == (datetime(2025, 4, 1), datetime(2025, 7, 1), datetime(2025, 1, 1))
+    assert period_bounds(TimeRange.annee, now) == (datetime(2025, 1, 1), datetime(2026, 1, 1), datetime(2024, 1, 1))
+
+
+def test_client_kpis_and_equipement_health(db_session):
+    from datetime import date
+    from app.models.client import Client
+    from app.models.contrat import Contrat, StatutContrat, TypeContrat
+    from app.schemas.dashboard import StatutSante
+    from app.services.dashboard_service import build_client_kpis
+    from app.services.equipement_health_service import build_equipements_health
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+
+    user = ensure_user_for_email(db_session, email="kpi-client@example.com", role=UserRole.client)
+    cli = Client(nom_entreprise="KPI SA", nom_contact="Doe", email="kpi-client-co@example.com", user_id=user.id)
+    db_session.add(cli)
+    db_session.commit()
+    db_session.add(Contrat(numero_contrat="KPI-C-1", nom_contrat="C", type_contrat=TypeContrat.maintenance_preventive,
+                           statut=StatutContrat.en_cours, date_debut=date(2031, 1, 1), date_fin=date(2031, 12, 31),
+                           nb_interventions_incluses=10, nb_interventions_utilisees=3, client_id=cli.id))
+    eq = create_equipement(db_session, EquipementCreate(nom="KPI-HEALTH-EQ", type="t", localisation="L", frequence_entretien="7"))
+    now = datetime(2031, 6, 15, 12, 0)
+    for jour in (2, 3, 4):
+        intervention = Intervention(titre="panne", type_intervention=InterventionType.corrective,
+                                    statut=StatutIntervention.ouverte, priorite=PrioriteIntervention.haute,
+                                    equipement_id=eq.id, client_id=cli.id, date_creation=datetime(2031, 6, jour),
+                                    duree_reelle=120)
+        db_session.add(intervention)
+    db_session.commit()
+
+    kpis = build_client_kpis(db_session, cli.id, now=now)
+    assert kpis.mes_interventions_ouvertes == 3
+    assert kpis.contrats_actifs == 1
+    assert kpis.interventions_incluses_restantes == 7
+
+    sante = {h.equipement_id: h for h in build_equipements_health(db_session, now=now, limit=10_000).items}[eq.id]
+    assert sante.nb_pannes_mois == 3
+    assert sante.statut_sante == StatutSante.critique
+    assert sante.temps_arret_mois == 6.0
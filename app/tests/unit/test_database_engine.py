@@ -0,0 +1,64 @@
+# app/tests/unit/test_database_engine.py
+
+from sqlalchemy import create_engine, event, text
+
+from app.core.config import settings
+from app.db import database
+from app.db.database import PoolMetrics, SessionLocal, engine_options, init_schema, pool_metrics
+
+
+def test_schema_initialise_une_seule_fois():
+    init_schema()
+    assert init_schema() is False
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(database.engine, "before_cursor_execute", listener)
+    try:
+        for _ in range(5):
+            db = SessionLocal()
+            db.execute(text("SELECT 1"))
+            db.close()
+    finally:
+        event.remove(database.engine, "before_cursor_execute", listener)
+    # Aucune introspection du schéma (PRAGMA table_info) par session
+    assert statements == ["SELECT 1"] * 5
+
+
+def test_engine_options_postgresql_depuis_settings():
+    options = engine_options("postgresql+psycopg2://u:p@db:5432/erp")
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_timeout"] == settings.DB_POOL_TIMEOUT_SECONDS
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE_SECONDS
+    assert options["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+    assert options["connect_args"]["connect_timeout"] == settings.DB_CONNECT_TIMEOUT_SECONDS
+    assert options["connect_args"]["options"] == f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+
+def test_engine_options_sqlite_sans_pool():
+    assert engine_options("sqlite://") == {"connect_args": {"check_same_thread": False}}
+
+
+def test_pool_metrics_compte_checkouts_et_pic(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    compteurs = PoolMetrics().attach(eng)
+    with eng.connect() as c1, eng.connect() as c2:
+        c1.execute(text("SELECT 1"))
+        c2.execute(text("SELECT 1"))
+        assert compteurs.snapshot()["en_cours"] == 2
+    snap = compteurs.snapshot()
+    assert snap["checkouts"] == snap["checkins"] == 2
+    assert snap["pic_en_cours"] == 2 and snap["en_cours"] == 0
+    assert snap["connexions_ouvertes"] >= 1
+    eng.dispose()
+
+
+def test_pool_metrics_engine_principal():
+    avant = pool_metrics()["checkouts"]
+    db = SessionLocal()
+    db.execute(text("SELECT 1"))
+    db.close()
+    metrics = pool_metrics()
+    assert metrics["pool"] == type(database.engine.pool).__name__
+    assert metrics["checkouts"] > avant
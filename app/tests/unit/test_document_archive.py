@@ -0,0 +1,126 @@
+# app/tests/unit/test_document_archive.py
+
+import io
+import os
+import threading
+import time
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services import document_archive_service as archive
+from app.services.document_service import create_document
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _upload(name: str, data: bytes):
+    return SimpleNamespace(filename=name, content_type=None, file=io.BytesIO(data))
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def interventions(db_session, tmp_upload_dir):
+    from app.services.equipement_service import create_equipement
+    from app.schemas.equipement import EquipementCreate
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+    from app.services.intervention_service import create_intervention
+    from app.schemas.intervention import InterventionCreate, StatutIntervention
+
+    eq = create_equipement(db_session, EquipementCreate(nom=f"ZIP{time.time_ns()}", type="t", localisation="L",
+                                                        frequence_entretien="7"))
+    user = ensure_user_for_email(db_session, email="archive@example.com", role=UserRole.admin)
+    result = []
+    for titre in ("zip-a", "zip-b"):
+        ic = InterventionCreate(titre=titre, description="d", type_intervention="corrective",
+                                statut=StatutIntervention.ouverte, priorite="normale", urgence=False,
+                                date_limite=None, technicien_id=None, equipement_id=eq.id)
+        result.append(create_intervention(db_session, ic, user_id=user.id))
+    a, b = result
+    create_document(db_session, _upload("photo.jpg", b"J" * 5000), a.id)
+    create_document(db_session, _upload("photo.jpg", b"K" * 10), a.id)  # même nom, autre contenu
+    create_document(db_session, _upload("rapport.pdf", os.urandom(3000)), b.id)
+    return a, b
+
+
+def test_archive_de_plusieurs_interventions(client, admin_token, interventions):
+    a, b = interventions
+    r = client.get(f"/documents/archive?intervention_id={a.id}&intervention_id={b.id}", headers=_auth(admin_token))
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/zip"
+    assert 'filename="documents-interventions.zip"' in r.headers["content-disposition"]
+    with zipfile.ZipFile(io.BytesIO(r.content)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [f"intervention-{a.id}/photo.jpg", f"intervention-{a.id}/photo (2).jpg",
+                                 f"intervention-{b.id}/rapport.pdf"]
+        assert zf.read(f"intervention-{a.id}/photo.jpg") == b"J" * 5000
+
+
+def test_flux_par_blocs_sans_assembler_l_archive(db_session, interventions):
+    a, _ = interventions
+    entries = archive.archive_entries(archive.archive_documents(db_session, [a.id], {"role": "admin"}))
+    chunks = list(archive.iter_zip(entries, chunk_size=1000))
+    # Émis au fil de la lecture : aucun bloc ne contient l'archive entière
+    assert len(chunks) > 5 and max(map(len, chunks)) < 2000
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.testzip() is None
+
+
+def test_fichier_manquant_signale_dans_l_archive(db_session, interventions):
+    _, b = interventions
+    entries = archive.archive_entries(archive.archive_documents(db_session, [b.id], {"role": "admin"}))
+    os.remove(entries[0].path)
+    assert archive.archive_key(entries) is None
+    with zipfile.ZipFile(io.BytesIO(b"".join(archive.iter_zip(entries)))) as zf:
+        assert zf.read(archive.MISSING_FILES_ENTRY).decode().strip() == entries[0].arcname
+
+
+def test_limite_de_generations_simultanees(client, admin_token, interventions, monkeypatch):
+    a, _ = interventions
+    monkeypatch.setattr(archive, "_slots", threading.BoundedSemaphore(1))
+    slot = archive.acquire_slot()
+    r = client.get(f"/documents/archive?intervention_id={a.id}", headers=_auth(admin_token))
+    assert r.status_code == 503 and r.headers["retry-after"] == "5"
+    slot.release()
+    slot.release()  # idempotent
+    assert client.get(f"/documents/archive?intervention_id={a.id}", headers=_auth(admin_token)).status_code == 200
+    # La place est rendue à la fin du flux
+    assert archive._slots.acquire(blocking=False)
+
+
+def test_cache_par_empreintes(client, admin_token, interventions, tmp_path, monkeypatch):
+    a, _ = interventions
+    monkeypatch.setattr(settings, "ARCHIVE_CACHE_DIRECTORY", str(tmp_path / "archives"))
+    url = f"/documents/archive?intervention_id={a.id}"
+    first = client.get(url, headers=_auth(admin_token))
+    etag = first.headers["etag"]
+    assert os.listdir(tmp_path / "archives") == [f"{etag.strip(chr(34))}.zip"]
+
+    # Servie depuis le cache, même sans place de génération libre
+    monkeypatch.setattr(archive, "_slots", threading.BoundedSemaphore(1))
+    archive._slots.acquire()
+    second = client.get(url, headers=_auth(admin_token))
+    assert second.status_code == 200 and second.content == first.content
+    assert client.get(url, headers={**_auth(admin_token), "If-None-Match": etag}).status_code == 304
+
+
+def test_perimetre_et_validation(client, db_session, admin_token, interventions, monkeypatch):
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+
+    a, _ = interventions
+    u = ensure_user_for_email(db_session, email="archive-client@example.com", role=UserRole.client)
+    token = create_access_token({"sub": u.email, "role": u.role.value, "user_id": u.id})
+    assert client.get(f"/documents/archive?intervention_id={a.id}", headers=_auth(token)).status_code == 404
+    assert client.get("/documents/archive", headers=_auth(admin_token)).status_code == 422
+    monkeypatch.setattr(settings, "ARCHIVE_MAX_INTERVENTIONS", 1)
+    r = client.get("/documents/archive?intervention_id=1&intervention_id=2", headers=_auth(admin_token))
+    assert r.status_code == 400
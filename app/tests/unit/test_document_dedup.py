@@ -0,0 +1,116 @@
+# app/tests/unit/test_document_dedup.py
+
+import io
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.document import Document
+from app.services import document_service
+from app.services.document_service import blob_path, create_document, reconcile_storage, release_blob
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _upload(name: str, data: bytes):
+    return SimpleNamespace(filename=name, content_type=None, file=io.BytesIO(data))
+
+
+@pytest.fixture
+def intervention(db_session):
+    from app.services.equipement_service import create_equipement
+    from app.schemas.equipement import EquipementCreate
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+    from app.services.intervention_service import create_intervention
+    from app.schemas.intervention import InterventionCreate, StatutIntervention
+
+    eq = create_equipement(db_session, EquipementCreate(nom=f"DEDUP{time.time_ns()}", type="t", localisation="L",
+                                                        frequence_entretien="7"))
+    user = ensure_user_for_email(db_session, email="dedup@example.com", role=UserRole.admin)
+    ic = InterventionCreate(titre="dedup", description="d", type_intervention="corrective",
+                            statut=StatutIntervention.ouverte, priorite="normale", urgence=False,
+                            date_limite=None, technicien_id=None, equipement_id=eq.id)
+    return create_intervention(db_session, ic, user_id=user.id)
+
+
+def test_doublon_reutilise_le_blob(db_session, tmp_upload_dir, intervention):
+    data = os.urandom(4096)
+    d1 = create_document(db_session, _upload("notice.pdf", data), intervention.id)
+    d2 = create_document(db_session, _upload("copie.PDF", data), intervention.id)
+    d3 = create_document(db_session, _upload("autre.pdf", os.urandom(10)), intervention.id)
+
+    assert d1.chemin == d2.chemin == f"static/uploads/{d1.sha256}.pdf"
+    assert d3.chemin != d1.chemin
+    # Deux blobs, aucun temporaire restant
+    assert sorted(os.listdir(tmp_upload_dir)) == sorted({os.path.basename(d1.chemin), os.path.basename(d3.chemin)})
+
+
+def test_blob_supprime_avec_sa_derniere_reference(client, db_session, admin_token, tmp_upload_dir, intervention):
+    data = os.urandom(2048)
+    d1 = create_document(db_session, _upload("a.jpg", data), intervention.id)
+    d2 = create_document(db_session, _upload("b.jpg", data), intervention.id)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    assert client.delete(f"/documents/{d1.id}", headers=headers).status_code == 200
+    assert os.path.isfile(blob_path(d2.chemin))
+    assert client.delete(f"/documents/{d2.id}", headers=headers).status_code == 200
+    assert not os.path.exists(blob_path(d2.chemin))
+
+
+def test_reconciliation_orphelins_et_lignes_sans_blob(db_session, tmp_upload_dir, intervention):
+    garde = create_document(db_session, _upload("garde.txt", os.urandom(64)), intervention.id)
+    perdu = create_document(db_session, _upload("perdu.txt", os.urandom(64)), intervention.id)
+    os.remove(blob_path(perdu.chemin))
+
+    vieux = time.time() - 7200
+    for name in ("orphelin.bin", ".upload-abandon"):
+        path = tmp_upload_dir / name
+        path.write_bytes(b"x")
+        os.utime(path, (vieux, vieux))
+    (tmp_upload_dir / "recent.bin").write_bytes(b"x")  # upload possiblement en cours
+
+    report = reconcile_storage(db_session, dry_run=True)
+    assert report.orphans == ["orphelin.bin"] and report.stale_temps == [".upload-abandon"]
+    assert perdu.id in report.dangling and garde.id not in report.dangling
+    assert report.removed == 0 and (tmp_upload_dir / "orphelin.bin").exists()
+
+    report = reconcile_storage(db_session, dry_run=False)
+    assert report.removed == 2
+    assert sorted(os.listdir(tmp_upload_dir)) == sorted([os.path.basename(garde.chemin), "recent.bin"])
+    # Les lignes sans blob sont signalées, jamais supprimées
+    assert db_session.get(Document, perdu.id) is not None
+
+
+def test_upload_retablit_un_blob_supprime_avant_son_commit(db_session, tmp_upload_dir, intervention):
+    data = os.urandom(1024)
+    d1 = create_document(db_session, _upload("a.png", data), intervention.id)
+    commit = db_session.commit
+
+    def commit_apres_suppression_concurrente():
+        # La suppression du dernier document a compté 0 référence et retire le blob
+        os.remove(blob_path(d1.chemin))
+        commit()
+
+    db_session.commit = commit_apres_suppression_concurrente
+    try:
+        d2 = create_document(db_session, _upload("b.png", data), intervention.id)
+    finally:
+        del db_session.commit
+
+    assert d2.chemin == d1.chemin
+    with open(blob_path(d2.chemin), "rb") as f:
+        assert f.read() == data
+    assert os.listdir(tmp_upload_dir) == [os.path.basename(d2.chemin)]
+
+
+def test_suppression_remet_le_blob_si_une_reference_apparait(db_session, tmp_upload_dir, intervention, monkeypatch):
+    doc = create_document(db_session, _upload("c.txt", os.urandom(32)), intervention.id)
+    comptes = iter([0, 1])  # un upload concurrent valide sa ligne pendant la suppression
+    monkeypatch.setattr(document_service, "_references", lambda db, chemin, sha256=None: next(comptes))
+
+    assert release_blob(db_session, doc.chemin, doc.sha256) is False
+    assert os.listdir(tmp_upload_dir) == [os.path.basename(doc.chemin)]
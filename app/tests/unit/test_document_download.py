@@ -0,0 +1,115 @@
+# app/tests/unit/test_document_download.py
+
+import io
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.document import Document
+from app.services.document_service import create_document, etag_matches
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+@pytest.fixture
+def document(db_session, tmp_upload_dir):
+    from app.services.equipement_service import create_equipement
+    from app.schemas.equipement import EquipementCreate
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+    from app.services.intervention_service import create_intervention
+    from app.schemas.intervention import InterventionCreate, StatutIntervention
+
+    eq = create_equipement(db_session, EquipementCreate(nom=f"DL{time.time_ns()}", type="t", localisation="L",
+                                                        frequence_entretien="7"))
+    user = ensure_user_for_email(db_session, email="download@example.com", role=UserRole.admin)
+    ic = InterventionCreate(titre="download", description="d", type_intervention="corrective",
+                            statut=StatutIntervention.ouverte, priorite="normale", urgence=False,
+                            date_limite=None, technicien_id=None, equipement_id=eq.id)
+    it = create_intervention(db_session, ic, user_id=user.id)
+    upload = SimpleNamespace(filename="rapport final.pdf", content_type="application/pdf",
+                             file=io.BytesIO(b"0123456789" * 100))
+    return create_document(db_session, upload, it.id)
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_telechargement_etag_fort_et_cache(client, admin_token, document):
+    r = client.get(f"/documents/{document.id}/download", headers=_auth(admin_token))
+    assert r.status_code == 200
+    assert r.content == b"0123456789" * 100
+    assert r.headers["etag"] == f'"{document.sha256}"'
+    assert r.headers["cache-control"] == f"private, max-age={settings.DOWNLOAD_CACHE_MAX_AGE}"
+    assert r.headers["content-type"] == "application/pdf"
+    assert "filename*=utf-8''rapport%20final.pdf" in r.headers["content-disposition"]
+
+
+def test_if_none_match_renvoie_304(client, admin_token, document):
+    headers = {**_auth(admin_token), "If-None-Match": f'W/"autre", "{document.sha256}"'}
+    r = client.get(f"/documents/{document.id}/download", headers=headers)
+    assert r.status_code == 304 and r.content == b""
+    assert r.headers["etag"] == f'"{document.sha256}"'
+
+
+def test_requete_range_pour_reprise(client, admin_token, document):
+    headers = {**_auth(admin_token), "Range": "bytes=990-", "If-Range": f'"{document.sha256}"'}
+    r = client.get(f"/documents/{document.id}/download", headers=headers)
+    assert r.status_code == 206
+    assert r.content == b"0123456789"
+    assert r.headers["content-range"] == "bytes 990-999/1000"
+
+
+def test_delegation_x_accel_redirect(client, admin_token, document, monkeypatch):
+    monkeypatch.setattr(settings, "DOWNLOAD_ACCEL_REDIRECT_PREFIX", "/protected-uploads/")
+    # Aucun accès disque : le fichier peut même être absent du conteneur applicatif
+    os.remove(os.path.join(settings.UPLOAD_DIRECTORY, os.path.basename(document.chemin)))
+    r = client.get(f"/documents/{document.id}/download", headers=_auth(admin_token))
+    assert r.status_code == 200 and r.content == b""
+    assert r.headers["x-accel-redirect"] == f"/protected-uploads/{document.sha256}.pdf"
+    assert r.headers["etag"] == f'"{document.sha256}"'
+
+
+def test_document_hors_perimetre_ou_sans_fichier(client, db_session, admin_token, document):
+    from app.services.user_service import ensure_user_for_email
+    from app.schemas.user import UserRole
+
+    u = ensure_user_for_email(db_session, email="dl-client@example.com", role=UserRole.client)
+    token = create_access_token({"sub": u.email, "role": u.role.value, "user_id": u.id})
+    assert client.get(f"/documents/{document.id}/download", headers=_auth(token)).status_code == 404
+    assert client.get(f"/documents/{document.id}/download").status_code in (401, 403)
+
+    legacy = Document(nom_fichier="ancien.txt", chemin="static/uploads/absent.txt",
+                      intervention_id=document.intervention_id)
+    db_session.add(legacy)
+    db_session.commit()
+    assert client.get(f"/documents/{legacy.id}/download", headers=_auth(admin_token)).status_code == 404
+
+
+def test_etag_faible_pour_document_sans_empreinte(client, db_session, admin_token, document, tmp_upload_dir):
+    (tmp_upload_dir / "ancien.txt").write_bytes(b"legacy")
+    legacy = Document(nom_fichier="ancien.txt", chemin="static/uploads/ancien.txt",
+                      intervention_id=document.intervention_id)
+    db_session.add(legacy)
+    db_session.commit()
+    r = client.get(f"/documents/{legacy.id}/download", headers=_auth(admin_token))
+    assert r.status_code == 200 and r.content == b"legacy"
+    assert r.headers["etag"].startswith('W/"')
+    assert etag_matches(r.headers["etag"], r.headers["etag"])
+    assert not etag_matches(None, r.headers["etag"]) and etag_matches("*", '"x"')
+
+
+def test_uploads_non_servis_publiquement(client, admin_token, document):
+    nom = os.path.basename(document.chemin)
+    assert client.get(f"/static/uploads/{nom}").status_code == 404
+
+    r = client.get(f"/documents/{document.intervention_id}", headers=_auth(admin_token))
+    assert r.status_code == 200
+    assert [d["id"] for d in r.json()] == [document.id]
+    assert "path" not in r.json()[0] and "chemin" not in r.json()[0]
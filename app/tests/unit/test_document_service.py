@@ -7,8 +7,10 @@ def test_save_uploaded_file_and_create_document(tmp_path, db_session, monkeypatc
     class BytesReader:
         def __init__(self, b: bytes):
             self._b = b
-        def read(self):
-            return self._b
+        def read(self, size=-1):
+            # Lecture par blocs: tout au premier appel, puis fin de flux
+            data, self._b = self._b, b""
+            return data
 
     class F:
         filename = "f.txt"
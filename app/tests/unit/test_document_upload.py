@@ -0,0 +1,102 @@
+# app/tests/unit/test_document_upload.py
+
+import hashlib
+import io
+import os
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.document_service import copy_upload, detect_mime_type, store_upload
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+class ChunkSource:
+    """Flux de `total` octets produits à la demande (rien n'est gardé en mémoire)."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        n = self.remaining if size < 0 else min(size, self.remaining)
+        self.remaining -= n
+        return b"x" * n
+
+
+class NullSink:
+    def write(self, chunk):
+        return len(chunk)
+
+
+def test_copie_par_blocs_avec_empreinte():
+    data = os.urandom(300_000)
+    out = io.BytesIO()
+    taille, sha = copy_upload(io.BytesIO(data), out, max_bytes=1_000_000, chunk_size=64 * 1024)
+    assert taille == len(data) and out.getvalue() == data
+    assert sha == hashlib.sha256(data).hexdigest()
+
+
+def test_plafond_applique_en_cours_de_copie():
+    source = ChunkSource(10 * 1024 * 1024)
+    with pytest.raises(HTTPException) as exc:
+        copy_upload(source, NullSink(), max_bytes=256 * 1024, chunk_size=64 * 1024)
+    assert exc.value.status_code == 413
+    # Arrêt au premier bloc qui dépasse, sans lire la suite
+    assert source.reads == 5
+
+
+def test_memoire_bornee_quelle_que_soit_la_taille():
+    chunk = 256 * 1024
+    tracemalloc.start()
+    copy_upload(ChunkSource(32 * 1024 * 1024), NullSink(), max_bytes=64 * 1024 * 1024, chunk_size=chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 4 * chunk
+
+
+def test_ecriture_atomique_sans_fichier_partiel(tmp_upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1000)
+    fake = SimpleNamespace(filename="gros.pdf", file=io.BytesIO(b"y" * 5000), content_type="application/pdf")
+    with pytest.raises(HTTPException):
+        store_upload(fake)
+    assert os.listdir(tmp_upload_dir) == []
+
+    fake = SimpleNamespace(filename="petit.pdf", file=io.BytesIO(b"y" * 500), content_type="application/pdf")
+    stored = store_upload(fake)
+    assert stored.taille == 500 and stored.type_mime == "application/pdf"
+    assert os.listdir(tmp_upload_dir) == [os.path.basename(stored.chemin)]
+
+
+def test_type_mime_deduit_de_l_extension():
+    assert detect_mime_type(SimpleNamespace(filename="a.png", content_type="application/octet-stream")) == "image/png"
+    assert detect_mime_type(SimpleNamespace(filename="a.inconnu", content_type=None)) == "application/octet-stream"
+    assert detect_mime_type(SimpleNamespace(filename="a.txt", content_type="text/plain; charset=utf-8")) == "text/plain"
+
+
+def test_corps_multipart_trop_gros_refuse(client, admin_token, tmp_upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1024)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    files = {"file": ("gros.bin", b"z" * 200_000)}
+    r = client.post("/documents/?intervention_id=1", files=files, headers=headers)
+    assert r.status_code == 413
+    assert os.listdir(tmp_upload_dir) == []
+
+
+def test_corps_chunked_interrompu_en_cours_de_reception(client, admin_token, tmp_upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1024)
+
+    def corps():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="g.bin"\r\n\r\n'
+        for _ in range(20):
+            yield b"z" * 16 * 1024
+
+    headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "multipart/form-data; boundary=b"}
+    r = client.post("/documents/?intervention_id=1", content=corps(), headers=headers)
+    assert r.status_code == 413
@@ -0,0 +1,163 @@
+import pytest
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from app.models.email_outbox import EmailOutbox, StatutEmail
+from app.schemas.notification import NotificationCreate
+from app.schemas.user import UserCreate, UserRole
+from app.services.email_outbox_service import SMTPSender, enqueue_email, outbox_depth, process_outbox
+from app.services.notification_service import create_notification
+from app.services.user_service import create_user
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+class LocalSMTPServer:
+    """Serveur SMTP minimal en thread (EHLO/NOOP/MAIL/RCPT/DATA/QUIT) pour les tests."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(5)
+        self.port = self.sock.getsockname()[1]
+        self.connexions = 0
+        self.messages = []
+        self.refuser = False
+        self._clients = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connexions += 1
+            self._clients.append(conn)
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        fichier = conn.makefile("rb")
+        conn.sendall(b"220 local ESMTP\r\n")
+        try:
+            for ligne in fichier:
+                commande = ligne.decode().strip().upper()
+                if commande.startswith(("EHLO", "HELO")):
+                    conn.sendall(b"250 local\r\n")
+                elif commande.startswith("MAIL"):
+                    conn.sendall(b"451 indisponible\r\n" if self.refuser else b"250 OK\r\n")
+                elif commande == "DATA":
+                    conn.sendall(b"354 go\r\n")
+                    corps = []
+                    for data in fichier:
+                        if data == b".\r\n":
+                            break
+                        corps.append(data)
+                    self.messages.append(b"".join(corps).decode())
+                    conn.sendall(b"250 OK\r\n")
+                elif commande == "QUIT":
+                    conn.sendall(b"221 bye\r\n")
+                    break
+                else:  # RCPT, NOOP, RSET
+                    conn.sendall(b"250 OK\r\n")
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def drop_clients(self):
+        """Ferme les connexions ouvertes (timeout d'inactivité côté serveur)."""
+        for conn in self._clients:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._clients = []
+
+    def close(self):
+        self.drop_clients()
+        self.sock.close()
+
+
+def _sender(server):
+    return SMTPSender("127.0.0.1", server.port, starttls=False, timeout=5, from_email="erp@example.com")
+
+
+def test_create_notification_enqueues_email_without_sending(db_session, monkeypatch):
+    u = create_user(db_session, UserCreate(username="outbox_u1", full_name="O", email="outbox_u1@example.com",
+                                           role=UserRole.client, password="p"))
+    monkeypatch.setattr("smtplib.SMTP", lambda *a, **k: (_ for _ in ()).throw(AssertionError("envoi synchrone")))
+    notif = create_notification(db_session, NotificationCreate(
+        **{"type": "information", "canal": "email", "contenu": "Bonjour", "user_id": u.id, "intervention_id": 0}
+    ))
+    message = db_session.query(EmailOutbox).filter(EmailOutbox.notification_id == notif.id).one()
+    assert message.destinataire == "outbox_u1@example.com"
+    assert message.statut == StatutEmail.en_attente
+    assert "Bonjour" in message.contenu_html
+
+
+def test_process_outbox_reuses_one_smtp_connection(db_session):
+    server = LocalSMTPServer()
+    sender = _sender(server)
+    try:
+        for i in range(3):
+            enqueue_email(db_session, f"lot{i}@example.com", "Sujet", f"<p>corps {i}</p>")
+        db_session.commit()
+        metriques = process_outbox(db_session, sender=sender, batch_size=2)
+        assert metriques["envoyes"] >= 3 and metriques["lots"] >= 2
+        assert metriques["file"]["en_attente"] == 0
+        assert server.connexions == 1 and sender.connexions == 1
+        assert any("corps 2" in m for m in server.messages)
+
+        # Le serveur coupe la connexion inactive: l'échéance suivante se reconnecte
+        server.drop_clients()
+        message = enqueue_email(db_session, "apres@example.com", "Sujet", "<p>après</p>")
+        db_session.commit()
+        process_outbox(db_session, sender=sender)
+        db_session.refresh(message)
+        assert message.statut == StatutEmail.envoye and message.tentatives == 1
+        assert sender.connexions == 2
+    finally:
+        sender.close()
+        server.close()
+
+
+def test_failed_sends_back_off_then_fail(db_session, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 60)
+    server = LocalSMTPServer()
+    server.refuser = True
+    sender = _sender(server)
+    now = datetime(2033, 1, 1, 8, 0)
+    try:
+        message = enqueue_email(db_session, "refus@example.com", "Sujet", "<p>x</p>")
+        db_session.commit()
+
+        process_outbox(db_session, sender=sender, now=now)
+        db_session.refresh(message)
+        assert message.statut == StatutEmail.en_attente and message.tentatives == 1
+        assert message.prochaine_tentative == now + timedelta(seconds=60)
+        assert "451" in message.derniere_erreur
+
+        # Pas encore dû: non retenté
+        process_outbox(db_session, sender=sender, now=now + timedelta(seconds=30))
+        db_session.refresh(message)
+        assert message.tentatives == 1
+
+        process_outbox(db_session, sender=sender, now=now + timedelta(seconds=61))
+        db_session.refresh(message)
+        assert message.statut == StatutEmail.echec and message.tentatives == 2
+        assert outbox_depth(db_session)["echec"] >= 1
+    finally:
+        sender.close()
+        server.close()
+
+
+def test_outbox_depth_endpoint(client, admin_token):
+    resp = client.get("/notifications/outbox", headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.status_code == 200
+    assert set(resp.json()) >= {"en_attente", "en_cours", "envoye", "echec", "age_plus_ancien_secondes"}
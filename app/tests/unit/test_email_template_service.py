@@ -0,0 +1,37 @@
+import pytest
+from jinja2 import TemplateNotFound
+
+from app.services.email_template_service import EmailTemplateRenderer, get_renderer
+from app.services import notification_service
+
+
+def test_warm_up_compiles_notification_templates_once(monkeypatch):
+    renderer = EmailTemplateRenderer()
+    noms = renderer.warm_up()
+    assert "notification_information.html" in noms and renderer.cached == sorted(noms)
+
+    # Après précompilation, aucun accès au loader (ni stat du fichier) par rendu
+    def interdit(*args, **kwargs):
+        raise AssertionError("template relu depuis le disque")
+
+    monkeypatch.setattr(renderer.environment.loader, "get_source", interdit)
+    html = renderer.render("notification_information.html", sujet="S", message="Bonjour")
+    assert "<h1>S</h1>" in html and "Bonjour" in html
+
+
+def test_render_many_for_recipients():
+    renderer = EmailTemplateRenderer()
+    rendus = renderer.render_many(
+        "notification_information.html",
+        [{"message": "pour A"}, {"message": "pour B"}],
+        common={"sujet": "Commun"},
+    )
+    assert len(rendus) == 2
+    assert all("Commun" in html for html in rendus)
+    assert "pour A" in rendus[0] and "pour B" in rendus[1]
+
+
+def test_unknown_template_raises_and_services_share_renderer():
+    with pytest.raises(TemplateNotFound):
+        EmailTemplateRenderer().get_template("notification_inexistant.html")
+    assert notification_service.env is get_renderer()
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.equipement import Equipement, StatutEquipement
+from app.models.intervention import Intervention, InterventionType, StatutIntervention
+from app.schemas.dashboard import StatutSante, TriSante
+from app.services.equipement_health_service import build_equipements_health
+
+
+def _equipement(db, nom, **kwargs):
+    equipement = Equipement(nom=nom, type_equipement="t", localisation="L", **kwargs)
+    db.add(equipement)
+    db.commit()
+    return equipement
+
+
+def _intervention(db, equipement_id, type_intervention, creation, **kwargs):
+    db.add(Intervention(titre="sante", type_intervention=type_intervention, equipement_id=equipement_id,
+                        date_creation=creation, **kwargs))
+
+
+def test_fleet_health_matches_model_rules(db_session):
+    now = datetime.utcnow()
+    mise_en_service = now - timedelta(days=730)
+    sain = _equipement(db_session, "SANTE-OK", frequence_entretien_jours=30, date_mise_en_service=mise_en_service)
+    # Dernière préventive clôturée il y a 10 jours: prochaine dans 20 jours
+    _intervention(db_session, sain.id, InterventionType.preventive, now - timedelta(days=40),
+                  statut=StatutIntervention.cloturee, date_cloture=now - timedelta(days=10), cout_reel=2500)
+    _intervention(db_session, sain.id, InterventionType.corrective, now - timedelta(days=300), cout_reel=1000)
+
+    a_risque = _equipement(db_session, "SANTE-RISQUE", frequence_entretien_jours=30, statut=StatutEquipement.panne,
+                           date_mise_en_service=mise_en_service)
+    # Préventive plus ancienne clôturée, mais la plus récente ne l'est pas: base = mise en service
+    _intervention(db_session, a_risque.id, InterventionType.preventive, now - timedelta(days=90),
+                  statut=StatutIntervention.cloturee, date_cloture=now - timedelta(days=89))
+    _intervention(db_session, a_risque.id, InterventionType.preventive, now - timedelta(days=5))
+    for jours in (1, 2):
+        _intervention(db_session, a_risque.id, InterventionType.corrective, now - timedelta(hours=jours))
+    db_session.commit()
+
+    page = build_equipements_health(db_session, now=now, equipement_ids=[sain.id, a_risque.id])
+    assert page.total == 2 and not page.has_next
+    premier, second = page.items
+    assert (premier.equipement_id, second.equipement_id) == (a_risque.id, sain.id)
+
+    assert premier.maintenance_en_retard is True
+    assert premier.prochaine_maintenance == mise_en_service + timedelta(days=30)
+    assert premier.statut_sante == StatutSante.critique
+    assert premier.score_fiabilite < second.score_fiabilite
+
+    assert second.maintenance_en_retard is False
+    assert second.prochaine_maintenance == now - timedelta(days=10) + timedelta(days=30)
+    assert second.taux_pannes_annuel == round(1 / 2.0, 2)
+    assert second.cout_total_maintenance == 35.0
+
+    # Les propriétés du modèle délèguent au calcul en lot
+    assert sain.cout_maintenance_total == 35.0
+    assert sain.taux_pannes_annuel == 0.5
+    assert sain.prochaine_maintenance_calculee == second.prochaine_maintenance
+    assert a_risque.maintenance_en_retard is True
+
+
+def test_fleet_health_pagination_and_sorting(db_session):
+    ids = [_equipement(db_session, f"SANTE-PAGE-{i}").id for i in range(3)]
+    page = build_equipements_health(db_session, limit=2, equipement_ids=ids, tri=TriSante.nom)
+    assert page.total == 3 and page.has_next
+    assert [e.equipement_nom for e in page.items] == ["SANTE-PAGE-0", "SANTE-PAGE-1"]
+
+    suite = build_equipements_health(db_session, limit=2, offset=2, equipement_ids=ids, tri=TriSante.nom)
+    assert [e.equipement_id for e in suite.items] == [ids[2]] and not suite.has_next
+
+    vide = build_equipements_health(db_session, limit=2, offset=10, equipement_ids=ids)
+    assert vide.items == [] and vide.total == 3
+
+    par_echeance = build_equipements_health(db_session, equipement_ids=ids, tri=TriSante.prochaine_maintenance)
+    assert {e.equipement_id for e in par_echeance.items} == set(ids)
+
+
+def test_single_equipement_health_scoped_and_computed_once(db_session):
+    now = datetime.utcnow()
+    equipement = _equipement(db_session, "SANTE-SEUL", frequence_entretien_jours=30,
+                             date_mise_en_service=now - timedelta(days=365))
+    _intervention(db_session, equipement.id, InterventionType.corrective, now - timedelta(days=3), cout_reel=500)
+    db_session.commit()
+
+    statements = []
+    listener = lambda conn, cursor, stmt, params, *args: statements.append((stmt, params))  # noqa: E731
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        data = equipement.to_dict(include_sensitive=True)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    sante = [(stmt, params) for stmt, params in statements if "row_number" in stmt.lower()]
+    assert len(sante) == 1
+    # Les deux sous-requêtes d'interventions sont restreintes à l'équipement
+    stmt, _ = sante[0]
+    assert stmt.count("interventions.equipement_id IN") == 2
+    assert data["cout_maintenance_total"] == 5.0
+    assert data["maintenance_en_retard"] is True  # mise en service + 30 jours dépassée
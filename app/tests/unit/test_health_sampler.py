@@ -0,0 +1,75 @@
+# app/tests/unit/test_health_sampler.py
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.api.v1 import health as health_router
+from app.core import health_sampler as hs
+from app.core.config import settings
+from app.core.health_sampler import HealthSampler
+from app.db import database
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    s = HealthSampler(interval=60, timeout=0.2)
+    monkeypatch.setattr(health_router, "get_health_sampler", lambda: s)
+    yield s
+    s.stop()
+
+
+def test_echantillon_base_saine_redis_non_configure(sampler, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    snap = sampler.sample()
+    assert snap["status"] == "healthy"
+    assert snap["checks"]["database"]["status"] == "healthy"
+    assert "pool" in snap["checks"]["database"]
+    assert snap["checks"]["redis"]["status"] == "not_configured"
+    assert set(snap["checks"]["system"]["metrics"]) == {"cpu_percent", "memory_percent", "disk_usage"}
+    assert sampler.snapshot() is snap and not sampler.is_stale()
+
+
+def test_redis_injoignable_n_affecte_pas_l_etat(sampler, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    snap = sampler.sample()
+    assert snap["checks"]["redis"]["status"] == "unhealthy"
+    assert snap["status"] == "healthy"
+
+
+def test_base_injoignable_instance_non_prete(sampler, client, tmp_path, monkeypatch):
+    broken = create_engine(f"sqlite:///{tmp_path / 'absent' / 'x.db'}")
+    monkeypatch.setattr(database, "engine", broken)
+    sampler.sample()
+    r = client.get("/health/ready")
+    assert r.status_code == 503 and r.json()["status"] == "not_ready"
+    # La liveness ne dépend pas de la base
+    assert client.get("/health/live").json()["status"] == "ok"
+
+
+def test_sondes_servies_depuis_l_instantane(sampler, client, monkeypatch):
+    sampler.sample()
+
+    def interdit(*args, **kwargs):
+        raise AssertionError("aucune mesure pendant une sonde")
+
+    monkeypatch.setattr(hs.psutil, "cpu_percent", interdit)
+    monkeypatch.setattr(sampler, "_check_database", interdit)
+    r = client.get("/health/detailed")
+    assert r.status_code == 200 and r.json()["status"] == "healthy"
+    assert client.get("/health/ready").status_code == 200
+
+
+def test_instantane_perime(sampler, client, monkeypatch):
+    sampler.sample()
+    monkeypatch.setattr(settings, "HEALTH_STALE_AFTER_SECONDS", -1)
+    assert sampler.is_stale()
+    assert client.get("/health/ready").status_code == 503
+
+
+def test_thread_demarre_et_s_arrete():
+    s = HealthSampler(interval=60, timeout=0.2)
+    s.start()
+    assert s.snapshot() is not None and s._thread.is_alive()
+    s.stop()
+    assert s._thread is None
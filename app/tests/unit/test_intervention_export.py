@@ -0,0 +1,60 @@
+# app/tests/unit/test_intervention_export.py
+
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.intervention import Intervention, InterventionType, StatutIntervention
+from app.services.intervention_export_service import EXPORT_FIELDS, iter_rows, stream_export
+from app.services.intervention_service import interventions_statement
+
+ADMIN = {"role": "admin"}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for i in range(7):
+        session.add(Intervention(titre=f"E{i}", description="a,b \"c\"", urgence=i % 2 == 0,
+                                 type_intervention=InterventionType.corrective,
+                                 statut=StatutIntervention.ouverte, date_creation=datetime(2026, 1, 1 + i)))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_lecture_par_paquets(db):
+    batches = list(iter_rows(db, interventions_statement(principal=ADMIN), batch_size=3))
+    assert [len(b) for b in batches] == [3, 3, 1]
+
+
+def test_ndjson_memes_cles_que_l_api(db):
+    chunks = list(stream_export(db, interventions_statement(principal=ADMIN), "ndjson", batch_size=3))
+    assert len(chunks) == 3
+    lignes = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert len(lignes) == 7
+    assert list(lignes[0]) == [key for key, _ in EXPORT_FIELDS]
+    assert lignes[0]["type"] == "corrective" and lignes[0]["statut"] == "ouverte"
+    assert lignes[0]["date_creation"] == "2026-01-01T00:00:00"
+
+
+def test_csv_avec_filtres(db):
+    stmt = interventions_statement(principal=ADMIN, urgence=True)
+    rows = list(csv.reader(io.StringIO("".join(stream_export(db, stmt, "csv", batch_size=2)))))
+    assert rows[0] == [key for key, _ in EXPORT_FIELDS]
+    assert [r[1] for r in rows[1:]] == ["E0", "E2", "E4", "E6"]
+    assert rows[1][2] == 'a,b "c"'
+
+
+def test_export_vide_csv_en_tete_seule(db):
+    stmt = interventions_statement(principal=ADMIN, statut=StatutIntervention.archivee)
+    assert "".join(stream_export(db, stmt, "csv")).splitlines() == [",".join(k for k, _ in EXPORT_FIELDS)]
@@ -0,0 +1,108 @@
+import pytest
+from datetime import date, datetime
+
+from app.models.intervention import Intervention, InterventionType, PrioriteIntervention, StatutIntervention
+from app.models.kpi_counter import InterventionKpiCounter
+from app.schemas.equipement import EquipementCreate
+from app.schemas.intervention import InterventionCreate
+from app.schemas.user import UserRole
+from app.services.equipement_service import create_equipement
+from app.services.intervention_service import create_intervention, update_statut_intervention
+from app.services.kpi_counter_service import (
+    bump_counter, month_of, reconcile_kpi_counters, rebuild_kpi_counters,
+)
+from app.services.user_service import ensure_user_for_email
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _bucket(db, statut, priorite, mois):
+    counter = db.get(InterventionKpiCounter, (statut, priorite, mois))
+    if counter is not None:
+        db.refresh(counter)
+    return counter.total if counter else 0
+
+
+def test_bump_counter_upserts(db_session):
+    mois = date(2040, 1, 1)
+    bump_counter(db_session, StatutIntervention.ouverte, "basse", mois, 2)
+    bump_counter(db_session, "ouverte", PrioriteIntervention.basse, mois, 3)
+    db_session.commit()
+    assert _bucket(db_session, StatutIntervention.ouverte, PrioriteIntervention.basse, mois) == 5
+
+
+def test_service_writes_keep_counters_in_sync(db_session):
+    eq = create_equipement(db_session, EquipementCreate(nom="KPI-EQ", type="t", localisation="L", frequence_entretien="7"))
+    user = ensure_user_for_email(db_session, email="kpi@example.com", role=UserRole.responsable)
+    mois = month_of(datetime.utcnow())
+    ouverte_avant = _bucket(db_session, StatutIntervention.ouverte, PrioriteIntervention.haute, mois)
+    en_cours_avant = _bucket(db_session, StatutIntervention.en_cours, PrioriteIntervention.haute, mois)
+
+    ic = InterventionCreate(titre="kpi", description="d", type_intervention="corrective", statut=StatutIntervention.ouverte,
+                            priorite="haute", urgence=False, date_limite=None, technicien_id=None, equipement_id=eq.id)
+    interv = create_intervention(db_session, ic, user_id=user.id)
+    assert _bucket(db_session, StatutIntervention.ouverte, PrioriteIntervention.haute, mois) == ouverte_avant + 1
+
+    update_statut_intervention(db_session, interv.id, StatutIntervention.en_cours, user_id=user.id)
+    assert _bucket(db_session, StatutIntervention.ouverte, PrioriteIntervention.haute, mois) == ouverte_avant
+    assert _bucket(db_session, StatutIntervention.en_cours, PrioriteIntervention.haute, mois) == en_cours_avant + 1
+
+
+def test_model_transitions_and_deletes_keep_counters_in_sync(db_session):
+    eq = create_equipement(db_session, EquipementCreate(nom="KPI-EQ3", type="t", localisation="L", frequence_entretien="7"))
+    mois = date(2038, 7, 1)
+    interv = Intervention(titre="orm", type_intervention=InterventionType.corrective, priorite=PrioriteIntervention.urgente,
+                          equipement_id=eq.id, date_creation=datetime(2038, 7, 4))
+    db_session.add(interv)
+    db_session.commit()
+    assert _bucket(db_session, StatutIntervention.ouverte, PrioriteIntervention.urgente, mois) == 1
+
+    # Méthodes de transition du modèle, attributs expirés par le commit précédent
+    interv.affecter_technicien(technicien_id=None)
+    db_session.commit()
+    interv.technicien_id = 1
+    interv.demarrer_travaux()
+    interv.mettre_en_attente("pièce")
+    interv.priorite = PrioriteIntervention.haute
+    db_session.commit()
+    assert _bucket(db_session, StatutIntervention.ouverte, PrioriteIntervention.urgente, mois) == 0
+    assert _bucket(db_session, StatutIntervention.affectee, PrioriteIntervention.urgente, mois) == 0
+    assert _bucket(db_session, StatutIntervention.en_attente, PrioriteIntervention.haute, mois) == 1
+
+    interv.cloturer(rapport="ok")
+    db_session.commit()
+    assert _bucket(db_session, StatutIntervention.en_attente, PrioriteIntervention.haute, mois) == 0
+    assert _bucket(db_session, StatutIntervention.cloturee, PrioriteIntervention.haute, mois) == 1
+
+    db_session.delete(interv)
+    db_session.commit()
+    assert _bucket(db_session, StatutIntervention.cloturee, PrioriteIntervention.haute, mois) == 0
+
+
+def test_reconcile_repairs_drift(db_session):
+    eq = create_equipement(db_session, EquipementCreate(nom="KPI-EQ2", type="t", localisation="L", frequence_entretien="7"))
+    # Écriture SQL directe (hors ORM): les compteurs dérivent
+    db_session.execute(Intervention.__table__.insert().values(
+        titre="raw", type=InterventionType.corrective, statut=StatutIntervention.annulee, urgence=False,
+        priorite=PrioriteIntervention.basse, equipement_id=eq.id, date_creation=datetime(2039, 3, 9),
+        validation_client=False, created_at=datetime(2039, 3, 9), updated_at=datetime(2039, 3, 9)))
+    bump_counter(db_session, StatutIntervention.archivee, PrioriteIntervention.basse, date(2039, 4, 1), 7)
+    db_session.commit()
+
+    report = reconcile_kpi_counters(db_session, dry_run=True)
+    drift = {(d["statut"], d["mois"]): (d["attendu"], d["actuel"]) for d in report["drift"]}
+    assert drift[("annulee", "2039-03-01")] == (1, 0)
+    assert drift[("archivee", "2039-04-01")] == (0, 7)
+
+    assert reconcile_kpi_counters(db_session)["corrected"] == report["corrected"]
+    assert reconcile_kpi_counters(db_session, dry_run=True)["corrected"] == 0
+    assert _bucket(db_session, StatutIntervention.annulee, PrioriteIntervention.basse, date(2039, 3, 1)) == 1
+    assert db_session.get(InterventionKpiCounter, (StatutIntervention.archivee, PrioriteIntervention.basse, date(2039, 4, 1))) is None
+
+
+def test_rebuild_matches_interventions(db_session):
+    buckets = rebuild_kpi_counters(db_session)
+    assert buckets == db_session.query(InterventionKpiCounter).count()
+    assert sum(c.total for c in db_session.query(InterventionKpiCounter)) == db_session.query(Intervention).count()
+    assert reconcile_kpi_counters(db_session, dry_run=True)["corrected"] == 0
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core import login_throttle
+from app.core.login_throttle import LoginThrottle, MemoryFailureWindow
+from app.core import password_hashing
+from app.core.password_hashing import PasswordExecutor, run_password_task_async
+from app.core.security import password_needs_rehash, verify_password
+from app.models.user import User
+from app.schemas.user import UserCreate, UserRole
+from app.services import auth_service
+from app.services.user_service import create_user
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+@pytest.fixture
+def throttle(monkeypatch):
+    t = LoginThrottle(MemoryFailureWindow(900), max_per_account=3, max_per_ip=100)
+    monkeypatch.setattr(login_throttle, "_throttle", t)
+    return t
+
+
+def _counting_verify(monkeypatch):
+    appels = []
+
+    def verify(password, hashed):
+        appels.append(password)
+        return verify_password(password, hashed)
+
+    monkeypatch.setattr(auth_service, "verify_password", verify)
+    return appels
+
+
+def test_executor_sheds_load_with_429():
+    executor = PasswordExecutor(max_workers=1, max_pending=0)
+    demarre, libere = threading.Event(), threading.Event()
+
+    def bloque():
+        demarre.set()
+        libere.wait(5)
+        return "ok"
+
+    resultat = []
+    t = threading.Thread(target=lambda: resultat.append(executor.run(bloque)))
+    t.start()
+    demarre.wait(5)
+    with pytest.raises(HTTPException) as exc:
+        executor.run(lambda: "jamais")
+    assert exc.value.status_code == 429 and exc.value.headers["Retry-After"] == "1"
+    assert executor.rejected == 1 and executor.in_flight == 1
+    libere.set()
+    t.join(5)
+    assert resultat == ["ok"] and executor.run(lambda: 2) == 2
+    executor.shutdown()
+
+
+def test_sliding_window_rejects_before_bcrypt(db_session, throttle, monkeypatch):
+    create_user(db_session, UserCreate(username="throttle_u", full_name="T", email="throttle_u@example.com",
+                                       role=UserRole.client, password="bon"))
+    appels = _counting_verify(monkeypatch)
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            auth_service.authenticate_user(db_session, "throttle_u@example.com", "mauvais", client_ip="10.0.0.1")
+        assert exc.value.status_code == 401
+    with pytest.raises(HTTPException) as exc:
+        auth_service.authenticate_user(db_session, "THROTTLE_U@example.com", "bon", client_ip="10.0.0.1")
+    assert exc.value.status_code == 429 and int(exc.value.headers["Retry-After"]) > 0
+    assert len(appels) == 3  # aucune vérification bcrypt pour la tentative rejetée
+
+    window = MemoryFailureWindow(60)
+    window.record("k", now=1000.0)
+    assert window.count("k", now=1030.0) == 1 and window.retry_after("k", now=1030.0) == 30
+    assert window.count("k", now=1061.0) == 0
+
+
+def test_locked_account_is_rejected_before_bcrypt(db_session, throttle, monkeypatch):
+    u = create_user(db_session, UserCreate(username="locked_u", full_name="L", email="locked_u@example.com",
+                                           role=UserRole.client, password="bon"))
+    for _ in range(5):
+        u.increment_failed_login()
+    db_session.commit()
+    appels = _counting_verify(monkeypatch)
+    with pytest.raises(HTTPException) as exc:
+        auth_service.authenticate_user_by_username(db_session, "locked_u", "bon")
+    assert exc.value.status_code == 403 and appels == []
+
+
+def test_login_rehashes_password_with_configured_cost(db_session, throttle):
+    ancien_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+    u = User(username="rehash_u", full_name="R", email="rehash_u@example.com", role=UserRole.client,
+             hashed_password=ancien_hash, is_active=True, failed_login_attempts=2)
+    db_session.add(u)
+    db_session.commit()
+    assert password_needs_rehash(ancien_hash)
+
+    auth_service.authenticate_user(db_session, "rehash_u@example.com", "secret")
+    db_session.refresh(u)
+    assert u.hashed_password != ancien_hash and not password_needs_rehash(u.hashed_password)
+    assert verify_password("secret", u.hashed_password)
+    assert u.failed_login_attempts == 0 and u.last_login is not None
+
+
+def test_async_wait_does_not_block_event_loop(monkeypatch):
+    executor = PasswordExecutor(max_workers=1, max_pending=0)
+    monkeypatch.setattr(password_hashing, "_executor", executor)
+    libere = threading.Event()
+
+    async def scenario():
+        calcul = asyncio.ensure_future(run_password_task_async(lambda: libere.wait(5) and "ok"))
+        await asyncio.sleep(0.01)
+        assert not calcul.done() and executor.in_flight == 1  # la boucle tourne pendant le calcul
+        libere.set()
+        return await calcul
+
+    assert asyncio.run(scenario()) == "ok"
+    assert executor.in_flight == 0
+    executor.shutdown()
+
+
+def test_async_login_rehashes_and_rejects(db_session, throttle):
+    ancien_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+    u = User(username="async_u", full_name="A", email="async_u@example.com", role=UserRole.client,
+             hashed_password=ancien_hash, is_active=True)
+    db_session.add(u)
+    db_session.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_service.authenticate_user_by_username_async(db_session, "async_u", "mauvais"))
+    assert exc.value.status_code == 401 and exc.value.detail == "Identifiants invalides"
+
+    token = asyncio.run(auth_service.authenticate_user_async(db_session, "async_u@example.com", "secret"))
+    assert token.access_token and token.token_type == "bearer"
+    db_session.refresh(u)
+    assert not password_needs_rehash(u.hashed_password) and verify_password("secret", u.hashed_password)
+    assert u.failed_login_attempts == 0 and u.last_login is not None
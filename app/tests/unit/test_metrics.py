@@ -0,0 +1,52 @@
+# app/tests/unit/test_metrics.py
+
+import pytest
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from app.core import metrics  # noqa: E402
+
+REGISTRY = prometheus_client.REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_endpoint_format_exposition(client):
+    client.get("/health")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'erp_http_requests_total{method="GET",route="/health",status="200"}' in r.text
+    assert "erp_cpu_usage" in r.text and "erp_http_request_duration_seconds_bucket" in r.text
+
+
+def test_route_inconnue_regroupee(client):
+    avant = sample("erp_http_requests_total", method="GET", route="unmatched", status="404")
+    client.get("/chemin/inexistant/123")
+    assert sample("erp_http_requests_total", method="GET", route="unmatched", status="404") == avant + 1
+
+
+def test_jobs_du_scheduler():
+    avant_ok = sample("erp_scheduler_job_runs_total", job="test_job", result="ok")
+    with metrics.JobTimer("test_job"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.JobTimer("test_job"):
+            raise ValueError("échec")
+    metrics.skip_job("test_job")
+    assert sample("erp_scheduler_job_runs_total", job="test_job", result="ok") == avant_ok + 1
+    assert sample("erp_scheduler_job_runs_total", job="test_job", result="error") >= 1
+    assert sample("erp_scheduler_job_runs_total", job="test_job", result="skipped") >= 1
+    assert sample("erp_scheduler_job_duration_seconds_count", job="test_job") >= 2
+
+
+def test_file_email_et_caches():
+    metrics.record_outbox({"envoyes": 3, "relances": 0, "echecs": 1,
+                           "file": {"en_attente": 7, "envoye": 40, "age_plus_ancien_secondes": 12}})
+    assert sample("erp_email_outbox_messages", statut="en_attente") == 7
+    assert sample("erp_email_outbox_oldest_pending_age_seconds") == 12
+    avant = sample("erp_cache_lookups_total", cache="test", result="hit")
+    metrics.record_cache("test", True)
+    assert sample("erp_cache_lookups_total", cache="test", result="hit") == avant + 1
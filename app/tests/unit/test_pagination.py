@@ -0,0 +1,104 @@
+# app/tests/unit/test_pagination.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import Pagination, TotalMode, decode_cursor, encode_cursor, paginate
+from app.db.database import Base
+from app.models.equipement import Equipement
+from app.models.intervention import Intervention, InterventionType, StatutIntervention
+from app.services.equipement_service import EQUIPEMENT_KEYSET
+from app.services.intervention_service import INTERVENTION_KEYSET
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    base = datetime(2026, 1, 1)
+    # Dates en double pour vérifier le départage par id
+    for i in range(10):
+        session.add(Intervention(titre=f"I{i}", type_intervention=InterventionType.corrective,
+                                 statut=StatutIntervention.ouverte, date_creation=base + timedelta(days=i // 3)))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_parcours_complet_par_curseur(db):
+    vus, cursor = [], None
+    while True:
+        page = paginate(db, select(Intervention), INTERVENTION_KEYSET, limit=4, cursor=cursor)
+        vus.extend(page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    attendu = db.scalars(select(Intervention).order_by(Intervention.date_creation, Intervention.id)).all()
+    assert [i.id for i in vus] == [i.id for i in attendu]
+    assert len(vus) == 10
+
+
+def test_derniere_page_sans_curseur(db):
+    page = paginate(db, select(Intervention), INTERVENTION_KEYSET, limit=10)
+    assert len(page.items) == 10 and page.next_cursor is None
+
+
+def test_total_exact_et_estimation_hors_postgresql(db):
+    stmt = select(Intervention).where(Intervention.date_creation >= datetime(2026, 1, 2))
+    page = paginate(db, stmt, INTERVENTION_KEYSET, limit=2, total=TotalMode.exact)
+    assert page.total == 7 and page.estimated is False
+    # Pas d'estimation sous SQLite: comptage exact
+    page = paginate(db, stmt, INTERVENTION_KEYSET, limit=2, total=TotalMode.estimate)
+    assert page.total == 7 and page.estimated is False
+
+
+def test_curseur_rejete_si_invalide_ou_d_une_autre_liste():
+    cursor = encode_cursor(EQUIPEMENT_KEYSET, [5])
+    assert decode_cursor(EQUIPEMENT_KEYSET, cursor) == [5]
+    for invalide in (cursor, "pas-un-curseur"):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(INTERVENTION_KEYSET, invalide)
+        assert exc.value.status_code == 400
+
+
+def test_curseur_datetime_aller_retour():
+    valeurs = [datetime(2026, 3, 4, 5, 6, 7, 890), 42]
+    assert decode_cursor(INTERVENTION_KEYSET, encode_cursor(INTERVENTION_KEYSET, valeurs)) == valeurs
+
+
+def test_taille_de_page_plafonnee(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "PAGINATION_MAX_LIMIT", 100)
+    monkeypatch.setattr(settings, "PAGINATION_DEFAULT_LIMIT", 100)
+    assert Pagination(None, None).page_size() == 100
+    assert Pagination(None, None).page_size(default_limit=50) == 50
+    assert Pagination(None, None, limit=5000).page_size() == 100
+
+
+def test_liste_api_en_tetes_de_pagination(client, db_session):
+    for i in range(3):
+        db_session.add(Equipement(nom=f"EQ-page-{i}-{datetime.utcnow().timestamp()}", type_equipement="machine",
+                                  localisation="Atelier"))
+    db_session.commit()
+
+    premiere = client.get("/equipements/", params={"limit": 2, "total": "exact"})
+    assert premiere.status_code == 200
+    assert len(premiere.json()) == 2
+    assert int(premiere.headers["X-Total-Count"]) >= 3
+    assert premiere.headers["X-Total-Estimated"] == "false"
+    cursor = premiere.headers["X-Next-Cursor"]
+    assert 'rel="next"' in premiere.headers["Link"]
+
+    suivante = client.get("/equipements/", params={"limit": 2, "cursor": cursor})
+    assert suivante.status_code == 200
+    ids = [e["id"] for e in premiere.json() + suivante.json()]
+    assert ids == sorted(set(ids))
+
+    assert client.get("/equipements/", params={"cursor": "abc"}).status_code == 400
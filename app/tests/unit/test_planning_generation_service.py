@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.historique import HistoriqueIntervention
+from app.models.intervention import Intervention
+from app.models.planning import FrequencePlanning, Planning
+from app.schemas.equipement import EquipementCreate
+from app.services.equipement_service import create_equipement
+from app.services.kpi_counter_service import reconcile_kpi_counters
+from app.services.planning_generation_service import _claim, generate_due_interventions
+from app.models.user import User, UserRole
+from app.services import user_service
+from app.services.user_service import SYSTEM_USER_EMAIL, SYSTEM_USERNAME, get_all_users, get_system_user_id
+
+
+def _plannings(db, nom, prochaines):
+    eq = create_equipement(db, EquipementCreate(nom=nom, type="t", localisation="L", frequence_entretien="7"))
+    plannings = [Planning(frequence=FrequencePlanning.mensuel, prochaine_date=d, equipement_id=eq.id) for d in prochaines]
+    db.add_all(plannings)
+    db.commit()
+    return eq, plannings
+
+
+def test_batch_generation_is_chunked_and_idempotent(db_session):
+    now = datetime(2032, 3, 1, 6, 0)
+    eq, plannings = _plannings(db_session, "PLAN-BATCH-EQ", [now - timedelta(days=d) for d in (1, 2, 3)] + [now + timedelta(days=1)])
+    dus = plannings[:3]
+
+    metriques = generate_due_interventions(db_session, now=now, chunk_size=2)
+    assert metriques["generees"] >= 3
+    assert metriques["paquets"] >= 2
+    assert metriques["debit_par_seconde"] is not None
+
+    interventions = db_session.execute(select(Intervention).where(Intervention.equipement_id == eq.id)).scalars().all()
+    assert sorted(i.description for i in interventions) == sorted(
+        f"Intervention générée automatiquement depuis le planning #{p.id}" for p in dus
+    )
+    assert all(i.titre == "Maintenance préventive - PLAN-BATCH-EQ" for i in interventions)
+    historiques = db_session.execute(
+        select(HistoriqueIntervention).where(HistoriqueIntervention.intervention_id.in_([i.id for i in interventions]))
+    ).scalars().all()
+    assert len(historiques) == 3
+    # Compteurs KPI ajustés en lot, sans dérive
+    assert reconcile_kpi_counters(db_session, dry_run=True)["drift"] == []
+
+    for planning in dus:
+        db_session.refresh(planning)
+        assert planning.derniere_date == now
+        assert planning.prochaine_date == now + timedelta(days=30)
+    db_session.refresh(plannings[3])
+    assert plannings[3].derniere_date is None
+
+    # Second passage (autre worker, ou reprise): rien à regénérer
+    assert generate_due_interventions(db_session, now=now)["generees"] == 0
+
+
+def test_claim_skips_plannings_already_advanced(db_session):
+    now = datetime(2032, 4, 1)
+    _, (planning,) = _plannings(db_session, "PLAN-CLAIM-EQ", [now - timedelta(days=1)])
+    candidat = db_session.execute(
+        select(Planning.id, Planning.frequence).where(Planning.id == planning.id)
+    ).one()
+    assert _claim(db_session, [candidat], now) == [planning.id]
+    # Un second worker ayant sélectionné le même planning ne le réclame plus
+    assert _claim(db_session, [candidat], now) == []
+    db_session.commit()
+
+
+@pytest.fixture
+def foreign_keys(db_session):
+    """Active le contrôle des clés étrangères SQLite (appliqué par PostgreSQL en production)."""
+    db_session.commit()
+    db_session.connection().exec_driver_sql("PRAGMA foreign_keys=ON")
+    yield
+    db_session.rollback()
+    db_session.connection().exec_driver_sql("PRAGMA foreign_keys=OFF")
+
+
+def test_historiques_attribues_au_compte_systeme(db_session, foreign_keys):
+    now = datetime(2032, 5, 1)
+    eq, _ = _plannings(db_session, "PLAN-FK-EQ", [now - timedelta(days=1), now - timedelta(days=2)])
+
+    assert generate_due_interventions(db_session, now=now)["generees"] >= 2
+
+    historiques = db_session.execute(
+        select(HistoriqueIntervention).join(Intervention).where(Intervention.equipement_id == eq.id)
+    ).scalars().all()
+    assert len(historiques) == 2
+    assert {h.user.email for h in historiques} == {SYSTEM_USER_EMAIL}
+    assert not historiques[0].user.is_active
+
+
+def test_compte_systeme_sans_privilege_et_hors_listes(db_session):
+    system = db_session.get(User, get_system_user_id(db_session))
+    assert system.role == UserRole.client and not system.is_active
+    assert SYSTEM_USER_EMAIL not in {u.email for u in get_all_users(db_session)}
+
+
+def test_compte_systeme_relu_par_username_apres_conflit(db_session, monkeypatch):
+    system_id = get_system_user_id(db_session)
+    # Création concurrente: le compte n'était pas visible à la lecture, l'insertion échoue
+    monkeypatch.setattr(user_service, "get_user_by_email", lambda db, email: None)
+    assert get_system_user_id(db_session) == system_id
+
+    db = MagicMock()
+    db.commit.side_effect = IntegrityError("INSERT", {}, Exception("unique"))
+    db.query.return_value.filter.return_value.first.return_value = None
+    with pytest.raises(RuntimeError, match=SYSTEM_USERNAME):
+        get_system_user_id(db)
+    db.rollback.assert_called_once()
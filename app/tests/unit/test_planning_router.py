@@ -1,6 +1,6 @@
 from datetime import datetime
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from app.api.v1 import planning as planning_router
 
 
@@ -12,12 +12,14 @@ def test_create_new_planning_calls_service(monkeypatch):
         cp.assert_called_once()
 
 
-def test_list_all_plannings_calls_service(monkeypatch):
+def test_list_all_plannings_paginates(monkeypatch):
     dummy = [{'id':1}, {'id':2}]
-    with patch('app.api.v1.planning.get_all_plannings', return_value=dummy) as gp:
-        res = planning_router.list_all_plannings(db=None, user={'id':1})
-        assert res == dummy
-        gp.assert_called_once()
+    page = MagicMock()
+    page.paginate.return_value = dummy
+    res = planning_router.list_all_plannings(db=None, user={'id':1}, page=page)
+    assert res == dummy
+    page.paginate.assert_called_once()
+    assert page.paginate.call_args[0][2] is planning_router.PLANNING_KEYSET
 
 
 def test_get_and_update_planning(monkeypatch):
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from datetime import datetime, timedelta
 from app.services import planning_service
@@ -76,23 +77,24 @@ def test_delete_planning_calls_delete(monkeypatch):
 
 # Tests for filters
 from app.api.v1 import filters as filters_module
+from app.db.async_database import ReadSession
+from app.core.pagination import Pagination
 from app.models.intervention import StatutIntervention, InterventionType
 
 
 def test_filter_interventions_calls_filters(monkeypatch):
     db = MagicMock()
-    q = MagicMock()
-    db.query.return_value = q
-    q.filter.return_value = q
-    q.all.return_value = ['a']
-    res = filters_module.filter_interventions(statut=StatutIntervention.cloturee, urgence=True, type=InterventionType.corrective, technicien_id=1, db=db, user={'id':1})
+    db.scalars.return_value.all.return_value = ['a']
+    res = asyncio.run(filters_module.filter_interventions(statut=StatutIntervention.cloturee, urgence=True, type=InterventionType.corrective, technicien_id=1, db=ReadSession(db), user={'id':1, 'role': 'admin'}, page=Pagination(None, None)))
     assert res == ['a']
+    sql = str(db.scalars.call_args[0][0])
+    for colonne in ('statut', 'urgence', 'type', 'technicien_id'):
+        assert f'interventions.{colonne} =' in sql
 
 
 def test_filter_interventions_no_filters(monkeypatch):
     db = MagicMock()
-    q = MagicMock()
-    db.query.return_value = q
-    q.all.return_value = []
-    res = filters_module.filter_interventions(statut=None, urgence=None, type=None, technicien_id=None, db=db, user={'id':1})
+    db.scalars.return_value.all.return_value = []
+    res = asyncio.run(filters_module.filter_interventions(statut=None, urgence=None, type=None, technicien_id=None, db=ReadSession(db), user={'id':1, 'role': 'admin'}, page=Pagination(None, None)))
     assert res == []
+    assert 'WHERE' not in str(db.scalars.call_args[0][0])
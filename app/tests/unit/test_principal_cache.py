@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core.principal_cache import PrincipalCache, RedisInvalidationBus, get_principal_cache, principal_key
+from app.core.rbac import get_current_user
+from app.core.security import create_access_token
+from app.db.database import engine
+from app.schemas.user import UserCreate, UserRole
+from app.services.user_service import create_user, deactivate_user, reactivate_user, update_user_role
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _user_token(db, username):
+    u = create_user(db, UserCreate(username=username, full_name="P", email=f"{username}@example.com",
+                                   role=UserRole.technicien, password="p"))
+    return u, create_access_token({"sub": u.email, "role": u.role.value, "user_id": u.id})
+
+
+def _count_queries(fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+
+def test_warm_cache_resolves_principal_without_queries(db_session):
+    u, token = _user_token(db_session, "principal_warm")
+    froid, _ = _count_queries(lambda: get_current_user(token=token, db=db_session))
+    chaud, requetes = _count_queries(lambda: get_current_user(token=token, db=db_session))
+    assert requetes == 0
+    assert chaud == froid and chaud["user_id"] == u.id
+    # Le principal renvoyé est une copie: le modifier n'altère pas le cache
+    chaud["role"] = "admin"
+    assert get_current_user(token=token, db=db_session)["role"] == UserRole.technicien
+
+
+def test_deactivation_and_role_change_invalidate_principal(db_session):
+    u, token = _user_token(db_session, "principal_inval")
+    get_current_user(token=token, db=db_session)
+
+    deactivate_user(db_session, u.id)
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token=token, db=db_session)
+    assert exc.value.status_code == 403
+
+    reactivate_user(db_session, u.id)
+    assert get_current_user(token=token, db=db_session)["is_active"] is True
+
+    update_user_role(db_session, u.id, UserRole.responsable)
+    assert get_current_user(token=token, db=db_session)["role"] == UserRole.responsable
+
+
+def test_cache_is_bounded_and_skips_stale_loads():
+    cache = PrincipalCache(max_entries=2, ttl=30)
+    generation = cache.generation
+    cache.invalidate_user(7)  # invalidation pendant la lecture en base
+    assert cache.set(("7", 1, 2), {"user_id": 7}, generation) is False
+
+    for i in range(3):
+        cache.set((str(i), None, None), {"user_id": i}, cache.generation)
+    assert len(cache) == 2 and cache.get(("0", None, None)) is None
+
+    assert principal_key({"sub": "a@b.c", "iat": 1, "exp": 2}) == ("a@b.c", 1, 2)
+    assert principal_key({"sub": "a@b.c", "user_id": 3, "exp": 2}) == ("3", None, 2)
+
+
+def test_redis_message_invalidates_local_cache():
+    cache = PrincipalCache()
+    cache.set(("9", 1, 2), {"user_id": 9}, cache.generation)
+    bus = RedisInvalidationBus.__new__(RedisInvalidationBus)
+    bus.cache = cache
+    bus._on_message({"type": "message", "data": b"9"})
+    assert cache.get(("9", 1, 2)) is None
+    bus._on_message({"type": "message", "data": b"inconnu"})  # ignoré
+    assert get_principal_cache() is get_principal_cache()
@@ -0,0 +1,53 @@
+# app/tests/unit/test_query_stats.py
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core import query_stats
+from app.core.config import settings
+from app.core.query_stats import QueryBudgetExceeded, fingerprint, instrument_queries, track_queries
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+@pytest.fixture
+def engine():
+    eng = instrument_queries(create_engine("sqlite://"))
+    yield eng
+    eng.dispose()
+
+
+def test_empreinte_normalise_litteraux_et_listes():
+    a = fingerprint("SELECT * FROM t WHERE id = 12 AND nom = 'x'  AND k IN (?, ?, ?)")
+    b = fingerprint("SELECT * FROM t\n WHERE id = 7 AND nom = 'y''z' AND k IN (?)")
+    assert a == b == "SELECT * FROM t WHERE id = ? AND nom = ? AND k IN (?)"
+
+
+def test_comptage_et_suspect_n_plus_un(engine):
+    with track_queries() as stats, engine.connect() as conn:
+        conn.execute(text("SELECT 'a', 'b'"))
+        for i in range(5):
+            conn.execute(text("SELECT :i"), {"i": i})
+    assert stats.count == 6
+    assert stats.total_ms >= stats.slowest_ms > 0
+    assert stats.repeated(threshold=5) == [("SELECT ?", 5)]
+    assert stats.server_timing().startswith('db;dur=') and 'desc="6 queries"' in stats.server_timing()
+
+
+def test_hors_contexte_rien_n_est_collecte(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert query_stats.current_stats() is None
+
+
+def test_en_tete_server_timing(client):
+    r = client.get("/health")
+    assert r.headers["server-timing"].startswith("db;dur=")
+
+
+def test_budget_depasse_en_mode_raise(client, admin_token, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "raise")
+    monkeypatch.setattr(settings, "QUERY_BUDGETS", {"GET /interventions/": 1})
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/interventions/", headers={"Authorization": f"Bearer {admin_token}"})
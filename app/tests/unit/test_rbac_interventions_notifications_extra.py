@@ -71,10 +71,17 @@ class DBWithNotifications:
         return Q(self._items)
 
 def test_list_notifications_filters():
+    from unittest.mock import MagicMock
+    from app.core.pagination import Pagination
+
     items = [{'id':1}, {'id':2}]
-    db = DBWithNotifications(items)
-    res = notifications_mod.list_notifications(db=db, user_id=10, intervention_id=20, limit=10, offset=0)
+    db = MagicMock()
+    db.scalars.return_value.all.return_value = items
+    res = notifications_mod.list_notifications(db=db, user_id=10, intervention_id=20,
+                                               page=Pagination(None, None, limit=10))
     assert res == items
+    sql = str(db.scalars.call_args[0][0])
+    assert 'notifications.user_id =' in sql and 'notifications.intervention_id =' in sql
 
 def test_delete_notification_not_found():
     db = DBWithNotifications([])
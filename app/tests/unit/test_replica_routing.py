@@ -0,0 +1,122 @@
+# app/tests/unit/test_replica_routing.py
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import database, replica_routing
+from app.db.database import Base, SessionLocal, use_replica_for
+from app.db.replica_routing import MemoryStickiness, WriteStickiness, client_key
+from app.models.user import User, UserRole
+
+
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _request(method="GET", token="tok-a", host="10.0.0.1"):
+    headers = {"authorization": f"Bearer {token}"} if token else {}
+    return SimpleNamespace(method=method, headers=headers, client=SimpleNamespace(host=host))
+
+
+def _user(email):
+    return User(username=email.split("@")[0], full_name="Réplica", email=email,
+                hashed_password="x", role=UserRole.technicien, is_active=True)
+
+
+@pytest.fixture
+def primary_replica(tmp_path, monkeypatch):
+    """Primaire et réplica sur deux fichiers SQLite distincts (le réplica ne reçoit rien)."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for eng in (primary, replica):
+        Base.metadata.create_all(eng)
+    with replica.begin() as conn:
+        conn.execute(User.__table__.insert(), [{
+            "username": "replica.only", "full_name": "R", "email": "replica.only@example.com",
+            "hashed_password": "x", "role": "technicien", "is_active": True, "failed_login_attempts": 0,
+        }])
+    factory = sessionmaker(class_=database.RoutingSession, bind=primary,
+                           autocommit=False, autoflush=False)
+    monkeypatch.setattr(database, "_SessionFactory", factory)
+    monkeypatch.setattr(database, "replica_engine", replica)
+    monkeypatch.setattr(replica_routing, "_stickiness", WriteStickiness(MemoryStickiness(60)))
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _emails(db):
+    return [u.email for u in db.scalars(select(User).order_by(User.email))]
+
+
+def test_lectures_sur_le_replica_ecritures_sur_le_primaire(primary_replica):
+    primary, _ = primary_replica
+    db = SessionLocal(read_replica=True)
+    assert _emails(db) == ["replica.only@example.com"]
+
+    db.add(_user("written@example.com"))
+    db.commit()
+    # Après écriture, la session relit sur le primaire
+    assert _emails(db) == ["written@example.com"]
+    db.close()
+
+    with primary.connect() as conn:
+        assert conn.execute(text("SELECT email FROM users")).scalars().all() == ["written@example.com"]
+
+
+def test_session_sans_replica_reste_sur_le_primaire(primary_replica):
+    db = SessionLocal()
+    assert _emails(db) == []
+    db.close()
+
+
+def test_select_for_update_sur_le_primaire(primary_replica):
+    db = SessionLocal(read_replica=True)
+    assert db.scalars(select(User).with_for_update()).all() == []
+    assert db.replica is None
+    db.close()
+
+
+def test_ecriture_marque_le_client_sur_le_primaire(primary_replica):
+    get_request = _request("GET")
+    assert use_replica_for(get_request) is True
+    assert use_replica_for(_request("POST")) is False
+
+    db = SessionLocal(read_replica=False, client=client_key(_request("POST")))
+    db.add(_user("sticky@example.com"))
+    db.commit()
+    db.close()
+
+    assert use_replica_for(get_request) is False
+    # Un autre client continue de lire sur le réplica
+    assert use_replica_for(_request("GET", token="tok-b")) is True
+
+
+def test_lecture_seule_ne_marque_pas_le_client(primary_replica):
+    key = client_key(_request("GET"))
+    db = SessionLocal(read_replica=True, client=key)
+    _emails(db)
+    db.commit()
+    db.close()
+    assert use_replica_for(_request("GET")) is True
+
+
+def test_sans_replica_configure_tout_va_au_primaire(monkeypatch):
+    monkeypatch.setattr(database, "replica_engine", None)
+    assert use_replica_for(_request("GET")) is False
+
+
+def test_stickiness_expire_apres_la_fenetre():
+    sticky = MemoryStickiness(window_seconds=5)
+    sticky.mark("k", now=100.0)
+    assert sticky.is_sticky("k", now=104.0) is True
+    assert sticky.is_sticky("k", now=105.5) is False
+
+
+def test_client_key_jeton_puis_ip():
+    assert client_key(_request(token="abc")) == client_key(_request(token="abc", host="10.9.9.9"))
+    assert client_key(_request(token="abc")) != client_key(_request(token="abd"))
+    assert client_key(_request(token=None, host="10.0.0.7")) == "ip:10.0.0.7"
+    assert client_key(None) is None
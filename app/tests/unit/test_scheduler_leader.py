@@ -0,0 +1,106 @@
+import threading
+import time
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import create_engine
+
+from app.tasks import scheduler as scheduler_module
+from app.tasks.leader import AdvisoryLock, FileLock, advisory_key, create_leader_lock
+
+
+def test_file_lock_is_exclusive_between_holders(tmp_path):
+    premier, second = FileLock(tmp_path / "leader.lock"), FileLock(tmp_path / "leader.lock")
+    assert premier.acquire() is True
+    assert premier.acquire() is True  # déjà leader
+    assert second.acquire() is False
+    premier.release()
+    assert second.acquire() is True
+    second.release()
+
+
+def test_leader_lock_backend_depends_on_dialect(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.db.database import engine
+
+    monkeypatch.setattr(settings, "SCHEDULER_LOCK_DIR", str(tmp_path))
+    lock = create_leader_lock("jobs", engine=engine)
+    assert isinstance(lock, FileLock) and lock.path == tmp_path / "erp-jobs.lock"
+
+    class FakeEngine:
+        class dialect:
+            name = "postgresql"
+
+    assert isinstance(create_leader_lock("jobs", engine=FakeEngine()), AdvisoryLock)
+    assert advisory_key("erp:jobs") == advisory_key("erp:jobs") != advisory_key("erp:autre")
+
+
+def test_only_the_leader_runs_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler_module, "_leader_lock", FileLock(tmp_path / "leader.lock"))
+    autre_worker = FileLock(tmp_path / "leader.lock")
+    assert autre_worker.acquire()
+    assert scheduler_module.run_as_leader("job", lambda: "fait") is None
+
+    autre_worker.release()
+    assert scheduler_module.run_as_leader("job", lambda: "fait") == "fait"
+    scheduler_module._leader_lock.release()
+
+
+def test_register_jobs_is_idempotent():
+    sched = BackgroundScheduler()
+    scheduler_module.register_jobs(sched)
+    scheduler_module.register_jobs(sched)
+    assert sorted(job.id for job in sched.get_jobs()) == sorted(
+        [scheduler_module.PLANNING_JOB_ID, scheduler_module.EMAIL_OUTBOX_JOB_ID]
+    )
+
+
+def test_leader_lock_created_once_across_threads(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "_leader_lock", None)
+    created = []
+
+    def slow_factory(name):
+        time.sleep(0.01)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(scheduler_module, "create_leader_lock", slow_factory)
+    barrier, locks = threading.Barrier(8), []
+
+    def worker():
+        barrier.wait()
+        locks.append(scheduler_module.get_leader_lock())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1 and all(lock is created[0] for lock in locks)
+
+
+def test_advisory_heartbeat_is_serialized_and_ends_transaction():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    lock = AdvisoryLock(engine, "erp:test")
+    lock._connection = engine.connect()  # verrou déjà obtenu
+    actifs, max_actifs = [0], [0]
+    execute = lock._connection.execute
+
+    def tracked_execute(*args, **kwargs):
+        actifs[0] += 1
+        max_actifs[0] = max(max_actifs[0], actifs[0])
+        time.sleep(0.005)
+        try:
+            return execute(*args, **kwargs)
+        finally:
+            actifs[0] -= 1
+
+    lock._connection.execute = tracked_execute
+    threads = [threading.Thread(target=lock.acquire) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max_actifs[0] == 1
+    # Pas de connexion laissée "idle in transaction" entre deux battements
+    assert lock.held and not lock._connection.in_transaction()
+    lock._discard()
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.intervention import Intervention, InterventionType, StatutIntervention
+from app.models.technicien import Technicien, NiveauCompetence
+from app.schemas.equipement import EquipementCreate
+from app.schemas.user import UserRole
+from app.services.equipement_service import create_equipement
+from app.services.technicien_kpi_service import compute_technicien_kpis, score_affectation
+from app.services.user_service import ensure_user_for_email
+
+# Les utilisateurs créés ici ne doivent pas décaler les identifiants vus par les autres tests
+pytestmark = pytest.mark.usefixtures("isolated_rows")
+
+
+def _technicien(db, email, niveau=NiveauCompetence.intermediaire):
+    user = ensure_user_for_email(db, email=email, role=UserRole.technicien)
+    technicien = Technicien(user_id=user.id, equipe="KPI", niveau_technicien=niveau)
+    db.add(technicien)
+    db.commit()
+    return technicien
+
+
+def _intervention(db, technicien_id, equipement_id, statut, creation, **kwargs):
+    db.add(Intervention(titre="kpi", type_intervention=InterventionType.corrective, statut=statut,
+                        technicien_id=technicien_id, equipement_id=equipement_id, date_creation=creation, **kwargs))
+
+
+def test_batch_kpis_match_legacy_rules(db_session):
+    tech = _technicien(db_session, "tkpi1@example.com", NiveauCompetence.expert)
+    eq1 = create_equipement(db_session, EquipementCreate(nom="TKPI-EQ1", type="t", localisation="L", frequence_entretien="7"))
+    eq2 = create_equipement(db_session, EquipementCreate(nom="TKPI-EQ2", type="t", localisation="L", frequence_entretien="7"))
+    t0 = datetime(2030, 1, 10, 8, 0)
+    # Clôture suivie d'une réouverture sur le même équipement sous 7 jours: échec
+    _intervention(db_session, tech.id, eq1.id, StatutIntervention.cloturee, t0, date_cloture=t0 + timedelta(hours=2),
+                  duree_reelle=60, satisfaction_client=5)
+    _intervention(db_session, tech.id, eq1.id, StatutIntervention.en_cours, t0 + timedelta(days=3))
+    # Clôture sans suite: réussite
+    _intervention(db_session, tech.id, eq2.id, StatutIntervention.cloturee, t0, date_cloture=t0 + timedelta(hours=1),
+                  duree_reelle=120, satisfaction_client=4)
+    db_session.commit()
+
+    kpis = compute_technicien_kpis(db_session, [tech.id])[tech.id]
+    assert kpis.nb_interventions_terminees == 2
+    assert kpis.nb_interventions_actives == 1
+    assert kpis.taux_reussite == 50.0
+    assert kpis.temps_moyen_intervention == 1.5
+    assert kpis.satisfaction_moyenne == 4.5
+    # disponible (+30), expert (+15), satisfaction >= 4.5 (+10)
+    assert kpis.score_affectation == score_affectation(True, 1, 0, NiveauCompetence.expert, 4.5) == 100
+
+    # Les propriétés du modèle délèguent au calcul en lot
+    assert tech.taux_reussite == 50.0
+    assert tech.score_affectation == 100
+
+
+def test_batch_kpis_use_constant_queries(db_session):
+    ids = [_technicien(db_session, f"tkpi-n{i}@example.com").id for i in range(5)]
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        kpis = compute_technicien_kpis(db_session, ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert set(kpis) == set(ids)
+    assert len(statements) == 3
+    assert all(k.taux_reussite is None and k.nb_interventions_actives == 0 for k in kpis.values())
+    assert compute_technicien_kpis(db_session, []) == {}
+
+
+def test_list_techniciens_includes_kpis(client, responsable_token, db_session):
+    tech = _technicien(db_session, "tkpi-api@example.com")
+    tech.user.full_name = "Tech KPI"
+    db_session.commit()
+    r = client.get(f"/techniciens/{tech.id}", headers={"Authorization": f"Bearer {responsable_token}"})
+    assert r.status_code == 200
+    assert r.json()["kpis"]["score_affectation"] >= 0
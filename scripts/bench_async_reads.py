@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark de charge des endpoints de lecture : session synchrone (requêtes SQL
+dans le threadpool, 40 threads) vs session asynchrone (asyncpg/aiosqlite).
+
+L'application est appelée en processus (httpx + transport ASGI) avec
+`--concurrency` requêtes simultanées; `--latency-ms` ajoute une attente par
+requête SQL pour simuler l'aller-retour réseau vers PostgreSQL.
+
+Usage:
+    python scripts/bench_async_reads.py
+    python scripts/bench_async_reads.py --concurrency 200 --requests 2000 --latency-ms 5
+    python scripts/bench_async_reads.py --url postgresql+psycopg2://u:p@localhost/bench
+
+Le mode asynchrone requiert asyncpg (PostgreSQL) ou aiosqlite, et greenlet.
+NOTE: la base cible est vidée puis remplie; utiliser une base dédiée.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db import async_database  # noqa: E402
+from app.db.database import Base, get_db  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.main import app  # noqa: E402
+from app.models.equipement import Equipement  # noqa: E402
+from app.models.intervention import Intervention  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+ENDPOINTS = ["/interventions/", "/filters/interventions", "/notifications/user/me", "/dashboard/stats", "/auth/me"]
+
+
+def seed(engine, nb_interventions: int) -> str:
+    """(Re)crée le schéma, insère un admin et des interventions; renvoie un token admin."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{
+            "username": "bench", "full_name": "Bench", "email": "bench@example.com", "hashed_password": "x",
+            "role": "admin", "is_active": True, "failed_login_attempts": 0,
+        }])
+        conn.execute(insert(Equipement.__table__), [
+            {"nom": "EQ-1", "type_equipement": "machine", "localisation": "Atelier", "criticite": "standard"}
+        ])
+        now = datetime.utcnow()
+        conn.execute(insert(Intervention.__table__), [
+            {"titre": f"I{i}", "type": "corrective", "statut": "ouverte", "priorite": "normale",
+             "urgence": False, "date_creation": now, "validation_client": False, "equipement_id": 1}
+            for i in range(nb_interventions)
+        ])
+    return create_access_token({"sub": "bench@example.com", "role": "admin", "user_id": 1})
+
+
+async def load(token: str, path: str, nb_requests: int, concurrency: int) -> float:
+    """Débit (requêtes/s) de `nb_requests` GET `path` avec `concurrency` requêtes simultanées."""
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    restantes = iter(range(nb_requests))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        async def worker():
+            for _ in restantes:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return nb_requests / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL SQLAlchemy (synchrone) de la base de benchmark")
+    parser.add_argument("--interventions", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_async.db')}"
+    # Pool dimensionné sur la concurrence: on mesure l'attente SQL, pas l'attente du pool
+    engine = create_engine(url, pool_size=args.concurrency, max_overflow=0)
+    token = seed(engine, args.interventions)
+    print(f"Base: {engine.url.render_as_string(hide_password=True)}")
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def bench_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_get_db
+    if args.latency_ms:
+        latence = args.latency_ms / 1000
+        # Engine synchrone: attente bloquante (thread occupé, comme un aller-retour réseau)
+        event.listen(engine, "before_cursor_execute", lambda *a: time.sleep(latence))
+
+    modes = [("synchrone", False)]
+    try:
+        settings.ASYNC_DATABASE_URL = async_database.async_database_url(url)
+        modes.append(("asynchrone", True))
+    except ValueError as exc:
+        print(f"Mode asynchrone ignoré: {exc}")
+
+    print(f"{'mode':>10} | {'endpoint':>24} | {'req/s':>8}")
+    for nom, active in modes:
+        settings.ASYNC_DB_ENABLED = active
+        async_database._async_unavailable = False
+        if active and async_database.get_async_sessionmaker() is None:
+            print(f"{nom:>10} | {'(asyncpg/aiosqlite ou greenlet absent)':>24} |")
+            continue
+        if active and args.latency_ms:
+            # Engine asynchrone: attente côté boucle (le pilote ne bloque aucun thread)
+            event.listen(async_database._async_engines["primary"].sync_engine, "before_cursor_execute",
+                         lambda *a: time.sleep(args.latency_ms / 1000))
+        for path in ENDPOINTS:
+            debit = asyncio.run(load(token, path, args.requests, args.concurrency))
+            print(f"{nom:>10} | {path:>24} | {debit:>8.0f}")
+        asyncio.run(async_database.dispose_async_engine())
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark de get_current_user : requêtes SQL et latence par requête
+authentifiée, sans cache (historique) puis avec le cache des principaux
+(app.core.principal_cache) froid et chaud.
+
+Usage:
+    python scripts/bench_auth_principal.py
+    python scripts/bench_auth_principal.py --requests 5000 --users 50
+    python scripts/bench_auth_principal.py --url postgresql+psycopg2://u:p@localhost/bench
+
+NOTE: la base cible est vidée puis remplie; utiliser une base dédiée.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import principal_cache  # noqa: E402
+from app.core.principal_cache import PrincipalCache  # noqa: E402
+from app.core.rbac import get_current_user  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.database import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.user import User  # noqa: E402
+
+
+def seed(engine, nb_users: int) -> list:
+    """(Re)crée le schéma, insère `nb_users` utilisateurs et renvoie un token par utilisateur."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"username": f"u{i}", "email": f"u{i}@bench.local", "hashed_password": "x",
+             "role": "technicien", "is_active": True, "failed_login_attempts": 0}
+            for i in range(1, nb_users + 1)
+        ])
+    return [
+        create_access_token({"sub": f"u{i}@bench.local", "role": "technicien", "user_id": i})
+        for i in range(1, nb_users + 1)
+    ]
+
+
+def measure(engine, tokens: list, nb_requests: int):
+    """Retourne (requêtes SQL par appel, latence moyenne en µs)."""
+    statements = []
+    listener = lambda *args: statements.append(1)  # noqa: E731
+    Session = sessionmaker(bind=engine)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with Session() as db:
+            t0 = time.perf_counter()
+            for i in range(nb_requests):
+                get_current_user(token=tokens[i % len(tokens)], db=db)
+            duree = time.perf_counter() - t0
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements) / nb_requests, duree / nb_requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL SQLAlchemy de la base de benchmark")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_auth.db')}"
+    engine = create_engine(url)
+    tokens = seed(engine, args.users)
+    print(f"Base: {engine.url.render_as_string(hide_password=True)}")
+
+    resultats = []
+    principal_cache._cache = PrincipalCache(ttl=0)  # cache désactivé
+    resultats.append(("sans cache",) + measure(engine, tokens, args.requests))
+    principal_cache._cache = PrincipalCache()
+    resultats.append(("cache froid",) + measure(engine, tokens, len(tokens)))
+    resultats.append(("cache chaud",) + measure(engine, tokens, args.requests))
+
+    print(f"{'variante':>12} | {'requêtes/appel':>14} | {'µs/appel':>9}")
+    for nom, requetes, latence in resultats:
+        print(f"{nom:>12} | {requetes:>14.2f} | {latence:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark du tableau de bord : requêtes unitaires (historique) vs moteur agrégé
+(lecture des compteurs matérialisés intervention_kpi_counters).
+
+Mesure, pour plusieurs volumétries d'interventions, le nombre d'allers-retours
+SQL et la latence de calcul de /dashboard/stats.
+
+Usage:
+    python scripts/bench_dashboard.py                      # SQLite fichier temporaire
+    python scripts/bench_dashboard.py --sizes 10000 100000
+    python scripts/bench_dashboard.py --url postgresql+psycopg2://u:p@localhost/bench
+    python scripts/bench_dashboard.py --rtt-ms 1.0             # latence réseau simulée
+
+NOTE: la base cible est vidée puis remplie; utiliser une base dédiée.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.database import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.equipement import Equipement, StatutEquipement  # noqa: E402
+from app.models.intervention import (  # noqa: E402
+    Intervention, InterventionType, PrioriteIntervention, StatutIntervention,
+)
+from app.models.user import User  # noqa: E402
+from app.services.dashboard_service import (  # noqa: E402
+    TREND_MONTHS, compute_dashboard_stats, month_start, shift_months,
+)
+from app.services.kpi_counter_service import rebuild_kpi_counters  # noqa: E402
+
+BATCH = 10_000
+
+
+def seed(engine, nb_interventions: int) -> None:
+    """(Re)crée le schéma et insère `nb_interventions` lignes par lots."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    statuts = list(StatutIntervention)
+    priorites = list(PrioriteIntervention)
+    types = list(InterventionType)
+    with engine.begin() as conn:
+        conn.execute(insert(Equipement.__table__), [
+            {"nom": f"EQ-{i}", "type_equipement": "machine", "localisation": "Atelier",
+             "statut": random.choice(list(StatutEquipement)), "criticite": "standard",
+             "created_at": now, "updated_at": now}
+            for i in range(200)
+        ])
+        conn.execute(insert(User.__table__), [
+            {"username": f"u{i}", "email": f"u{i}@bench.local", "hashed_password": "x",
+             "role": "technicien", "is_active": i % 10 != 0, "created_at": now,
+             "updated_at": now, "failed_login_attempts": 0, "password_changed_at": now}
+            for i in range(100)
+        ])
+        for start in range(0, nb_interventions, BATCH):
+            rows = []
+            for _ in range(min(BATCH, nb_interventions - start)):
+                created = now - timedelta(minutes=random.randint(0, 60 * 24 * 365))
+                rows.append({
+                    "titre": "bench", "type": random.choice(types), "statut": random.choice(statuts),
+                    "priorite": random.choice(priorites), "urgence": False,
+                    "date_creation": created, "created_at": created, "updated_at": created,
+                    "validation_client": False, "equipement_id": random.randint(1, 200),
+                })
+            conn.execute(insert(Intervention.__table__), rows)
+    with sessionmaker(bind=engine)() as db:
+        rebuild_kpi_counters(db)
+
+
+def legacy_stats(db) -> dict:
+    """Reproduction portable de l'implémentation historique (une requête par KPI)."""
+    now = datetime.utcnow()
+    debut_mois = month_start(now)
+    count = lambda *crit: db.execute(  # noqa: E731
+        select(func.count()).select_from(crit[0]).where(*crit[1:])
+    ).scalar()
+    statuts = dict(db.execute(select(Intervention.statut, func.count()).group_by(Intervention.statut)).all())
+    total_mensuel = count(Intervention, Intervention.date_creation >= debut_mois)
+    terminees_mensuel = count(Intervention, Intervention.date_creation >= debut_mois,
+                              Intervention.statut == StatutIntervention.cloturee)
+    total = count(Intervention) or 1
+    cloturees = count(Intervention, Intervention.statut == StatutIntervention.cloturee)
+    tendances = db.execute(
+        select(func.extract("month", Intervention.date_creation), func.count())
+        .where(Intervention.date_creation >= shift_months(debut_mois, -(TREND_MONTHS - 1)))
+        .group_by(func.extract("month", Intervention.date_creation))
+    ).all()
+    priorites = dict(db.execute(select(Intervention.priorite, func.count()).group_by(Intervention.priorite)).all())
+    return {
+        "statuts": statuts, "total_mensuel": total_mensuel, "terminees_mensuel": terminees_mensuel,
+        "taux": cloturees / total, "tendances": tendances, "priorites": priorites,
+        "eq_total": count(Equipement),
+        "eq_operationnel": count(Equipement, Equipement.statut == StatutEquipement.operationnel),
+        "eq_maintenance": count(Equipement, Equipement.statut == StatutEquipement.maintenance),
+        "users_total": count(User),
+        "users_actifs": count(User, User.is_active.is_(True)),
+    }
+
+
+def measure(engine, fn, repeat: int, rtt_ms: float = 0.0):
+    """
+    Retourne (allers-retours par appel, latence médiane en ms).
+
+    `rtt_ms` simule la latence réseau client/serveur par requête (nulle en SQLite local).
+    """
+    statements = []
+
+    def listener(*args):
+        statements.append(1)
+        if rtt_ms:
+            time.sleep(rtt_ms / 1000)
+
+    Session = sessionmaker(bind=engine)
+    timings = []
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        for _ in range(repeat):
+            with Session() as db:
+                t0 = time.perf_counter()
+                fn(db)
+                timings.append((time.perf_counter() - t0) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    timings.sort()
+    return len(statements) // repeat, timings[len(timings) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL SQLAlchemy de la base de benchmark")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=0.0,
+                        help="Latence réseau simulée par aller-retour (ex: 1.0 en conteneurs)")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_dashboard.db')}"
+    engine = create_engine(url)
+    print(f"Base: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{'interventions':>14} | {'legacy RT':>9} | {'legacy ms':>9} | {'agrégé RT':>9} | {'agrégé ms':>9} | gain")
+    for size in args.sizes:
+        seed(engine, size)
+        legacy_rt, legacy_ms = measure(engine, legacy_stats, args.repeat, args.rtt_ms)
+        new_rt, new_ms = measure(engine, compute_dashboard_stats, args.repeat, args.rtt_ms)
+        print(f"{size:>14} | {legacy_rt:>9} | {legacy_ms:>9.1f} | {new_rt:>9} | {new_ms:>9.1f} | x{legacy_ms / new_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
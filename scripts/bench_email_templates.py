@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark du rendu des emails de notification : environnement Jinja
+recréé et template recherché à chaque envoi (historique) vs renderer partagé
+avec templates précompilés (app.services.email_template_service).
+
+Usage:
+    python scripts/bench_email_templates.py
+    python scripts/bench_email_templates.py --renders 20000 --template notification_affectation.html
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+
+from app.services.email_template_service import TEMPLATES_DIR, EmailTemplateRenderer  # noqa: E402
+
+
+def contexts(n: int):
+    return [
+        {"user": f"Technicien {i}", "titre": f"Intervention #{i}", "contenu": f"Message {i}",
+         "message": f"Message {i}", "type": "information", "sujet": "[MIF] Notification"}
+        for i in range(n)
+    ]
+
+
+def legacy(template_name: str, ctxs) -> None:
+    """Reproduction de l'implémentation historique (Environment + get_template par envoi)."""
+    for ctx in ctxs:
+        env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
+        env.get_template(template_name).render(**ctx)
+
+
+def lookup_per_send(template_name: str, ctxs) -> None:
+    """Environnement module partagé, recherche du template (stat du fichier) à chaque envoi."""
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
+    for ctx in ctxs:
+        env.get_template(template_name).render(**ctx)
+
+
+def precompiled(renderer: EmailTemplateRenderer):
+    def run(template_name: str, ctxs) -> None:
+        for ctx in ctxs:
+            renderer.render(template_name, **ctx)
+    return run
+
+
+def bulk(renderer: EmailTemplateRenderer):
+    def run(template_name: str, ctxs) -> None:
+        renderer.render_many(template_name, ctxs)
+    return run
+
+
+def measure(fn, template_name: str, ctxs) -> float:
+    t0 = time.perf_counter()
+    fn(template_name, ctxs)
+    return len(ctxs) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=5000)
+    parser.add_argument("--template", default="notification_information.html")
+    args = parser.parse_args()
+
+    renderer = EmailTemplateRenderer()
+    print(f"Templates précompilés: {', '.join(renderer.warm_up())}")
+    ctxs = contexts(args.renders)
+    # Les variantes lentes sont mesurées sur un échantillon réduit
+    legacy_ctxs = ctxs[: max(args.renders // 10, 1)]
+    resultats = [
+        ("Environment par envoi", measure(legacy, args.template, legacy_ctxs)),
+        ("get_template par envoi", measure(lookup_per_send, args.template, ctxs)),
+        ("précompilé", measure(precompiled(renderer), args.template, ctxs)),
+        ("précompilé en lot", measure(bulk(renderer), args.template, ctxs)),
+    ]
+    reference = resultats[0][1]
+    print(f"{'variante':>24} | {'rendus/s':>10} | gain")
+    for nom, debit in resultats:
+        print(f"{nom:>24} | {debit:>10.0f} | x{debit / reference:.1f}")
+
+
+if __name__ == "__main__":
+    main()
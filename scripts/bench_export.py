@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'export des interventions : chargement complet (objets ORM,
+InterventionOut puis une liste JSON, comme une liste non paginée) vs export
+en flux NDJSON/CSV (curseur serveur, paquets de EXPORT_BATCH_SIZE lignes).
+
+Mesure le pic mémoire Python (tracemalloc) et le débit (lignes/s).
+
+Usage:
+    python scripts/bench_export.py
+    python scripts/bench_export.py --rows 200000 --batch-size 2000
+    python scripts/bench_export.py --url postgresql+psycopg2://u:p@localhost/bench
+
+NOTE: la base cible est vidée puis remplie; utiliser une base dédiée.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.database import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.equipement import Equipement  # noqa: E402
+from app.models.intervention import Intervention  # noqa: E402
+from app.schemas.intervention import InterventionOut  # noqa: E402
+from app.services.intervention_export_service import stream_export  # noqa: E402
+from app.services.intervention_service import interventions_statement  # noqa: E402
+
+ADMIN = {"role": "admin", "email": "bench@example.com", "user_id": 1}
+SEED_BATCH = 20_000
+
+
+def seed(engine, nb_rows: int) -> None:
+    """(Re)crée le schéma et insère `nb_rows` interventions par paquets."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Equipement.__table__), [
+            {"nom": "EQ-1", "type_equipement": "machine", "localisation": "Atelier", "criticite": "standard"}
+        ])
+        for start in range(0, nb_rows, SEED_BATCH):
+            conn.execute(insert(Intervention.__table__), [
+                {"titre": f"Intervention {i}", "description": "Contrôle périodique", "type": "corrective",
+                 "statut": "ouverte", "priorite": "normale", "urgence": i % 5 == 0, "date_creation": now,
+                 "validation_client": False, "equipement_id": 1}
+                for i in range(start, min(start + SEED_BATCH, nb_rows))
+            ])
+
+
+def legacy_export(db) -> int:
+    """Toute la table en mémoire : entités, schémas Pydantic puis un seul document JSON."""
+    items = db.scalars(interventions_statement(principal=ADMIN)).all()
+    payload = [InterventionOut.model_validate(i).model_dump(mode="json", by_alias=True) for i in items]
+    return len(json.dumps(payload))
+
+
+def streaming_export(db, fmt: str, batch_size: int) -> int:
+    """Consomme le flux comme le ferait StreamingResponse (chunks envoyés puis libérés)."""
+    return sum(len(chunk) for chunk in stream_export(db, interventions_statement(principal=ADMIN), fmt, batch_size))
+
+
+def measure(label: str, fn, session_factory, nb_rows: int) -> None:
+    db = session_factory()
+    try:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        size = fn(db)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+    print(f"{label:<18} {nb_rows / elapsed:>12,.0f} lignes/s  pic {peak / 2**20:>9.1f} Mo  "
+          f"({size / 2**20:.1f} Mo produits, {elapsed:.1f} s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--url", help="URL de base dédiée (défaut: SQLite temporaire)")
+    parser.add_argument("--skip-legacy", action="store_true", help="Ne mesurer que l'export en flux")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench_export.db')}"
+    engine = create_engine(url)
+    print(f"Préparation de {args.rows:,} interventions...")
+    seed(engine, args.rows)
+    session_factory = sessionmaker(bind=engine)
+
+    if not args.skip_legacy:
+        measure("liste complète", legacy_export, session_factory, args.rows)
+    for fmt in ("ndjson", "csv"):
+        measure(f"flux {fmt}", lambda db, fmt=fmt: streaming_export(db, fmt, args.batch_size),
+                session_factory, args.rows)
+
+    engine.dispose()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark des connexions : débit de vérifications bcrypt et latence des
+autres requêtes pendant une rafale de logins.
+
+Le threadpool des endpoints synchrones est simulé par un pool de
+--request-threads threads. Deux variantes :
+- historique : bcrypt exécuté directement dans les threads des requêtes ;
+- exécuteur dédié (app.core.password_hashing) : bcrypt sur PASSWORD_HASH_WORKERS
+  threads, file bornée, délestage en 429 au-delà.
+Pendant la rafale, une requête "légère" est soumise toutes les 10 ms : on
+mesure son attente avant d'obtenir un thread (famine du threadpool).
+
+Usage:
+    python scripts/bench_login.py
+    python scripts/bench_login.py --logins 400 --request-threads 40 --workers 4 --pending 16
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.core.password_hashing import PasswordExecutor  # noqa: E402
+from app.core.security import get_password_hash, verify_password  # noqa: E402
+
+
+def run(nb_logins: int, request_threads: int, login_fn):
+    """Retourne (logins/s, part rejetée en 429, attente p50/max des requêtes légères en ms)."""
+    pool = ThreadPoolExecutor(max_workers=request_threads)
+    attentes, rejets = [], []
+    fini = threading.Event()
+
+    def login():
+        try:
+            login_fn()
+        except HTTPException as exc:
+            if exc.status_code == 429:
+                rejets.append(1)
+
+    def sonde():
+        while not fini.is_set():
+            soumis = time.perf_counter()
+            pool.submit(lambda s=soumis: attentes.append((time.perf_counter() - s) * 1000)).result()
+            time.sleep(0.01)
+
+    sondeur = threading.Thread(target=sonde, daemon=True)
+    t0 = time.perf_counter()
+    futures = [pool.submit(login) for _ in range(nb_logins)]
+    sondeur.start()
+    for future in futures:
+        future.result()
+    duree = time.perf_counter() - t0
+    fini.set()
+    sondeur.join()
+    pool.shutdown()
+    attentes.sort()
+    return (
+        (nb_logins - len(rejets)) / duree,
+        len(rejets) / nb_logins,
+        attentes[len(attentes) // 2] if attentes else 0.0,
+        attentes[-1] if attentes else 0.0,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--request-threads", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pending", type=int, default=16)
+    args = parser.parse_args()
+
+    hashed = get_password_hash("benchmark")
+    executor = PasswordExecutor(args.workers, args.pending)
+    variantes = [
+        ("historique", lambda: verify_password("benchmark", hashed)),
+        ("exécuteur dédié", lambda: executor.run(verify_password, "benchmark", hashed)),
+    ]
+    print(f"{args.logins} connexions, {args.request_threads} threads de requêtes, "
+          f"exécuteur {args.workers}+{args.pending}, {os.cpu_count()} CPU")
+    print(f"{'variante':>16} | {'logins/s':>8} | {'429':>6} | {'attente p50':>11} | {'attente max':>11}")
+    for nom, fn in variantes:
+        debit, rejet, p50, pmax = run(args.logins, args.request_threads, fn)
+        print(f"{nom:>16} | {debit:>8.1f} | {rejet:>6.0%} | {p50:>9.1f}ms | {pmax:>9.1f}ms")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la fabrique de sessions : ouverture/fermeture de sessions par
+seconde avec l'ancien SessionLocal (create_all à chaque appel) puis avec
+l'initialisation unique du schéma (app.db.database.SessionLocal).
+
+Chaque itération ouvre une session, exécute SELECT 1 et la ferme, comme une
+requête qui passe par get_db.
+
+Usage:
+    python scripts/bench_sessions.py
+    python scripts/bench_sessions.py --sessions 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event, text  # noqa: E402
+
+from app.db import database  # noqa: E402
+from app.db.database import Base, engine, pool_metrics  # noqa: E402
+import app.models  # noqa: E402,F401
+
+
+def legacy_session_local():
+    """SessionLocal historique : create_all (checkfirst) à chaque session."""
+    Base.metadata.create_all(bind=engine)
+    return database._SessionFactory()
+
+
+def measure(factory, nb_sessions: int):
+    """Retourne (sessions par seconde, requêtes SQL par session)."""
+    statements = []
+    listener = lambda *args: statements.append(1)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        t0 = time.perf_counter()
+        for _ in range(nb_sessions):
+            db = factory()
+            try:
+                db.execute(text("SELECT 1"))
+            finally:
+                db.close()
+        duree = time.perf_counter() - t0
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return nb_sessions / duree, len(statements) / nb_sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"Base: {engine.url.render_as_string(hide_password=True)}")
+    database.init_schema()
+
+    resultats = [
+        ("historique", ) + measure(legacy_session_local, args.sessions),
+        ("schéma unique", ) + measure(database.SessionLocal, args.sessions),
+    ]
+    print(f"{'variante':>14} | {'sessions/s':>11} | {'requêtes/session':>16}")
+    for nom, debit, requetes in resultats:
+        print(f"{nom:>14} | {debit:>11.0f} | {requetes:>16.2f}")
+    print(f"Pool: {pool_metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Réconciliation des compteurs KPI d'interventions (intervention_kpi_counters).
+
+Compare les buckets statut/priorité/mois à la table interventions et corrige
+les écarts (écritures hors services, imports SQL, restauration partielle).
+
+Usage:
+    python scripts/rebuild_kpi_counters.py             # corrige la dérive
+    python scripts/rebuild_kpi_counters.py --dry-run   # rapporte sans modifier
+    python scripts/rebuild_kpi_counters.py --full      # vide puis reconstruit
+
+Code de sortie 1 en --dry-run si une dérive est détectée (utilisable en CI/cron).
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.services.kpi_counter_service import (  # noqa: E402
+    reconcile_kpi_counters, rebuild_kpi_counters,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Rapporte les écarts sans modifier la base")
+    parser.add_argument("--full", action="store_true", help="Reconstruction complète de la table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.full:
+            print(f"✅ {rebuild_kpi_counters(db)} buckets reconstruits")
+            return 0
+        report = reconcile_kpi_counters(db, dry_run=args.dry_run)
+        for ecart in report["drift"]:
+            print(f"  {ecart['mois']} {ecart['statut']:<10} {ecart['priorite']:<10} "
+                  f"attendu={ecart['attendu']} actuel={ecart['actuel']}")
+        if not report["corrected"]:
+            print(f"✅ Compteurs cohérents ({report['buckets']} buckets)")
+            return 0
+        verbe = "détecté(s)" if args.dry_run else "corrigé(s)"
+        print(f"⚠️ {report['corrected']} écart(s) {verbe} sur {report['buckets']} buckets")
+        return 1 if args.dry_run else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Réconciliation du stockage des documents (UPLOAD_DIRECTORY) avec la table documents.
+
+Rapporte les blobs orphelins (aucun document ne les référence), les fichiers
+temporaires d'upload abandonnés et les documents dont le blob a disparu.
+Hors --dry-run, les orphelins et temporaires plus vieux que --grace sont
+supprimés; les documents sans blob sont seulement signalés.
+
+Usage:
+    python scripts/reconcile_documents.py --dry-run   # rapporte sans modifier
+    python scripts/reconcile_documents.py             # supprime les orphelins
+    python scripts/reconcile_documents.py --grace 600 # délai de grâce (s)
+
+Code de sortie 1 si un écart subsiste (orphelins en --dry-run, documents sans blob).
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.services.document_service import reconcile_storage  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Rapporte les écarts sans supprimer de fichier")
+    parser.add_argument("--grace", type=int, default=3600,
+                        help="Âge minimal (s) d'un fichier non référencé avant suppression (uploads en cours)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = reconcile_storage(db, dry_run=args.dry_run, grace_seconds=args.grace)
+    finally:
+        db.close()
+
+    for name in report.orphans:
+        print(f"  blob orphelin      {name}")
+    for name in report.stale_temps:
+        print(f"  temporaire         {name}")
+    for document_id in report.dangling:
+        print(f"  document sans blob #{document_id}")
+
+    a_nettoyer = len(report.orphans) + len(report.stale_temps)
+    if args.dry_run:
+        print(f"{report.blobs} blobs référencés, {a_nettoyer} fichier(s) à supprimer, "
+              f"{len(report.dangling)} document(s) sans blob")
+    else:
+        print(f"{report.blobs} blobs référencés, {report.removed} fichier(s) supprimé(s), "
+              f"{len(report.dangling)} document(s) sans blob")
+    if report.dangling or (args.dry_run and a_nettoyer):
+        print("⚠️ Stockage incohérent")
+        return 1
+    print("✅ Stockage cohérent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())